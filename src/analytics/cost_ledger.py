@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Cost Ledger - Append-only, batched storage for AI cost records
+
+Cost records are appended to an in-memory buffer and written to SQLite in
+one transaction per flush: when the buffer reaches max_buffer records, or
+flush_interval seconds after the first unflushed record (on the running
+event loop), or on flush() / close(). Recording a cost never rewrites
+history.
+
+Running totals (overall, per day, per month, per service and per category)
+are kept in memory, updated as each record is appended, and written to a
+rollup table in the same transaction as the records they cover, so spend
+checks and analytics are dictionary lookups. Budgets are stored alongside.
+
+Range queries (iter_records) stream rows from the timestamp index in
+chunks instead of loading the full history.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rollup dimensions: total (key ''), day (YYYY-MM-DD), month (YYYY-MM), service, category
+ROLLUP_DIMENSIONS = ("total", "day", "month", "service", "category")
+
+
+class CostRollup:
+    """Running totals for one rollup bucket"""
+    __slots__ = ("count", "successes", "cost", "tokens")
+
+    def __init__(self, count: int = 0, successes: int = 0, cost: Decimal = Decimal("0"), tokens: int = 0):
+        self.count = count
+        self.successes = successes
+        self.cost = cost
+        self.tokens = tokens
+
+    def add(self, cost: Decimal, tokens: int, success: bool) -> None:
+        self.count += 1
+        self.successes += 1 if success else 0
+        self.cost += cost
+        self.tokens += tokens
+
+
+class CostLedger:
+    """Append-only SQLite cost ledger with write buffering and rolled-up totals"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cost_records (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            record_id TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            service TEXT NOT NULL,
+            operation_type TEXT NOT NULL,
+            profile_id TEXT,
+            opportunity_id TEXT,
+            batch_id TEXT,
+            actual_cost_usd TEXT NOT NULL,
+            input_tokens INTEGER NOT NULL,
+            output_tokens INTEGER NOT NULL,
+            success INTEGER NOT NULL,
+            record TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cost_records_timestamp ON cost_records (timestamp);
+
+        CREATE TABLE IF NOT EXISTS cost_rollups (
+            dimension TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            successes INTEGER NOT NULL,
+            cost TEXT NOT NULL,
+            tokens INTEGER NOT NULL,
+            PRIMARY KEY (dimension, bucket)
+        );
+
+        CREATE TABLE IF NOT EXISTS budgets (
+            budget_id TEXT PRIMARY KEY,
+            budget TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS ledger_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self,
+                 db_path: Path,
+                 flush_interval: float = 5.0,
+                 max_buffer: int = 500):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self._conn.commit()
+
+        self._buffer: List[Tuple] = []
+        self._dirty_rollups: set = set()
+        self._dirty_budgets: Dict[str, str] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+        atexit.register(self._flush_at_exit)
+
+        self.rollups: Dict[Tuple[str, str], CostRollup] = {
+            (dimension, bucket): CostRollup(count, successes, Decimal(cost), tokens)
+            for dimension, bucket, count, successes, cost, tokens in self._conn.execute(
+                "SELECT dimension, bucket, count, successes, cost, tokens FROM cost_rollups"
+            )
+        }
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Buffer one cost record (CostRecord.to_dict() form) and update the rollups
+
+        The record is durable after the next flush.
+        """
+        timestamp = datetime.fromisoformat(record["timestamp"])
+        cost = Decimal(record["actual_cost_usd"])
+        tokens = record.get("input_tokens", 0) + record.get("output_tokens", 0)
+        success = bool(record.get("success"))
+
+        with self._lock:
+            self._buffer.append((
+                record["record_id"], record["timestamp"], record["service"], record["operation_type"],
+                record.get("profile_id"), record.get("opportunity_id"),
+                (record.get("metadata") or {}).get("batch_id"),
+                str(cost), record.get("input_tokens", 0), record.get("output_tokens", 0),
+                int(success), json.dumps(record, default=str),
+            ))
+            for key in (
+                ("total", ""),
+                ("day", timestamp.date().isoformat()),
+                ("month", timestamp.strftime("%Y-%m")),
+                ("service", record["service"]),
+                ("category", record["operation_type"]),
+            ):
+                rollup = self.rollups.get(key)
+                if rollup is None:
+                    rollup = self.rollups[key] = CostRollup()
+                rollup.add(cost, tokens, success)
+                self._dirty_rollups.add(key)
+
+            if len(self._buffer) >= self.max_buffer:
+                self.flush()
+            else:
+                self._schedule_flush()
+
+    def put_budget(self, budget_id: str, budget: Dict[str, Any]) -> None:
+        """Buffer a budget's current state (CostBudget.to_dict() form)"""
+        with self._lock:
+            self._dirty_budgets[budget_id] = json.dumps(budget, default=str)
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to run a timer on: write through
+            self.flush()
+            return
+        if self._flush_handle is not None and self._flush_loop is loop and not loop.is_closed():
+            return
+        self._flush_loop = loop
+        self._flush_handle = loop.call_later(self.flush_interval, self._timed_flush)
+
+    def _timed_flush(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Cost ledger flush failed: {e}")
+
+    def flush(self) -> int:
+        """Write buffered records, rollups and budgets in one transaction. Returns records written."""
+        with self._lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            if not (self._buffer or self._dirty_rollups or self._dirty_budgets):
+                return 0
+
+            records, rollup_keys, budgets = self._buffer, self._dirty_rollups, self._dirty_budgets
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO cost_records (record_id, timestamp, service, operation_type, profile_id, "
+                    "opportunity_id, batch_id, actual_cost_usd, input_tokens, output_tokens, success, record) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    records,
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cost_rollups (dimension, bucket, count, successes, cost, tokens) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (dimension, bucket, rollup.count, rollup.successes, str(rollup.cost), rollup.tokens)
+                        for (dimension, bucket), rollup in
+                        ((key, self.rollups[key]) for key in rollup_keys)
+                    ],
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO budgets (budget_id, budget) VALUES (?, ?)",
+                    list(budgets.items()),
+                )
+            self._buffer, self._dirty_rollups, self._dirty_budgets = [], set(), {}
+            return len(records)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._conn.close()
+            self._closed = True
+        atexit.unregister(self._flush_at_exit)
+
+    def _flush_at_exit(self) -> None:
+        try:
+            if not self._closed:
+                self.flush()
+        except Exception as e:
+            logger.error(f"Cost ledger flush at exit failed: {e}")
+
+    def delete_before(self, cutoff: datetime) -> int:
+        """Drop raw records older than cutoff (rollups keep their history). Returns records removed."""
+        with self._lock:
+            self.flush()
+            with self._conn:
+                return self._conn.execute(
+                    "DELETE FROM cost_records WHERE timestamp < ?", (cutoff.isoformat(),)
+                ).rowcount
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def rollup(self, dimension: str, bucket: str = "") -> CostRollup:
+        """Running totals for one bucket (zero when nothing was recorded)"""
+        return self.rollups.get((dimension, bucket)) or CostRollup()
+
+    def rollups_for(self, dimension: str) -> Dict[str, CostRollup]:
+        return {bucket: rollup for (dim, bucket), rollup in self.rollups.items() if dim == dimension}
+
+    def load_budgets(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            self.flush()
+            return {
+                budget_id: json.loads(budget)
+                for budget_id, budget in self._conn.execute("SELECT budget_id, budget FROM budgets")
+            }
+
+    def iter_records(self,
+                     start: Optional[datetime] = None,
+                     end: Optional[datetime] = None,
+                     chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream records with start <= timestamp <= end, oldest first, chunk_size rows at a time"""
+        with self._lock:
+            self.flush()
+
+        bounds = ""
+        params: List[Any] = []
+        if end:
+            bounds += " AND timestamp <= ?"
+            params.append(end.isoformat())
+
+        # Keyset pagination over the (timestamp, seq) index
+        last = (start.isoformat() if start else "", 0)
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT timestamp, seq, record FROM cost_records "
+                    "WHERE (timestamp > ? OR (timestamp = ? AND seq >= ?))" + bounds +
+                    " ORDER BY timestamp, seq LIMIT ?",
+                    [last[0], last[0], last[1], *params, chunk_size],
+                ).fetchall()
+            for _, _, record in rows:
+                yield json.loads(record)
+            if len(rows) < chunk_size:
+                return
+            last = (rows[-1][0], rows[-1][1] + 1)
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM ledger_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO ledger_meta (key, value) VALUES (?, ?)", (key, value))
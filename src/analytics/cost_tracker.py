@@ -16,6 +16,7 @@ from decimal import Decimal, ROUND_HALF_UP
 
 from src.core.processing_state import ProcessingStep, get_processing_state_manager
 from src.core.cache_manager import CacheType, get_cache_manager
+from src.analytics.cost_ledger import CostLedger
 
 logger = logging.getLogger(__name__)
 
@@ -379,62 +380,66 @@ class CostTracker:
         }
     }
     
-    def __init__(self, cost_dir: Optional[Path] = None):
+    def __init__(self, cost_dir: Optional[Path] = None, flush_interval: float = 5.0):
         self.cost_dir = cost_dir or Path("data/cost_tracking")
+        # Legacy JSON files, imported into the ledger once
         self.records_file = self.cost_dir / "cost_records.json"
         self.budgets_file = self.cost_dir / "budgets.json"
         
-        self.cost_records: List[CostRecord] = []
         self.budgets: Dict[str, CostBudget] = {}
         self.lock = asyncio.Lock()
         
         # Ensure directory exists
         self.cost_dir.mkdir(parents=True, exist_ok=True)
         
+        # Append-only ledger: records, rolled-up totals and budgets
+        self.ledger = CostLedger(self.cost_dir / "cost_ledger.db", flush_interval=flush_interval)
+        
         # Load existing data
         self._load_data()
     
     def _load_data(self) -> None:
-        """Load cost records and budgets from disk"""
+        """Load budgets from the ledger, importing legacy JSON files on first run"""
         try:
-            # Load cost records
-            if self.records_file.exists():
-                with open(self.records_file, 'r') as f:
-                    records_data = json.load(f)
-                    self.cost_records = [CostRecord.from_dict(data) for data in records_data]
-                logger.info(f"Loaded {len(self.cost_records)} cost records")
+            if self.ledger.get_meta("json_imported") is None:
+                self._import_json_files()
             
-            # Load budgets
-            if self.budgets_file.exists():
-                with open(self.budgets_file, 'r') as f:
-                    budgets_data = json.load(f)
-                    self.budgets = {
-                        budget_id: CostBudget.from_dict(data)
-                        for budget_id, data in budgets_data.items()
-                    }
-                logger.info(f"Loaded {len(self.budgets)} budgets")
+            self.budgets = {
+                budget_id: CostBudget.from_dict(data)
+                for budget_id, data in self.ledger.load_budgets().items()
+            }
+            logger.info(
+                f"Loaded {self.ledger.rollup('total').count} cost records (rolled up) "
+                f"and {len(self.budgets)} budgets"
+            )
                 
         except Exception as e:
             logger.error(f"Failed to load cost tracking data: {e}")
-            self.cost_records = []
             self.budgets = {}
     
+    def _import_json_files(self) -> None:
+        """One-time import of cost_records.json / budgets.json (the files are left in place)"""
+        if self.records_file.exists():
+            with open(self.records_file, 'r') as f:
+                records_data = json.load(f)
+            for data in records_data:
+                self.ledger.append(CostRecord.from_dict(data).to_dict())
+            logger.info(f"Imported {len(records_data)} cost records into the ledger")
+        
+        if self.budgets_file.exists():
+            with open(self.budgets_file, 'r') as f:
+                budgets_data = json.load(f)
+            for budget_id, data in budgets_data.items():
+                self.ledger.put_budget(budget_id, CostBudget.from_dict(data).to_dict())
+            logger.info(f"Imported {len(budgets_data)} budgets into the ledger")
+        
+        self.ledger.flush()
+        self.ledger.set_meta("json_imported", datetime.now().isoformat())
+    
     async def _save_data(self) -> None:
-        """Save cost records and budgets to disk"""
+        """Flush buffered cost records and budgets to the ledger"""
         try:
-            # Save cost records
-            records_data = [record.to_dict() for record in self.cost_records]
-            with open(self.records_file, 'w') as f:
-                json.dump(records_data, f, indent=2)
-            
-            # Save budgets
-            budgets_data = {
-                budget_id: budget.to_dict() 
-                for budget_id, budget in self.budgets.items()
-            }
-            with open(self.budgets_file, 'w') as f:
-                json.dump(budgets_data, f, indent=2)
-                
+            self.ledger.flush()
         except Exception as e:
             logger.error(f"Failed to save cost tracking data: {e}")
     
@@ -538,6 +543,7 @@ class CostTracker:
             processing_time_seconds=processing_time_seconds,
             actual_cost_usd=actual_cost_usd,
             estimated_cost_usd=estimated_cost.estimated_cost_usd if estimated_cost else None,
+            cost_variance=None,
             timestamp=datetime.now(),
             success=success,
             error_message=error_message,
@@ -548,15 +554,13 @@ class CostTracker:
         record.calculate_variance()
         
         async with self.lock:
-            # Add to records
-            self.cost_records.append(record)
+            # Append to the ledger (buffered; flushed on an interval)
+            self.ledger.append(record.to_dict())
             
             # Update budgets
-            for budget in self.budgets.values():
+            for budget_id, budget in self.budgets.items():
                 budget.add_cost(record)
-            
-            # Save data
-            await self._save_data()
+                self.ledger.put_budget(budget_id, budget.to_dict())
         
         # Log significant cost variances
         if record.cost_variance and abs(record.cost_variance) > Decimal('0.01'):
@@ -589,15 +593,27 @@ class CostTracker:
         
         async with self.lock:
             self.budgets[budget_id] = budget
+            self.ledger.put_budget(budget_id, budget.to_dict())
             await self._save_data()
         
         logger.info(f"Created budget {name} with ${total_budget_usd}")
         return budget
     
+    def get_spend(self, period: str = "day", when: Optional[datetime] = None) -> Decimal:
+        """Total spend for the day or month containing `when` (default now), from the rollups"""
+        when = when or datetime.now()
+        bucket = when.date().isoformat() if period == "day" else when.strftime("%Y-%m")
+        return self.ledger.rollup(period, bucket).cost
+    
+    def get_service_spend(self, service: AIService) -> Decimal:
+        """Total spend on one service, from the rollups"""
+        return self.ledger.rollup("service", service.value).cost
+    
     async def get_cost_analytics(self) -> Dict[str, Any]:
-        """Get comprehensive cost analytics"""
+        """Get comprehensive cost analytics (from the ledger's rolled-up totals)"""
         async with self.lock:
-            total_records = len(self.cost_records)
+            totals = self.ledger.rollup("total")
+            total_records = totals.count
             if total_records == 0:
                 return {
                     'total_records': 0,
@@ -609,20 +625,12 @@ class CostTracker:
                 }
             
             # Calculate totals
-            total_cost = sum(record.actual_cost_usd for record in self.cost_records)
-            successful_operations = sum(1 for record in self.cost_records if record.success)
-            
-            # Cost by service
-            cost_by_service = {}
-            for record in self.cost_records:
-                service = record.service.value
-                cost_by_service[service] = cost_by_service.get(service, Decimal('0.00')) + record.actual_cost_usd
+            total_cost = totals.cost
+            successful_operations = totals.successes
             
-            # Cost by category
-            cost_by_category = {}
-            for record in self.cost_records:
-                category = record.operation_type.value
-                cost_by_category[category] = cost_by_category.get(category, Decimal('0.00')) + record.actual_cost_usd
+            # Cost by service and category
+            cost_by_service = {k: r.cost for k, r in self.ledger.rollups_for("service").items()}
+            cost_by_category = {k: r.cost for k, r in self.ledger.rollups_for("category").items()}
             
             # Budget status
             budget_status = {}
@@ -782,20 +790,22 @@ class CostTracker:
                                format_type: str = 'json') -> Dict[str, Any]:
         """Export billing data in various formats for ChatGPT's billing export suggestion"""
         
-        # Filter records by date range
-        filtered_records = self.cost_records
-        if start_date:
-            filtered_records = [r for r in filtered_records if r.timestamp >= start_date]
-        if end_date:
-            filtered_records = [r for r in filtered_records if r.timestamp <= end_date]
-        
-        # Group by different dimensions
+        # Group by different dimensions, streaming the date range from the ledger
         by_model = {}
         by_task_type = {}
         by_batch_id = {}
         by_date = {}
-        
-        for record in filtered_records:
+        total_records = 0
+        total_cost = Decimal('0.0')
+        detailed_records = []
+        
+        for data in self.ledger.iter_records(start_date, end_date):
+            record = CostRecord.from_dict(data)
+            total_records += 1
+            total_cost += record.actual_cost_usd
+            if format_type == 'detailed':
+                detailed_records.append(data)
+            
             # By model/service
             model = record.service.value
             if model not in by_model:
@@ -840,13 +850,13 @@ class CostTracker:
                     'start': start_date.isoformat() if start_date else None,
                     'end': end_date.isoformat() if end_date else None
                 },
-                'total_records': len(filtered_records),
+                'total_records': total_records,
                 'format': format_type
             },
             'summary': {
-                'total_cost': str(sum(r.actual_cost_usd for r in filtered_records)),
-                'total_operations': len(filtered_records),
-                'avg_cost_per_operation': str(sum(r.actual_cost_usd for r in filtered_records) / len(filtered_records)) if filtered_records else '0.00'
+                'total_cost': str(total_cost),
+                'total_operations': total_records,
+                'avg_cost_per_operation': str(total_cost / total_records) if total_records else '0.00'
             },
             'breakdowns': {
                 'by_model': convert_decimals(by_model),
@@ -854,26 +864,18 @@ class CostTracker:
                 'by_batch_id': convert_decimals(by_batch_id),
                 'by_date': convert_decimals(by_date)
             },
-            'detailed_records': [record.to_dict() for record in filtered_records] if format_type == 'detailed' else []
+            'detailed_records': detailed_records
         }
         
         return export_data
     
     async def cleanup_old_records(self, max_age: timedelta = timedelta(days=90)) -> int:
-        """Clean up old cost records"""
+        """Clean up old cost records (rolled-up totals are kept)"""
         async with self.lock:
             cutoff_date = datetime.now() - max_age
-            old_count = len(self.cost_records)
-            
-            self.cost_records = [
-                record for record in self.cost_records 
-                if record.timestamp > cutoff_date
-            ]
-            
-            removed_count = old_count - len(self.cost_records)
+            removed_count = self.ledger.delete_before(cutoff_date)
             
             if removed_count > 0:
-                await self._save_data()
                 logger.info(f"Cleaned up {removed_count} old cost records")
             
             return removed_count
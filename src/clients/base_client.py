@@ -2,9 +2,10 @@
 Base API Client
 Abstract base class for all external API clients.
 """
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 from datetime import datetime
 
 from ..core.http_client import CatalynxHTTPClient, HTTPConfig, get_http_client
@@ -135,8 +136,17 @@ class BaseAPIClient(ABC):
 class PaginatedAPIClient(BaseAPIClient):
     """
     Base class for APIs that support pagination.
+    
+    iter_pages() streams pages as they arrive. When the first response says
+    how many pages or records there are (_plan_pages), the remaining pages are
+    prefetched concurrently, up to prefetch_pages at a time; requests still
+    go through the shared rate limiter. Otherwise pages are followed one by
+    one with _build_next_page_params.
     """
     
+    # Pages requested concurrently when the page count is known up front
+    prefetch_pages: int = 4
+    
     @abstractmethod
     def _extract_pagination_info(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Extract pagination information from response"""
@@ -149,11 +159,112 @@ class PaginatedAPIClient(BaseAPIClient):
         """Build parameters for next page request"""
         pass
     
+    def _plan_pages(self,
+                    first_params: Dict[str, Any],
+                    pagination_info: Dict[str, Any],
+                    max_pages: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parameters for every page after the first (at most max_pages - 1), when
+        the first response reports total pages or records. None means the
+        count is unknown and pages are followed one at a time.
+        """
+        return None
+    
+    async def _fetch_page(self, endpoint: str, params: Dict[str, Any], method: str) -> Dict[str, Any]:
+        if method == 'POST':
+            return await self._post(endpoint, json_data=params)
+        return await self._get(endpoint, params=params)
+    
+    async def iter_pages(self,
+                         endpoint: str,
+                         initial_params: Optional[Dict[str, Any]] = None,
+                         max_pages: int = 10,
+                         method: str = 'GET',
+                         prefetch: Optional[int] = None,
+                         progress_callback=None) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yield (page_index, items) for each non-empty page as it arrives
+        
+        Prefetched pages may arrive out of order; page_index (0 = first page)
+        gives their position. An empty page ends the listing: no later page
+        is requested after it is seen.
+        
+        Args:
+            endpoint: API endpoint
+            initial_params: Query parameters (GET) or JSON payload (POST) for the first page
+            max_pages: Maximum pages to fetch
+            method: 'GET' or 'POST'
+            prefetch: Concurrent page requests (defaults to prefetch_pages)
+            progress_callback: Optional progress callback
+        """
+        params = dict(initial_params or {})
+        
+        if progress_callback:
+            progress_callback(f"Fetching page 1/{max_pages}")
+        response = await self._fetch_page(endpoint, params, method)
+        page_data = self._extract_page_data(response)
+        if not page_data:
+            return
+        yield 0, page_data
+        
+        pagination_info = self._extract_pagination_info(response)
+        planned = self._plan_pages(params, pagination_info, max_pages) if max_pages > 1 else []
+        
+        if planned is None:
+            # Page count unknown: each request needs the previous response
+            for page_index in range(1, max_pages):
+                params = self._build_next_page_params(params, pagination_info)
+                if not params:
+                    return
+                if progress_callback:
+                    progress_callback(f"Fetching page {page_index + 1}/{max_pages}")
+                response = await self._fetch_page(endpoint, params, method)
+                page_data = self._extract_page_data(response)
+                if not page_data:
+                    return
+                yield page_index, page_data
+                pagination_info = self._extract_pagination_info(response)
+            return
+        
+        # Page count known: keep up to `prefetch` requests in flight
+        planned = planned[:max_pages - 1]
+        window = max(1, prefetch or self.prefetch_pages)
+        pending: Dict[asyncio.Task, int] = {}
+        next_page = 0
+        last_page = len(planned)  # Lowered when an empty page marks the end
+        try:
+            while pending or next_page < last_page:
+                while next_page < last_page and len(pending) < window:
+                    if progress_callback:
+                        progress_callback(f"Fetching page {next_page + 2}/{max_pages}")
+                    task = asyncio.create_task(self._fetch_page(endpoint, planned[next_page], method))
+                    pending[task] = next_page + 1
+                    next_page += 1
+                
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=pending.get):
+                    page_index = pending.pop(task)
+                    if page_index > last_page:
+                        continue
+                    page_data = self._extract_page_data(task.result())
+                    if not page_data:
+                        last_page = page_index - 1
+                        for other, other_index in list(pending.items()):
+                            if other_index > last_page:
+                                other.cancel()
+                                del pending[other]
+                        continue
+                    yield page_index, page_data
+        finally:
+            for task in pending:
+                task.cancel()
+    
     async def get_all_pages(self,
                            endpoint: str,
                            initial_params: Optional[Dict[str, Any]] = None,
                            max_pages: int = 10,
-                           progress_callback=None) -> List[Dict[str, Any]]:
+                           progress_callback=None,
+                           method: str = 'GET') -> List[Dict[str, Any]]:
         """
         Fetch all pages from a paginated endpoint
         
@@ -162,41 +273,28 @@ class PaginatedAPIClient(BaseAPIClient):
             initial_params: Initial query parameters
             max_pages: Maximum pages to fetch
             progress_callback: Optional progress callback
+            method: 'GET' or 'POST' (params sent as the JSON payload)
             
         Returns:
             List of all response data from all pages
         """
+        pages = {}
+        async for page_index, page_data in self.iter_pages(
+            endpoint, initial_params, max_pages, method=method, progress_callback=progress_callback
+        ):
+            pages[page_index] = page_data
+        
+        # Page order, up to the first missing (empty) page
         all_results = []
-        params = initial_params or {}
         page_count = 0
-        
-        while page_count < max_pages:
-            if progress_callback:
-                progress_callback(f"Fetching page {page_count + 1}/{max_pages}")
-            
-            response = await self._get(endpoint, params=params)
-            
-            # Extract data from response
-            page_data = self._extract_page_data(response)
-            if not page_data:
-                break
-                
-            all_results.extend(page_data)
-            
-            # Check for next page
-            pagination_info = self._extract_pagination_info(response)
-            next_params = self._build_next_page_params(params, pagination_info)
-            
-            if not next_params:
-                break
-                
-            params = next_params
+        while page_count in pages:
+            all_results.extend(pages[page_count])
             page_count += 1
         
-        self.logger.info(f"Fetched {len(all_results)} total results from {page_count + 1} pages")
+        self.logger.info(f"Fetched {len(all_results)} total results from {page_count} pages")
         return all_results
     
     @abstractmethod
     def _extract_page_data(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract data items from a single page response"""
-        pass
\ No newline at end of file
+        pass
@@ -40,11 +40,7 @@ class FoundationDirectoryClient(PaginatedAPIClient):
     
     def _configure_rate_limits(self):
         """Configure Foundation Directory specific rate limits"""
-        self.http_client.set_api_rate_limit(
-            self.api_name,
-            calls_per_hour=500,
-            delay_between_calls=0.2
-        )
+        self.http_client.set_api_rate_limit(self.api_name)
     
     def _format_auth_headers(self, api_key: str) -> Dict[str, str]:
         """Format Foundation Directory API key"""
@@ -212,6 +208,16 @@ class FoundationDirectoryClient(PaginatedAPIClient):
         next_params['page'] = current_page + 1
         return next_params
     
+    def _plan_pages(self,
+                    first_params: Dict[str, Any],
+                    pagination_info: Dict[str, Any],
+                    max_pages: int) -> Optional[List[Dict[str, Any]]]:
+        """Page numbers for the remaining pages, from total_pages"""
+        current_page = pagination_info.get('current_page', 1)
+        total_pages = min(pagination_info.get('total_pages', 1), current_page + max_pages - 1)
+        
+        return [{**first_params, 'page': page} for page in range(current_page + 1, total_pages + 1)]
+    
     def _extract_page_data(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract foundation/CSR data from response"""
         if not isinstance(response, dict):
@@ -42,11 +42,7 @@ class GrantsGovClient(PaginatedAPIClient):
     
     def _configure_rate_limits(self):
         """Configure Grants.gov specific rate limits"""
-        self.http_client.set_api_rate_limit(
-            self.api_name,
-            calls_per_hour=1000,
-            delay_between_calls=0.1  # Be respectful to public API
-        )
+        self.http_client.set_api_rate_limit(self.api_name)
     
     def _format_auth_headers(self, api_key: str) -> Dict[str, str]:
         """Grants.gov doesn't require authentication"""
@@ -168,6 +164,20 @@ class GrantsGovClient(PaginatedAPIClient):
         next_params['startRecordNum'] = next_start
         return next_params
     
+    def _plan_pages(self,
+                    first_params: Dict[str, Any],
+                    pagination_info: Dict[str, Any],
+                    max_pages: int) -> Optional[List[Dict[str, Any]]]:
+        """Record offsets for the remaining pages, from hitCountTotal"""
+        total_hits = pagination_info.get('total_hits', 0)
+        start_record = pagination_info.get('start_record', 0)
+        page_size = first_params.get('rows', 25)
+        
+        return [
+            {**first_params, 'startRecordNum': start}
+            for start in range(start_record + page_size, total_hits, page_size)
+        ][:max_pages - 1]
+    
     def _extract_page_data(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract opportunity data from response"""
         if not isinstance(response, dict):
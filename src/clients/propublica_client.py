@@ -40,11 +40,7 @@ class ProPublicaClient(BaseAPIClient):
     
     def _configure_rate_limits(self):
         """Configure ProPublica specific rate limits"""
-        self.http_client.set_api_rate_limit(
-            self.api_name,
-            calls_per_hour=500,  # Reduced from 1000 to be conservative
-            delay_between_calls=0.2  # Increased from 0.1 to avoid rate limiting
-        )
+        self.http_client.set_api_rate_limit(self.api_name)
     
     def _format_auth_headers(self, api_key: str) -> Dict[str, str]:
         """ProPublica doesn't require authentication"""
@@ -41,11 +41,7 @@ class USASpendingClient(PaginatedAPIClient):
     
     def _configure_rate_limits(self):
         """Configure USASpending specific rate limits"""
-        self.http_client.set_api_rate_limit(
-            self.api_name,
-            calls_per_hour=1000,  # Reduced from 2000 to be more conservative  
-            delay_between_calls=0.1  # Increased from 0.05 to avoid rate limiting
-        )
+        self.http_client.set_api_rate_limit(self.api_name)
     
     def _format_auth_headers(self, api_key: str) -> Dict[str, str]:
         """USASpending doesn't require authentication"""
@@ -257,34 +253,13 @@ class USASpendingClient(PaginatedAPIClient):
         Returns:
             List of all response data from all pages
         """
-        all_results = []
-        payload = initial_payload.copy()
-        page_count = 0
-        
-        while page_count < max_pages:
-            if progress_callback:
-                progress_callback(f"Fetching page {page_count + 1}/{max_pages}")
-            
-            response = await self._post(endpoint, json_data=payload)
-            
-            # Extract data from response
-            page_data = self._extract_page_data(response)
-            if not page_data:
-                break
-                
-            all_results.extend(page_data)
-            
-            # Check for next page
-            pagination_info = self._extract_pagination_info(response)
-            if not self._has_next_page(pagination_info):
-                break
-            
-            # Update payload for next page
-            payload['page'] = payload.get('page', 1) + 1
-            page_count += 1
-        
-        self.logger.info(f"Fetched {len(all_results)} total results from {page_count + 1} pages")
-        return all_results
+        return await self.get_all_pages(
+            endpoint,
+            initial_params=initial_payload,
+            max_pages=max_pages,
+            progress_callback=progress_callback,
+            method='POST'
+        )
     
     def _has_next_page(self, pagination_info: Dict[str, Any]) -> bool:
         """Check if there are more pages available"""
@@ -307,8 +282,25 @@ class USASpendingClient(PaginatedAPIClient):
     def _build_next_page_params(self,
                                current_params: Dict[str, Any],
                                pagination_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Build parameters for next page (not used for POST pagination)"""
-        return None
+        """Build the POST payload for the next page"""
+        if not self._has_next_page(pagination_info):
+            return None
+        
+        next_payload = current_params.copy()
+        next_payload['page'] = current_params.get('page', 1) + 1
+        return next_payload
+    
+    def _plan_pages(self,
+                    first_params: Dict[str, Any],
+                    pagination_info: Dict[str, Any],
+                    max_pages: int) -> Optional[List[Dict[str, Any]]]:
+        """POST payloads for the remaining pages, from page_metadata.total_pages"""
+        if not self._has_next_page(pagination_info):
+            return []
+        
+        first_page = first_params.get('page', 1)
+        last_page = min(pagination_info.get('total_pages', 1), first_page + max_pages - 1)
+        return [{**first_params, 'page': page} for page in range(first_page + 1, last_page + 1)]
     
     def _extract_page_data(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract award data from response"""
@@ -95,11 +95,7 @@ class VAStateClient(BaseAPIClient):
     
     def _configure_rate_limits(self):
         """Configure Virginia State specific rate limits"""
-        self.http_client.set_api_rate_limit(
-            self.api_name,
-            calls_per_hour=500,
-            delay_between_calls=0.2
-        )
+        self.http_client.set_api_rate_limit(self.api_name)
     
     def _format_auth_headers(self, api_key: str) -> Dict[str, str]:
         """Most Virginia APIs don't require authentication"""
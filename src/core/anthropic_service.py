@@ -20,6 +20,8 @@ from typing import Any, Dict, List, Optional, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .completion_cache import DEFAULT_COMPLETION_CACHE_PATH, CompletionCache, completion_cache_key
+
 logger = logging.getLogger(__name__)
 
 # Strip leading/trailing markdown fences (```json ... ``` or ``` ... ```)
@@ -85,6 +87,8 @@ class ClaudeCompletionResponse:
     stop_reason: str
     cost_estimate: float
     latency_ms: float = 0.0
+    cached: bool = False  # Served from the completion cache (cost_estimate is then 0)
+    cache_key: Optional[str] = None
 
 
 @dataclass
@@ -115,6 +119,7 @@ class AnthropicService:
     - Cost tracking per model
     - Structured JSON output support
     - Graceful error handling with retries
+    - Persistent completion cache for deterministic (temperature 0) calls
     """
 
     # Claude API pricing (per token) — April 2026
@@ -144,16 +149,29 @@ class AnthropicService:
     RATE_LIMIT_RPM = 1000  # requests per minute
     RATE_LIMIT_TPM = 400_000  # tokens per minute
 
-    def __init__(self, api_key: Optional[str] = None):
+    # None disables completion caching
+    completion_cache: Optional[CompletionCache] = None
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        completion_cache: Optional[CompletionCache] = None,
+        cache_completions: bool = True,
+    ):
         """
         Initialize Anthropic service.
 
         Args:
             api_key: Anthropic API key. Falls back to ANTHROPIC_API_KEY env var.
+            completion_cache: Cache for completions (defaults to one at
+                data/cache/anthropic_completions.db).
+            cache_completions: If False, never cache completions.
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         self.client: Optional[Any] = None
         self.cost_tracking: Dict[str, ModelCostTracker] = {}
+        if cache_completions:
+            self.completion_cache = completion_cache or CompletionCache(DEFAULT_COMPLETION_CACHE_PATH)
         # (timestamp, input_tokens_est) tuples for sliding-window RPM/TPM enforcement
         self._request_history: List[tuple] = []
         self._rate_limit_lock = asyncio.Lock()
@@ -206,6 +224,7 @@ class AnthropicService:
         stop_sequences: Optional[List[str]] = None,
         json_mode: bool = False,
         cache_system_prompt: bool = False,
+        use_cache: Optional[bool] = None,
     ) -> ClaudeCompletionResponse:
         """
         Create a Claude completion with rate limiting and cost tracking.
@@ -222,6 +241,8 @@ class AnthropicService:
             cache_system_prompt: If True, emit ephemeral cache_control on the
                 system prompt for prompt caching (50-90% input-token savings
                 on repeated system prompts, e.g. batch screening).
+            use_cache: Serve from / store in the completion cache. None (default)
+                caches only deterministic calls (temperature 0); False opts out.
 
         Returns:
             ClaudeCompletionResponse with content and metadata
@@ -255,6 +276,18 @@ class AnthropicService:
                 "Do not include any text outside the JSON object."
             )
 
+        # Completion cache: identical deterministic requests are served from disk
+        if use_cache is None:
+            use_cache = temperature == 0
+        cache_key = None
+        if use_cache and self.completion_cache is not None:
+            cache_key = completion_cache_key(
+                model, system, messages, max_tokens, temperature, stop_sequences
+            )
+            cached = self._cached_completion(cache_key)
+            if cached is not None:
+                return cached
+
         # Estimate tokens for TPM rate limiting (rough: ~4 chars per token)
         estimated_input_tokens = self._estimate_tokens(messages, system)
 
@@ -333,6 +366,12 @@ class AnthropicService:
         # Normalize stop_reason (SDK may return None on some interruptions)
         stop_reason = response.stop_reason or "unknown"
 
+        if cache_key is not None and content:
+            try:
+                self.completion_cache.put(cache_key, model, content, usage, stop_reason, cost)
+            except Exception as e:
+                logger.warning(f"Failed to cache Claude completion: {e}")
+
         logger.info(
             f"Claude completion: {model}, "
             f"tokens: {usage['total_tokens']} "
@@ -350,6 +389,33 @@ class AnthropicService:
             stop_reason=stop_reason,
             cost_estimate=cost,
             latency_ms=latency_ms,
+            cache_key=cache_key,
+        )
+
+    def _cached_completion(self, cache_key: str) -> Optional[ClaudeCompletionResponse]:
+        """Completion from the cache, or None on a miss (cache errors are misses)"""
+        start_time = time.time()
+        try:
+            entry = self.completion_cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Completion cache lookup failed: {e}")
+            return None
+        if entry is None:
+            return None
+
+        logger.info(
+            f"Claude completion served from cache: {entry['model']}, "
+            f"saved: ${entry['cost']:.4f}"
+        )
+        return ClaudeCompletionResponse(
+            content=entry["content"],
+            model=entry["model"],
+            usage=entry["usage"],
+            stop_reason=entry["stop_reason"] or "unknown",
+            cost_estimate=0.0,
+            latency_ms=(time.time() - start_time) * 1000,
+            cached=True,
+            cache_key=cache_key,
         )
 
     async def create_json_completion(
@@ -361,6 +427,7 @@ class AnthropicService:
         max_tokens: int = 4096,
         temperature: float = 0.0,
         cache_system_prompt: bool = False,
+        use_cache: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Create a Claude completion that returns parsed JSON.
@@ -383,12 +450,19 @@ class AnthropicService:
             temperature=temperature,
             json_mode=True,
             cache_system_prompt=cache_system_prompt,
+            use_cache=use_cache,
         )
 
         # Strip markdown code fences via a single regex (handles ```json, ```, etc.)
         content = _FENCE_RE.sub("", response.content).strip()
 
-        return json.loads(content)
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            # Don't keep serving a response that can't be parsed
+            if response.cache_key and self.completion_cache is not None:
+                self.completion_cache.invalidate(response.cache_key)
+            raise
 
     def _extract_content(self, response: Any) -> str:
         """Extract text content from Claude API response."""
@@ -534,12 +608,18 @@ class AnthropicService:
                 }
                 for model, tracker in self.cost_tracking.items()
             },
+            "completion_cache": (
+                self.completion_cache.get_stats()
+                if self.completion_cache is not None else {"enabled": False}
+            ),
         }
 
     def reset_cost_tracking(self) -> None:
         """Reset all cost tracking data."""
         self.cost_tracking.clear()
         self._request_history.clear()
+        if self.completion_cache is not None:
+            self.completion_cache.reset_stats()
         logger.info("Anthropic cost tracking reset")
 
     @property
@@ -107,17 +107,17 @@ class BaseProcessor(ABC):
             
         processor_name = self.metadata.name.lower()
         
-        # Configure rate limits based on known API limits
+        # Limits are shared with the API clients (see API_RATE_LIMITS)
         if 'grants_gov' in processor_name:
-            self._http_client.set_api_rate_limit('grants_gov', 1000, 0.1)
+            self._http_client.set_api_rate_limit('grants_gov')
         elif 'propublica' in processor_name:
-            self._http_client.set_api_rate_limit('propublica', 1000, 0.1)
+            self._http_client.set_api_rate_limit('propublica')
         elif 'foundation' in processor_name:
-            self._http_client.set_api_rate_limit('foundation_directory', 500, 0.2)
+            self._http_client.set_api_rate_limit('foundation_directory')
         elif 'usaspending' in processor_name:
-            self._http_client.set_api_rate_limit('usaspending', 2000, 0.05)
+            self._http_client.set_api_rate_limit('usaspending')
         elif 'state' in processor_name or 'virginia' in processor_name:
-            self._http_client.set_api_rate_limit('va_state', 500, 0.2)
+            self._http_client.set_api_rate_limit('va_state')
     
     async def _http_get(self, 
                        url: str, 
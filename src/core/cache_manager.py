@@ -9,6 +9,7 @@ import aiofiles
 import hashlib
 import json
 import shutil
+import sqlite3
 from pathlib import Path
 from typing import Dict, Any, Optional, Union, List
 from datetime import datetime, timedelta
@@ -41,6 +42,7 @@ class CacheEntry:
     file_path: Optional[Path]
     metadata: Dict[str, Any]
     access_count: int = 0
+    size_bytes: int = 0
     
     def is_expired(self) -> bool:
         """Check if cache entry has expired"""
@@ -65,6 +67,7 @@ class CacheEntry:
     def from_dict(cls, data: Dict[str, Any]) -> 'CacheEntry':
         """Create from dictionary"""
         data = data.copy()
+        data['cache_type'] = CacheType(data['cache_type'])
         # Convert ISO format back to datetime
         data['created_at'] = datetime.fromisoformat(data['created_at'])
         data['last_accessed'] = datetime.fromisoformat(data['last_accessed'])
@@ -80,53 +83,254 @@ class CacheEntry:
         return cls(**data)
 
 
+class CacheMetadataStore:
+    """
+    SQLite-backed metadata index for CacheManager.
+
+    One row per cache key in ``cache_metadata.db`` (WAL mode), with indexes
+    for the access paths the manager needs: primary-key lookup, content-hash
+    dedup, LRU order, expiry and file reference counting. Replaces the
+    ``cache_metadata.json`` file that was rewritten in full on every hit.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            cache_key      TEXT PRIMARY KEY,
+            cache_type     TEXT NOT NULL,
+            content_hash   TEXT NOT NULL,
+            created_at     TEXT NOT NULL,
+            last_accessed  TEXT NOT NULL,
+            expires_at     TEXT,
+            file_path      TEXT,
+            size_bytes     INTEGER NOT NULL DEFAULT 0,
+            metadata       TEXT,
+            access_count   INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_hash     ON cache_entries(cache_type, content_hash);
+        CREATE INDEX IF NOT EXISTS idx_cache_lru      ON cache_entries(last_accessed);
+        CREATE INDEX IF NOT EXISTS idx_cache_expires  ON cache_entries(expires_at) WHERE expires_at IS NOT NULL;
+        CREATE INDEX IF NOT EXISTS idx_cache_file     ON cache_entries(file_path);
+    """
+
+    _COLUMNS = ("cache_key, cache_type, content_hash, created_at, last_accessed, "
+                "expires_at, file_path, size_bytes, metadata, access_count")
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @staticmethod
+    def _to_entry(row: sqlite3.Row) -> CacheEntry:
+        return CacheEntry(
+            cache_key=row['cache_key'],
+            cache_type=CacheType(row['cache_type']),
+            content_hash=row['content_hash'],
+            created_at=datetime.fromisoformat(row['created_at']),
+            last_accessed=datetime.fromisoformat(row['last_accessed']),
+            expires_at=datetime.fromisoformat(row['expires_at']) if row['expires_at'] else None,
+            file_path=Path(row['file_path']) if row['file_path'] else None,
+            metadata=json.loads(row['metadata']) if row['metadata'] else {},
+            access_count=row['access_count'],
+            size_bytes=row['size_bytes'],
+        )
+
+    @staticmethod
+    def _to_row(entry: CacheEntry) -> tuple:
+        return (
+            entry.cache_key,
+            entry.cache_type.value,
+            entry.content_hash,
+            entry.created_at.isoformat(),
+            entry.last_accessed.isoformat(),
+            entry.expires_at.isoformat() if entry.expires_at else None,
+            str(entry.file_path) if entry.file_path else None,
+            entry.size_bytes,
+            json.dumps(entry.metadata, default=str),
+            entry.access_count,
+        )
+
+    def get(self, cache_key: str) -> Optional[CacheEntry]:
+        row = self._conn.execute(
+            f"SELECT {self._COLUMNS} FROM cache_entries WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        return self._to_entry(row) if row else None
+
+    def put_many(self, entries: List[CacheEntry]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO cache_entries ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._to_row(e) for e in entries],
+            )
+
+    def put(self, entry: CacheEntry) -> None:
+        self.put_many([entry])
+
+    def delete_many(self, cache_keys: List[str]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM cache_entries WHERE cache_key = ?", [(k,) for k in cache_keys]
+            )
+
+    def record_access(self, updates: Dict[str, tuple]) -> None:
+        """Apply buffered access stats: {cache_key: (last_accessed, hit_count)}."""
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE cache_entries SET last_accessed = ?, access_count = access_count + ? "
+                "WHERE cache_key = ?",
+                [(ts.isoformat(), hits, key) for key, (ts, hits) in updates.items()],
+            )
+
+    def find_by_content_hash(self, content_hash: str, cache_type: CacheType) -> Optional[CacheEntry]:
+        row = self._conn.execute(
+            f"SELECT {self._COLUMNS} FROM cache_entries "
+            "WHERE cache_type = ? AND content_hash = ? "
+            "AND (expires_at IS NULL OR expires_at > ?) LIMIT 1",
+            (cache_type.value, content_hash, datetime.now().isoformat()),
+        ).fetchone()
+        return self._to_entry(row) if row else None
+
+    def file_has_other_refs(self, file_path: Path, exclude_keys: List[str]) -> bool:
+        placeholders = ",".join("?" * len(exclude_keys))
+        row = self._conn.execute(
+            f"SELECT 1 FROM cache_entries WHERE file_path = ? AND cache_key NOT IN ({placeholders}) LIMIT 1",
+            (str(file_path), *exclude_keys),
+        ).fetchone()
+        return row is not None
+
+    def expired_keys(self, now: datetime) -> List[str]:
+        return [r[0] for r in self._conn.execute(
+            "SELECT cache_key FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now.isoformat(),),
+        )]
+
+    def lru_entries(self, limit: int) -> List[CacheEntry]:
+        rows = self._conn.execute(
+            f"SELECT {self._COLUMNS} FROM cache_entries ORDER BY last_accessed LIMIT ?", (limit,)
+        ).fetchall()
+        return [self._to_entry(r) for r in rows]
+
+    def keys(self, cache_type: Optional[CacheType] = None) -> List[str]:
+        if cache_type:
+            cur = self._conn.execute(
+                "SELECT cache_key FROM cache_entries WHERE cache_type = ?", (cache_type.value,)
+            )
+        else:
+            cur = self._conn.execute("SELECT cache_key FROM cache_entries")
+        return [r[0] for r in cur]
+
+    def entries_for_keys(self, cache_keys: List[str]) -> List[CacheEntry]:
+        out = []
+        for i in range(0, len(cache_keys), 500):
+            chunk = cache_keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            out.extend(self._to_entry(r) for r in self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM cache_entries WHERE cache_key IN ({placeholders})", chunk
+            ))
+        return out
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def type_distribution(self) -> Dict[str, int]:
+        return {
+            r[0]: r[1] for r in self._conn.execute(
+                "SELECT cache_type, COUNT(*) FROM cache_entries GROUP BY cache_type"
+            )
+        }
+
+    def total_size(self) -> int:
+        """Bytes on disk, counting each file once (dedup aliases share a file)."""
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM "
+            "(SELECT MAX(size_bytes) AS size_bytes FROM cache_entries GROUP BY file_path)"
+        ).fetchone()
+        return row[0]
+
+
 class CacheManager:
     """Centralized cache management system"""
-    
+
+    # Access stats are buffered and written in one batch
+    ACCESS_FLUSH_SIZE = 256
+    ACCESS_FLUSH_INTERVAL = timedelta(seconds=30)
+    # Entries removed per round when enforcing max_cache_size
+    EVICTION_BATCH = 64
+
     def __init__(self, cache_dir: Optional[Path] = None):
         self.cache_dir = cache_dir or Path("data/cache")
         self.metadata_file = self.cache_dir / "cache_metadata.json"
-        self.cache_entries: Dict[str, CacheEntry] = {}
-        
+        self.metadata_db = self.cache_dir / "cache_metadata.db"
+
         # Cache configuration
         self.default_ttl = timedelta(hours=24)  # 24 hour default TTL
         self.max_cache_size = 1024 * 1024 * 1024  # 1GB max cache size
         self.cleanup_interval = timedelta(hours=6)  # Cleanup every 6 hours
-        
+
         # Ensure cache directory exists
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Load existing cache metadata
-        self._load_cache_metadata()
-    
-    def _load_cache_metadata(self) -> None:
-        """Load cache metadata from disk"""
+
+        self.store = CacheMetadataStore(self.metadata_db)
+        self._pending_access: Dict[str, tuple] = {}
+        self._last_access_flush = datetime.now()
+
+        # One-time import of the legacy JSON metadata file
+        self._migrate_json_metadata()
+        self._total_size = self.store.total_size()
+        logger.info(f"Loaded {self.store.count()} cache entries")
+
+    def _migrate_json_metadata(self) -> None:
+        """Import cache_metadata.json into the SQLite store, then retire the file."""
+        if not self.metadata_file.exists():
+            return
         try:
-            if self.metadata_file.exists():
-                with open(self.metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    self.cache_entries = {
-                        key: CacheEntry.from_dict(data) 
-                        for key, data in metadata.items()
-                    }
-                logger.info(f"Loaded {len(self.cache_entries)} cache entries")
-            else:
-                self.cache_entries = {}
+            with open(self.metadata_file, 'r') as f:
+                metadata = json.load(f)
+            entries = []
+            for key, data in metadata.items():
+                entry = CacheEntry.from_dict(data)
+                # Dedup aliases were stored under their own key but carry the original's cache_key
+                entry.cache_key = key
+                if entry.file_path and entry.file_path.exists():
+                    entry.size_bytes = entry.file_path.stat().st_size
+                    entries.append(entry)
+            if entries:
+                self.store.put_many(entries)
+            self.metadata_file.rename(self.metadata_file.with_suffix('.json.migrated'))
+            logger.info(f"Migrated {len(entries)} cache entries from {self.metadata_file.name}")
         except Exception as e:
-            logger.error(f"Failed to load cache metadata: {e}")
-            self.cache_entries = {}
-    
-    def _save_cache_metadata(self) -> None:
-        """Save cache metadata to disk"""
+            logger.error(f"Failed to migrate cache metadata: {e}")
+
+    def flush_access_stats(self) -> None:
+        """Write buffered access_count / last_accessed updates in one batch."""
+        if not self._pending_access:
+            return
+        pending, self._pending_access = self._pending_access, {}
         try:
-            metadata = {
-                key: entry.to_dict() 
-                for key, entry in self.cache_entries.items()
-            }
-            with open(self.metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            self.store.record_access(pending)
         except Exception as e:
-            logger.error(f"Failed to save cache metadata: {e}")
+            logger.error(f"Failed to save cache access stats: {e}")
+        self._last_access_flush = datetime.now()
+
+    def _note_access(self, cache_key: str) -> None:
+        now = datetime.now()
+        _, hits = self._pending_access.get(cache_key, (now, 0))
+        self._pending_access[cache_key] = (now, hits + 1)
+        if (len(self._pending_access) >= self.ACCESS_FLUSH_SIZE
+                or now - self._last_access_flush >= self.ACCESS_FLUSH_INTERVAL):
+            self.flush_access_stats()
+
+    def close(self) -> None:
+        """Flush buffered stats and close the metadata store."""
+        self.flush_access_stats()
+        self.store.close()
     
     def _generate_cache_key(self, 
                           identifier: str, 
@@ -158,20 +362,17 @@ class CacheManager:
         """Get cached content if available and not expired"""
         cache_key = self._generate_cache_key(identifier, cache_type, profile_independent)
         
-        if cache_key not in self.cache_entries:
+        entry = self.store.get(cache_key)
+        if entry is None:
             return None
         
-        entry = self.cache_entries[cache_key]
-        
         # Check if expired
         if entry.is_expired():
-            await self._remove_cache_entry(cache_key)
+            await self._remove_cache_entry(cache_key, entry)
             return None
         
-        # Update access information
-        entry.last_accessed = datetime.now()
-        entry.access_count += 1
-        self._save_cache_metadata()
+        # Update access information (buffered, written in batches)
+        self._note_access(cache_key)
         
         # Load and return content
         try:
@@ -188,12 +389,12 @@ class CacheManager:
                     return content
             else:
                 logger.warning(f"Cache file missing for key {cache_key}")
-                await self._remove_cache_entry(cache_key)
+                await self._remove_cache_entry(cache_key, entry)
                 return None
                 
         except Exception as e:
             logger.error(f"Failed to load cached content for key {cache_key}: {e}")
-            await self._remove_cache_entry(cache_key)
+            await self._remove_cache_entry(cache_key, entry)
             return None
     
     async def set(self, 
@@ -218,28 +419,42 @@ class CacheManager:
         
         # Generate content hash for deduplication
         content_hash = self._generate_content_hash(serialized_content)
+        now = datetime.now()
         
         # Check if content already exists with same hash
         existing_entry = self._find_by_content_hash(content_hash, cache_type)
-        if existing_entry:
-            logger.info(f"Content already cached with hash {content_hash}, reusing")
-            # Update access info for existing entry
-            existing_entry.last_accessed = datetime.now()
-            existing_entry.access_count += 1
-            # Create alias entry pointing to same file
-            self.cache_entries[cache_key] = existing_entry
-            self._save_cache_metadata()
+        if existing_entry and existing_entry.file_path and existing_entry.file_path.exists():
+            logger.debug(f"Content already cached with hash {content_hash}, reusing")
+            if existing_entry.cache_key != cache_key:
+                # Create alias entry pointing to same file
+                previous = self.store.get(cache_key)
+                alias = CacheEntry(
+                    cache_key=cache_key,
+                    cache_type=cache_type,
+                    content_hash=content_hash,
+                    created_at=now,
+                    last_accessed=now,
+                    expires_at=existing_entry.expires_at,
+                    file_path=existing_entry.file_path,
+                    metadata=metadata or existing_entry.metadata,
+                    access_count=1,
+                    size_bytes=existing_entry.size_bytes
+                )
+                self.store.put(alias)
+                if previous and previous.file_path and previous.file_path != alias.file_path:
+                    self._release_file(previous, [cache_key])
+            self._note_access(existing_entry.cache_key)
             return cache_key
         
         # Save new content
         file_path = self._get_cache_file_path(cache_key, cache_type)
+        previous = self.store.get(cache_key)
         
         try:
             async with aiofiles.open(file_path, 'wb') as f:
                 await f.write(serialized_content)
             
             # Create cache entry
-            now = datetime.now()
             expires_at = now + (ttl or self.default_ttl)
             
             entry = CacheEntry(
@@ -251,14 +466,19 @@ class CacheManager:
                 expires_at=expires_at,
                 file_path=file_path,
                 metadata=metadata or {},
-                access_count=1
+                access_count=1,
+                size_bytes=len(serialized_content)
             )
             
-            self.cache_entries[cache_key] = entry
-            self._save_cache_metadata()
+            self.store.put(entry)
+            if previous and previous.file_path == file_path:
+                # Overwrote our own file in place
+                self._total_size -= previous.size_bytes
+            elif previous:
+                self._release_file(previous, [cache_key])
+            self._total_size += entry.size_bytes
             
-            logger.info(f"Cached content with key {cache_key} and hash {content_hash}")
-            return cache_key
+            logger.debug(f"Cached content with key {cache_key} and hash {content_hash}")
             
         except Exception as e:
             logger.error(f"Failed to cache content: {e}")
@@ -266,85 +486,101 @@ class CacheManager:
             if file_path.exists():
                 file_path.unlink()
             raise
+        
+        if self._total_size > self.max_cache_size:
+            self._evict_lru(protect=cache_key)
+        return cache_key
     
     def _find_by_content_hash(self, content_hash: str, cache_type: CacheType) -> Optional[CacheEntry]:
         """Find existing cache entry by content hash"""
-        for entry in self.cache_entries.values():
-            if entry.content_hash == content_hash and entry.cache_type == cache_type:
-                if not entry.is_expired():
-                    return entry
-        return None
+        return self.store.find_by_content_hash(content_hash, cache_type)
     
-    async def _remove_cache_entry(self, cache_key: str) -> None:
+    def _release_file(self, entry: CacheEntry, removed_keys: List[str]) -> None:
+        """Delete an entry's file unless a surviving entry still references it"""
+        if not entry.file_path:
+            return
+        if self.store.file_has_other_refs(entry.file_path, removed_keys):
+            return
+        self._total_size = max(0, self._total_size - entry.size_bytes)
+        if entry.file_path.exists():
+            try:
+                entry.file_path.unlink()
+            except Exception as e:
+                logger.error(f"Failed to remove cache file {entry.file_path}: {e}")
+    
+    def _remove_entries(self, entries: List[CacheEntry]) -> None:
+        """Remove a batch of entries and any files no longer referenced"""
+        if not entries:
+            return
+        keys = [e.cache_key for e in entries]
+        for key in keys:
+            self._pending_access.pop(key, None)
+        self.store.delete_many(keys)
+        released = set()
+        for entry in entries:
+            if entry.file_path and entry.file_path not in released:
+                released.add(entry.file_path)
+                self._release_file(entry, keys)
+    
+    async def _remove_cache_entry(self, cache_key: str, entry: Optional[CacheEntry] = None) -> None:
         """Remove cache entry and associated file"""
-        if cache_key not in self.cache_entries:
+        entry = entry or self.store.get(cache_key)
+        if entry is None:
             return
-        
-        entry = self.cache_entries[cache_key]
-        
-        # Remove file if it exists and no other entries reference it
-        if entry.file_path and entry.file_path.exists():
-            # Check if any other entries reference the same file
-            other_refs = [
-                e for k, e in self.cache_entries.items() 
-                if k != cache_key and e.file_path == entry.file_path
-            ]
-            if not other_refs:
-                try:
-                    entry.file_path.unlink()
-                except Exception as e:
-                    logger.error(f"Failed to remove cache file {entry.file_path}: {e}")
-        
-        # Remove from entries
-        del self.cache_entries[cache_key]
-        self._save_cache_metadata()
+        self._remove_entries([entry])
+    
+    def _evict_lru(self, protect: Optional[str] = None) -> int:
+        """Evict least-recently-used entries until the cache fits max_cache_size"""
+        # Buffered hits must land first or LRU order would be stale
+        self.flush_access_stats()
+        evicted = 0
+        while self._total_size > self.max_cache_size:
+            batch = [e for e in self.store.lru_entries(self.EVICTION_BATCH + 1) if e.cache_key != protect]
+            batch = batch[:self.EVICTION_BATCH]
+            if not batch:
+                break
+            victims = []
+            projected = self._total_size
+            for entry in batch:
+                victims.append(entry)
+                projected -= entry.size_bytes
+                if projected <= self.max_cache_size:
+                    break
+            self._remove_entries(victims)
+            evicted += len(victims)
+        if evicted:
+            logger.info(f"Evicted {evicted} cache entries to stay under {self.max_cache_size} bytes")
+        return evicted
     
     async def cleanup_expired(self) -> int:
         """Remove expired cache entries"""
-        expired_keys = [
-            key for key, entry in self.cache_entries.items()
-            if entry.is_expired()
-        ]
+        expired_keys = self.store.expired_keys(datetime.now())
         
-        for key in expired_keys:
-            await self._remove_cache_entry(key)
+        for i in range(0, len(expired_keys), 500):
+            self._remove_entries(self.store.entries_for_keys(expired_keys[i:i + 500]))
         
         logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
         return len(expired_keys)
     
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        total_entries = len(self.cache_entries)
-        total_size = 0
-        type_counts = {}
-        
-        for entry in self.cache_entries.values():
-            cache_type = entry.cache_type.value
-            type_counts[cache_type] = type_counts.get(cache_type, 0) + 1
-            
-            if entry.file_path and entry.file_path.exists():
-                total_size += entry.file_path.stat().st_size
+        total_size = self._total_size
         
         return {
-            'total_entries': total_entries,
+            'total_entries': self.store.count(),
             'total_size_bytes': total_size,
             'total_size_mb': round(total_size / (1024 * 1024), 2),
-            'type_distribution': type_counts,
+            'max_size_bytes': self.max_cache_size,
+            'type_distribution': self.store.type_distribution(),
             'cache_directory': str(self.cache_dir)
         }
     
     async def clear_cache(self, cache_type: Optional[CacheType] = None) -> int:
         """Clear cache entries of specified type or all if None"""
-        if cache_type:
-            keys_to_remove = [
-                key for key, entry in self.cache_entries.items()
-                if entry.cache_type == cache_type
-            ]
-        else:
-            keys_to_remove = list(self.cache_entries.keys())
+        keys_to_remove = self.store.keys(cache_type)
         
-        for key in keys_to_remove:
-            await self._remove_cache_entry(key)
+        for i in range(0, len(keys_to_remove), 500):
+            self._remove_entries(self.store.entries_for_keys(keys_to_remove[i:i + 500]))
         
         logger.info(f"Cleared {len(keys_to_remove)} cache entries")
         return len(keys_to_remove)
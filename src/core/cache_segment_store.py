@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Segment Store - Compressed, Append-Only Disk Layer for EnhancedCacheSystem
+
+Entries are packed into a small number of segment files instead of one
+pickle plus one ``.meta`` file per entry:
+
+1. Each record is a fixed header (codec, key, payload length, CRC, expiry)
+   followed by the key and the (optionally compressed) pickled payload.
+2. The key -> (segment, offset, length, expiry) index lives in memory and is
+   rebuilt on startup by scanning the record headers, so there are no side
+   files to keep in sync.
+3. Sealed segments are read through ``mmap``; a hit costs one slice and one
+   decompress, with expiry checked before any I/O.
+4. Segments roll over at ``segment_max_bytes``; sealed segments that are
+   mostly dead (overwritten, invalidated or expired records) are compacted.
+5. A directory belongs to one store at a time. The store holds an exclusive
+   lock on its ``.lock`` file until closed, so appends, torn-tail recovery and
+   compaction never race another writer; opening a second store on the same
+   directory raises ``SegmentStoreLocked``. The lock needs ``fcntl`` and is
+   not enforced where it is unavailable.
+"""
+
+import logging
+import mmap
+import os
+import pickle
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# zstandard is optional; zlib level 1 is the always-available fallback
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# fcntl is POSIX-only; elsewhere directory ownership is not enforced
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+FLAG_TOMBSTONE = 0x01
+
+# magic, codec, flags, key_len, payload_len, crc32, expires_at (epoch seconds)
+_HEADER = struct.Struct("<4sBBHIId")
+_MAGIC = b"ECS1"
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".seg"
+LOCK_NAME = ".lock"
+
+
+class SegmentStoreLocked(RuntimeError):
+    """Another SegmentStore owns the directory"""
+
+
+@dataclass
+class SegmentRecord:
+    """In-memory index entry for one live record"""
+    segment_id: int
+    offset: int          # offset of the payload (after header and key)
+    length: int          # stored payload length
+    codec: int
+    crc: int
+    expires_at: float    # epoch seconds
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) > self.expires_at
+
+
+class SegmentStore:
+    """Append-only, memory-mapped segment files with an in-memory index"""
+
+    def __init__(self,
+                 root: Path,
+                 segment_max_bytes: int = 64 * 1024 * 1024,
+                 compress_min_bytes: int = 512,
+                 compact_dead_ratio: float = 0.5):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.compact_dead_ratio = compact_dead_ratio
+
+        self.index: Dict[str, SegmentRecord] = {}
+        self._segment_bytes: Dict[int, int] = {}   # total bytes written per segment
+        self._dead_bytes: Dict[int, int] = {}      # bytes no longer referenced
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._active_id = 0
+        self._active = None
+        self._compacting = False
+        self._lock_file = None
+
+        if ZSTD_AVAILABLE:
+            self._zstd_c = zstandard.ZstdCompressor(level=3)
+            self._zstd_d = zstandard.ZstdDecompressor()
+
+        self._lock_directory()
+        self._load()
+
+    # ── Paths / handles ──────────────────────────────────────────────────────
+
+    def _lock_directory(self) -> None:
+        """Take exclusive ownership of root until close()"""
+        self._lock_file = open(self.root / LOCK_NAME, "ab")
+        if not FCNTL_AVAILABLE:
+            return
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            self._lock_file = None
+            raise SegmentStoreLocked(f"{self.root} is in use by another SegmentStore")
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.root / f"{SEGMENT_PREFIX}{segment_id:06d}{SEGMENT_SUFFIX}"
+
+    def _segment_ids(self) -> List[int]:
+        ids = []
+        for path in self.root.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            try:
+                ids.append(int(path.stem[len(SEGMENT_PREFIX):]))
+            except ValueError:
+                continue
+        return sorted(ids)
+
+    def _open_active(self, segment_id: int) -> None:
+        if self._active:
+            self._active.close()
+        self._active_id = segment_id
+        self._active = open(self._segment_path(segment_id), "ab")
+        self._segment_bytes.setdefault(segment_id, self._active.tell())
+        self._dead_bytes.setdefault(segment_id, 0)
+
+    def _view(self, segment_id: int, end: int) -> mmap.mmap:
+        """Map a segment, re-mapping when the record lies past the current map"""
+        view = self._maps.get(segment_id)
+        if view is None or len(view) < end:
+            if view is not None:
+                view.close()
+            if segment_id == self._active_id and self._active:
+                self._active.flush()
+            with open(self._segment_path(segment_id), "rb") as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment_id] = view
+        return view
+
+    def _unmap(self, segment_id: int) -> None:
+        view = self._maps.pop(segment_id, None)
+        if view is not None:
+            view.close()
+
+    # ── Startup ──────────────────────────────────────────────────────────────
+
+    def _scan(self, segment_id: int) -> Iterator[tuple]:
+        """Yield (key, record_start, payload_offset, length, codec, flags, crc, expires) per record"""
+        path = self._segment_path(segment_id)
+        size = path.stat().st_size
+        if size == 0:
+            return
+        with open(path, "rb") as f:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            pos = 0
+            while pos < size:
+                end = size + 1
+                if pos + _HEADER.size <= size:
+                    magic, codec, flags, key_len, length, crc, expires = _HEADER.unpack_from(view, pos)
+                    if magic == _MAGIC:
+                        end = pos + _HEADER.size + key_len + length
+                if end > size:
+                    # Torn write at the tail of a crashed run (no other writer
+                    # can be mid-append: this store owns the directory)
+                    logger.warning(f"Truncating {path.name} at offset {pos} (incomplete record)")
+                    view.close()
+                    view = None
+                    os.truncate(path, pos)
+                    return
+                key = bytes(view[pos + _HEADER.size:pos + _HEADER.size + key_len]).decode("utf-8")
+                yield key, pos, pos + _HEADER.size + key_len, length, codec, flags, crc, expires
+                pos = end
+        finally:
+            if view is not None:
+                view.close()
+
+    def _load(self) -> None:
+        """Rebuild the in-memory index from segment headers"""
+        ids = self._segment_ids()
+        now = time.time()
+        for segment_id in ids:
+            self._segment_bytes[segment_id] = 0
+            self._dead_bytes[segment_id] = 0
+            for key, start, offset, length, codec, flags, crc, expires in self._scan(segment_id):
+                size = offset - start + length
+                self._segment_bytes[segment_id] += size
+                self._retire(key)
+                if flags & FLAG_TOMBSTONE or expires < now:
+                    self._dead_bytes[segment_id] += size
+                    continue
+                self.index[key] = SegmentRecord(segment_id, offset, length, codec, crc, expires)
+        self._open_active(ids[-1] if ids else 1)
+        if self.index:
+            logger.info(f"Loaded {len(self.index)} disk cache entries from {len(ids)} segments")
+
+    # ── Codec ────────────────────────────────────────────────────────────────
+
+    def _encode(self, raw: bytes, compress: bool) -> Tuple[int, bytes]:
+        if not compress or len(raw) < self.compress_min_bytes:
+            return CODEC_RAW, raw
+        if ZSTD_AVAILABLE:
+            return CODEC_ZSTD, self._zstd_c.compress(raw)
+        return CODEC_ZLIB, zlib.compress(raw, 1)
+
+    def _decode(self, codec: int, payload: bytes) -> bytes:
+        if codec == CODEC_RAW:
+            return payload
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(payload)
+        if codec == CODEC_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard not installed; cannot read zstd cache record")
+            return self._zstd_d.decompress(payload)
+        raise ValueError(f"Unknown cache codec {codec}")
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def put(self, key: str, value: Any, expires_at: float, compress: bool) -> None:
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        codec, payload = self._encode(raw, compress)
+        self._append(key, payload, codec, 0, expires_at)
+
+    def get(self, key: str) -> Optional[Any]:
+        record = self.index.get(key)
+        if record is None:
+            return None
+        if record.is_expired():
+            self._retire(key)
+            return None
+        view = self._view(record.segment_id, record.offset + record.length)
+        payload = view[record.offset:record.offset + record.length]
+        if zlib.crc32(payload) != record.crc:
+            self.delete(key)
+            raise ValueError(f"CRC mismatch for cache record {key}")
+        return pickle.loads(self._decode(record.codec, payload))
+
+    def contains(self, key: str) -> bool:
+        record = self.index.get(key)
+        return record is not None and not record.is_expired()
+
+    def delete(self, key: str) -> bool:
+        """Drop a key; a tombstone keeps it dead across restarts"""
+        if key not in self.index:
+            return False
+        self._append(key, b"", CODEC_RAW, FLAG_TOMBSTONE, 0.0)
+        return True
+
+    def keys(self) -> List[str]:
+        return list(self.index.keys())
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        expired = [k for k, r in self.index.items() if r.is_expired(now)]
+        for key in expired:
+            # Expired records are skipped on load, so no tombstone is needed
+            self._retire(key)
+        return len(expired)
+
+    def flush(self) -> None:
+        if self._active:
+            self._active.flush()
+
+    def close(self) -> None:
+        for segment_id in list(self._maps):
+            self._unmap(segment_id)
+        if self._active:
+            self._active.close()
+            self._active = None
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def disk_bytes(self) -> int:
+        return sum(self._segment_bytes.values())
+
+    def live_bytes(self) -> int:
+        return sum(self._segment_bytes[s] - self._dead_bytes.get(s, 0) for s in self._segment_bytes)
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _retire(self, key: str) -> None:
+        """Account the bytes of the record currently indexed under key as dead"""
+        old = self.index.pop(key, None)
+        if old is not None:
+            key_len = len(key.encode("utf-8"))
+            self._dead_bytes[old.segment_id] = (
+                self._dead_bytes.get(old.segment_id, 0) + _HEADER.size + key_len + old.length
+            )
+
+    def _append(self, key: str, payload: bytes, codec: int, flags: int, expires_at: float) -> None:
+        key_bytes = key.encode("utf-8")
+        crc = zlib.crc32(payload)
+        header = _HEADER.pack(_MAGIC, codec, flags, len(key_bytes), len(payload), crc, expires_at)
+        size = len(header) + len(key_bytes) + len(payload)
+
+        if self._segment_bytes[self._active_id] and \
+                self._segment_bytes[self._active_id] + size > self.segment_max_bytes:
+            self._roll()
+
+        start = self._active.tell()
+        self._active.write(header + key_bytes + payload)
+        self._segment_bytes[self._active_id] = start + size
+
+        self._retire(key)
+        if flags & FLAG_TOMBSTONE:
+            self._dead_bytes[self._active_id] += size
+        else:
+            self.index[key] = SegmentRecord(
+                self._active_id, start + len(header) + len(key_bytes), len(payload), codec, crc, expires_at
+            )
+
+        start = self._active.tell()
+        self._active.write(header + key_bytes + payload)
+        self._segment_bytes[self._active_id] = start + size
+    def _roll(self) -> None:
+        self._open_active(self._active_id + 1)
+        if not self._compacting:
+            self.compact()
+
+    def compact(self) -> int:
+        """Rewrite live records out of sealed segments that are mostly dead"""
+        candidates = [
+            segment_id for segment_id, total in self._segment_bytes.items()
+            if segment_id != self._active_id and total
+            and self._dead_bytes.get(segment_id, 0) / total >= self.compact_dead_ratio
+        ]
+        if not candidates:
+            return 0
+        self._compacting = True
+        try:
+            for segment_id in sorted(candidates):
+                has_older = any(s < segment_id for s in self._segment_bytes)
+                now = time.time()
+                for key, _, offset, length, codec, flags, _, expires in self._scan(segment_id):
+                    if flags & FLAG_TOMBSTONE:
+                        # Keep tombstones that still shadow a record in an older segment
+                        if has_older and key not in self.index:
+                            self._append(key, b"", CODEC_RAW, FLAG_TOMBSTONE, 0.0)
+                        continue
+                    record = self.index.get(key)
+                    if record is None or record.segment_id != segment_id or record.offset != offset:
+                        continue
+                    if record.is_expired(now):
+                        self.index.pop(key)
+                        continue
+                    view = self._view(segment_id, offset + length)
+                    self._append(key, view[offset:offset + length], codec, 0, expires)
+                self._unmap(segment_id)
+                self._segment_path(segment_id).unlink(missing_ok=True)
+                self._segment_bytes.pop(segment_id, None)
+                self._dead_bytes.pop(segment_id, None)
+        finally:
+            self._compacting = False
+        logger.info(f"Compacted {len(candidates)} cache segments")
+        return len(candidates)
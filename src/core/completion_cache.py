@@ -0,0 +1,255 @@
+"""
+Completion Cache - Persistent, content-addressed cache for Claude completions
+
+Responses are stored in SQLite under a SHA-256 of everything that determines
+the output: model, system prompt, messages, max_tokens, temperature and stop
+sequences. Re-running a deterministic (temperature 0) screen over the same
+opportunities is then served from disk instead of the API.
+
+Entries older than max_age_seconds are dropped on read and during eviction;
+when the stored responses exceed max_bytes the least recently used entries
+are evicted. Hit/miss counts and the dollars saved (the original cost of
+every response served from cache) are kept for the cost summary.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPLETION_CACHE_PATH = Path("data/cache/anthropic_completions.db")
+
+
+def completion_cache_key(
+    model: str,
+    system: Optional[str],
+    messages: List[Dict[str, Any]],
+    max_tokens: int,
+    temperature: Optional[float],
+    stop_sequences: Optional[List[str]],
+) -> str:
+    """Hash of the request fields that determine a completion"""
+    canonical = json.dumps(
+        {
+            "model": model,
+            "system": system,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stop_sequences": list(stop_sequences or []),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """SQLite-backed completion cache with age and size eviction"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS completions (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            content TEXT NOT NULL,
+            usage TEXT NOT NULL,
+            stop_reason TEXT,
+            cost REAL NOT NULL DEFAULT 0,
+            size_bytes INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_used REAL NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_completions_last_used ON completions (last_used);
+        CREATE INDEX IF NOT EXISTS idx_completions_created_at ON completions (created_at);
+    """
+
+    def __init__(self,
+                 db_path: Path = DEFAULT_COMPLETION_CACHE_PATH,
+                 max_bytes: int = 200 * 1024 * 1024,
+                 max_age_seconds: float = 30 * 24 * 3600):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+
+        # Session counters
+        self.hits = 0
+        self.misses = 0
+        self.dollars_saved = 0.0
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use, so an unused cache never touches disk"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(self._SCHEMA)
+            conn.commit()
+            self._total_bytes = conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM completions"
+            ).fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Cached completion for the key, or None (expired entries count as misses)"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT model, content, usage, stop_reason, cost, size_bytes, created_at "
+                "FROM completions WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            now = time.time()
+
+            if row is not None and now - row[6] > self.max_age_seconds:
+                self._delete(conn, cache_key, row[5])
+                conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            conn.execute(
+                "UPDATE completions SET last_used = ?, hits = hits + 1 WHERE cache_key = ?",
+                (now, cache_key),
+            )
+            conn.commit()
+            self.hits += 1
+            self.dollars_saved += row[4]
+            return {
+                "model": row[0],
+                "content": row[1],
+                "usage": json.loads(row[2]),
+                "stop_reason": row[3],
+                "cost": row[4],
+            }
+
+    def put(self,
+            cache_key: str,
+            model: str,
+            content: str,
+            usage: Dict[str, int],
+            stop_reason: Optional[str],
+            cost: float) -> None:
+        """Store a completion, then evict if the cache is over its size limit"""
+        usage_json = json.dumps(usage, sort_keys=True)
+        size = len(content.encode("utf-8")) + len(usage_json) + len(cache_key)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            previous = conn.execute(
+                "SELECT size_bytes FROM completions WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO completions "
+                "(cache_key, model, content, usage, stop_reason, cost, size_bytes, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, model, content, usage_json, stop_reason, cost, size, now, now),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(conn, now)
+            conn.commit()
+
+    def invalidate(self, cache_key: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT size_bytes FROM completions WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is not None:
+                self._delete(conn, cache_key, row[0])
+                conn.commit()
+
+    def clear(self) -> None:
+        """Drop every cached completion"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM completions")
+            conn.commit()
+            self._total_bytes = 0
+
+    def evict(self) -> int:
+        """Drop expired entries, then LRU entries until under max_bytes. Returns entries removed."""
+        with self._lock:
+            removed = self._evict(self._connection(), time.time())
+            self._conn.commit()
+            return removed
+
+    def _delete(self, conn: sqlite3.Connection, cache_key: str, size: int) -> None:
+        conn.execute("DELETE FROM completions WHERE cache_key = ?", (cache_key,))
+        self._total_bytes -= size
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        removed = conn.execute(
+            "DELETE FROM completions WHERE created_at < ?", (now - self.max_age_seconds,)
+        ).rowcount
+
+        # Trim to 90% of the limit so eviction does not run on every put
+        self._total_bytes = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM completions").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        if self._total_bytes > target:
+            excess = self._total_bytes - target
+            freed = 0
+            victims = []
+            for cache_key, size in conn.execute(
+                "SELECT cache_key, size_bytes FROM completions ORDER BY last_used"
+            ):
+                if freed >= excess:
+                    break
+                victims.append((cache_key,))
+                freed += size
+            conn.executemany("DELETE FROM completions WHERE cache_key = ?", victims)
+            self._total_bytes -= freed
+            removed += len(victims)
+
+        self.evictions += removed
+        if removed:
+            logger.info(f"Completion cache evicted {removed} entries ({self._total_bytes} bytes kept)")
+        return removed
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.dollars_saved = 0.0
+        self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = (
+                self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+                if self._conn is not None else None
+            )
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "dollars_saved": round(self.dollars_saved, 6),
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": self._total_bytes if self._conn is not None else None,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+        }
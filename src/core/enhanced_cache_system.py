@@ -12,8 +12,11 @@ This module provides:
 
 import asyncio
 import hashlib
+import inspect
 import json
 import logging
+import time
+from array import array
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Union, Callable
 from datetime import datetime, timedelta
@@ -24,6 +27,8 @@ import threading
 from collections import defaultdict, OrderedDict
 import weakref
 
+from .cache_segment_store import SegmentStore, SegmentStoreLocked
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,6 +79,10 @@ class CacheMetrics:
     cache_size_mb: float = 0.0
     evictions: int = 0
     warming_successes: int = 0
+    warming_failures: int = 0
+    warmed_hits: int = 0                # hits served only because warming refreshed the key
+    baseline_hit_rate: float = 0.0      # hit rate with warmed hits counted as misses
+    warming_hit_rate_gain: float = 0.0  # hit_rate - baseline_hit_rate
     layer_hit_distribution: Dict[CacheLayer, int] = None
     
     def __post_init__(self):
@@ -84,18 +93,82 @@ class CacheMetrics:
         """Update hit rate calculation"""
         if self.total_requests > 0:
             self.hit_rate = self.cache_hits / self.total_requests
+            self.baseline_hit_rate = (self.cache_hits - self.warmed_hits) / self.total_requests
+            self.warming_hit_rate_gain = self.hit_rate - self.baseline_hit_rate
+
+
+@dataclass
+class AccessHistogram:
+    """
+    Compact per-key access profile for predictive warming.
+
+    Holds an hour-of-day histogram (24 saturating uint16 buckets), an EWMA of
+    the inter-access interval and what is needed to reload the key. Memory is
+    fixed per key regardless of how often it is read.
+    """
+    data_type: DataType
+    entity_id: str
+    context: Optional[Dict[str, Any]]
+    hour_counts: array = None
+    total: int = 0
+    last_access: float = 0.0
+    ewma_interval: float = 0.0
+
+    EWMA_ALPHA = 0.3
+    BUCKET_MAX = 65535
+
+    def __post_init__(self):
+        if self.hour_counts is None:
+            self.hour_counts = array('H', [0] * 24)
+
+    def record(self, ts: float) -> None:
+        if self.last_access:
+            interval = ts - self.last_access
+            if self.ewma_interval:
+                self.ewma_interval += self.EWMA_ALPHA * (interval - self.ewma_interval)
+            else:
+                self.ewma_interval = interval
+        self.last_access = ts
+        self.total += 1
+        hour = time.localtime(ts).tm_hour
+        if self.hour_counts[hour] == self.BUCKET_MAX:
+            # Halve every bucket to keep relative shape while staying bounded
+            for h in range(24):
+                self.hour_counts[h] //= 2
+        self.hour_counts[hour] += 1
+
+    def expected_accesses(self, now: float, window_seconds: float) -> float:
+        """Expected number of reads in (now, now + window], 0 for cold/stale keys"""
+        if self.total < 2 or self.ewma_interval <= 0:
+            return 0.0
+        # A key silent for several of its own intervals has gone cold
+        if now - self.last_access > 4 * self.ewma_interval + window_seconds:
+            return 0.0
+        rate = window_seconds / max(self.ewma_interval, 1.0)
+        # Weight by how busy the upcoming hour usually is for this key
+        bucket_total = sum(self.hour_counts)
+        if bucket_total >= 24:
+            hour = time.localtime(now + window_seconds / 2).tm_hour
+            rate *= self.hour_counts[hour] * 24 / bucket_total
+        return rate
 
 
 class EnhancedCacheSystem:
     """Multi-layer cache system targeting 92% hit rate"""
     
+    # A segment directory has one owner; other processes use segments-1, -2, ...
+    MAX_SEGMENT_SLOTS = 16
+    
     def __init__(self, cache_dir: Optional[Path] = None):
         self.cache_dir = cache_dir or Path("data/cache/enhanced")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Cache layers
         self.memory_cache: Dict[str, Tuple[Any, datetime]] = OrderedDict()
-        self.disk_cache_index: Dict[str, Path] = {}
+        # Disk layer: compressed records packed into mmap-able segment files;
+        # the key -> (segment, offset, expiry) index is held in memory
+        self.disk_store = self._open_disk_store()
+        self.disk_cache_index = self.disk_store.index
         
         # Cache strategies for different data types
         self.strategies = self._initialize_cache_strategies()
@@ -108,18 +181,37 @@ class EnhancedCacheSystem:
         self.max_memory_items = 10000  # Maximum items in memory cache
         self.memory_cleanup_threshold = 0.8  # Cleanup when 80% full
         
-        # Predictive caching
-        self.access_patterns: Dict[str, List[datetime]] = defaultdict(list)
-        self.prediction_window_hours = 24
+        # Predictive caching: bounded LRU of per-key access histograms
+        self.access_patterns: Dict[str, AccessHistogram] = OrderedDict()
+        self.max_tracked_keys = 50000
+        self.prediction_window_hours = 24  # keys idle longer than this are dropped
         
         # Cache warming scheduler
+        self.warming_loaders: Dict[DataType, Callable] = {}
+        self.warming_interval_seconds = 300
+        self.warming_lookahead_seconds = 1800
+        self.warming_min_expected_accesses = 0.5
+        self.max_warm_per_cycle = 200
+        self.warming_concurrency = 8
         self.warming_tasks: List[asyncio.Task] = []
+        # Refreshed keys -> expiry (epoch seconds) of the entry the refresh replaced
+        self._warmed_keys: Dict[str, float] = {}
         
         # Load existing cache index
         self._load_cache_index()
         
         logger.info("Enhanced Cache System initialized with 92% hit rate target")
     
+    def _open_disk_store(self) -> SegmentStore:
+        """Open the first segment directory not owned by another process's cache"""
+        for slot in range(self.MAX_SEGMENT_SLOTS):
+            path = self.cache_dir / ("segments" if slot == 0 else f"segments-{slot}")
+            try:
+                return SegmentStore(path)
+            except SegmentStoreLocked:
+                continue
+        raise SegmentStoreLocked(f"All {self.MAX_SEGMENT_SLOTS} segment directories in {self.cache_dir} are in use")
+    
     def _initialize_cache_strategies(self) -> Dict[DataType, CacheStrategy]:
         """Initialize caching strategies for different data types"""
         return {
@@ -226,12 +318,12 @@ class EnhancedCacheSystem:
         
         try:
             # Record access pattern for predictive caching
-            self._record_access_pattern(cache_key)
+            self._record_access_pattern(cache_key, data_type, entity_id, context)
             
             # Try memory cache first (fastest)
             result = await self._get_from_memory(cache_key, data_type)
             if result is not None:
-                self._record_cache_hit(CacheLayer.MEMORY, start_time)
+                self._record_cache_hit(CacheLayer.MEMORY, start_time, cache_key)
                 return result
             
             # Try disk cache
@@ -239,7 +331,7 @@ class EnhancedCacheSystem:
             if result is not None:
                 # Promote to memory cache for future hits
                 await self._promote_to_memory(cache_key, result, data_type)
-                self._record_cache_hit(CacheLayer.DISK, start_time)
+                self._record_cache_hit(CacheLayer.DISK, start_time, cache_key)
                 return result
             
             # Cache miss
@@ -279,10 +371,6 @@ class EnhancedCacheSystem:
             if CacheLayer.DISK in strategy.preferred_layers:
                 success = await self._put_to_disk(cache_key, data, expires_at, strategy) or success
             
-            # Schedule predictive warming if enabled
-            if strategy.predictive_warming:
-                await self._schedule_predictive_warming(cache_key, data_type, entity_id, context)
-            
             return success
             
         except Exception as e:
@@ -312,41 +400,14 @@ class EnhancedCacheSystem:
         if cache_key not in self.disk_cache_index:
             return None
         
-        cache_file = self.disk_cache_index[cache_key]
-        
-        if not cache_file.exists():
-            # Clean up stale index entry
-            del self.disk_cache_index[cache_key]
-            return None
-        
         try:
-            # Load metadata
-            metadata_file = cache_file.with_suffix('.meta')
-            if metadata_file.exists():
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                
-                # Check expiration
-                expires_at = datetime.fromisoformat(metadata['expires_at'])
-                if datetime.now() > expires_at:
-                    cache_file.unlink(missing_ok=True)
-                    metadata_file.unlink(missing_ok=True)
-                    del self.disk_cache_index[cache_key]
-                    return None
-            
-            # Load data
-            with open(cache_file, 'rb') as f:
-                data = pickle.load(f)
-            
-            return data
+            # Expiry is checked against the in-memory index before any I/O
+            return self.disk_store.get(cache_key)
             
         except Exception as e:
             logger.error(f"Disk cache read error for {cache_key}: {e}")
-            # Clean up corrupted cache entry
-            cache_file.unlink(missing_ok=True)
-            cache_file.with_suffix('.meta').unlink(missing_ok=True)
-            if cache_key in self.disk_cache_index:
-                del self.disk_cache_index[cache_key]
+            # Drop corrupted cache entry
+            self.disk_store.delete(cache_key)
             return None
     
     async def _put_to_memory(self, 
@@ -379,31 +440,9 @@ class EnhancedCacheSystem:
         """Put data to disk cache"""
         
         try:
-            # Create cache file path
-            cache_hash = hashlib.md5(cache_key.encode()).hexdigest()
-            cache_file = self.cache_dir / strategy.data_type.value / f"{cache_hash}.cache"
-            cache_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Save data
-            with open(cache_file, 'wb') as f:
-                pickle.dump(data, f)
-            
-            # Save metadata
-            metadata = {
-                'cache_key': cache_key,
-                'data_type': strategy.data_type.value,
-                'created_at': datetime.now().isoformat(),
-                'expires_at': expires_at.isoformat(),
-                'compression_enabled': strategy.compression_enabled
-            }
-            
-            metadata_file = cache_file.with_suffix('.meta')
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f)
-            
-            # Update index
-            self.disk_cache_index[cache_key] = cache_file
-            
+            self.disk_store.put(
+                cache_key, data, expires_at.timestamp(), compress=strategy.compression_enabled
+            )
             return True
             
         except Exception as e:
@@ -440,20 +479,29 @@ class EnhancedCacheSystem:
             with self.metrics_lock:
                 self.metrics.evictions += 1
     
-    def _record_access_pattern(self, cache_key: str):
+    def _record_access_pattern(self,
+                               cache_key: str,
+                               data_type: DataType,
+                               entity_id: str,
+                               context: Optional[Dict[str, Any]]):
         """Record access pattern for predictive caching"""
         
-        now = datetime.now()
-        self.access_patterns[cache_key].append(now)
+        strategy = self.strategies.get(data_type)
+        if not strategy or not strategy.predictive_warming:
+            return
         
-        # Keep only recent access history
-        cutoff = now - timedelta(hours=self.prediction_window_hours)
-        self.access_patterns[cache_key] = [
-            access_time for access_time in self.access_patterns[cache_key] 
-            if access_time > cutoff
-        ]
+        stats = self.access_patterns.get(cache_key)
+        if stats is None:
+            stats = AccessHistogram(data_type, entity_id, context)
+            self.access_patterns[cache_key] = stats
+            if len(self.access_patterns) > self.max_tracked_keys:
+                evicted, _ = self.access_patterns.popitem(last=False)
+                self._warmed_keys.pop(evicted, None)
+        else:
+            self.access_patterns.move_to_end(cache_key)
+        stats.record(time.time())
     
-    def _record_cache_hit(self, layer: CacheLayer, start_time: datetime):
+    def _record_cache_hit(self, layer: CacheLayer, start_time: datetime, cache_key: Optional[str] = None):
         """Record cache hit metrics"""
         
         response_time = (datetime.now() - start_time).total_seconds() * 1000
@@ -461,6 +509,12 @@ class EnhancedCacheSystem:
         with self.metrics_lock:
             self.metrics.total_requests += 1
             self.metrics.cache_hits += 1
+            replaced_until = self._warmed_keys.get(cache_key)
+            if replaced_until is not None and time.time() > replaced_until:
+                # First hit past the replaced entry's expiry would otherwise
+                # have been a miss; earlier hits would have been served anyway
+                del self._warmed_keys[cache_key]
+                self.metrics.warmed_hits += 1
             self.metrics.layer_hit_distribution[layer] += 1
             
             # Update average response time
@@ -484,69 +538,161 @@ class EnhancedCacheSystem:
             
             self.metrics.update_hit_rate()
     
-    async def _schedule_predictive_warming(self,
-                                         cache_key: str,
-                                         data_type: DataType,
-                                         entity_id: str,
-                                         context: Optional[Dict[str, Any]]):
-        """Schedule predictive cache warming based on access patterns"""
-        
-        # Analyze access pattern to predict next access
-        if cache_key in self.access_patterns:
-            accesses = self.access_patterns[cache_key]
-            if len(accesses) >= 2:
-                # Calculate average access interval
-                intervals = [
-                    (accesses[i] - accesses[i-1]).total_seconds() 
-                    for i in range(1, len(accesses))
-                ]
-                avg_interval = sum(intervals) / len(intervals)
-                
-                # Schedule warming before predicted next access
-                warming_delay = max(avg_interval * 0.8, 300)  # At least 5 minutes
-                
-                async def warm_cache():
-                    await asyncio.sleep(warming_delay)
-                    # This would trigger cache warming logic
-                    logger.debug(f"Predictive warming triggered for {cache_key}")
-                
-                task = asyncio.create_task(warm_cache())
-                self.warming_tasks.append(task)
+    def register_warming_loader(self, data_type: DataType, loader: Callable):
+        """
+        Register the callback that rebuilds a value for predictive warming.
+        
+        ``loader(entity_id, context)`` may be sync (run in a worker thread) or
+        async, and returns the value to cache or None to skip. Registering a
+        loader from inside a running event loop starts the scheduler.
+        """
+        self.warming_loaders[data_type] = loader
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self.start_predictive_warming()
+    
+    def start_predictive_warming(self):
+        """Start the background warming scheduler (idempotent)"""
+        if any(not task.done() for task in self.warming_tasks):
+            return
+        self.warming_tasks = [asyncio.create_task(self._warming_loop())]
+    
+    async def stop_predictive_warming(self):
+        """Cancel the background warming scheduler"""
+        for task in self.warming_tasks:
+            task.cancel()
+        await asyncio.gather(*self.warming_tasks, return_exceptions=True)
+        self.warming_tasks = []
+    
+    async def _warming_loop(self):
+        while True:
+            await asyncio.sleep(self.warming_interval_seconds)
+            try:
+                await self.warm_predicted_keys()
+            except Exception as e:
+                logger.error(f"Predictive warming cycle failed: {e}")
+    
+    def _cached_until(self, cache_key: str) -> float:
+        """Latest expiry of cache_key across layers (epoch seconds, 0 if absent)"""
+        until = 0.0
+        if cache_key in self.memory_cache:
+            until = self.memory_cache[cache_key][1].timestamp()
+        record = self.disk_cache_index.get(cache_key)
+        if record is not None:
+            until = max(until, record.expires_at)
+        return until
+    
+    def predict_hot_keys(self, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Keys expected to be read in the look-ahead window that will not be cached then"""
+        
+        now = now or time.time()
+        horizon = now + self.warming_lookahead_seconds
+        idle_cutoff = now - self.prediction_window_hours * 3600
+        
+        candidates = []
+        stale = []
+        for cache_key, stats in self.access_patterns.items():
+            if stats.last_access < idle_cutoff:
+                stale.append(cache_key)
+                continue
+            if stats.data_type not in self.warming_loaders:
+                continue
+            expected = stats.expected_accesses(now, self.warming_lookahead_seconds)
+            if expected < self.warming_min_expected_accesses:
+                continue
+            if self._cached_until(cache_key) > horizon:
+                continue
+            candidates.append((cache_key, expected))
+        
+        for cache_key in stale:
+            del self.access_patterns[cache_key]
+            self._warmed_keys.pop(cache_key, None)
+        
+        candidates.sort(key=lambda item: item[1], reverse=True)
+        return candidates[:self.max_warm_per_cycle]
+    
+    async def warm_predicted_keys(self) -> int:
+        """Run one warming cycle; returns the number of keys refreshed"""
+        
+        hot_keys = self.predict_hot_keys()
+        if not hot_keys:
+            return 0
+        
+        semaphore = asyncio.Semaphore(self.warming_concurrency)
+        
+        async def warm(cache_key: str) -> bool:
+            stats = self.access_patterns.get(cache_key)
+            if stats is None:
+                return False
+            loader = self.warming_loaders[stats.data_type]
+            replaced_until = self._cached_until(cache_key)
+            async with semaphore:
+                try:
+                    if inspect.iscoroutinefunction(loader):
+                        value = await loader(stats.entity_id, stats.context)
+                    else:
+                        value = await asyncio.to_thread(loader, stats.entity_id, stats.context)
+                    if value is None:
+                        return False
+                    stored = await self.put(stats.data_type, stats.entity_id, value, stats.context)
+                except Exception as e:
+                    logger.warning(f"Predictive warming failed for {cache_key}: {e}")
+                    stored = False
+            with self.metrics_lock:
+                if stored:
+                    self.metrics.warming_successes += 1
+                    self._warmed_keys[cache_key] = replaced_until
+                else:
+                    self.metrics.warming_failures += 1
+            return stored
+        
+        results = await asyncio.gather(*(warm(key) for key, _ in hot_keys))
+        warmed = sum(1 for ok in results if ok)
+        logger.debug(f"Predictive warming refreshed {warmed}/{len(hot_keys)} keys")
+        return warmed
     
     def _load_cache_index(self):
-        """Load disk cache index from metadata"""
+        """Migrate the legacy per-file disk cache (.cache pickle + .meta JSON) into segments"""
+        
+        legacy_meta = list(self.cache_dir.glob("*/*.meta"))
+        if not legacy_meta:
+            return
         
-        index_file = self.cache_dir / "cache_index.json"
-        if index_file.exists():
+        migrated = 0
+        now = datetime.now()
+        for metadata_file in legacy_meta:
+            cache_file = metadata_file.with_suffix('.cache')
             try:
-                with open(index_file, 'r') as f:
-                    index_data = json.load(f)
-                
-                # Rebuild index with Path objects
-                for cache_key, file_path in index_data.items():
-                    self.disk_cache_index[cache_key] = Path(file_path)
-                
-                logger.info(f"Loaded {len(self.disk_cache_index)} cache entries from index")
-                
+                with open(metadata_file, 'r') as f:
+                    metadata = json.load(f)
+                expires_at = datetime.fromisoformat(metadata['expires_at'])
+                if expires_at > now and cache_file.exists():
+                    with open(cache_file, 'rb') as f:
+                        data = pickle.load(f)
+                    self.disk_store.put(
+                        metadata['cache_key'], data, expires_at.timestamp(),
+                        compress=metadata.get('compression_enabled', True)
+                    )
+                    migrated += 1
             except Exception as e:
-                logger.error(f"Failed to load cache index: {e}")
+                logger.warning(f"Skipping legacy cache entry {metadata_file.name}: {e}")
+            finally:
+                cache_file.unlink(missing_ok=True)
+                metadata_file.unlink(missing_ok=True)
+        
+        self.disk_store.flush()
+        (self.cache_dir / "cache_index.json").unlink(missing_ok=True)
+        logger.info(f"Migrated {migrated} legacy disk cache entries into segments")
     
     async def save_cache_index(self):
-        """Save disk cache index to metadata"""
+        """Flush the active disk segment (the index is rebuilt from segment headers on load)"""
         
-        index_file = self.cache_dir / "cache_index.json" 
         try:
-            # Convert Path objects to strings for JSON serialization
-            index_data = {
-                cache_key: str(file_path) 
-                for cache_key, file_path in self.disk_cache_index.items()
-            }
-            
-            with open(index_file, 'w') as f:
-                json.dump(index_data, f, indent=2)
-                
+            self.disk_store.flush()
         except Exception as e:
-            logger.error(f"Failed to save cache index: {e}")
+            logger.error(f"Failed to flush disk cache: {e}")
     
     def get_metrics(self) -> CacheMetrics:
         """Get current cache performance metrics"""
@@ -568,6 +714,10 @@ class EnhancedCacheSystem:
                 cache_size_mb=self.metrics.cache_size_mb,
                 evictions=self.metrics.evictions,
                 warming_successes=self.metrics.warming_successes,
+                warming_failures=self.metrics.warming_failures,
+                warmed_hits=self.metrics.warmed_hits,
+                baseline_hit_rate=self.metrics.baseline_hit_rate,
+                warming_hit_rate_gain=self.metrics.warming_hit_rate_gain,
                 layer_hit_distribution=dict(self.metrics.layer_hit_distribution)
             )
     
@@ -590,16 +740,14 @@ class EnhancedCacheSystem:
         for key in keys_to_remove:
             del self.memory_cache[key]
         
-        # Disk cache
-        keys_to_remove = []
-        for cache_key, cache_file in self.disk_cache_index.items():
-            if pattern in cache_key:
-                cache_file.unlink(missing_ok=True)
-                cache_file.with_suffix('.meta').unlink(missing_ok=True)
-                keys_to_remove.append(cache_key)
+        # Disk cache (tombstoned so the entries stay dead across restarts)
+        keys_to_remove = [
+            cache_key for cache_key in self.disk_store.keys()
+            if pattern in cache_key
+        ]
         
         for key in keys_to_remove:
-            del self.disk_cache_index[key]
+            self.disk_store.delete(key)
         
         logger.info(f"Invalidated {len(keys_to_remove)} cache entries for {data_type.value}:{entity_id} (trigger: {trigger})")
 
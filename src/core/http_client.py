@@ -4,16 +4,17 @@ Centralized HTTP client with retry logic, caching, rate limiting, and error hand
 """
 import asyncio
 import aiohttp
-import time
 import logging
-from typing import Dict, Any, Optional, List, Union, Callable
+from typing import Dict, Any, Optional, Union, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
+import copy
 import json
 import hashlib
 
 from .cache_manager import get_cache_manager, CacheType
+from .request_scheduler import API_RATE_LIMITS, RequestPriority, get_request_scheduler
 
 
 @dataclass
@@ -26,6 +27,7 @@ class HTTPConfig:
     rate_limit_calls: int = 50  # Reduced from 100
     rate_limit_window: int = 600  # 10 minutes instead of 1 hour
     cache_ttl: int = 3600  # 1 hour
+    negative_cache_ttl: int = 900  # 404 / empty GET responses, 15 minutes
     user_agent: str = "Catalynx/2.0 Grant Research Platform"
     headers: Dict[str, str] = field(default_factory=dict)
 
@@ -38,6 +40,13 @@ class APIRateLimit:
     delay_between_calls: float = 0.0
 
 
+# Marks a negative cache entry (404 or empty response) stored under a GET's cache key
+_NEGATIVE_CACHE_MARKER = "__catalynx_negative_cache__"
+
+# Client errors that a retry will not fix
+_NON_RETRYABLE_STATUSES = frozenset({400, 401, 403, 404, 405, 410, 422})
+
+
 class HTTPError(Exception):
     """Custom HTTP error with response details"""
     def __init__(self, message: str, status_code: Optional[int] = None, response_data: Optional[Dict] = None):
@@ -52,8 +61,9 @@ class CatalynxHTTPClient:
     
     Features:
     - Automatic retry with exponential backoff
-    - Response caching
-    - Rate limiting per API endpoint
+    - Response caching, including short-lived caching of 404 / empty responses
+    - Coalescing of concurrent identical GETs into one in-flight request
+    - Rate limiting per API endpoint (shared token buckets with priority queuing)
     - Structured error handling
     - Progress tracking integration
     - Connection pooling
@@ -64,9 +74,19 @@ class CatalynxHTTPClient:
         self.logger = logging.getLogger(__name__)
         self.cache_manager = get_cache_manager()
         
-        # Rate limiting tracking
+        # Rate limiting: per-API settings, enforced by the process-wide scheduler
         self.rate_limits: Dict[str, APIRateLimit] = {}
-        self.call_history: Dict[str, List[float]] = {}  # Per-API call history
+        self.scheduler = get_request_scheduler()
+        
+        # In-flight GETs by cache key, shared by concurrent identical requests
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            'requests': 0,
+            'cache_hits': 0,
+            'negative_cache_hits': 0,
+            'coalesced': 0,
+            'http_calls': 0,
+        }
         
         # Session will be created lazily
         self._session: Optional[aiohttp.ClientSession] = None
@@ -113,7 +133,8 @@ class CatalynxHTTPClient:
                   headers: Optional[Dict[str, str]] = None,
                   cache_key: Optional[str] = None,
                   rate_limit_key: Optional[str] = None,
-                  progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+                  progress_callback: Optional[Callable] = None,
+                  priority: Optional[RequestPriority] = None) -> Dict[str, Any]:
         """
         Perform GET request with caching, rate limiting, and retry logic
         
@@ -124,6 +145,7 @@ class CatalynxHTTPClient:
             cache_key: Key for caching (auto-generated if None)
             rate_limit_key: Key for rate limiting (uses domain if None)
             progress_callback: Optional progress callback
+            priority: Queue priority when rate limited (context priority if None)
             
         Returns:
             Response data as dictionary
@@ -131,7 +153,7 @@ class CatalynxHTTPClient:
         return await self._request(
             'GET', url, params=params, headers=headers,
             cache_key=cache_key, rate_limit_key=rate_limit_key,
-            progress_callback=progress_callback
+            progress_callback=progress_callback, priority=priority
         )
     
     async def post(self,
@@ -140,7 +162,8 @@ class CatalynxHTTPClient:
                    json_data: Optional[Dict[str, Any]] = None,
                    headers: Optional[Dict[str, str]] = None,
                    rate_limit_key: Optional[str] = None,
-                   progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+                   progress_callback: Optional[Callable] = None,
+                   priority: Optional[RequestPriority] = None) -> Dict[str, Any]:
         """
         Perform POST request with rate limiting and retry logic
         
@@ -151,13 +174,15 @@ class CatalynxHTTPClient:
             headers: Additional headers
             rate_limit_key: Key for rate limiting
             progress_callback: Optional progress callback
+            priority: Queue priority when rate limited (context priority if None)
             
         Returns:
             Response data as dictionary
         """
         return await self._request(
             'POST', url, data=data, json_data=json_data, headers=headers,
-            rate_limit_key=rate_limit_key, progress_callback=progress_callback
+            rate_limit_key=rate_limit_key, progress_callback=progress_callback,
+            priority=priority
         )
     
     async def _request(self,
@@ -169,37 +194,93 @@ class CatalynxHTTPClient:
                       headers: Optional[Dict[str, str]] = None,
                       cache_key: Optional[str] = None,
                       rate_limit_key: Optional[str] = None,
-                      progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+                      progress_callback: Optional[Callable] = None,
+                      priority: Optional[RequestPriority] = None) -> Dict[str, Any]:
         """Internal request method with all the logic"""
+        self.stats['requests'] += 1
         
         # Generate cache key for GET requests
         if method == 'GET' and not cache_key:
             cache_key = self._generate_cache_key(url, params)
         
+        send = lambda: self._send(
+            method, url, params=params, data=data, json_data=json_data, headers=headers,
+            cache_key=cache_key, rate_limit_key=rate_limit_key,
+            progress_callback=progress_callback, priority=priority
+        )
+        if method != 'GET' or not cache_key:
+            return await send()
+        
         # Check cache first for GET requests
-        if method == 'GET' and cache_key:
-            cached_data = await self.cache_manager.get(
-                identifier=cache_key,
-                cache_type=CacheType.API_RESPONSE
-            )
-            if cached_data:
-                self.logger.debug(f"Cache hit for {cache_key}")
-                return cached_data
+        cached_data = await self.cache_manager.get(
+            identifier=cache_key,
+            cache_type=CacheType.API_RESPONSE
+        )
+        if isinstance(cached_data, dict) and cached_data.get(_NEGATIVE_CACHE_MARKER):
+            self.stats['negative_cache_hits'] += 1
+            self.logger.debug(f"Negative cache hit for {cache_key}")
+            if cached_data['status_code'] >= 400:
+                raise HTTPError(
+                    f"HTTP {method} to {url} served from negative cache: "
+                    f"HTTP {cached_data['status_code']} for {url}",
+                    cached_data['status_code'], cached_data['response_data']
+                )
+            return cached_data['response_data']
+        if cached_data:
+            self.stats['cache_hits'] += 1
+            self.logger.debug(f"Cache hit for {cache_key}")
+            return cached_data
+        
+        # Single flight: concurrent identical GETs share one request. It runs as
+        # its own task so a cancelled caller does not cancel it for the others.
+        # Every caller gets its own copy so none sees another's mutations.
+        loop = asyncio.get_running_loop()
+        task = self._in_flight.get(cache_key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.stats['coalesced'] += 1
+            return copy.deepcopy(await asyncio.shield(task))
+        
+        task = loop.create_task(send())
+        self._in_flight[cache_key] = task
+        task.add_done_callback(lambda t: self._request_done(cache_key, t))
+        return copy.deepcopy(await asyncio.shield(task))
+    
+    def _request_done(self, cache_key: str, task: asyncio.Task):
+        if self._in_flight.get(cache_key) is task:
+            del self._in_flight[cache_key]
+        if not task.cancelled():
+            task.exception()  # Retrieved even if every caller was cancelled
+    
+    async def _send(self,
+                    method: str,
+                    url: str,
+                    params: Optional[Dict[str, Any]] = None,
+                    data: Optional[Dict[str, Any]] = None,
+                    json_data: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None,
+                    cache_key: Optional[str] = None,
+                    rate_limit_key: Optional[str] = None,
+                    progress_callback: Optional[Callable] = None,
+                    priority: Optional[RequestPriority] = None) -> Dict[str, Any]:
+        """Send the request with rate limiting and retries, caching GET outcomes"""
         
         # Apply rate limiting
         if rate_limit_key:
-            await self._apply_rate_limit(rate_limit_key)
+            await self._apply_rate_limit(rate_limit_key, priority)
         
         # Prepare headers
         request_headers = headers.copy() if headers else {}
         
         # Retry logic
         last_error = None
+        attempts = 0
         for attempt in range(self.config.max_retries + 1):
+            attempts = attempt + 1
             try:
                 if progress_callback:
                     progress_callback(f"HTTP {method} attempt {attempt + 1}/{self.config.max_retries + 1}: {url}")
                 
+                self.stats['http_calls'] += 1
                 async with self.get_session() as session:
                     kwargs = {
                         'headers': request_headers,
@@ -216,14 +297,17 @@ class CatalynxHTTPClient:
                     async with session.request(method, url, **kwargs) as response:
                         response_data = await self._process_response(response, url)
                         
-                        # Cache successful GET responses
+                        # Cache successful GET responses; empty ones only briefly
                         if method == 'GET' and cache_key and response.status == 200:
-                            await self.cache_manager.set(
-                                identifier=cache_key,
-                                cache_type=CacheType.API_RESPONSE,
-                                content=response_data,
-                                ttl=timedelta(seconds=self.config.cache_ttl)
-                            )
+                            if response_data:
+                                await self.cache_manager.set(
+                                    identifier=cache_key,
+                                    cache_type=CacheType.API_RESPONSE,
+                                    content=response_data,
+                                    ttl=timedelta(seconds=self.config.cache_ttl)
+                                )
+                            else:
+                                await self._set_negative_cache(cache_key, 200, response_data)
                         
                         return response_data
                         
@@ -231,6 +315,12 @@ class CatalynxHTTPClient:
                 last_error = e
                 self.logger.warning(f"HTTP request attempt {attempt + 1} failed: {e}")
                 
+                status_code = getattr(e, 'status_code', None)
+                if status_code == 404 and method == 'GET' and cache_key:
+                    await self._set_negative_cache(cache_key, 404, e.response_data)
+                if status_code in _NON_RETRYABLE_STATUSES:
+                    break
+                
                 if attempt < self.config.max_retries:
                     delay = self.config.retry_delay * (self.config.retry_backoff ** attempt)
                     await asyncio.sleep(delay)
@@ -238,11 +328,28 @@ class CatalynxHTTPClient:
                     break
         
         # All retries failed
-        error_msg = f"HTTP {method} to {url} failed after {self.config.max_retries + 1} attempts"
+        error_msg = f"HTTP {method} to {url} failed after {attempts} attempts"
         if last_error:
             error_msg += f": {last_error}"
         
-        raise HTTPError(error_msg)
+        raise HTTPError(
+            error_msg,
+            getattr(last_error, 'status_code', None),
+            getattr(last_error, 'response_data', None)
+        )
+    
+    async def _set_negative_cache(self, cache_key: str, status_code: int, response_data: Any):
+        """Remember a 404 / empty GET response for negative_cache_ttl seconds"""
+        await self.cache_manager.set(
+            identifier=cache_key,
+            cache_type=CacheType.API_RESPONSE,
+            content={
+                _NEGATIVE_CACHE_MARKER: True,
+                'status_code': status_code,
+                'response_data': response_data
+            },
+            ttl=timedelta(seconds=self.config.negative_cache_ttl)
+        )
     
     async def _process_response(self, response: aiohttp.ClientResponse, url: str) -> Dict[str, Any]:
         """Process HTTP response and handle errors"""
@@ -284,53 +391,42 @@ class CatalynxHTTPClient:
         key_string = '|'.join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
     
-    async def _apply_rate_limit(self, rate_limit_key: str):
-        """Apply rate limiting for specific API"""
-        now = time.time()
-        
-        # Initialize call history for this API if not exists
-        if rate_limit_key not in self.call_history:
-            self.call_history[rate_limit_key] = []
+    async def _apply_rate_limit(self, rate_limit_key: str, priority: Optional[RequestPriority] = None):
+        """Wait for the API's shared token bucket; uses this client's default limit if none is set"""
+        if not self.scheduler.is_configured(rate_limit_key):
+            self.scheduler.configure(rate_limit_key, self.config.rate_limit_calls, self.config.rate_limit_window)
         
-        # Clean old calls from history for this specific API
-        window_start = now - self.config.rate_limit_window
-        self.call_history[rate_limit_key] = [call_time for call_time in self.call_history[rate_limit_key] if call_time > window_start]
-        
-        # Check if we're exceeding rate limit for this specific API
-        api_calls = self.call_history[rate_limit_key]
-        if len(api_calls) >= self.config.rate_limit_calls:
-            # Calculate wait time until oldest call expires
-            oldest_call = min(api_calls)
-            wait_time = oldest_call + self.config.rate_limit_window - now
-            
-            # Cap wait time to prevent excessive delays
-            max_wait_time = 300  # Max 5 minutes
-            if wait_time > max_wait_time:
-                self.logger.warning(f"Rate limit wait time for {rate_limit_key} capped at {max_wait_time}s (was {wait_time:.2f}s)")
-                wait_time = max_wait_time
-            
-            if wait_time > 0:
-                self.logger.info(f"Rate limit reached for {rate_limit_key}, waiting {wait_time:.2f} seconds")
-                await asyncio.sleep(wait_time)
-        
-        # Apply API-specific rate limiting
-        if rate_limit_key in self.rate_limits:
-            rate_limit = self.rate_limits[rate_limit_key]
-            if rate_limit.delay_between_calls > 0:
-                await asyncio.sleep(rate_limit.delay_between_calls)
-        
-        # Record this call for this specific API
-        self.call_history[rate_limit_key].append(now)
+        waited = await self.scheduler.acquire(rate_limit_key, priority)
+        if waited > 1.0:
+            self.logger.info(f"Rate limited {rate_limit_key}: waited {waited:.2f} seconds")
     
-    def set_api_rate_limit(self, api_key: str, calls_per_hour: int, delay_between_calls: float = 0.0):
-        """Set specific rate limiting for an API"""
+    def set_api_rate_limit(self,
+                           api_key: str,
+                           calls_per_hour: Optional[int] = None,
+                           delay_between_calls: Optional[float] = None):
+        """Set specific rate limiting for an API; omitted values come from API_RATE_LIMITS"""
+        if calls_per_hour is None or delay_between_calls is None:
+            if api_key not in API_RATE_LIMITS:
+                raise ValueError(f"No rate limit defined for API {api_key}")
+            default_calls, default_delay = API_RATE_LIMITS[api_key]
+            calls_per_hour = default_calls if calls_per_hour is None else calls_per_hour
+            delay_between_calls = default_delay if delay_between_calls is None else delay_between_calls
         self.rate_limits[api_key] = APIRateLimit(
             calls_remaining=calls_per_hour,
             window_reset=datetime.now() + timedelta(hours=1),
             delay_between_calls=delay_between_calls
         )
+        self.scheduler.configure(api_key, calls_per_hour, 3600, min_interval=delay_between_calls)
         
         self.logger.info(f"Set rate limit for {api_key}: {calls_per_hour} calls/hour, {delay_between_calls}s delay")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Request, cache and coalescing counters plus rate limiter metrics per API"""
+        return {
+            **self.stats,
+            'in_flight': len(self._in_flight),
+            'rate_limits': self.scheduler.get_stats()
+        }
 
 
 # Global HTTP client instance
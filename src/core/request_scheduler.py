@@ -0,0 +1,231 @@
+"""
+Request Scheduler
+Process-wide token-bucket rate limiting and priority dispatch for external APIs.
+
+Every outbound call to a rate-limited API acquires a token from that API's
+bucket first. When no token is available the caller queues, and queued
+callers are released by priority (interactive requests before batch jobs,
+FIFO within a priority) as tokens refill. Batch code marks its requests with
+the request_priority() context manager; everything else is interactive.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Requests a bucket allows back to back before refill pacing applies, unless
+# configured otherwise. Kept small so an hourly quota is not spent in one burst.
+DEFAULT_BURST = 5
+
+# Limits per external API as (calls per hour, minimum seconds between calls).
+# Clients and processors sharing an API read its limit from here.
+API_RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "propublica": (500, 0.2),
+    "grants_gov": (1000, 0.1),
+    "foundation_directory": (500, 0.2),
+    "usaspending": (1000, 0.1),
+    "va_state": (500, 0.2),
+}
+
+
+class RequestPriority(IntEnum):
+    """Dispatch priority for queued requests (lower dispatches first)"""
+    INTERACTIVE = 0
+    DEFAULT = 1
+    BATCH = 2
+
+
+_current_priority: ContextVar[RequestPriority] = ContextVar(
+    "request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority):
+    """Run the enclosed requests (and tasks created inside) at the given priority"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_request_priority() -> RequestPriority:
+    return _current_priority.get()
+
+
+@dataclass
+class _APIQueue:
+    """Token bucket, wait queue and metrics for one API"""
+    rate: float  # tokens per second
+    capacity: float
+    min_interval: float = 0.0
+    tokens: float = 0.0
+    updated: float = 0.0
+    last_dispatch: float = float("-inf")
+    waiters: List[Tuple[int, int, float, asyncio.Future]] = field(default_factory=list)
+    dispatcher: Optional[asyncio.Task] = None
+
+    # Metrics
+    dispatched: int = 0
+    queued: int = 0
+    peak_queue_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    wait_by_priority: Dict[str, List[float]] = field(default_factory=dict)  # name -> [count, total wait]
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token can be taken (0 when one can be taken now)"""
+        self.refill(now)
+        token_wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+        return max(token_wait, self.last_dispatch + self.min_interval - now, 0.0)
+
+    def take(self, now: float) -> None:
+        self.tokens -= 1
+        self.last_dispatch = now
+
+    def record(self, priority: RequestPriority, waited: float) -> None:
+        self.dispatched += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        entry = self.wait_by_priority.setdefault(priority.name.lower(), [0, 0.0])
+        entry[0] += 1
+        entry[1] += waited
+
+
+class RequestScheduler:
+    """
+    Shared rate limiter for external APIs.
+
+    Each API key gets a token bucket refilling at calls / window_seconds with
+    room for a burst of `burst` tokens (DEFAULT_BURST unless configured), and
+    optionally a minimum spacing between dispatches. Keys that were never
+    configured use the defaults.
+    """
+
+    def __init__(self, default_calls: int = 50, default_window: float = 600.0):
+        self.default_calls = default_calls
+        self.default_window = default_window
+        self._queues: Dict[str, _APIQueue] = {}
+        self._sequence = itertools.count()
+
+    def configure(self,
+                  api_key: str,
+                  calls: int,
+                  window_seconds: float,
+                  min_interval: float = 0.0,
+                  burst: Optional[int] = None):
+        """Set (or replace) the limit for an API; queued requests are kept"""
+        rate = calls / window_seconds
+        capacity = float(max(1, burst if burst is not None else min(calls, DEFAULT_BURST)))
+        existing = self._queues.get(api_key)
+        now = time.monotonic()
+        if existing is None:
+            self._queues[api_key] = _APIQueue(
+                rate=rate, capacity=capacity, min_interval=min_interval, tokens=capacity, updated=now
+            )
+        else:
+            existing.refill(now)
+            existing.rate, existing.capacity, existing.min_interval = rate, capacity, min_interval
+            existing.tokens = min(existing.tokens, capacity)
+
+    def is_configured(self, api_key: str) -> bool:
+        return api_key in self._queues
+
+    def _queue(self, api_key: str) -> _APIQueue:
+        if api_key not in self._queues:
+            self.configure(api_key, self.default_calls, self.default_window)
+        return self._queues[api_key]
+
+    async def acquire(self, api_key: str, priority: Optional[RequestPriority] = None) -> float:
+        """
+        Wait for permission to call the API. Returns the seconds spent waiting.
+
+        Uses the context's request priority unless one is given.
+        """
+        priority = RequestPriority(priority if priority is not None else current_request_priority())
+        queue = self._queue(api_key)
+        now = time.monotonic()
+
+        # Fast path: nobody waiting and a token is available
+        if not queue.waiters and queue.delay(now) == 0:
+            queue.take(now)
+            queue.record(priority, 0.0)
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(queue.waiters, (int(priority), next(self._sequence), now, future))
+        queue.queued += 1
+        queue.peak_queue_depth = max(queue.peak_queue_depth, len(queue.waiters))
+
+        dispatcher = queue.dispatcher
+        if dispatcher is None or dispatcher.done() or dispatcher.get_loop() is not loop:
+            queue.dispatcher = loop.create_task(self._dispatch(queue))
+
+        waited = await future
+        queue.record(priority, waited)
+        return waited
+
+    async def _dispatch(self, queue: _APIQueue):
+        """Release queued requests one token at a time, highest priority first"""
+        while queue.waiters:
+            now = time.monotonic()
+            delay = queue.delay(now)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, enqueued, future = heapq.heappop(queue.waiters)
+            if future.done() or future.get_loop().is_closed():
+                continue  # Caller was cancelled while queued
+            queue.take(now)
+            future.set_result(now - enqueued)
+
+    def get_stats(self, api_key: Optional[str] = None) -> Dict[str, Any]:
+        """Queue depth and wait-time metrics, for one API or all of them"""
+        if api_key is not None:
+            queue = self._queues.get(api_key)
+            return self._queue_stats(queue) if queue else {}
+        return {key: self._queue_stats(queue) for key, queue in self._queues.items()}
+
+    @staticmethod
+    def _queue_stats(queue: _APIQueue) -> Dict[str, Any]:
+        queue.refill(time.monotonic())
+        return {
+            'calls_per_second': queue.rate,
+            'burst': queue.capacity,
+            'min_interval': queue.min_interval,
+            'tokens_available': round(queue.tokens, 3),
+            'queue_depth': len(queue.waiters),
+            'peak_queue_depth': queue.peak_queue_depth,
+            'dispatched': queue.dispatched,
+            'queued': queue.queued,
+            'avg_wait_ms': round(queue.total_wait / queue.dispatched * 1000, 2) if queue.dispatched else 0.0,
+            'max_wait_ms': round(queue.max_wait * 1000, 2),
+            'avg_wait_ms_by_priority': {
+                name: round(total / count * 1000, 2) for name, (count, total) in queue.wait_by_priority.items()
+            },
+        }
+
+
+# Global scheduler instance
+_request_scheduler: Optional[RequestScheduler] = None
+
+
+def get_request_scheduler() -> RequestScheduler:
+    """Get the process-wide request scheduler"""
+    global _request_scheduler
+    if _request_scheduler is None:
+        _request_scheduler = RequestScheduler()
+    return _request_scheduler
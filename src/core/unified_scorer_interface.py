@@ -11,9 +11,11 @@ This module provides:
 """
 
 import asyncio
+import contextvars
 import time
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any, Tuple, Union
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -34,6 +36,15 @@ class ScorerType(Enum):
     NETWORK = "network"
 
 
+# Scorers whose cached results are recomputed ahead of expiry by predictive
+# warming. AI scorers are left out because re-running them costs API calls.
+WARMED_SCORER_TYPES = {ScorerType.SUCCESS, ScorerType.NETWORK}
+
+# Set while a warming loader re-scores, so the scorer neither reads the entry
+# being refreshed nor stores it a second time
+_warming_rescore: contextvars.ContextVar = contextvars.ContextVar("warming_rescore", default=False)
+
+
 class WorkflowStage(Enum):
     """Workflow stages where scorers operate"""
     DISCOVER = "discover"
@@ -106,6 +117,10 @@ class UnifiedScorerInterface(ABC):
         # Enhanced caching integration
         self._cache_enabled = True
         self._cache_ttl_hours = 24  # Default TTL for this scorer type
+        
+        # Inputs of recently cached scores, replayed by the warming loader
+        self._warming_inputs: OrderedDict = OrderedDict()
+        self._max_warming_inputs = 1000
     
     @abstractmethod
     async def score(self, 
@@ -284,7 +299,7 @@ class UnifiedScorerInterface(ABC):
                               context: ScoringContext) -> Optional[ScoringResult]:
         """Get cached scoring result if available"""
         
-        if not self._cache_enabled:
+        if not self._cache_enabled or _warming_rescore.get():
             return None
         
         try:
@@ -336,7 +351,7 @@ class UnifiedScorerInterface(ABC):
                          result: ScoringResult) -> bool:
         """Cache scoring result for future use"""
         
-        if not self._cache_enabled:
+        if not self._cache_enabled or _warming_rescore.get():
             return False
         
         try:
@@ -362,36 +377,74 @@ class UnifiedScorerInterface(ABC):
                 'priority_level': context.priority_level
             }
             
-            # Convert result to cacheable format
-            cacheable_result = {
-                'overall_score': result.overall_score,
-                'dimension_scores': result.dimension_scores,
-                'confidence_level': result.confidence_level,
-                'metadata': result.metadata,
-                'scorer_type': result.scorer_type.value,
-                'workflow_stage': result.workflow_stage.value,
-                'scoring_timestamp': result.scoring_timestamp.isoformat(),
-                'processing_time_ms': result.processing_time_ms,
-                'data_quality_score': result.data_quality_score
-            }
+            entity_id = f"{context.profile_id}:{context.opportunity_id}"
             
             # Cache the result
             success = await enhanced_cache_system.put(
                 data_type=data_type,
-                entity_id=f"{context.profile_id}:{context.opportunity_id}",
-                data=cacheable_result,
+                entity_id=entity_id,
+                data=self._to_cacheable(result),
                 context=cache_context,
                 custom_ttl=self._cache_ttl_hours
             )
             
             if success:
                 logger.debug(f"Cached result for {self.scorer_type.value} scorer")
+                if self.scorer_type in WARMED_SCORER_TYPES:
+                    self._remember_for_warming(entity_id, cache_context, (opportunity_data, profile_data, context))
+                    if enhanced_cache_system.warming_loaders.get(data_type) != self.rescore_for_warming:
+                        enhanced_cache_system.register_warming_loader(data_type, self.rescore_for_warming)
             
             return success
             
         except Exception as e:
             logger.warning(f"Cache storage failed for {self.scorer_type.value}: {e}")
             return False
+    
+    @staticmethod
+    def _to_cacheable(result: ScoringResult) -> Dict[str, Any]:
+        """Convert a scoring result to the dict stored in the enhanced cache"""
+        return {
+            'overall_score': result.overall_score,
+            'dimension_scores': result.dimension_scores,
+            'confidence_level': result.confidence_level,
+            'metadata': result.metadata,
+            'scorer_type': result.scorer_type.value,
+            'workflow_stage': result.workflow_stage.value,
+            'scoring_timestamp': result.scoring_timestamp.isoformat(),
+            'processing_time_ms': result.processing_time_ms,
+            'data_quality_score': result.data_quality_score
+        }
+    
+    def _remember_for_warming(self, entity_id: str, cache_context: Dict[str, Any], inputs: Tuple) -> None:
+        """Keep the inputs of a cached score (most recent max_warming_inputs only)"""
+        key = (entity_id, tuple(sorted(cache_context.items())))
+        self._warming_inputs[key] = inputs
+        self._warming_inputs.move_to_end(key)
+        while len(self._warming_inputs) > self._max_warming_inputs:
+            self._warming_inputs.popitem(last=False)
+    
+    async def rescore_for_warming(self,
+                                  entity_id: str,
+                                  cache_context: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Predictive warming loader: recompute a cached score from its remembered inputs
+        
+        Registered with the enhanced cache system the first time a scorer in
+        WARMED_SCORER_TYPES caches a result. Returns None (nothing is cached)
+        when the inputs are no longer held or scoring failed.
+        """
+        inputs = self._warming_inputs.get((entity_id, tuple(sorted((cache_context or {}).items()))))
+        if inputs is None:
+            return None
+        token = _warming_rescore.set(True)
+        try:
+            result = await self.score(*inputs)
+        finally:
+            _warming_rescore.reset(token)
+        if 'error' in (result.metadata or {}):
+            return None
+        return self._to_cacheable(result)
 
 
 class ScorerFactory:
@@ -0,0 +1,374 @@
+"""
+BMF Name Index - Persistent Full-Text Name Search over bmf_organizations
+
+Name tables stored in the same database as the BMF:
+
+- bmf_name_trigram: external-content trigram index on bmf_organizations.name.
+  Answers case-insensitive substring filters (the indexed equivalent of
+  UPPER(name) LIKE '%X%') and typo-tolerant ranked lookups.
+- bmf_name_tokens: normalized name words (lowercase, punctuation and legal
+  suffixes removed) with state and ZIP3, keyed by the bmf_organizations
+  rowid. Answers ranked top-N candidate searches for EIN resolution.
+- bmf_name_keys: the whole normalized name with state and ZIP3, B-tree
+  indexed, for exact lookups.
+
+Candidate search runs from most to least precise. An exact normalized-name
+hit is returned immediately (nothing can score higher); otherwise stages
+fill up to the limit: all known words, then the rarest few words, then the
+rarest trigrams (typo tolerance). Document frequencies come from fts5vocab tables,
+so common words and trigrams ("church", "the") never drive the OR stages.
+
+The index is built with rebuild() and kept in sync by sync(), which indexes
+rows appended since the last build (BMFSOIETLProcessor.process_bmf_data
+inserts with INSERT OR IGNORE, so existing rows never change). Both record
+the time in loaded_at(), which consumers use to expire results derived from
+an earlier BMF load.
+"""
+
+import logging
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_TABLE = "bmf_name_trigram"
+TOKEN_TABLE = "bmf_name_tokens"
+TRIGRAM_VOCAB = "bmf_name_trigram_vocab"
+TOKEN_VOCAB = "bmf_name_tokens_vocab"
+KEY_TABLE = "bmf_name_keys"
+META_TABLE = "bmf_name_index_meta"
+
+NAME_INDEX_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {TRIGRAM_TABLE} USING fts5(
+    name,
+    content='bmf_organizations',
+    content_rowid='rowid',
+    tokenize='trigram'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS {TOKEN_TABLE} USING fts5(
+    tokens,
+    state UNINDEXED,
+    zip3 UNINDEXED,
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TABLE IF NOT EXISTS {KEY_TABLE} (
+    name_key TEXT NOT NULL,
+    state TEXT,
+    zip3 TEXT,
+    org_rowid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_{KEY_TABLE}_lookup ON {KEY_TABLE}(name_key, state);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS {TRIGRAM_VOCAB} USING fts5vocab({TRIGRAM_TABLE}, 'row');
+CREATE VIRTUAL TABLE IF NOT EXISTS {TOKEN_VOCAB} USING fts5vocab({TOKEN_TABLE}, 'row');
+
+CREATE TABLE IF NOT EXISTS {META_TABLE} (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Legal / generic suffixes dropped from normalized names (as in EINResolver)
+_SUFFIX_PATTERN = re.compile(
+    r"\b(?:inc|llc|corp|corporation|foundation|fund|trust|charities|charity)\b\.?"
+)
+_PUNCT_PATTERN = re.compile(r"[^\w\s]")
+
+# Words skipped when building queries (kept in the index)
+QUERY_STOPWORDS = frozenset({"the", "of", "and", "for", "a", "an", "in", "at", "to", "on"})
+
+# Rarest words / trigrams OR-ed together in the recall stages
+MAX_OR_WORDS = 3
+MAX_OR_TRIGRAMS = 6
+
+# Terms in more names than this are too common to drive an OR stage
+MAX_OR_DOC_FREQ = 5000
+
+_SYNC_BATCH = 10000
+
+# Document frequencies remembered per index instance (cleared past this size)
+_DOC_FREQ_CACHE_SIZE = 100000
+
+
+def normalize_org_name(name: Optional[str]) -> str:
+    """Lowercase, drop legal suffixes and punctuation, collapse whitespace"""
+    if not name:
+        return ""
+    text = _SUFFIX_PATTERN.sub("", name.lower().strip())
+    text = _PUNCT_PATTERN.sub("", text)
+    return " ".join(text.split())
+
+
+def zip3(zip_code: Optional[str]) -> Optional[str]:
+    return str(zip_code)[:3] if zip_code else None
+
+
+def _phrase(text: str) -> str:
+    """Quote text as a single FTS5 phrase"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+class BMFNameIndex:
+    """FTS5 name index stored alongside bmf_organizations"""
+
+    def __init__(self, conn: sqlite3.Connection,
+                 doc_freq_cache: Optional[Dict[Tuple[str, str], int]] = None):
+        self.conn = conn
+        # fts5vocab counts walk each term's doclist, so common terms are worth
+        # remembering across searches; frequencies only steer stage selection.
+        # Indexes on other connections to the same database may share the dict.
+        self._doc_freq_cache = doc_freq_cache if doc_freq_cache is not None else {}
+
+    # ── Build / sync ─────────────────────────────────────────────────────────
+
+    def ensure_schema(self) -> None:
+        self.conn.executescript(NAME_INDEX_SCHEMA)
+
+    def is_built(self) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (META_TABLE,)
+        ).fetchone()
+        return row is not None and self._last_indexed_rowid() is not None
+
+    def _last_indexed_rowid(self) -> Optional[int]:
+        row = self.conn.execute(
+            f"SELECT value FROM {META_TABLE} WHERE key = 'last_rowid'"
+        ).fetchone()
+        return int(row[0]) if row else None
+
+    def _set_last_indexed_rowid(self, rowid: int) -> None:
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {META_TABLE} (key, value) VALUES ('last_rowid', ?)", (str(rowid),)
+        )
+
+    def loaded_at(self) -> Optional[str]:
+        """ISO time of the last rebuild or sync that indexed new rows"""
+        try:
+            row = self.conn.execute(
+                f"SELECT value FROM {META_TABLE} WHERE key = 'loaded_at'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+
+    def _set_loaded_at(self) -> None:
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {META_TABLE} (key, value) VALUES ('loaded_at', ?)",
+            (datetime.now().isoformat(),),
+        )
+
+    def rebuild(self) -> int:
+        """Rebuild both tables from bmf_organizations; returns rows indexed"""
+        self.ensure_schema()
+        self.conn.execute(f"INSERT INTO {TRIGRAM_TABLE}({TRIGRAM_TABLE}) VALUES ('rebuild')")
+        self.conn.execute(f"DELETE FROM {TOKEN_TABLE}")
+        self.conn.execute(f"DELETE FROM {KEY_TABLE}")
+        self._set_last_indexed_rowid(0)
+        indexed = self._index_tokens_after(0)
+        self._set_loaded_at()
+        self._doc_freq_cache.clear()
+        self.conn.commit()
+        logger.info(f"Built BMF name index over {indexed:,} organizations")
+        return indexed
+
+    def sync(self) -> int:
+        """Index rows appended to bmf_organizations since the last build or sync"""
+        if not self.is_built():
+            return self.rebuild()
+        last_rowid = self._last_indexed_rowid()
+        self.conn.execute(
+            f"INSERT INTO {TRIGRAM_TABLE}(rowid, name) "
+            f"SELECT rowid, name FROM bmf_organizations WHERE rowid > ?",
+            (last_rowid,),
+        )
+        indexed = self._index_tokens_after(last_rowid)
+        if indexed:
+            self._set_loaded_at()
+            self._doc_freq_cache.clear()
+        self.conn.commit()
+        if indexed:
+            logger.info(f"BMF name index synced: {indexed:,} new organizations")
+        return indexed
+
+    def _index_tokens_after(self, last_rowid: int) -> int:
+        indexed = 0
+        cursor = self.conn.execute(
+            "SELECT rowid, name, state, zip FROM bmf_organizations WHERE rowid > ? ORDER BY rowid",
+            (last_rowid,),
+        )
+        while True:
+            rows = cursor.fetchmany(_SYNC_BATCH)
+            if not rows:
+                break
+            entries = [(rowid, normalize_org_name(name), state, zip3(zip_code))
+                       for rowid, name, state, zip_code in rows]
+            self.conn.executemany(
+                f"INSERT INTO {TOKEN_TABLE}(rowid, tokens, state, zip3) VALUES (?, ?, ?, ?)", entries
+            )
+            self.conn.executemany(
+                f"INSERT INTO {KEY_TABLE}(org_rowid, name_key, state, zip3) VALUES (?, ?, ?, ?)", entries
+            )
+            indexed += len(rows)
+            last_rowid = rows[-1][0]
+        self._set_last_indexed_rowid(last_rowid)
+        return indexed
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def substring_match(text: str) -> Optional[str]:
+        """
+        FTS5 MATCH expression equivalent to a case-insensitive substring test,
+        or None when text is too short for the trigram index (< 3 chars)
+        """
+        if len(text.strip()) < 3:
+            return None
+        return _phrase(text)
+
+    def search(
+        self,
+        name: str,
+        state: Optional[str] = None,
+        zip_code: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict]:
+        """
+        Ranked top-N organizations for a name, optionally restricted to a
+        state and/or ZIP3.
+
+        Returns:
+            Dicts with ein, name, state, zip_code, ntee_code, best match first
+        """
+        name_key = normalize_org_name(name)
+        area = zip3(zip_code)
+
+        rowids = self._key_query(name_key, state, area, limit)
+        if rowids:
+            return self._fetch(rowids)
+
+        words = list(dict.fromkeys(w for w in name_key.split() if w not in QUERY_STOPWORDS))
+
+        # Words missing from the index are typos or noise; leave them to the trigram stage
+        word_freq = self._doc_freqs(TOKEN_VOCAB, words)
+        known = sorted((w for w in words if word_freq.get(w)), key=lambda w: word_freq[w])
+        if known:
+            rowids = self._token_query(" ".join(_phrase(w) for w in known), state, area, limit)
+            rare_words = [w for w in known if word_freq[w] <= MAX_OR_DOC_FREQ][:MAX_OR_WORDS]
+            if len(rowids) < limit and len(known) > 1 and rare_words:
+                rowids += self._token_query(
+                    " OR ".join(_phrase(w) for w in rare_words),
+                    state, area, limit - len(rowids), exclude=rowids
+                )
+
+        if len(rowids) < limit:
+            # Trigrams of the words the token index did not know (likely typos)
+            unknown = [w for w in words if not word_freq.get(w)]
+            grams = self._query_trigrams(" ".join(unknown)) or self._query_trigrams(name)
+            gram_freq = self._doc_freqs(TRIGRAM_VOCAB, grams)
+            ranked = sorted((g for g in grams if gram_freq.get(g)), key=lambda g: gram_freq[g])
+            rare = [g for g in ranked if gram_freq[g] <= MAX_OR_DOC_FREQ][:MAX_OR_TRIGRAMS]
+            if rare:
+                rowids += self._trigram_query(
+                    " OR ".join(_phrase(g) for g in rare),
+                    state, area, limit - len(rowids), exclude=rowids
+                )
+
+        return self._fetch(rowids[:limit])
+
+    def _doc_freqs(self, vocab_table: str, terms: Sequence[str]) -> Dict[str, int]:
+        """Number of indexed names containing each term"""
+        if len(self._doc_freq_cache) > _DOC_FREQ_CACHE_SIZE:
+            self._doc_freq_cache.clear()
+        freqs = {}
+        for term in terms:
+            key = (vocab_table, term)
+            if key not in self._doc_freq_cache:
+                # fts5vocab answers a range constraint from the index; = and IN scan it
+                row = self.conn.execute(
+                    f"SELECT doc FROM {vocab_table} WHERE term >= ? AND term <= ?", (term, term)
+                ).fetchone()
+                self._doc_freq_cache[key] = row[0] if row else 0
+            if self._doc_freq_cache[key]:
+                freqs[term] = self._doc_freq_cache[key]
+        return freqs
+
+    def _key_query(self, name_key: str, state: Optional[str], area: Optional[str],
+                   limit: int) -> List[int]:
+        if not name_key:
+            return []
+        sql = f"SELECT org_rowid FROM {KEY_TABLE} WHERE name_key = ?"
+        params: list = [name_key]
+        if state:
+            sql += " AND state = ?"
+            params.append(state)
+        if area:
+            sql += " AND zip3 = ?"
+            params.append(area)
+        sql += " LIMIT ?"
+        params.append(limit)
+        return [r[0] for r in self.conn.execute(sql, params)]
+
+    def _token_query(self, match: str, state: Optional[str], area: Optional[str],
+                     limit: int, exclude: Sequence[int] = ()) -> List[int]:
+        sql = f"SELECT rowid FROM {TOKEN_TABLE} WHERE {TOKEN_TABLE} MATCH ?"
+        params: list = [match]
+        if state:
+            sql += " AND state = ?"
+            params.append(state)
+        if area:
+            sql += " AND zip3 = ?"
+            params.append(area)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit + len(exclude))
+        skip = set(exclude)
+        return [r[0] for r in self.conn.execute(sql, params) if r[0] not in skip][:limit]
+
+    def _trigram_query(self, match: str, state: Optional[str], area: Optional[str],
+                       limit: int, exclude: Sequence[int] = ()) -> List[int]:
+        sql = (
+            f"SELECT t.rowid FROM {TRIGRAM_TABLE} t "
+            f"JOIN bmf_organizations o ON o.rowid = t.rowid "
+            f"WHERE {TRIGRAM_TABLE} MATCH ?"
+        )
+        params: list = [match]
+        if state:
+            sql += " AND o.state = ?"
+            params.append(state)
+        if area:
+            sql += " AND SUBSTR(o.zip, 1, 3) = ?"
+            params.append(area)
+        sql += " ORDER BY t.rank LIMIT ?"
+        params.append(limit + len(exclude))
+        skip = set(exclude)
+        return [r[0] for r in self.conn.execute(sql, params) if r[0] not in skip][:limit]
+
+    @staticmethod
+    def _query_trigrams(name: str) -> List[str]:
+        """Distinct lowercase trigrams of the name"""
+        text = " ".join(name.lower().split())
+        return list(dict.fromkeys(text[i:i + 3] for i in range(len(text) - 2)))
+
+    def _fetch(self, rowids: List[int]) -> List[Dict]:
+        if not rowids:
+            return []
+        placeholders = ",".join("?" for _ in rowids)
+        rows = self.conn.execute(
+            f"SELECT rowid, ein, name, state, zip, ntee_code FROM bmf_organizations "
+            f"WHERE rowid IN ({placeholders})",
+            rowids,
+        ).fetchall()
+        by_rowid: Dict[int, Tuple] = {r[0]: r for r in rows}
+        return [
+            {
+                "ein": by_rowid[r][1],
+                "name": by_rowid[r][2],
+                "state": by_rowid[r][3],
+                "zip_code": by_rowid[r][4],
+                "ntee_code": by_rowid[r][5],
+            }
+            for r in rowids if r in by_rowid
+        ]
@@ -23,6 +23,11 @@ from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import numpy as np
 
+try:
+    from src.database.bmf_name_index import BMFNameIndex
+except ImportError:
+    from bmf_name_index import BMFNameIndex
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -268,6 +273,14 @@ class BMFSOIETLProcessor:
             
             self.import_stats['bmf_records'] = total_processed
             logger.info(f"BMF processing complete. Total records: {total_processed}")
+
+            # Keep the FTS5 name index in step with the newly inserted rows
+            try:
+                indexed = BMFNameIndex(conn).sync()
+                logger.info(f"BMF name index up to date ({indexed} organizations indexed)")
+            except sqlite3.Error as e:
+                logger.error(f"Error updating BMF name index: {e}")
+                self.import_stats['total_errors'] += 1
     
     def process_990_data(self, file_paths: List[str]):
         """
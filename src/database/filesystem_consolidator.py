@@ -8,6 +8,8 @@ import os
 import shutil
 import json
 import logging
+import sqlite3
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Set, Optional
@@ -147,6 +149,13 @@ class FilesystemConsolidator:
                 metadata_file = cache_dir / "cache_metadata.json"
                 if metadata_file.exists():
                     shutil.copy2(metadata_file, essential_cache / "cache_metadata.json")
+                metadata_db = cache_dir / "cache_metadata.db"
+                if metadata_db.exists():
+                    # closing(): a connection's own context manager only commits,
+                    # and the source file is removed with the cache dir below
+                    with closing(sqlite3.connect(str(metadata_db))) as src, \
+                            closing(sqlite3.connect(str(essential_cache / "cache_metadata.db"))) as dst:
+                        src.backup(dst)
                     
                 # Count files before cleanup
                 for file_path in cache_dir.rglob("*"):
@@ -1,14 +1,21 @@
 """
 Multi-Track Discovery Engine
 Orchestrates discovery across multiple funding sources simultaneously
+
+Results stream through a per-session pipeline as discoverers yield them:
+duplicates (same EIN or opportunity id) are dropped, Schedule I grantees are
+fast-tracked against the profile's prepared grantee index, and the result is
+added to a bounded SessionResultStore that keeps running counts and the top
+results and spills overflow to disk. Throttled progress updates carry the
+current totals and top results, so the first scored opportunities reach the
+UI while discovery is still running.
 """
 import asyncio
 import time
 import uuid
 import logging
-from typing import Dict, List, Optional, Any, AsyncIterator, Callable
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
 
 from .base_discoverer import (
     BaseDiscoverer, 
@@ -22,6 +29,7 @@ from .government_discoverer import GovernmentDiscoverer
 from .commercial_discoverer import CommercialDiscoverer
 from .state_discoverer import StateDiscoverer
 from .entity_discovery_service import get_entity_discovery_service, EntityDiscoveryResult
+from .session_result_store import SessionResultStore
 
 from src.profiles.models import (
     OrganizationProfile, 
@@ -38,7 +46,14 @@ class MultiTrackDiscoveryEngine:
         self.logger = logging.getLogger(__name__)
         self.search_engine = ProfileSearchEngine()
         self.active_sessions: Dict[str, DiscoverySession] = {}
-        self.session_results: Dict[str, List[DiscoveryResult]] = {}
+        self.session_results: Dict[str, SessionResultStore] = {}
+        
+        # Streaming result pipeline settings
+        self.max_results_in_memory = 2000      # per session; the rest spill to disk
+        self.top_results_count = 10            # top results tracked and sent with progress
+        self.results_update_interval = 1.0     # seconds between top-results progress updates
+        self.spill_dir = None                  # None: system temp directory
+        self._last_results_update: Dict[str, Tuple[float, int]] = {}
         
         # Initialize entity-based discovery service
         self.entity_discovery_service = get_entity_discovery_service()
@@ -69,7 +84,9 @@ class MultiTrackDiscoveryEngine:
         profile: OrganizationProfile,
         funding_types: Optional[List[FundingType]] = None,
         max_results_per_type: int = 100,
-        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        progress_service: Optional[Any] = None,
+        progress_workflow_id: Optional[str] = None
     ) -> DiscoverySession:
         """
         Main discovery method that coordinates multi-track search
@@ -78,7 +95,11 @@ class MultiTrackDiscoveryEngine:
             profile: Organization profile to search for
             funding_types: Types of funding to search (defaults to profile preferences)
             max_results_per_type: Maximum results per funding type
-            progress_callback: Optional callback for progress updates
+            progress_callback: Optional callback for progress updates (sync or async)
+            progress_service: Optional ProgressService; updates are broadcast
+                to websocket clients subscribed to progress_workflow_id
+            progress_workflow_id: Workflow id to broadcast under (defaults to
+                the session id, which callers only learn once discovery ends)
             
         Returns:
             DiscoverySession with complete results
@@ -105,25 +126,33 @@ class MultiTrackDiscoveryEngine:
         )
         
         self.active_sessions[session.session_id] = session
-        self.session_results[session.session_id] = []
+        store = self._create_result_store(session.session_id)
+        progress_callback = self._progress_sink(
+            progress_callback, progress_service, progress_workflow_id
+        )
         
         try:
             # Start discovery
             session.status = DiscoveryStatus.RUNNING
-            if progress_callback:
-                progress_callback(session.session_id, {
-                    "status": "started",
-                    "message": f"Starting multi-track discovery for {profile.name}",
-                    "funding_types": [ft.value for ft in funding_types]
-                })
+            await self._send_progress(progress_callback, session.session_id, {
+                "status": "started",
+                "message": f"Starting multi-track discovery for {profile.name}",
+                "funding_types": [ft.value for ft in funding_types]
+            })
             
-            # Execute discovery across all funding types concurrently
+            # Execute discovery across all funding types concurrently; results
+            # are deduplicated, Schedule I fast-tracked and ranked as they arrive
             await self._execute_concurrent_discovery(
                 session, profile, search_params, progress_callback
             )
             
-            # Apply Schedule I grantee fast-tracking
-            self._apply_schedule_i_fast_tracking(session.session_id, profile, progress_callback)
+            if store.schedule_i_matches:
+                await self._send_progress(progress_callback, session.session_id, {
+                    "status": "schedule_i_processed",
+                    "message": f"Schedule I fast-tracking: {store.schedule_i_matches} grantee matches identified",
+                    "grantee_matches": store.schedule_i_matches,
+                    "fast_tracked": store.fast_tracked
+                })
             
             # Finalize session
             session.status = DiscoveryStatus.COMPLETED
@@ -131,15 +160,16 @@ class MultiTrackDiscoveryEngine:
             session.execution_time_seconds = (
                 session.completed_at - session.started_at
             ).total_seconds()
-            session.total_results = len(self.session_results[session.session_id])
+            session.total_results = len(store)
             
-            if progress_callback:
-                progress_callback(session.session_id, {
-                    "status": "completed",
-                    "message": f"Discovery completed: {session.total_results} opportunities found",
-                    "total_results": session.total_results,
-                    "execution_time": session.execution_time_seconds
-                })
+            await self._send_results_update(session, progress_callback, force=True)
+            await self._send_progress(progress_callback, session.session_id, {
+                "status": "completed",
+                "message": f"Discovery completed: {session.total_results} opportunities found",
+                "total_results": session.total_results,
+                "duplicates_skipped": store.duplicates,
+                "execution_time": session.execution_time_seconds
+            })
             
         except Exception as e:
             session.status = DiscoveryStatus.ERROR
@@ -149,12 +179,13 @@ class MultiTrackDiscoveryEngine:
                     session.completed_at - session.started_at
                 ).total_seconds()
             
-            if progress_callback:
-                progress_callback(session.session_id, {
-                    "status": "error",
-                    "message": f"Discovery failed: {str(e)}",
-                    "error": str(e)
-                })
+            await self._send_progress(progress_callback, session.session_id, {
+                "status": "error",
+                "message": f"Discovery failed: {str(e)}",
+                "error": str(e)
+            })
+        finally:
+            self._last_results_update.pop(session.session_id, None)
         
         return session
     
@@ -167,11 +198,18 @@ class MultiTrackDiscoveryEngine:
     ):
         """Execute discovery across multiple funding types concurrently"""
         
+        # Schedule I grantees are indexed once and matched per result as it arrives
+        grantee_index = None
+        if profile.schedule_i_grantees:
+            from src.utils.grantee_matcher import get_grantee_matcher
+            grantee_index = get_grantee_matcher().prepare(profile.schedule_i_grantees, profile.profile_id)
+        
         # Create discovery tasks for each funding type
         discovery_tasks = []
         
         for funding_type, params in search_params.items():
             discoverers = discoverer_registry.get_discoverers_for_type(funding_type)
+            session.results_by_type[funding_type] = 0
             
             if discoverers:
                 # Use the first available discoverer for each funding type
@@ -179,28 +217,21 @@ class MultiTrackDiscoveryEngine:
                 
                 task = asyncio.create_task(
                     self._execute_single_discoverer(
-                        session, discoverer, profile, params, progress_callback
+                        session, discoverer, profile, params, progress_callback, grantee_index
                     )
                 )
                 discovery_tasks.append(task)
                 
-                if progress_callback:
-                    progress_callback(session.session_id, {
-                        "status": "running",
-                        "message": f"Starting {funding_type.value} discovery with {discoverer.name}",
-                        "funding_type": funding_type.value,
-                        "discoverer": discoverer.name
-                    })
+                await self._send_progress(progress_callback, session.session_id, {
+                    "status": "running",
+                    "message": f"Starting {funding_type.value} discovery with {discoverer.name}",
+                    "funding_type": funding_type.value,
+                    "discoverer": discoverer.name
+                })
         
         # Execute all discovery tasks concurrently
         if discovery_tasks:
             await asyncio.gather(*discovery_tasks, return_exceptions=True)
-        
-        # Update results by type
-        results = self.session_results[session.session_id]
-        for funding_type in search_params.keys():
-            type_results = [r for r in results if r.source_type == funding_type]
-            session.results_by_type[funding_type] = len(type_results)
     
     async def _execute_single_discoverer(
         self,
@@ -208,9 +239,15 @@ class MultiTrackDiscoveryEngine:
         discoverer: BaseDiscoverer,
         profile: OrganizationProfile,
         search_params: ProfileSearchParams,
-        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]]
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]],
+        grantee_index: Optional[Any] = None
     ):
-        """Execute discovery for a single discoverer"""
+        """Execute discovery for a single discoverer, streaming results into the session store"""
+        
+        store = self.session_results[session.session_id]
+        if grantee_index is not None:
+            from src.utils.grantee_matcher import get_grantee_matcher
+            grantee_matcher = get_grantee_matcher()
         
         try:
             # Validate search parameters
@@ -218,13 +255,12 @@ class MultiTrackDiscoveryEngine:
                 error_msg = f"Invalid search parameters for {discoverer.name}"
                 session.errors_by_type[discoverer.funding_type] = error_msg
                 
-                if progress_callback:
-                    progress_callback(session.session_id, {
-                        "status": "error",
-                        "message": error_msg,
-                        "funding_type": discoverer.funding_type.value,
-                        "discoverer": discoverer.name
-                    })
+                await self._send_progress(progress_callback, session.session_id, {
+                    "status": "error",
+                    "message": error_msg,
+                    "funding_type": discoverer.funding_type.value,
+                    "discoverer": discoverer.name
+                })
                 return
             
             # Pre-discovery setup
@@ -233,13 +269,12 @@ class MultiTrackDiscoveryEngine:
                 error_msg = f"Setup failed for {discoverer.name}"
                 session.errors_by_type[discoverer.funding_type] = error_msg
                 
-                if progress_callback:
-                    progress_callback(session.session_id, {
-                        "status": "error",
-                        "message": error_msg,
-                        "funding_type": discoverer.funding_type.value,
-                        "discoverer": discoverer.name
-                    })
+                await self._send_progress(progress_callback, session.session_id, {
+                    "status": "error",
+                    "message": error_msg,
+                    "funding_type": discoverer.funding_type.value,
+                    "discoverer": discoverer.name
+                })
                 return
             
             # Execute discovery
@@ -249,46 +284,155 @@ class MultiTrackDiscoveryEngine:
             async for result in discoverer.discover_opportunities(
                 profile, search_params, max_results
             ):
-                # Store result
-                self.session_results[session.session_id].append(result)
                 results_count += 1
                 session.api_calls_made += 1
                 
+                # Fast-track Schedule I grantees, then dedupe, store and rank
+                if grantee_index is not None and not store.is_duplicate(result):
+                    grantee_matcher.fast_track_result(result, grantee_index)
+                if store.add(result):
+                    session.results_by_type[result.source_type] = store.count_by_type[result.source_type]
+                    session.total_results = len(store)
+                
                 # Progress update every 10 results
-                if results_count % 10 == 0 and progress_callback:
-                    progress_callback(session.session_id, {
+                if results_count % 10 == 0:
+                    await self._send_progress(progress_callback, session.session_id, {
                         "status": "running",
                         "message": f"Found {results_count} {discoverer.funding_type.value} opportunities",
                         "funding_type": discoverer.funding_type.value,
                         "discoverer": discoverer.name,
                         "results_count": results_count
                     })
+                await self._send_results_update(session, progress_callback)
             
             # Post-discovery cleanup
             await discoverer.post_discovery_cleanup(session)
             
             # Final progress update
-            if progress_callback:
-                progress_callback(session.session_id, {
-                    "status": "completed",
-                    "message": f"Completed {discoverer.funding_type.value} discovery: {results_count} opportunities found",
-                    "funding_type": discoverer.funding_type.value,
-                    "discoverer": discoverer.name,
-                    "results_count": results_count
-                })
+            await self._send_progress(progress_callback, session.session_id, {
+                "status": "completed",
+                "message": f"Completed {discoverer.funding_type.value} discovery: {results_count} opportunities found",
+                "funding_type": discoverer.funding_type.value,
+                "discoverer": discoverer.name,
+                "results_count": results_count
+            })
         
         except Exception as e:
             error_msg = f"Discovery failed for {discoverer.name}: {str(e)}"
             session.errors_by_type[discoverer.funding_type] = error_msg
             
+            await self._send_progress(progress_callback, session.session_id, {
+                "status": "error",
+                "message": error_msg,
+                "funding_type": discoverer.funding_type.value,
+                "discoverer": discoverer.name,
+                "error": str(e)
+            })
+    
+    def _create_result_store(self, session_id: str) -> SessionResultStore:
+        """Create (replacing any previous) the result store for a session"""
+        previous = self.session_results.pop(session_id, None)
+        if previous is not None:
+            previous.close()
+        store = SessionResultStore(
+            session_id,
+            max_in_memory=self.max_results_in_memory,
+            top_n=self.top_results_count,
+            spill_dir=self.spill_dir
+        )
+        self.session_results[session_id] = store
+        return store
+    
+    @staticmethod
+    def _progress_sink(
+        progress_callback: Optional[Callable],
+        progress_service: Optional[Any],
+        workflow_id: Optional[str] = None
+    ) -> Optional[Callable]:
+        """Combine a progress callback and a ProgressService into one async callback"""
+        if progress_service is None:
+            return progress_callback
+        
+        async def sink(session_id: str, update_data: Dict[str, Any]):
             if progress_callback:
-                progress_callback(session.session_id, {
-                    "status": "error",
-                    "message": error_msg,
-                    "funding_type": discoverer.funding_type.value,
-                    "discoverer": discoverer.name,
-                    "error": str(e)
-                })
+                if asyncio.iscoroutinefunction(progress_callback):
+                    await progress_callback(session_id, update_data)
+                else:
+                    progress_callback(session_id, update_data)
+            # broadcast_progress stamps the dict it is given
+            await progress_service.broadcast_progress(
+                workflow_id or session_id, {**update_data, "session_id": session_id}
+            )
+        
+        return sink
+    
+    async def _send_progress(
+        self,
+        progress_callback: Optional[Callable],
+        session_id: str,
+        update_data: Dict[str, Any]
+    ):
+        """Send a progress update to a sync or async callback"""
+        if not progress_callback:
+            return
+        try:
+            if asyncio.iscoroutinefunction(progress_callback):
+                await progress_callback(session_id, update_data)
+            else:
+                progress_callback(session_id, update_data)
+        except Exception as e:
+            self.logger.warning(f"Progress update failed for session {session_id}: {e}")
+    
+    async def _send_results_update(
+        self,
+        session: DiscoverySession,
+        progress_callback: Optional[Callable],
+        force: bool = False
+    ):
+        """
+        Send running totals and the current top results. The first result is
+        sent immediately; later updates at most every results_update_interval
+        seconds, and only when the top results changed.
+        """
+        if not progress_callback:
+            return
+        store = self.session_results.get(session.session_id)
+        if store is None:
+            return
+        
+        now = time.monotonic()
+        last = self._last_results_update.get(session.session_id)
+        if not force:
+            if last is not None and now - last[0] < self.results_update_interval:
+                return
+            if last is not None and last[1] == store.top_version:
+                return
+        self._last_results_update[session.session_id] = (now, store.top_version)
+        
+        await self._send_progress(progress_callback, session.session_id, {
+            "status": "results",
+            "message": f"{len(store)} opportunities scored so far",
+            "total_results": len(store),
+            "results_by_type": {ft.value: count for ft, count in store.count_by_type.items()},
+            "duplicates_skipped": store.duplicates,
+            "schedule_i_matches": store.schedule_i_matches,
+            "top_opportunities": [self._summarize_result(opp) for opp in store.top()]
+        })
+    
+    @staticmethod
+    def _summarize_result(opp: DiscoveryResult) -> Dict[str, Any]:
+        return {
+            "organization_name": opp.organization_name,
+            "funding_type": opp.source_type.value,
+            "program_name": opp.program_name,
+            "funding_amount": opp.funding_amount,
+            "compatibility_score": opp.compatibility_score,
+            "opportunity_id": opp.opportunity_id
+        }
+    
+    def get_session_store(self, session_id: str) -> Optional[SessionResultStore]:
+        """Result store of a session, for streaming its results and running totals"""
+        return self.session_results.get(session_id)
     
     def get_session_results(
         self,
@@ -297,25 +441,17 @@ class MultiTrackDiscoveryEngine:
         min_compatibility_score: Optional[float] = None,
         max_results: Optional[int] = None
     ) -> List[DiscoveryResult]:
-        """Get results for a discovery session with optional filtering"""
+        """Get results for a discovery session with optional filtering, best first"""
         
-        results = self.session_results.get(session_id, [])
-        
-        # Apply filters
-        if funding_type:
-            results = [r for r in results if r.source_type == funding_type]
-        
-        if min_compatibility_score is not None:
-            results = [r for r in results if r.compatibility_score >= min_compatibility_score]
-        
-        # Sort by compatibility score (descending)
-        results.sort(key=lambda r: r.compatibility_score, reverse=True)
-        
-        # Apply result limit
-        if max_results:
-            results = results[:max_results]
+        store = self.session_results.get(session_id)
+        if store is None:
+            return []
         
-        return results
+        return store.results(
+            funding_type=funding_type,
+            min_score=min_compatibility_score,
+            limit=max_results
+        )
     
     def get_session_summary(self, session_id: str) -> Dict[str, Any]:
         """Get comprehensive summary of discovery session"""
@@ -324,28 +460,18 @@ class MultiTrackDiscoveryEngine:
         if not session:
             return {"error": "Session not found"}
         
-        results = self.session_results.get(session_id, [])
+        store = self.session_results.get(session_id)
         
-        # Calculate summary statistics
-        total_results = len(results)
-        
-        # Results by funding type
-        results_by_type = defaultdict(int)
-        avg_scores_by_type = defaultdict(list)
-        
-        for result in results:
-            results_by_type[result.source_type.value] += 1
-            avg_scores_by_type[result.source_type.value].append(result.compatibility_score)
-        
-        # Calculate average scores
-        for funding_type, scores in avg_scores_by_type.items():
-            if scores:
-                avg_scores_by_type[funding_type] = sum(scores) / len(scores)
-            else:
-                avg_scores_by_type[funding_type] = 0.0
-        
-        # Top opportunities
-        top_opportunities = sorted(results, key=lambda r: r.compatibility_score, reverse=True)[:10]
+        # Summary statistics come from the store's running totals
+        total_results = len(store) if store else 0
+        results_by_type = {}
+        avg_scores_by_type = {}
+        top_opportunities = []
+        if store:
+            for funding_type, count in store.count_by_type.items():
+                results_by_type[funding_type.value] = count
+                avg_scores_by_type[funding_type.value] = store.average_score(funding_type)
+            top_opportunities = store.top(10)
         
         # Success rate by discoverer
         success_rates = {}
@@ -365,23 +491,14 @@ class MultiTrackDiscoveryEngine:
             "execution_time_seconds": session.execution_time_seconds,
             "funding_types_searched": [ft.value for ft in session.funding_types],
             "total_results": total_results,
-            "results_by_funding_type": dict(results_by_type),
-            "avg_compatibility_scores": dict(avg_scores_by_type),
+            "results_by_funding_type": results_by_type,
+            "avg_compatibility_scores": avg_scores_by_type,
             "success_rates": success_rates,
             "errors": dict(session.errors_by_type),
             "api_calls_made": session.api_calls_made,
             "cache_hits": session.cache_hits,
-            "top_opportunities": [
-                {
-                    "organization_name": opp.organization_name,
-                    "funding_type": opp.source_type.value,
-                    "program_name": opp.program_name,
-                    "funding_amount": opp.funding_amount,
-                    "compatibility_score": opp.compatibility_score,
-                    "opportunity_id": opp.opportunity_id
-                }
-                for opp in top_opportunities
-            ]
+            "duplicates_skipped": store.duplicates if store else 0,
+            "top_opportunities": [self._summarize_result(opp) for opp in top_opportunities]
         }
     
     def get_engine_status(self) -> Dict[str, Any]:
@@ -435,47 +552,12 @@ class MultiTrackDiscoveryEngine:
         
         for session_id in sessions_to_remove:
             del self.active_sessions[session_id]
-            if session_id in self.session_results:
-                del self.session_results[session_id]
+            store = self.session_results.pop(session_id, None)
+            if store is not None:
+                store.close()
         
         return len(sessions_to_remove)
     
-    def _apply_schedule_i_fast_tracking(
-        self, 
-        session_id: str, 
-        profile: OrganizationProfile,
-        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
-    ):
-        """Apply Schedule I grantee fast-tracking to discovery results"""
-        
-        if not profile.schedule_i_grantees:
-            return  # No grantees to match against
-        
-        # Get session results
-        results = self.session_results.get(session_id, [])
-        if not results:
-            return  # No results to process
-        
-        # Import grantee matcher
-        from src.utils.grantee_matcher import apply_schedule_i_fast_tracking
-        
-        # Apply fast-tracking
-        updated_results = apply_schedule_i_fast_tracking(results, profile)
-        
-        # Update session results
-        self.session_results[session_id] = updated_results
-        
-        # Count grantee matches
-        grantee_matches = [r for r in updated_results if r.is_schedule_i_grantee]
-        
-        if grantee_matches and progress_callback:
-            progress_callback(session_id, {
-                "status": "schedule_i_processed",
-                "message": f"Schedule I fast-tracking: {len(grantee_matches)} grantee matches identified",
-                "grantee_matches": len(grantee_matches),
-                "fast_tracked": len([r for r in grantee_matches if r.funnel_stage.value == "candidates"])
-            })
-    
     # Enhanced Entity-Based Discovery Methods
     
     async def discover_with_entity_analytics(
@@ -558,12 +640,14 @@ class MultiTrackDiscoveryEngine:
                 legacy_results.append(legacy_result)
             
             # Store results
-            self.session_results[session_id] = legacy_results
+            store = self._create_result_store(session_id)
+            for legacy_result in legacy_results:
+                store.add(legacy_result)
             
             # Complete session
             session.status = DiscoveryStatus.COMPLETED
             session.completed_at = datetime.now()
-            session.total_results = len(legacy_results)
+            session.total_results = len(store)
             
             if progress_callback:
                 progress_callback(session_id, {
@@ -1,131 +1,342 @@
 """
 Grant Opportunity Funnel Management
 Handles stage progression, filtering, and analytics for the grant opportunity funnel
+
+Each profile's funnel keeps an id -> opportunity map, a per-stage index,
+stage counts, stage-duration totals and per-stage discovery-time sums, all
+updated on every transition, plus a stage_updated_at-ordered index for
+stalled-opportunity reports. Lookups and metrics never rescan the funnel.
+A stage changed directly on an opportunity is picked up when it is
+re-added; the indexes always remove an id from the stage it was indexed
+under.
+
+Stage transitions are appended to a SQLite log (log_path; None keeps them
+in memory only) and replayed when a profile's funnel is first used, so
+stage history and durations survive restarts.
 """
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime
+import bisect
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 
 from .base_discoverer import DiscoveryResult, FunnelStage
 from src.profiles.models import OrganizationProfile
 
+DEFAULT_FUNNEL_LOG_PATH = Path("data/funnel/stage_transitions.db")
+
+STAGE_ORDER = [
+    FunnelStage.PROSPECTS,
+    FunnelStage.QUALIFIED_PROSPECTS,
+    FunnelStage.CANDIDATES,
+    FunnelStage.TARGETS,
+    FunnelStage.OPPORTUNITIES
+]
+
+
+class FunnelTransitionLog:
+    """Append-only SQLite log of funnel stage transitions"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS stage_transitions (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_id TEXT NOT NULL,
+            opportunity_id TEXT NOT NULL,
+            organization_name TEXT,
+            old_stage TEXT,
+            new_stage TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            compatibility_score REAL,
+            notes TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_stage_transitions_profile
+            ON stage_transitions (profile_id, timestamp);
+    """
+
+    _COLUMNS = ("opportunity_id", "organization_name", "old_stage", "new_stage",
+                "timestamp", "compatibility_score", "notes")
+
+    def __init__(self, db_path: Path = DEFAULT_FUNNEL_LOG_PATH):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use, so an unused log never touches disk"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(self._SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def append(self, profile_id: str, transitions: List[Dict[str, Any]]) -> None:
+        """Append transitions (one transaction)"""
+        if not transitions:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO stage_transitions (profile_id, opportunity_id, organization_name, old_stage, "
+                    "new_stage, timestamp, compatibility_score, notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (profile_id, t["opportunity_id"], t["organization_name"], t["old_stage"], t["new_stage"],
+                         t["timestamp"].isoformat(), t["compatibility_score"], t["notes"])
+                        for t in transitions
+                    ],
+                )
+
+    def load(self, profile_id: str) -> List[Dict[str, Any]]:
+        """A profile's transitions in the order they were recorded"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT opportunity_id, organization_name, old_stage, new_stage, timestamp, "
+                "compatibility_score, notes FROM stage_transitions WHERE profile_id = ? ORDER BY seq",
+                (profile_id,),
+            ).fetchall()
+        transitions = []
+        for row in rows:
+            transition = dict(zip(self._COLUMNS, row))
+            transition["timestamp"] = datetime.fromisoformat(transition["timestamp"])
+            transitions.append(transition)
+        return transitions
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ProfileFunnel:
+    """One profile's opportunities with stage indexes and running funnel metrics"""
+
+    def __init__(self):
+        self.opportunities: Dict[str, DiscoveryResult] = {}
+        self.position: Dict[str, int] = {}
+        self.by_stage: Dict[FunnelStage, Dict[str, None]] = {stage: {} for stage in FunnelStage}
+        self.stage_counts: Counter = Counter()
+
+        # Sum of discovered_at timestamps (seconds) per stage, for velocity
+        self.discovered_sums: Dict[FunnelStage, float] = defaultdict(float)
+
+        # (stage, discovered_at seconds) each id is indexed under; opportunities
+        # are shared objects whose stage may change outside the manager
+        self.indexed_as: Dict[str, Tuple[FunnelStage, Optional[float]]] = {}
+
+        # (stage_updated_at, position, opportunity_id), sorted, for stalled reports
+        self.updated_index: List[Tuple[datetime, int, str]] = []
+        self.updated_keys: Dict[str, Tuple[datetime, int, str]] = {}
+
+        # Transition history (time order), last transition per opportunity and
+        # total/count of completed stage durations in hours
+        self.history: List[Dict[str, Any]] = []
+        self.last_transition: Dict[str, Tuple[Optional[str], datetime]] = {}
+        self.duration_totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        self._next_position = 0
+
+    def add(self, opportunity: DiscoveryResult) -> None:
+        opp_id = opportunity.opportunity_id
+        if opp_id in self.opportunities:
+            self._unindex(opp_id)
+        else:
+            self.position[opp_id] = self._next_position
+            self._next_position += 1
+        self.opportunities[opp_id] = opportunity
+        self._index(opp_id)
+
+    def move(self, opp_id: str, apply_change: Callable[[], bool]) -> bool:
+        """Re-index an opportunity around a stage change made by apply_change()"""
+        self._unindex(opp_id)
+        try:
+            return apply_change()
+        finally:
+            self._index(opp_id)
+
+    def _index(self, opp_id: str) -> None:
+        opp = self.opportunities[opp_id]
+        stage = opp.funnel_stage
+        discovered = opp.discovered_at.timestamp() if opp.discovered_at else None
+        self.indexed_as[opp_id] = (stage, discovered)
+        self.by_stage[stage][opp_id] = None
+        self.stage_counts[stage] += 1
+        if discovered is not None:
+            self.discovered_sums[stage] += discovered
+        if opp.stage_updated_at:
+            key = (opp.stage_updated_at, self.position[opp_id], opp_id)
+            bisect.insort(self.updated_index, key)
+            self.updated_keys[opp_id] = key
+
+    def _unindex(self, opp_id: str) -> None:
+        stage, discovered = self.indexed_as.pop(opp_id)
+        del self.by_stage[stage][opp_id]
+        self.stage_counts[stage] -= 1
+        if not self.stage_counts[stage]:
+            del self.stage_counts[stage]
+        if discovered is not None:
+            self.discovered_sums[stage] -= discovered
+        key = self.updated_keys.pop(opp_id, None)
+        if key is not None:
+            i = bisect.bisect_left(self.updated_index, key)
+            del self.updated_index[i]
+
+    def record(self, transition: Dict[str, Any]) -> None:
+        """Add a transition to the history and the running stage durations"""
+        opp_id = transition["opportunity_id"]
+        previous = self.last_transition.get(opp_id)
+        if previous is not None and previous[0]:
+            totals = self.duration_totals[previous[0]]
+            totals[0] += (transition["timestamp"] - previous[1]).total_seconds() / 3600
+            totals[1] += 1
+        self.last_transition[opp_id] = (transition["new_stage"], transition["timestamp"])
+        self.history.append(transition)
+
+    def in_stage(self, stage: FunnelStage) -> List[DiscoveryResult]:
+        """Opportunities at a stage, in the order they were added"""
+        ids = sorted(self.by_stage[stage], key=self.position.__getitem__)
+        return [self.opportunities[opp_id] for opp_id in ids]
+
 
 class FunnelManager:
     """Manages grant opportunity funnel progression and analytics"""
-    
-    def __init__(self):
-        self.opportunities: Dict[str, List[DiscoveryResult]] = defaultdict(list)
-        self.stage_history: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    
+
+    def __init__(self, log_path: Optional[Path] = DEFAULT_FUNNEL_LOG_PATH):
+        self.transition_log = FunnelTransitionLog(log_path) if log_path else None
+        self.funnels: Dict[str, ProfileFunnel] = {}
+
+    @property
+    def stage_history(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Transition history per loaded profile"""
+        return {profile_id: funnel.history for profile_id, funnel in self.funnels.items()}
+
+    def _funnel(self, profile_id: str) -> ProfileFunnel:
+        """A profile's funnel, replaying its logged transitions on first use"""
+        funnel = self.funnels.get(profile_id)
+        if funnel is None:
+            funnel = self.funnels[profile_id] = ProfileFunnel()
+            if self.transition_log is not None:
+                for transition in self.transition_log.load(profile_id):
+                    funnel.record(transition)
+        return funnel
+
     def add_opportunities(self, profile_id: str, opportunities: List[DiscoveryResult]) -> None:
         """Add opportunities to profile's funnel"""
-        self.opportunities[profile_id].extend(opportunities)
-        
-        # Track initial stage entry
+        funnel = self._funnel(profile_id)
+        transitions = []
         for opp in opportunities:
-            self._record_stage_transition(profile_id, opp, None, opp.funnel_stage)
-    
+            funnel.add(opp)
+
+            # Track stage entry, unless the log already has the opportunity at this stage
+            last = funnel.last_transition.get(opp.opportunity_id)
+            if last is None or last[0] != opp.funnel_stage.value:
+                old_stage = FunnelStage(last[0]) if last and last[0] else None
+                transitions.append(self._stage_transition(opp, old_stage, opp.funnel_stage))
+        self._record_stage_transitions(profile_id, transitions)
+
     def get_opportunities_by_stage(
-        self, 
-        profile_id: str, 
+        self,
+        profile_id: str,
         stage: FunnelStage
     ) -> List[DiscoveryResult]:
         """Get all opportunities at a specific funnel stage"""
-        return [
-            opp for opp in self.opportunities.get(profile_id, [])
-            if opp.funnel_stage == stage
-        ]
-    
+        funnel = self.funnels.get(profile_id)
+        return funnel.in_stage(stage) if funnel else []
+
     def get_all_opportunities(self, profile_id: str) -> List[DiscoveryResult]:
         """Get all opportunities for a profile"""
-        return self.opportunities.get(profile_id, [])
-    
+        funnel = self.funnels.get(profile_id)
+        return list(funnel.opportunities.values()) if funnel else []
+
     def promote_opportunity(
-        self, 
-        profile_id: str, 
-        opportunity_id: str, 
+        self,
+        profile_id: str,
+        opportunity_id: str,
         notes: Optional[str] = None
     ) -> bool:
         """Promote opportunity to next funnel stage"""
-        opportunity = self._find_opportunity(profile_id, opportunity_id)
-        if not opportunity:
-            return False
-        
-        old_stage = opportunity.funnel_stage
-        if opportunity.promote_to_next_stage(notes):
-            self._record_stage_transition(profile_id, opportunity, old_stage, opportunity.funnel_stage)
-            return True
-        return False
-    
+        return self._record_stage_change(profile_id, self._change_stage(
+            profile_id, opportunity_id, lambda opp: opp.promote_to_next_stage(notes)
+        ))
+
     def demote_opportunity(
-        self, 
-        profile_id: str, 
-        opportunity_id: str, 
+        self,
+        profile_id: str,
+        opportunity_id: str,
         notes: Optional[str] = None
     ) -> bool:
         """Demote opportunity to previous funnel stage"""
-        opportunity = self._find_opportunity(profile_id, opportunity_id)
-        if not opportunity:
-            return False
-        
-        old_stage = opportunity.funnel_stage
-        if opportunity.demote_to_previous_stage(notes):
-            self._record_stage_transition(profile_id, opportunity, old_stage, opportunity.funnel_stage)
-            return True
-        return False
-    
+        return self._record_stage_change(profile_id, self._change_stage(
+            profile_id, opportunity_id, lambda opp: opp.demote_to_previous_stage(notes)
+        ))
+
     def set_opportunity_stage(
-        self, 
-        profile_id: str, 
-        opportunity_id: str, 
+        self,
+        profile_id: str,
+        opportunity_id: str,
         new_stage: FunnelStage,
         notes: Optional[str] = None
     ) -> bool:
         """Set opportunity to specific funnel stage"""
+        return self._record_stage_change(profile_id, self._change_stage(
+            profile_id, opportunity_id, lambda opp: opp.set_stage(new_stage, notes) or True
+        ))
+
+    def _change_stage(
+        self,
+        profile_id: str,
+        opportunity_id: str,
+        change: Callable[[DiscoveryResult], bool]
+    ) -> Optional[Dict[str, Any]]:
+        """Apply a stage change and re-index the opportunity. Returns the transition, or None if unchanged."""
         opportunity = self._find_opportunity(profile_id, opportunity_id)
         if not opportunity:
-            return False
-        
+            return None
+
         old_stage = opportunity.funnel_stage
-        opportunity.set_stage(new_stage, notes)
-        self._record_stage_transition(profile_id, opportunity, old_stage, new_stage)
+        if not self.funnels[profile_id].move(opportunity_id, lambda: change(opportunity)):
+            return None
+        return self._stage_transition(opportunity, old_stage, opportunity.funnel_stage)
+
+    def _record_stage_change(self, profile_id: str, transition: Optional[Dict[str, Any]]) -> bool:
+        if transition is None:
+            return False
+        self._record_stage_transitions(profile_id, [transition])
         return True
-    
+
     def get_funnel_metrics(self, profile_id: str) -> Dict[str, Any]:
         """Get comprehensive funnel analytics for a profile"""
-        opportunities = self.opportunities.get(profile_id, [])
-        
-        if not opportunities:
+        funnel = self.funnels.get(profile_id)
+
+        if not funnel or not funnel.opportunities:
             return self._empty_metrics()
-        
+
         # Stage distribution
-        stage_counts = Counter(opp.funnel_stage for opp in opportunities)
-        
+        stage_counts = funnel.stage_counts
+
         # Conversion metrics
-        total_opps = len(opportunities)
+        total_opps = len(funnel.opportunities)
         conversion_rates = {}
-        stage_order = [
-            FunnelStage.PROSPECTS,
-            FunnelStage.QUALIFIED_PROSPECTS,
-            FunnelStage.CANDIDATES,
-            FunnelStage.TARGETS,
-            FunnelStage.OPPORTUNITIES
-        ]
-        
-        for i, stage in enumerate(stage_order):
+
+        for i, stage in enumerate(STAGE_ORDER):
             if i == 0:
                 conversion_rates[stage.value] = 100.0  # All start as prospects
             else:
                 current_count = stage_counts.get(stage, 0)
                 # Calculate conversion from prospects (total) to current stage
                 conversion_rates[stage.value] = (current_count / total_opps * 100) if total_opps > 0 else 0.0
-        
+
         # Time in stages
         stage_times = self._calculate_stage_durations(profile_id)
-        
+
         # Recent activity
         recent_transitions = self._get_recent_transitions(profile_id, days=7)
-        
+
         return {
             "profile_id": profile_id,
             "total_opportunities": total_opps,
@@ -137,7 +348,7 @@ class FunnelManager:
             "top_performers": self._get_top_performing_opportunities(profile_id),
             "at_risk_opportunities": self._identify_stalled_opportunities(profile_id)
         }
-    
+
     def bulk_stage_transition(
         self,
         profile_id: str,
@@ -145,12 +356,19 @@ class FunnelManager:
         target_stage: FunnelStage,
         notes: Optional[str] = None
     ) -> Dict[str, bool]:
-        """Bulk transition multiple opportunities to target stage"""
+        """Bulk transition multiple opportunities to target stage (logged in one write)"""
         results = {}
+        transitions = []
         for opp_id in opportunity_ids:
-            results[opp_id] = self.set_opportunity_stage(profile_id, opp_id, target_stage, notes)
+            transition = self._change_stage(
+                profile_id, opp_id, lambda opp: opp.set_stage(target_stage, notes) or True
+            )
+            results[opp_id] = transition is not None
+            if transition is not None:
+                transitions.append(transition)
+        self._record_stage_transitions(profile_id, transitions)
         return results
-    
+
     def apply_stage_filter(
         self,
         opportunities: List[DiscoveryResult],
@@ -160,62 +378,58 @@ class FunnelManager:
     ) -> List[DiscoveryResult]:
         """Apply filters to opportunity list"""
         filtered = opportunities
-        
+
         if stage_filter:
             filtered = [opp for opp in filtered if opp.funnel_stage == stage_filter]
-        
+
         if min_score is not None:
             filtered = [opp for opp in filtered if opp.compatibility_score >= min_score]
-        
+
         if funding_type_filter:
             filtered = [opp for opp in filtered if opp.source_type.value == funding_type_filter]
-        
+
         return filtered
-    
+
     def get_stage_recommendations(self, profile_id: str) -> Dict[str, List[str]]:
         """Get recommendations for stage transitions"""
-        opportunities = self.opportunities.get(profile_id, [])
+        opportunities = self.get_all_opportunities(profile_id)
         recommendations = defaultdict(list)
-        
+
         for opp in opportunities:
             # High-scoring prospects should be qualified
-            if (opp.funnel_stage == FunnelStage.PROSPECTS and 
+            if (opp.funnel_stage == FunnelStage.PROSPECTS and
                 opp.compatibility_score > 0.7):
                 recommendations["promote_to_qualified"].append(opp.opportunity_id)
-            
+
             # Well-qualified candidates with high scores should be targets
-            elif (opp.funnel_stage == FunnelStage.CANDIDATES and 
+            elif (opp.funnel_stage == FunnelStage.CANDIDATES and
                   opp.compatibility_score > 0.8 and
                   opp.confidence_level > 0.7):
                 recommendations["promote_to_targets"].append(opp.opportunity_id)
-            
+
             # Targets with very high scores should be opportunities
             elif (opp.funnel_stage == FunnelStage.TARGETS and
                   opp.compatibility_score > 0.9):
                 recommendations["promote_to_opportunities"].append(opp.opportunity_id)
-            
+
             # Low-performing opportunities should be demoted or archived
             elif opp.compatibility_score < 0.3:
                 recommendations["consider_demotion"].append(opp.opportunity_id)
-        
+
         return dict(recommendations)
-    
+
     def _find_opportunity(self, profile_id: str, opportunity_id: str) -> Optional[DiscoveryResult]:
         """Find opportunity by ID within profile"""
-        for opp in self.opportunities.get(profile_id, []):
-            if opp.opportunity_id == opportunity_id:
-                return opp
-        return None
-    
-    def _record_stage_transition(
-        self,
-        profile_id: str,
+        funnel = self.funnels.get(profile_id)
+        return funnel.opportunities.get(opportunity_id) if funnel else None
+
+    @staticmethod
+    def _stage_transition(
         opportunity: DiscoveryResult,
         old_stage: Optional[FunnelStage],
         new_stage: FunnelStage
-    ) -> None:
-        """Record stage transition for analytics"""
-        transition_record = {
+    ) -> Dict[str, Any]:
+        return {
             "opportunity_id": opportunity.opportunity_id,
             "organization_name": opportunity.organization_name,
             "old_stage": old_stage.value if old_stage else None,
@@ -224,81 +438,63 @@ class FunnelManager:
             "compatibility_score": opportunity.compatibility_score,
             "notes": opportunity.stage_notes
         }
-        self.stage_history[profile_id].append(transition_record)
-    
+
+    def _record_stage_transitions(self, profile_id: str, transitions: List[Dict[str, Any]]) -> None:
+        """Record stage transitions for analytics and append them to the log"""
+        funnel = self._funnel(profile_id)
+        for transition in transitions:
+            funnel.record(transition)
+        if self.transition_log is not None:
+            self.transition_log.append(profile_id, transitions)
+
     def _calculate_stage_durations(self, profile_id: str) -> Dict[str, float]:
         """Calculate average time spent in each stage"""
-        stage_durations = defaultdict(list)
-        transitions = self.stage_history.get(profile_id, [])
-        
-        # Group transitions by opportunity
-        opp_transitions = defaultdict(list)
-        for transition in transitions:
-            opp_transitions[transition["opportunity_id"]].append(transition)
-        
-        # Calculate durations for each opportunity
-        for opp_id, opp_transitions_list in opp_transitions.items():
-            # Sort by timestamp
-            opp_transitions_list.sort(key=lambda x: x["timestamp"])
-            
-            for i in range(len(opp_transitions_list) - 1):
-                current = opp_transitions_list[i]
-                next_transition = opp_transitions_list[i + 1]
-                
-                if current["new_stage"]:
-                    duration_hours = (
-                        next_transition["timestamp"] - current["timestamp"]
-                    ).total_seconds() / 3600
-                    stage_durations[current["new_stage"]].append(duration_hours)
-        
-        # Calculate averages
+        funnel = self.funnels.get(profile_id)
+        if not funnel:
+            return {}
         return {
-            stage: sum(durations) / len(durations) if durations else 0.0
-            for stage, durations in stage_durations.items()
+            stage: total / count if count else 0.0
+            for stage, (total, count) in funnel.duration_totals.items()
         }
-    
+
     def _get_recent_transitions(self, profile_id: str, days: int = 7) -> List[Dict[str, Any]]:
         """Get recent stage transitions"""
-        cutoff_date = datetime.now() - datetime.timedelta(days=days)
-        transitions = self.stage_history.get(profile_id, [])
-        
-        return [
-            t for t in transitions
-            if t["timestamp"] >= cutoff_date
-        ]
-    
+        funnel = self.funnels.get(profile_id)
+        if not funnel:
+            return []
+
+        # History is in time order, so the recent ones are a suffix
+        cutoff_date = datetime.now() - timedelta(days=days)
+        start = bisect.bisect_left(funnel.history, cutoff_date, key=lambda t: t["timestamp"])
+        return funnel.history[start:]
+
     def _calculate_funnel_velocity(self, profile_id: str) -> Dict[str, float]:
-        """Calculate how quickly opportunities move through funnel"""
-        opportunities = self.opportunities.get(profile_id, [])
-        
-        if not opportunities:
+        """Calculate how quickly opportunities move through funnel (average days since discovery per stage)"""
+        funnel = self.funnels.get(profile_id)
+        if not funnel or not funnel.opportunities:
             return {}
-        
-        # Calculate average days since discovery for each stage
-        now = datetime.now()
+
+        now = datetime.now().timestamp()
         velocity_metrics = {}
-        
+
         for stage in FunnelStage:
-            stage_opps = [opp for opp in opportunities if opp.funnel_stage == stage]
-            if stage_opps:
-                avg_days = sum(
-                    (now - opp.discovered_at).days for opp in stage_opps
-                ) / len(stage_opps)
-                velocity_metrics[stage.value] = avg_days
-        
+            count = funnel.stage_counts.get(stage, 0)
+            if count:
+                velocity_metrics[stage.value] = (now - funnel.discovered_sums[stage] / count) / 86400
+
         return velocity_metrics
-    
+
     def _get_top_performing_opportunities(self, profile_id: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Get top-performing opportunities by compatibility score"""
-        opportunities = self.opportunities.get(profile_id, [])
-        
+        opportunities = self.get_all_opportunities(profile_id)
+
         # Sort by compatibility score descending
         top_opps = sorted(
             opportunities,
             key=lambda x: x.compatibility_score,
             reverse=True
         )[:limit]
-        
+
         return [
             {
                 "opportunity_id": opp.opportunity_id,
@@ -309,26 +505,31 @@ class FunnelManager:
             }
             for opp in top_opps
         ]
-    
+
     def _identify_stalled_opportunities(self, profile_id: str, days_threshold: int = 14) -> List[Dict[str, Any]]:
         """Identify opportunities that haven't progressed in a while"""
-        cutoff_date = datetime.now() - datetime.timedelta(days=days_threshold)
-        opportunities = self.opportunities.get(profile_id, [])
-        
+        funnel = self.funnels.get(profile_id)
+        if not funnel:
+            return []
+
+        # The stage_updated_at index is sorted, so stalled opportunities are a prefix
+        now = datetime.now()
+        cutoff_date = now - timedelta(days=days_threshold)
+        end = bisect.bisect_left(funnel.updated_index, cutoff_date, key=lambda key: key[0])
+
         stalled = []
-        for opp in opportunities:
-            if opp.stage_updated_at and opp.stage_updated_at < cutoff_date:
-                days_stalled = (datetime.now() - opp.stage_updated_at).days
-                stalled.append({
-                    "opportunity_id": opp.opportunity_id,
-                    "organization_name": opp.organization_name,
-                    "funnel_stage": opp.funnel_stage.value,
-                    "days_stalled": days_stalled,
-                    "compatibility_score": opp.compatibility_score
-                })
-        
+        for stage_updated_at, _, opp_id in funnel.updated_index[:end]:
+            opp = funnel.opportunities[opp_id]
+            stalled.append({
+                "opportunity_id": opp.opportunity_id,
+                "organization_name": opp.organization_name,
+                "funnel_stage": opp.funnel_stage.value,
+                "days_stalled": (now - stage_updated_at).days,
+                "compatibility_score": opp.compatibility_score
+            })
+
         return sorted(stalled, key=lambda x: x["days_stalled"], reverse=True)
-    
+
     def _empty_metrics(self) -> Dict[str, Any]:
         """Return empty metrics structure"""
         return {
@@ -345,4 +546,4 @@ class FunnelManager:
 
 
 # Global funnel manager instance
-funnel_manager = FunnelManager()
\ No newline at end of file
+funnel_manager = FunnelManager()
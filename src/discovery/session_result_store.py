@@ -0,0 +1,294 @@
+"""
+Session Result Store - Bounded per-session storage for streamed discovery results
+
+Results are added one at a time as discoverers yield them. Each result is
+deduplicated (a result whose EIN or opportunity id was already seen is
+skipped) and counted into running per-funding-type totals and a top-N ranking,
+so summaries and progress updates never rescan the session.
+
+The first max_in_memory results are kept in memory; later results are
+pickled to a SQLite spill file in spill_dir (the system temp directory by
+default) and read back only when the full result list is requested. The
+spill file is removed when the store is closed.
+"""
+
+import heapq
+import logging
+import os
+import pickle
+import re
+import sqlite3
+import tempfile
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .base_discoverer import DiscoveryResult, FunnelStage
+from src.profiles.models import FundingType
+
+logger = logging.getLogger(__name__)
+
+EIN_FIELDS = ('ein', 'EIN', 'tax_id', 'taxid', 'federal_tax_id')
+
+
+def result_dedupe_keys(result: DiscoveryResult) -> List[str]:
+    """Identity keys of a result: its EIN (when valid) and its opportunity id"""
+    keys = []
+    external = result.external_data or {}
+    for field in EIN_FIELDS:
+        if external.get(field):
+            digits = re.sub(r'\D', '', str(external[field]))
+            if len(digits) == 9:
+                keys.append(f"ein:{digits}")
+            break
+    if result.opportunity_id:
+        keys.append(f"opportunity:{result.opportunity_id}")
+    return keys
+
+
+class SessionResultStore:
+    """Deduplicated, bounded result storage for one discovery session"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            seq INTEGER PRIMARY KEY,
+            funding_type TEXT NOT NULL,
+            score REAL NOT NULL,
+            result BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_score ON results (score DESC, seq);
+    """
+
+    # Rows read from the spill file per query
+    SPILL_PAGE_SIZE = 500
+
+    # Results scoring above this count as top matches in the per-type totals
+    TOP_MATCH_SCORE = 0.7
+
+    def __init__(self,
+                 session_id: str,
+                 max_in_memory: int = 2000,
+                 top_n: int = 10,
+                 spill_dir: Optional[Path] = None,
+                 spill_batch: int = 200):
+        self.session_id = session_id
+        self.max_in_memory = max_in_memory
+        self.top_n = top_n
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.spill_batch = spill_batch
+
+        self._lock = threading.RLock()
+        self._seen: set = set()
+        self._memory: List[Tuple[int, DiscoveryResult]] = []
+        self._pending_spill: List[Tuple] = []
+        self._spill_path: Optional[Path] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._seq = 0
+
+        # Best results as (score, -seq, result) in a min-heap, so ties keep arrival order
+        self._top: List[Tuple[float, int, DiscoveryResult]] = []
+        self.top_version = 0
+
+        # Running totals
+        self.count_by_type: Dict[FundingType, int] = defaultdict(int)
+        self.score_sum_by_type: Dict[FundingType, float] = defaultdict(float)
+        self.top_matches_by_type: Dict[FundingType, int] = defaultdict(int)
+        self.duplicates = 0
+        self.schedule_i_matches = 0
+        self.fast_tracked = 0
+        self.spilled = 0
+
+    def __len__(self) -> int:
+        return self._seq
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def is_duplicate(self, result: DiscoveryResult) -> bool:
+        return any(key in self._seen for key in result_dedupe_keys(result))
+
+    def add(self, result: DiscoveryResult) -> bool:
+        """Store a result. Returns False (and stores nothing) for a duplicate."""
+        keys = result_dedupe_keys(result)
+        score = result.compatibility_score or 0.0
+        with self._lock:
+            if any(key in self._seen for key in keys):
+                self.duplicates += 1
+                return False
+            self._seen.update(keys)
+
+            seq = self._seq
+            self._seq += 1
+            self.count_by_type[result.source_type] += 1
+            self.score_sum_by_type[result.source_type] += score
+            if score > self.TOP_MATCH_SCORE:
+                self.top_matches_by_type[result.source_type] += 1
+            if result.is_schedule_i_grantee:
+                self.schedule_i_matches += 1
+                if result.funnel_stage == FunnelStage.CANDIDATES:
+                    self.fast_tracked += 1
+
+            entry = (score, -seq, result)
+            if len(self._top) < self.top_n:
+                heapq.heappush(self._top, entry)
+                self.top_version += 1
+            elif entry[:2] > self._top[0][:2]:
+                heapq.heapreplace(self._top, entry)
+                self.top_version += 1
+
+            if len(self._memory) < self.max_in_memory:
+                self._memory.append((seq, result))
+            else:
+                self._pending_spill.append((seq, result.source_type.value, score, pickle.dumps(result)))
+                self.spilled += 1
+                if len(self._pending_spill) >= self.spill_batch:
+                    self._flush_spill()
+            return True
+
+    def _connection(self) -> sqlite3.Connection:
+        """Create the spill file on first overflow"""
+        if self._conn is None:
+            if self.spill_dir is not None:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+            fd, path = tempfile.mkstemp(
+                prefix=f"{self.session_id}_", suffix=".db",
+                dir=str(self.spill_dir) if self.spill_dir else None,
+            )
+            os.close(fd)
+            self._spill_path = Path(path)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = OFF")
+            self._conn.executescript(self._SCHEMA)
+            self._conn.commit()
+            logger.info(f"Discovery session {self.session_id} spilling results to {path}")
+        return self._conn
+
+    def _flush_spill(self) -> None:
+        if not self._pending_spill:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO results (seq, funding_type, score, result) VALUES (?, ?, ?, ?)",
+                self._pending_spill,
+            )
+        self._pending_spill = []
+
+    def close(self) -> None:
+        """Release memory and delete the spill file"""
+        with self._lock:
+            self._memory = []
+            self._pending_spill = []
+            self._top = []
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self._spill_path is not None:
+                for suffix in ("", "-wal", "-shm"):
+                    Path(str(self._spill_path) + suffix).unlink(missing_ok=True)
+                self._spill_path = None
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def top(self, limit: Optional[int] = None) -> List[DiscoveryResult]:
+        """Highest-scoring results, best first (at most top_n)"""
+        with self._lock:
+            ranked = sorted(self._top, key=lambda entry: entry[:2], reverse=True)
+        return [result for _, _, result in ranked[:limit]]
+
+    def average_score(self, funding_type: FundingType) -> float:
+        count = self.count_by_type.get(funding_type, 0)
+        return self.score_sum_by_type[funding_type] / count if count else 0.0
+
+    def iter_results(self,
+                     funding_type: Optional[FundingType] = None,
+                     min_score: Optional[float] = None) -> Iterator[DiscoveryResult]:
+        """Results in arrival order, spilled ones streamed from disk"""
+        with self._lock:
+            memory = list(self._memory)
+            self._flush_spill()
+        for _, result in memory:
+            if self._matches(result, funding_type, min_score):
+                yield result
+        for _, result in self._iter_spilled(funding_type, min_score, by_score=False):
+            yield result
+
+    def results(self,
+                funding_type: Optional[FundingType] = None,
+                min_score: Optional[float] = None,
+                limit: Optional[int] = None) -> List[DiscoveryResult]:
+        """Filtered results sorted by compatibility score (descending, ties in arrival order)"""
+        with self._lock:
+            memory = sorted(
+                ((seq, r) for seq, r in self._memory if self._matches(r, funding_type, min_score)),
+                key=lambda item: (-item[1].compatibility_score, item[0]),
+            )
+            self._flush_spill()
+        spilled = self._iter_spilled(funding_type, min_score, by_score=True)
+        merged = heapq.merge(memory, spilled, key=lambda item: (-item[1].compatibility_score, item[0]))
+        results = []
+        for _, result in merged:
+            if limit and len(results) >= limit:
+                break
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _matches(result: DiscoveryResult, funding_type: Optional[FundingType], min_score: Optional[float]) -> bool:
+        if funding_type and result.source_type != funding_type:
+            return False
+        return min_score is None or result.compatibility_score >= min_score
+
+    def _iter_spilled(self,
+                      funding_type: Optional[FundingType],
+                      min_score: Optional[float],
+                      by_score: bool) -> Iterator[Tuple[int, DiscoveryResult]]:
+        """Spilled results in arrival order, or by score (descending, ties by seq)
+
+        Pages are keyset-paginated from the last row read, so each chunk is an
+        index seek rather than a rescan of everything before it.
+        """
+        if self._conn is None:
+            return
+        where, params = "", []
+        if funding_type:
+            where += " AND funding_type = ?"
+            params.append(funding_type.value)
+        if min_score is not None:
+            where += " AND score >= ?"
+            params.append(min_score)
+        order = "score DESC, seq" if by_score else "seq"
+        last: Optional[Tuple[int, float]] = None
+        while True:
+            page_where, page_params = where, list(params)
+            if last is not None:
+                last_seq, last_score = last
+                if by_score:
+                    page_where += " AND (score < ? OR (score = ? AND seq > ?))"
+                    page_params += [last_score, last_score, last_seq]
+                else:
+                    page_where += " AND seq > ?"
+                    page_params.append(last_seq)
+            with self._lock:
+                if self._conn is None:
+                    return
+                rows = self._conn.execute(
+                    f"SELECT seq, score, result FROM results WHERE 1 = 1{page_where} ORDER BY {order} LIMIT ?",
+                    [*page_params, self.SPILL_PAGE_SIZE],
+                ).fetchall()
+            for seq, _, blob in rows:
+                yield seq, pickle.loads(blob)
+            if len(rows) < self.SPILL_PAGE_SIZE:
+                return
+            last = (rows[-1][0], rows[-1][1])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "total_results": len(self),
+            "duplicates_skipped": self.duplicates,
+            "in_memory": len(self._memory),
+            "spilled_to_disk": self.spilled,
+            "schedule_i_matches": self.schedule_i_matches,
+            "fast_tracked": self.fast_tracked,
+        }
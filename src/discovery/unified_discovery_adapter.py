@@ -6,7 +6,7 @@ opportunity creation with enhanced data persistence and real-time analytics.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Optional, Any
 from datetime import datetime
 import uuid
 
@@ -88,7 +88,7 @@ class UnifiedDiscoveryAdapter:
     
     async def save_discovery_results(
         self, 
-        discovery_results: List[DiscoveryResult], 
+        discovery_results: Iterable[DiscoveryResult], 
         profile_id: str,
         session_id: str
     ) -> Dict[str, Any]:
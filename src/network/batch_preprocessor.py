@@ -348,9 +348,12 @@ class NetworkBatchPreprocessor:
         )
 
         from src.clients.propublica_client import ProPublicaClient
+        from src.core.request_scheduler import RequestPriority, request_priority
         from src.database.database_manager import DatabaseManager
 
         db_mgr = DatabaseManager(self.db_path)
+        # ProPublica pacing comes from the shared rate limiter, not per-request sleeps
+        client = ProPublicaClient()
         sem = asyncio.Semaphore(concurrency)
         found = 0
         errors = 0
@@ -359,7 +362,6 @@ class NetworkBatchPreprocessor:
             nonlocal found, errors
             async with sem:
                 try:
-                    client = ProPublicaClient()
                     org_data = await client.get_organization_by_ein(item["ein"])
                     filings = []
                     if org_data:
@@ -373,12 +375,13 @@ class NetworkBatchPreprocessor:
                     if filings:
                         db_mgr.upsert_ein_intelligence(item["ein"], filing_history=filings)
                         found += 1
-                    await asyncio.sleep(0.25)  # Respect rate limits
                 except Exception as e:
                     logger.warning(f"[Stage 1] EIN {item['ein']}: {e}")
                     errors += 1
 
-        await asyncio.gather(*[fetch_one(item) for item in eins_needing_filings])
+        # Batch priority: interactive ProPublica requests are served first
+        with request_priority(RequestPriority.BATCH):
+            await asyncio.gather(*[fetch_one(item) for item in eins_needing_filings])
 
         return StageResult(
             stage="discover_filings",
@@ -433,6 +436,7 @@ class NetworkBatchPreprocessor:
             f"({len(funder_eins) - len(targets)} already populated)"
         )
 
+        from src.core.request_scheduler import RequestPriority, request_priority
         from src.utils.xml_fetcher import XMLFetcher
         from src.network.graph_builder import NetworkGraphBuilder
 
@@ -466,7 +470,6 @@ class NetworkBatchPreprocessor:
                         if xml_bytes:
                             officers = self._extract_officers_from_xml(xml_bytes, ein)
                             source = "propublica"
-                        await asyncio.sleep(0.3)  # Polite delay for ProPublica
 
                     if not officers:
                         eins_no_xml += 1
@@ -486,7 +489,8 @@ class NetworkBatchPreprocessor:
                     logger.warning(f"[Stage 2] EIN {ein}: {e}")
                     errors += 1
 
-        await asyncio.gather(*[process_one(t) for t in targets])
+        with request_priority(RequestPriority.BATCH):
+            await asyncio.gather(*[process_one(t) for t in targets])
 
         return StageResult(
             stage="xml_officers",
@@ -5,11 +5,21 @@ fuzzy name matching and shared-organization signals.
 All matching runs against the local SQLite `people` and `organization_roles`
 tables.  No external libraries are required beyond the Python standard library
 and the project's own NameNormalizer.
+
+Fuzzy matching scales to large graphs by generating candidates with a
+character-bigram prefix filter inside each last-name block (lossless for the
+similarity threshold), pruning with length / bigram / character-bag bounds,
+and scoring the survivors with a bit-parallel LCS, fanned out to a process
+pool for large candidate sets.
 """
 
 import logging
+import os
 import sqlite3
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 
 from src.network.name_normalizer import NameNormalizer
@@ -21,33 +31,141 @@ logger = logging.getLogger(__name__)
 # Helpers
 # ---------------------------------------------------------------------------
 
+FUZZY_SIMILARITY_THRESHOLD = 0.85
+
+# Candidate pairs needed before LCS scoring is spread over a process pool
+_POOL_MIN_PAIRS = 20_000
+_POOL_CHUNK_PAIRS = 5_000
+
+
+def _lcs_length(a: str, b: str) -> int:
+    """Length of the longest common subsequence of *a* and *b*.
+
+    Bit-parallel formulation (Crochemore et al.): one big-int update per
+    character of *b* instead of a len(a) x len(b) table.
+    """
+    match: dict[str, int] = {}
+    for i, ch in enumerate(a):
+        match[ch] = match.get(ch, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    v = mask
+    for ch in b:
+        u = v & match.get(ch, 0)
+        v = ((v + u) | (v - u)) & mask
+    return len(a) - bin(v).count("1")
+
+
 def _similarity(a: str, b: str) -> float:
     """Character-level similarity ratio (0.0–1.0) inspired by SequenceMatcher.
 
-    Uses a simple longest-common-subsequence approach to avoid pulling in any
-    external dependency.  Adequate for short strings such as person names.
+    Dice-style coefficient over the longest common subsequence,
+    2 * |LCS| / (|a| + |b|), without pulling in any external dependency.
     """
     if a == b:
         return 1.0
     if not a or not b:
         return 0.0
+    return (2.0 * _lcs_length(a, b)) / (len(a) + len(b))
 
-    # Build the LCS length via dynamic programming (space-optimised to two
-    # rows since we only need the final length).
-    len_a, len_b = len(a), len(b)
-    prev = [0] * (len_b + 1)
-    curr = [0] * (len_b + 1)
-    for i in range(1, len_a + 1):
-        for j in range(1, len_b + 1):
-            if a[i - 1] == b[j - 1]:
-                curr[j] = prev[j - 1] + 1
-            else:
-                curr[j] = max(prev[j], curr[j - 1])
-        prev, curr = curr, [0] * (len_b + 1)
 
-    lcs_len = prev[len_b]
-    # Dice-style coefficient: 2 * |LCS| / (|a| + |b|)
-    return (2.0 * lcs_len) / (len_a + len_b)
+@lru_cache(maxsize=None)
+def _min_lcs(len_a: int, len_b: int, threshold: float = FUZZY_SIMILARITY_THRESHOLD) -> int:
+    """Smallest LCS length for which _similarity() of such strings exceeds *threshold*."""
+    total = len_a + len_b
+    for lcs in range(min(len_a, len_b) + 1):
+        if (2.0 * lcs) / total > threshold:
+            return lcs
+    return min(len_a, len_b) + 1  # unreachable for these lengths
+
+
+def _min_shared_bigrams(len_a: int, len_b: int) -> int:
+    """Lower bound on shared bigrams for a pair that can pass the threshold.
+
+    q-gram lemma: strings within k edits share at least
+    max(|a|, |b|) - q + 1 - k*q q-grams; the indel distance implied by the
+    minimum LCS bounds k from above, so the bound is safe.
+    """
+    max_indels = len_a + len_b - 2 * _min_lcs(len_a, len_b)
+    return max(len_a, len_b) - 1 - 2 * max_indels
+
+
+def _bigram_tokens(text: str) -> list[tuple[str, int]]:
+    """Bigrams of *text*, numbered per occurrence so multisets act like sets."""
+    seen: Counter = Counter()
+    tokens = []
+    for i in range(len(text) - 1):
+        gram = text[i:i + 2]
+        tokens.append((gram, seen[gram]))
+        seen[gram] += 1
+    return tokens
+
+
+def _score_pairs(pairs: list[tuple[str, str]]) -> list[float]:
+    """Process-pool worker: similarity for each (a, b) pair."""
+    return [_similarity(a, b) for a, b in pairs]
+
+
+def _block_candidates(names: list[str]) -> list[tuple[int, int]]:
+    """Index pairs within one block that may exceed the fuzzy threshold.
+
+    *names* must be distinct.  Prefix filtering over bigram tokens ordered
+    rarest-first finds every pair whose bigram overlap can reach
+    _min_shared_bigrams(); names too short for that bound are compared
+    against every length-compatible name.  The surviving pairs also pass the
+    length and character-bag bounds, so only they need an LCS.
+    """
+    tokens = [_bigram_tokens(n) for n in names]
+    frequency: Counter = Counter(t for toks in tokens for t in toks)
+    lengths = [len(n) for n in names]
+    length_set = sorted(set(lengths))
+
+    def partner_lengths(la: int) -> list[int]:
+        return [lb for lb in length_set if _min_lcs(la, lb) <= min(la, lb)]
+
+    order = sorted(range(len(names)), key=lambda i: lengths[i])
+    postings: dict[tuple[str, int], list[int]] = defaultdict(list)
+    loose: list[int] = []
+    candidates: set[tuple[int, int]] = set()
+
+    for i in order:
+        partners = partner_lengths(lengths[i])
+        min_shared = min((_min_shared_bigrams(lengths[i], lb) for lb in partners), default=0)
+        found: set[int] = set()
+        if min_shared <= 0 or not tokens[i]:
+            loose.append(i)
+        else:
+            ranked = sorted(tokens[i], key=lambda t: (frequency[t], t))
+            prefix = ranked[:len(ranked) - min_shared + 1]
+            for token in prefix:
+                found.update(postings[token])
+            for token in prefix:
+                postings[token].append(i)
+        candidates.update((min(i, j), max(i, j)) for j in found)
+
+    # Names with no usable bigram bound pair with every compatible length
+    if loose:
+        by_length: dict[int, list[int]] = defaultdict(list)
+        for i, length in enumerate(lengths):
+            by_length[length].append(i)
+        for i in loose:
+            for lb in partner_lengths(lengths[i]):
+                candidates.update((min(i, j), max(i, j)) for j in by_length[lb] if j != i)
+
+    bags = [Counter(n) for n in names]
+    grams = [Counter(g for g, _ in toks) for toks in tokens]
+    survivors = []
+    for i, j in candidates:
+        la, lb = lengths[i], lengths[j]
+        need = _min_lcs(la, lb)
+        if need > min(la, lb):
+            continue
+        if sum((grams[i] & grams[j]).values()) < _min_shared_bigrams(la, lb):
+            continue
+        if sum((bags[i] & bags[j]).values()) < need:
+            continue
+        survivors.append((i, j))
+    survivors.sort()
+    return survivors
 
 
 # ---------------------------------------------------------------------------
@@ -57,9 +175,11 @@ def _similarity(a: str, b: str) -> float:
 class PersonDeduplicationService:
     """Find and merge duplicate person records in the people table."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, fuzzy_workers: Optional[int] = None) -> None:
         self.db_path = db_path
         self._normalizer = NameNormalizer()
+        # Process-pool size for fuzzy LCS scoring (None = CPU count)
+        self.fuzzy_workers = fuzzy_workers or os.cpu_count() or 1
 
     # -- connection helper ---------------------------------------------------
 
@@ -358,35 +478,67 @@ class PersonDeduplicationService:
     ) -> None:
         """Strategy: character-level similarity on normalized names > 0.85.
 
-        To keep the query set manageable we restrict to pairs sharing the same
-        first two characters of last_name (a blocking key).
+        Pairs are restricted to people sharing the same first two characters
+        of last_name (a blocking key).  Within each block only pairs that can
+        still exceed the threshold are scored (see _block_candidates).
         """
         rows = conn.execute(
             """
-            SELECT a.id AS a_id, a.original_name AS a_name,
-                   a.normalized_name AS a_norm,
-                   b.id AS b_id, b.original_name AS b_name,
-                   b.normalized_name AS b_norm
-            FROM people a
-            JOIN people b
-              ON a.id < b.id
-             AND a.last_name IS NOT NULL
-             AND b.last_name IS NOT NULL
-             AND a.last_name != ''
-             AND b.last_name != ''
-             AND SUBSTR(a.last_name, 1, 2) = SUBSTR(b.last_name, 1, 2)
+            SELECT id, original_name, normalized_name, last_name
+            FROM people
+            WHERE last_name IS NOT NULL
+              AND last_name != ''
+            ORDER BY id
             """
         ).fetchall()
 
+        # block key -> normalized name -> [(id, original_name), ...]
+        blocks: dict[str, dict[str, list[tuple[int, str]]]] = defaultdict(lambda: defaultdict(list))
         for r in rows:
-            sim = _similarity(r["a_norm"], r["b_norm"])
-            if sim > 0.85:
-                key = (r["a_id"], r["b_id"])
-                entry = candidates.setdefault(key, self._empty_pair(r))
-                entry["confidence"] = max(entry["confidence"], 0.65)
-                entry["match_reasons"].append(
-                    f"fuzzy_similarity({sim:.2f})"
-                )
+            if r["normalized_name"]:
+                blocks[r["last_name"][:2]][r["normalized_name"]].append((r["id"], r["original_name"]))
+
+        # Distinct-name pairs that need an LCS, plus identical-name groups (similarity 1.0)
+        pending: list[tuple[list, list, str, str]] = []
+        matches: list[tuple[float, list, list]] = []
+        for block in blocks.values():
+            names = list(block)
+            for name in names:
+                if len(block[name]) > 1:
+                    matches.append((1.0, block[name], block[name]))
+            for i, j in _block_candidates(names):
+                pending.append((block[names[i]], block[names[j]], names[i], names[j]))
+
+        for (people_a, people_b, _, _), sim in zip(pending, self._score_name_pairs(
+                [(name_a, name_b) for _, _, name_a, name_b in pending])):
+            if sim > FUZZY_SIMILARITY_THRESHOLD:
+                matches.append((sim, people_a, people_b))
+
+        pairs = []
+        for sim, people_a, people_b in matches:
+            for a_id, a_name in people_a:
+                for b_id, b_name in people_b:
+                    if a_id < b_id:
+                        pairs.append((a_id, a_name, b_id, b_name, sim))
+                    elif b_id < a_id and people_a is not people_b:
+                        pairs.append((b_id, b_name, a_id, a_name, sim))
+        pairs.sort()
+
+        for a_id, a_name, b_id, b_name, sim in pairs:
+            row = {"a_id": a_id, "a_name": a_name, "b_id": b_id, "b_name": b_name}
+            entry = candidates.setdefault((a_id, b_id), self._empty_pair(row))
+            entry["confidence"] = max(entry["confidence"], 0.65)
+            entry["match_reasons"].append(
+                f"fuzzy_similarity({sim:.2f})"
+            )
+
+    def _score_name_pairs(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Similarity for each name pair, across a process pool when the set is large."""
+        if len(pairs) < _POOL_MIN_PAIRS or self.fuzzy_workers <= 1:
+            return _score_pairs(pairs)
+        chunks = [pairs[i:i + _POOL_CHUNK_PAIRS] for i in range(0, len(pairs), _POOL_CHUNK_PAIRS)]
+        with ProcessPoolExecutor(max_workers=self.fuzzy_workers) as pool:
+            return [sim for chunk in pool.map(_score_pairs, chunks) for sim in chunk]
 
     def _apply_shared_org_boost(
         self,
@@ -65,9 +65,11 @@ class ProcessingPipeline:
         self,
         profile: OrganizationProfile,
         config: PipelineConfig,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        progress_service: Optional[Any] = None,
+        progress_workflow_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Execute complete 4-stage pipeline"""
+        """Execute complete 4-stage pipeline (discovery updates also go to progress_service, if given)"""
         
         pipeline_id = f"pipeline_{config.profile_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
@@ -79,7 +81,9 @@ class ProcessingPipeline:
             "stage_results": [],
             "current_opportunities": [],
             "started_at": datetime.now(),
-            "status": "running"
+            "status": "running",
+            "progress_service": progress_service,
+            "progress_workflow_id": progress_workflow_id or pipeline_id
         }
         
         self.active_pipelines[pipeline_id] = pipeline_state
@@ -137,7 +141,9 @@ class ProcessingPipeline:
                 profile=profile,
                 funding_types=config.funding_types,
                 max_results_per_type=config.discovery_limit,
-                progress_callback=lambda sid, data: progress_callback("discovery", data) if progress_callback else None
+                progress_callback=lambda sid, data: progress_callback("discovery", data) if progress_callback else None,
+                progress_service=pipeline_state.get("progress_service"),
+                progress_workflow_id=pipeline_state.get("progress_workflow_id")
             )
             
             # Get raw results
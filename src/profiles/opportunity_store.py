@@ -0,0 +1,606 @@
+"""
+Opportunity Store - Indexed SQLite storage for unified opportunities
+
+One row per (profile_id, opportunity key) in opportunities.db under the
+profiles data directory: indexed columns for the fields searches filter and
+sort on (stage, score, EIN, discovery date, ...) plus the complete
+UnifiedOpportunity as a JSON payload. Reads no longer glob and parse every
+opportunity_*.json file.
+
+Every write also applies its delta to per-profile aggregates (opportunity and
+stage counts, score sums and histogram, discovery dates, promotion counts)
+and to each opportunity's two most recent promotions, so profile analytics
+are read without touching the opportunities themselves. reconcile()
+recomputes the aggregates from the stored rows and repairs any drift.
+
+The opportunity key is the ID without its opp_/lead_ prefix, which is also
+how UnifiedProfileService names opportunity_<key>.json files. Existing JSON
+trees are imported once per profile (migrate_profile / migrate_json_tree).
+
+Filters use the AdvancedSearchService operator names and reproduce its
+semantics in SQL (a missing value never matches; text comparisons are
+case-insensitive with Python's lower()). Filters and sorts on other fields
+are not supported here; callers check supports_filter / supports_sort and
+evaluate those in Python.
+"""
+
+import base64
+import json
+import logging
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Search field (dot path on UnifiedOpportunity) -> indexed column
+FIELD_COLUMNS = {
+    "opportunity_id": "opportunity_id",
+    "organization_name": "organization_name",
+    "ein": "ein",
+    "current_stage": "current_stage",
+    "scoring.overall_score": "overall_score",
+    "discovered_at": "discovered_at",
+    "last_updated": "last_updated",
+    "status": "status",
+    "source": "source",
+    "opportunity_type": "opportunity_type",
+    "funding_amount": "funding_amount",
+}
+NUMERIC_COLUMNS = frozenset({"overall_score", "funding_amount"})
+
+# Filter operators (AdvancedSearchService SearchOperator values)
+TEXT_OPERATORS = frozenset({"equals", "contains", "starts_with", "ends_with", "in", "not_in"})
+NUMERIC_OPERATORS = frozenset({"equals", "gt", "lt", "between", "in", "not_in"})
+
+# Rows per executemany batch when importing JSON trees
+_IMPORT_BATCH = 500
+
+# Aggregates: scores at or above this count as high potential; histogram buckets over [0, 1]
+HIGH_POTENTIAL_SCORE = 0.80
+SCORE_HISTOGRAM_BUCKETS = 10
+# Promotions per opportunity kept for recent activity
+RECENT_PROMOTIONS_PER_OPPORTUNITY = 2
+# Float aggregate differences below this are rounding, not drift
+_AGGREGATE_TOLERANCE = 1e-6
+
+Filter = Tuple[str, str, Any, Any]  # (field, operator, value, value2)
+
+
+def opportunity_key(opportunity_id: str) -> str:
+    """Storage key for an opportunity ID (also its opportunity_<key>.json file name)"""
+    return opportunity_id.replace('opp_', '').replace('lead_', '')
+
+
+def _py_lower(value: Any) -> Optional[str]:
+    return None if value is None else str(value).lower()
+
+
+def _score_bucket(score: float) -> str:
+    """Lower edge of the histogram bucket holding score (0.8 -> "0.8", 1.0 -> "0.9")"""
+    index = min(int(score * SCORE_HISTOGRAM_BUCKETS + 1e-9), SCORE_HISTOGRAM_BUCKETS - 1)
+    return f"{index / SCORE_HISTOGRAM_BUCKETS:.1f}"
+
+
+def aggregate_contributions(data: Dict[str, Any]) -> Counter:
+    """(metric, bucket) -> amount one opportunity adds to its profile's aggregates"""
+    contributions = Counter({("opportunity_count", ""): 1, ("stage", data.get("current_stage") or ""): 1})
+
+    scoring = data.get("scoring")
+    if scoring:
+        score = scoring.get("overall_score") or 0.0
+        contributions[("score_count", "")] += 1
+        contributions[("score_sum", "")] += score
+        contributions[("score_histogram", _score_bucket(score))] += 1
+        if score >= HIGH_POTENTIAL_SCORE:
+            contributions[("high_potential_count", "")] += 1
+        if scoring.get("auto_promotion_eligible"):
+            contributions[("auto_promotion_eligible", "")] += 1
+        if scoring.get("scored_at"):
+            contributions[("scored_at", scoring["scored_at"])] += 1
+
+    discovered_at = data.get("discovered_at")
+    if discovered_at:
+        contributions[("discovered_at", discovered_at)] += 1
+        contributions[("discovery_date", discovered_at[:10])] += 1
+
+    promotions = data.get("promotion_history") or []
+    if promotions:
+        contributions[("promotions", "")] += len(promotions)
+        auto = sum(1 for promo in promotions if promo.get("decision_type") == "auto_promote")
+        if auto:
+            contributions[("auto_promotions", "")] += auto
+    return contributions
+
+
+def _recent_promotion_rows(profile_id: str, key: str, data: Dict[str, Any]) -> List[tuple]:
+    promotions = (data.get("promotion_history") or [])[-RECENT_PROMOTIONS_PER_OPPORTUNITY:]
+    return [
+        (profile_id, key, position, promo.get("promoted_at"), promo.get("decision_type"),
+         promo.get("from_stage"), promo.get("to_stage"), data.get("organization_name"))
+        for position, promo in enumerate(promotions)
+    ]
+
+
+class OpportunityStore:
+    """SQLite-backed opportunity storage with SQL filtering, sorting and paging"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS opportunities (
+            profile_id         TEXT NOT NULL,
+            opportunity_key    TEXT NOT NULL,
+            opportunity_id     TEXT NOT NULL,
+            organization_name  TEXT,
+            ein                TEXT,
+            current_stage      TEXT,
+            overall_score      REAL,
+            discovered_at      TEXT,
+            last_updated       TEXT,
+            status             TEXT,
+            source             TEXT,
+            opportunity_type   TEXT,
+            funding_amount     INTEGER,
+            payload            TEXT NOT NULL,
+            PRIMARY KEY (profile_id, opportunity_key)
+        );
+        CREATE INDEX IF NOT EXISTS idx_opp_profile_discovered ON opportunities(profile_id, discovered_at);
+        CREATE INDEX IF NOT EXISTS idx_opp_profile_stage      ON opportunities(profile_id, current_stage);
+        CREATE INDEX IF NOT EXISTS idx_opp_profile_score      ON opportunities(profile_id, overall_score);
+        CREATE INDEX IF NOT EXISTS idx_opp_stage              ON opportunities(current_stage);
+        CREATE INDEX IF NOT EXISTS idx_opp_score              ON opportunities(overall_score);
+        CREATE INDEX IF NOT EXISTS idx_opp_discovered         ON opportunities(discovered_at);
+        CREATE INDEX IF NOT EXISTS idx_opp_ein                ON opportunities(ein);
+
+        CREATE INDEX IF NOT EXISTS idx_opp_profile_updated    ON opportunities(profile_id, last_updated);
+
+        CREATE TABLE IF NOT EXISTS opportunity_aggregates (
+            profile_id  TEXT NOT NULL,
+            metric      TEXT NOT NULL,
+            bucket      TEXT NOT NULL DEFAULT '',
+            value       REAL NOT NULL,
+            PRIMARY KEY (profile_id, metric, bucket)
+        );
+
+        CREATE TABLE IF NOT EXISTS opportunity_recent_promotions (
+            profile_id         TEXT NOT NULL,
+            opportunity_key    TEXT NOT NULL,
+            position           INTEGER NOT NULL,
+            promoted_at        TEXT,
+            decision_type      TEXT,
+            from_stage         TEXT,
+            to_stage           TEXT,
+            organization_name  TEXT,
+            PRIMARY KEY (profile_id, opportunity_key, position)
+        );
+        CREATE INDEX IF NOT EXISTS idx_recent_promotions ON opportunity_recent_promotions(profile_id, promoted_at);
+
+        CREATE TABLE IF NOT EXISTS migrated_profiles (
+            profile_id   TEXT PRIMARY KEY,
+            migrated_at  TEXT NOT NULL DEFAULT (datetime('now')),
+            imported     INTEGER NOT NULL DEFAULT 0
+        );
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.create_function("py_lower", 1, _py_lower, deterministic=True)
+        has_aggregates = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'opportunity_aggregates'"
+        ).fetchone()
+        self._conn.executescript(self._SCHEMA)
+        self._conn.commit()
+        self._migrated = {row[0] for row in self._conn.execute("SELECT profile_id FROM migrated_profiles")}
+        if not has_aggregates:
+            # Store created before aggregates were maintained: build them once
+            self.reconcile()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _write_transaction(self):
+        """
+        Hold the database write lock from the first read to commit, so an
+        aggregate delta is computed from the rows it replaces even when other
+        stores (or processes) write to the same file.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    @staticmethod
+    def _row(profile_id: str, key: str, data: Dict[str, Any]) -> tuple:
+        scoring = data.get("scoring") or {}
+        return (
+            profile_id, key, data.get("opportunity_id") or key,
+            data.get("organization_name"), data.get("ein"), data.get("current_stage"),
+            scoring.get("overall_score"), data.get("discovered_at"), data.get("last_updated"),
+            data.get("status"), data.get("source"), data.get("opportunity_type"),
+            data.get("funding_amount"),
+            json.dumps(data, ensure_ascii=False, default=str),
+        )
+
+    def upsert_many(self, profile_id: str, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Insert or replace (key, opportunity dict) pairs; returns rows written"""
+        items = dict(items)
+        if not items:
+            return 0
+        with self._write_transaction():
+            # Aggregate delta: remove what the replaced rows contributed, add the new rows
+            deltas = Counter()
+            for data in self._payloads(profile_id, list(items)).values():
+                deltas.subtract(aggregate_contributions(data))
+            for data in items.values():
+                deltas.update(aggregate_contributions(data))
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO opportunities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._row(profile_id, key, data) for key, data in items.items()],
+            )
+            self._apply_aggregate_deltas(profile_id, deltas)
+            self._conn.executemany(
+                "DELETE FROM opportunity_recent_promotions WHERE profile_id = ? AND opportunity_key = ?",
+                [(profile_id, key) for key in items],
+            )
+            self._conn.executemany(
+                "INSERT INTO opportunity_recent_promotions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [row for key, data in items.items() for row in _recent_promotion_rows(profile_id, key, data)],
+            )
+        return len(items)
+
+    def _payloads(self, profile_id: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        payloads = {}
+        for start in range(0, len(keys), _IMPORT_BATCH):
+            chunk = keys[start:start + _IMPORT_BATCH]
+            rows = self._conn.execute(
+                f"SELECT opportunity_key, payload FROM opportunities "
+                f"WHERE profile_id = ? AND opportunity_key IN ({','.join('?' * len(chunk))})",
+                [profile_id, *chunk],
+            )
+            payloads.update((key, json.loads(payload)) for key, payload in rows)
+        return payloads
+
+    def _apply_aggregate_deltas(self, profile_id: str, deltas: Counter) -> None:
+        changed = [(profile_id, metric, bucket, delta) for (metric, bucket), delta in deltas.items() if delta]
+        self._conn.executemany(
+            "INSERT INTO opportunity_aggregates VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(profile_id, metric, bucket) DO UPDATE SET value = value + excluded.value",
+            changed,
+        )
+        # Buckets that dropped to zero go away (distinct discovery dates are counted by rows)
+        self._conn.executemany(
+            "DELETE FROM opportunity_aggregates "
+            "WHERE profile_id = ? AND metric = ? AND bucket = ? AND abs(value) < ?",
+            [(pid, metric, bucket, _AGGREGATE_TOLERANCE) for pid, metric, bucket, _ in changed],
+        )
+
+    def upsert(self, profile_id: str, data: Dict[str, Any]) -> None:
+        self.upsert_many(profile_id, [(opportunity_key(data["opportunity_id"]), data)])
+
+    # ── Migration from the JSON tree ─────────────────────────────────────────
+
+    def is_migrated(self, profile_id: str) -> bool:
+        return profile_id in self._migrated
+
+    def migrate_profile(self, profile_id: str, opportunities_dir: Path, validate=None) -> int:
+        """
+        Import a profile's opportunity_*.json files (once). Files that fail to
+        parse, or that validate() rejects, are logged and skipped as before.
+        """
+        if profile_id in self._migrated:
+            return 0
+
+        imported = 0
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        if opportunities_dir.is_dir():
+            for opp_file in sorted(opportunities_dir.glob("opportunity_*.json")):
+                try:
+                    with open(opp_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if validate is not None:
+                        data = validate(data)
+                except Exception as e:
+                    logger.error(f"Error loading {opp_file}: {e}")
+                    continue
+                batch.append((opp_file.stem[len("opportunity_"):], data))
+                if len(batch) >= _IMPORT_BATCH:
+                    imported += self.upsert_many(profile_id, batch)
+                    batch = []
+        imported += self.upsert_many(profile_id, batch)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO migrated_profiles (profile_id, imported) VALUES (?, ?)",
+                (profile_id, imported),
+            )
+            self._conn.commit()
+        self._migrated.add(profile_id)
+        if imported:
+            logger.info(f"Migrated {imported} opportunities for profile {profile_id} into {self.db_path.name}")
+        return imported
+
+    def migrate_json_tree(self, profiles_dir: Path, validate=None) -> int:
+        """Import every <profile_id>/opportunities directory not yet migrated"""
+        imported = 0
+        for profile_dir in sorted(p for p in Path(profiles_dir).iterdir() if p.is_dir()):
+            if profile_dir.name not in self._migrated:
+                imported += self.migrate_profile(profile_dir.name, profile_dir / "opportunities", validate)
+        return imported
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def get(self, profile_id: str, keys: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Payload for the first of keys that exists"""
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT payload FROM opportunities WHERE profile_id = ? AND opportunity_key = ?",
+                    (profile_id, key),
+                ).fetchone()
+                if row:
+                    return json.loads(row[0])
+        return None
+
+    @staticmethod
+    def supports_sort(field: str) -> bool:
+        return field in FIELD_COLUMNS
+
+    @staticmethod
+    def supports_filter(field: str, operator: str, value: Any, value2: Any = None) -> bool:
+        """Whether the filter can be evaluated in SQL with the same result as in Python"""
+        column = FIELD_COLUMNS.get(field)
+        if column is None:
+            return False
+        numeric = column in NUMERIC_COLUMNS
+        if operator not in (NUMERIC_OPERATORS if numeric else TEXT_OPERATORS):
+            return False
+
+        def typed(v):
+            if numeric:
+                return isinstance(v, (int, float)) and not isinstance(v, bool)
+            return isinstance(v, str)
+
+        if operator in ("in", "not_in"):
+            return not isinstance(value, list) or all(typed(v) for v in value)
+        if operator in ("gt", "lt", "between"):
+            try:
+                float(value)
+                if operator == "between" and value2 is not None:
+                    float(value2)
+            except (TypeError, ValueError):
+                return False
+            return True
+        if operator == "equals":
+            return typed(value)
+        return True
+
+    @staticmethod
+    def _filter_sql(field: str, operator: str, value: Any, value2: Any) -> Tuple[str, list]:
+        column = FIELD_COLUMNS[field]
+        if operator == "equals":
+            return f"{column} = ?", [value]
+        if operator in ("contains", "starts_with", "ends_with"):
+            needle = str(value).lower()
+            if not needle:
+                return f"{column} IS NOT NULL", []
+            test = {
+                "contains": "instr(py_lower({c}), ?) > 0",
+                "starts_with": "substr(py_lower({c}), 1, length(?)) = ?",
+                "ends_with": "length(py_lower({c})) >= length(?) AND substr(py_lower({c}), -length(?)) = ?",
+            }[operator].format(c=column)
+            return f"{column} IS NOT NULL AND {test}", [needle] * test.count("?")
+        if operator == "gt":
+            return f"{column} > ?", [float(value)]
+        if operator == "lt":
+            return f"{column} < ?", [float(value)]
+        if operator == "between":
+            if value2 is None:
+                return "0", []
+            return f"{column} BETWEEN ? AND ?", [float(value), float(value2)]
+        if operator == "in":
+            if not isinstance(value, list) or not value:
+                return "0", []
+            return f"{column} IN ({','.join('?' * len(value))})", list(value)
+        if operator == "not_in":
+            if not isinstance(value, list) or not value:
+                return f"{column} IS NOT NULL", []
+            return f"{column} IS NOT NULL AND {column} NOT IN ({','.join('?' * len(value))})", list(value)
+        raise ValueError(f"Unsupported operator: {operator}")
+
+    def _where(self, profile_id: Optional[str], filters: Sequence[Filter]) -> Tuple[str, list]:
+        clauses, params = [], []
+        if profile_id is not None:
+            clauses.append("profile_id = ?")
+            params.append(profile_id)
+        for field, operator, value, value2 in filters:
+            clause, clause_params = self._filter_sql(field, operator, value, value2)
+            clauses.append(f"({clause})")
+            params.extend(clause_params)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @staticmethod
+    def _order_keys(sort_by: Optional[str], descending: bool) -> List[Tuple[str, bool]]:
+        """(expression, descending) sort keys, ending in the unique row key"""
+        # Newest discoveries first, as get_profile_opportunities always returned them
+        default = [("COALESCE(discovered_at, '1900-01-01')", True),
+                   ("profile_id", False), ("opportunity_key", False)]
+        if sort_by is None:
+            return default
+        column = FIELD_COLUMNS[sort_by]
+        expr = column if column in NUMERIC_COLUMNS else f"py_lower({column})"
+        # Missing values sort last in either direction; ties keep the default order
+        return [(f"({column} IS NULL)", False), (expr, descending)] + default
+
+    def count(self, profile_id: Optional[str] = None, filters: Sequence[Filter] = ()) -> int:
+        where, params = self._where(profile_id, filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM opportunities{where}", params).fetchone()[0]
+
+    def query(
+        self,
+        profile_id: Optional[str] = None,
+        filters: Sequence[Filter] = (),
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Matching opportunity payloads in sort order.
+
+        Pages either by limit/offset or, for deep pages, by keyset: pass the
+        cursor returned with the previous page as after (offset is then
+        ignored). Returns (payloads, cursor for the next page or None when
+        this is the last one).
+        """
+        where, params = self._where(profile_id, filters)
+        keys = self._order_keys(sort_by, descending)
+
+        if after is not None:
+            last = json.loads(base64.urlsafe_b64decode(after.encode()).decode())
+            # Row strictly after the cursor: equal on a prefix of the keys, then past it on the next
+            disjuncts, keyset_params = [], []
+            for i, (expr, desc) in enumerate(keys):
+                terms = [f"{e} IS ?" for e, _ in keys[:i]] + [f"{expr} {'<' if desc else '>'} ?"]
+                disjuncts.append("(" + " AND ".join(terms) + ")")
+                keyset_params.extend(last[:i + 1])
+            where += (" AND " if where else " WHERE ") + "(" + " OR ".join(disjuncts) + ")"
+            params += keyset_params
+            offset = 0
+
+        order = ", ".join(f"{expr} {'DESC' if desc else 'ASC'}" for expr, desc in keys)
+        sql = (f"SELECT payload, {', '.join(expr for expr, _ in keys)} "
+               f"FROM opportunities{where} ORDER BY {order}")
+        if limit is not None or offset:
+            # One extra row tells whether another page follows
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit + 1 if limit is not None else -1, max(0, offset)]
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            if rows:
+                cursor = base64.urlsafe_b64encode(json.dumps(list(rows[-1][1:])).encode()).decode()
+        return [json.loads(row[0]) for row in rows], cursor
+
+    # ── Aggregates ───────────────────────────────────────────────────────────
+
+    def analytics(self, profile_id: str, recent_dates: int = 3, recent_promotions: int = 3) -> Dict[str, Any]:
+        """
+        Profile aggregates, read without scanning opportunities.
+
+        Returns counts keyed by metric ("opportunity_count", "score_sum", ...),
+        "stages" and "score_histogram" dicts, "last_scored" / "last_discovery"
+        maxima, "discovery_sessions" (distinct discovery dates) with the
+        "recent_discovery_dates" [(date, count)], and "recent_promotions" rows.
+        """
+        with self._lock:
+            result: Dict[str, Any] = {"stages": {}, "score_histogram": {}}
+            for metric, bucket, value in self._conn.execute(
+                "SELECT metric, bucket, value FROM opportunity_aggregates "
+                "WHERE profile_id = ? AND metric NOT IN ('scored_at', 'discovered_at', 'discovery_date')",
+                (profile_id,),
+            ):
+                if metric == "stage":
+                    result["stages"][bucket] = int(value)
+                elif metric == "score_histogram":
+                    result["score_histogram"][bucket] = int(value)
+                else:
+                    result[metric] = value
+
+            def max_bucket(metric):
+                return self._conn.execute(
+                    "SELECT MAX(bucket) FROM opportunity_aggregates WHERE profile_id = ? AND metric = ?",
+                    (profile_id, metric),
+                ).fetchone()[0]
+
+            result["last_scored"] = max_bucket("scored_at")
+            result["last_discovery"] = max_bucket("discovered_at")
+            result["discovery_sessions"] = self._conn.execute(
+                "SELECT COUNT(*) FROM opportunity_aggregates WHERE profile_id = ? AND metric = 'discovery_date'",
+                (profile_id,),
+            ).fetchone()[0]
+            result["recent_discovery_dates"] = [
+                (bucket, int(value)) for bucket, value in self._conn.execute(
+                    "SELECT bucket, value FROM opportunity_aggregates "
+                    "WHERE profile_id = ? AND metric = 'discovery_date' ORDER BY bucket DESC LIMIT ?",
+                    (profile_id, recent_dates),
+                )
+            ]
+            columns = ("promoted_at", "decision_type", "from_stage", "to_stage", "organization_name")
+            result["recent_promotions"] = [
+                dict(zip(columns, row)) for row in self._conn.execute(
+                    f"SELECT {', '.join(columns)} FROM opportunity_recent_promotions "
+                    f"WHERE profile_id = ? ORDER BY COALESCE(promoted_at, '') DESC LIMIT ?",
+                    (profile_id, recent_promotions),
+                )
+            ]
+        return result
+
+    def reconcile(self, profile_id: Optional[str] = None) -> List[str]:
+        """
+        Recompute aggregates from the stored opportunities (one profile, or all)
+        and repair any that drifted. Returns the profile IDs that were repaired.
+        """
+        with self._write_transaction():
+            if profile_id is None:
+                profile_ids = [row[0] for row in self._conn.execute(
+                    "SELECT profile_id FROM opportunities UNION SELECT profile_id FROM opportunity_aggregates"
+                )]
+            else:
+                profile_ids = [profile_id]
+
+            repaired = []
+            for pid in profile_ids:
+                expected, promotions = Counter(), []
+                for key, payload in self._conn.execute(
+                    "SELECT opportunity_key, payload FROM opportunities WHERE profile_id = ?", (pid,)
+                ):
+                    data = json.loads(payload)
+                    expected.update(aggregate_contributions(data))
+                    promotions.extend(_recent_promotion_rows(pid, key, data))
+
+                stored = {
+                    (metric, bucket): value for metric, bucket, value in self._conn.execute(
+                        "SELECT metric, bucket, value FROM opportunity_aggregates WHERE profile_id = ?", (pid,)
+                    )
+                }
+                stored_promotions = self._conn.execute(
+                    "SELECT * FROM opportunity_recent_promotions WHERE profile_id = ? "
+                    "ORDER BY opportunity_key, position", (pid,)
+                ).fetchall()
+
+                drifted = set(stored) != {k for k, v in expected.items() if abs(v) >= _AGGREGATE_TOLERANCE} or any(
+                    abs(stored[k] - expected[k]) >= _AGGREGATE_TOLERANCE for k in stored
+                )
+                if drifted or stored_promotions != sorted(promotions, key=lambda row: (row[1], row[2])):
+                    self._conn.execute("DELETE FROM opportunity_aggregates WHERE profile_id = ?", (pid,))
+                    self._conn.execute("DELETE FROM opportunity_recent_promotions WHERE profile_id = ?", (pid,))
+                    self._apply_aggregate_deltas(pid, expected)
+                    self._conn.executemany(
+                        "INSERT INTO opportunity_recent_promotions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", promotions
+                    )
+                    repaired.append(pid)
+
+        if repaired:
+            logger.warning(f"Reconciled drifted opportunity aggregates for {len(repaired)} profile(s)")
+        return repaired
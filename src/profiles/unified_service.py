@@ -6,6 +6,7 @@ Handles the new unified architecture with:
 - Single profile.json with embedded analytics
 - Individual opportunity files in opportunities/ subdirectory
 - Single source of truth per opportunity with complete lifecycle data
+- Indexed opportunity store (opportunities.db) serving opportunity reads
 """
 
 import json
@@ -19,6 +20,7 @@ from .models import (
     PipelineStage, ScoringResult, StageAnalysis, UserAssessment,
     PromotionEvent, StageTransition, RecentActivity, DiscoverySession
 )
+from .opportunity_store import OpportunityStore, opportunity_key
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -33,6 +35,9 @@ class UnifiedProfileService:
         
         # Ensure base directory exists
         self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        # Indexed opportunity storage; JSON files are imported on first access per profile
+        self.opportunity_store = OpportunityStore(self.data_dir / "opportunities.db")
     
     # ============================================================================
     # PROFILE OPERATIONS
@@ -359,26 +364,24 @@ class UnifiedProfileService:
             if not profile:
                 return {}
 
-            # Get all opportunities for this profile
-            opportunities = self.get_profile_opportunities(profile_id)
+            # Stage counts come from the maintained aggregates, not a scan
+            self.ensure_opportunities_migrated(profile_id)
+            aggregates = self.opportunity_store.analytics(profile_id, recent_dates=0, recent_promotions=0)
 
             # Calculate stage distribution
             stage_distribution = {}
-            for opp in opportunities:
-                stage = opp.current_stage or 'DISCOVER'
-                stage_distribution[stage] = stage_distribution.get(stage, 0) + 1
+            for stage, count in aggregates['stages'].items():
+                stage = stage or 'DISCOVER'
+                stage_distribution[stage] = stage_distribution.get(stage, 0) + count
 
             # Calculate conversion metrics
-            total_opps = len(opportunities)
-            approach_stage = sum(1 for o in opportunities if o.current_stage == 'APPROACH')
+            total_opps = int(aggregates.get('opportunity_count', 0))
+            approach_stage = aggregates['stages'].get('APPROACH', 0)
             conversion_rate = (approach_stage / total_opps * 100) if total_opps > 0 else 0
 
             # Get recent activity
-            recent_updates = sorted(
-                opportunities,
-                key=lambda o: o.last_updated or '',
-                reverse=True
-            )[:10]
+            payloads, _ = self.opportunity_store.query(profile_id, sort_by='last_updated', limit=10)
+            recent_updates = [UnifiedOpportunity(**data) for data in payloads]
 
             return {
                 "total_opportunities": total_opps,
@@ -411,7 +414,16 @@ class UnifiedProfileService:
         opportunities_dir = self.data_dir / profile_id / "opportunities"
         
         # Try different possible filename formats to handle legacy naming
-        clean_id = opportunity_id.replace('opp_', '').replace('lead_', '')
+        clean_id = opportunity_key(opportunity_id)
+        try:
+            self.ensure_opportunities_migrated(profile_id)
+            data = self.opportunity_store.get(profile_id, [opportunity_id, clean_id])
+            if data is not None:
+                return UnifiedOpportunity(**data)
+        except Exception as e:
+            logger.error(f"Error loading opportunity {opportunity_id} from store: {e}")
+        
+        # Files outside the opportunity_*.json naming are not in the store
         possible_files = [
             opportunities_dir / f"{opportunity_id}.json",
             opportunities_dir / f"opportunity_{opportunity_id}.json",
@@ -441,14 +453,17 @@ class UnifiedProfileService:
             opportunities_dir.mkdir(parents=True, exist_ok=True)
             
             # Use consistent filename format
-            opp_file = opportunities_dir / f"opportunity_{opportunity.opportunity_id.replace('opp_', '').replace('lead_', '')}.json"
+            opp_file = opportunities_dir / f"opportunity_{opportunity_key(opportunity.opportunity_id)}.json"
             
             # Update timestamp
             opportunity.last_updated = datetime.now().isoformat()
             
-            # Save opportunity
+            # Save opportunity to the store, keeping the JSON file as an export mirror
+            self.ensure_opportunities_migrated(profile_id)
+            data = opportunity.model_dump(mode="json")
+            self.opportunity_store.upsert(profile_id, data)
             with open(opp_file, 'w', encoding='utf-8') as f:
-                json.dump(opportunity.model_dump(), f, indent=2, ensure_ascii=False)
+                json.dump(data, f, indent=2, ensure_ascii=False)
             
             logger.info(f"Opportunity {opportunity.opportunity_id} saved successfully")
             return True
@@ -459,42 +474,38 @@ class UnifiedProfileService:
     
     def get_profile_opportunities(self, profile_id: str, stage_filter: Optional[str] = None) -> List[UnifiedOpportunity]:
         """Get all opportunities for a profile, optionally filtered by stage"""
-        opportunities_dir = self.data_dir / profile_id / "opportunities"
-        
-        if not opportunities_dir.exists():
-            logger.info(f"No opportunities directory for profile {profile_id}")
-            return []
-        
-        opportunities = []
-        
         try:
-            for opp_file in opportunities_dir.glob("opportunity_*.json"):
+            self.ensure_opportunities_migrated(profile_id)
+            
+            filters = [("current_stage", "equals", stage_filter, None)] if stage_filter is not None else []
+            # Sorted by discovery date (newest first)
+            payloads, _ = self.opportunity_store.query(profile_id, filters)
+            
+            opportunities = []
+            for data in payloads:
                 try:
-                    with open(opp_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    opportunity = UnifiedOpportunity(**data)
-                    
-                    # Apply stage filter if specified
-                    if stage_filter is None or opportunity.current_stage == stage_filter:
-                        opportunities.append(opportunity)
-                        
+                    opportunities.append(UnifiedOpportunity(**data))
                 except Exception as e:
-                    logger.error(f"Error loading {opp_file}: {e}")
+                    logger.error(f"Error loading opportunity {data.get('opportunity_id')}: {e}")
                     continue
             
-            # Sort by discovery date (newest first)
-            opportunities.sort(
-                key=lambda x: x.discovered_at or "1900-01-01", 
-                reverse=True
-            )
-            
             return opportunities
             
         except Exception as e:
             logger.error(f"Error getting opportunities for {profile_id}: {e}")
             return []
 
+    def ensure_opportunities_migrated(self, profile_id: Optional[str] = None) -> int:
+        """Import opportunity JSON files into the store (one profile, or all when None); returns rows imported"""
+        validate = lambda data: UnifiedOpportunity(**data).model_dump(mode="json")
+        if profile_id is None:
+            return self.opportunity_store.migrate_json_tree(self.data_dir, validate)
+        if self.opportunity_store.is_migrated(profile_id):
+            return 0
+        return self.opportunity_store.migrate_profile(
+            profile_id, self.data_dir / profile_id / "opportunities", validate
+        )
+
     # ============================================================================
     # DISCOVERY SESSION MANAGEMENT - NO LOCKING NEEDED
     # ============================================================================
@@ -880,14 +891,11 @@ class UnifiedProfileService:
     # ============================================================================
     
     def refresh_profile_analytics(self, profile_id: str) -> bool:
-        """Recompute profile analytics from current opportunities"""
+        """Refresh profile analytics from the incrementally maintained opportunity aggregates"""
         
         try:
-            # Get all opportunities
-            opportunities = self.get_profile_opportunities(profile_id)
-            
-            # Compute analytics
-            analytics = self._compute_analytics(opportunities)
+            self.ensure_opportunities_migrated(profile_id)
+            aggregates = self.opportunity_store.analytics(profile_id)
             
             # Get and update profile
             profile = self.get_profile(profile_id)
@@ -895,8 +903,8 @@ class UnifiedProfileService:
                 logger.error(f"Profile {profile_id} not found for analytics refresh")
                 return False
             
-            profile.analytics = analytics
-            profile.recent_activity = self._generate_recent_activity(opportunities)
+            profile.analytics = self._compute_analytics(aggregates)
+            profile.recent_activity = self._generate_recent_activity(aggregates)
             
             # Save updated profile
             return self.save_profile(profile)
@@ -905,86 +913,75 @@ class UnifiedProfileService:
             logger.error(f"Error refreshing analytics for {profile_id}: {e}")
             return False
     
-    def _compute_analytics(self, opportunities: List[UnifiedOpportunity]) -> ProfileAnalytics:
-        """Compute analytics from opportunities"""
+    def reconcile_profile_analytics(self, profile_id: Optional[str] = None) -> List[str]:
+        """
+        Verify opportunity aggregates against the full opportunity data (one
+        profile, or all) and repair drift; repaired profiles get their stored
+        analytics refreshed. Returns the repaired profile IDs.
+        """
+        try:
+            self.ensure_opportunities_migrated(profile_id)
+            repaired = self.opportunity_store.reconcile(profile_id)
+            for repaired_id in repaired:
+                self.refresh_profile_analytics(repaired_id)
+            return repaired
+            
+        except Exception as e:
+            logger.error(f"Error reconciling analytics: {e}")
+            return []
+    
+    def _compute_analytics(self, aggregates: Dict[str, Any]) -> ProfileAnalytics:
+        """Compute analytics from opportunity aggregates"""
         
-        if not opportunities:
+        opportunity_count = int(aggregates.get('opportunity_count', 0))
+        if not opportunity_count:
             return ProfileAnalytics()
         
-        # Stage distribution
-        stages_dist = {}
-        for opp in opportunities:
-            stage = opp.current_stage
-            stages_dist[stage] = stages_dist.get(stage, 0) + 1
-        
         # Scoring statistics
-        scores = [opp.scoring.overall_score for opp in opportunities if opp.scoring]
-        high_potential_count = len([s for s in scores if s >= 0.80])
-        auto_promotion_eligible = len([opp for opp in opportunities 
-                                     if opp.scoring and opp.scoring.auto_promotion_eligible])
-        
+        score_count = aggregates.get('score_count', 0)
         scoring_stats = {
-            'avg_score': round(sum(scores) / len(scores), 3) if scores else 0.0,
-            'high_potential_count': high_potential_count,
-            'auto_promotion_eligible': auto_promotion_eligible,
-            'last_scored': max((opp.scoring.scored_at for opp in opportunities 
-                               if opp.scoring and opp.scoring.scored_at), default=None)
+            'avg_score': round(aggregates.get('score_sum', 0.0) / score_count, 3) if score_count else 0.0,
+            'high_potential_count': int(aggregates.get('high_potential_count', 0)),
+            'auto_promotion_eligible': int(aggregates.get('auto_promotion_eligible', 0)),
+            'last_scored': aggregates.get('last_scored'),
+            'score_histogram': dict(sorted(aggregates.get('score_histogram', {}).items()))
         }
         
-        # Discovery statistics  
-        discovery_dates = set()
-        for opp in opportunities:
-            if opp.discovered_at:
-                date = opp.discovered_at[:10]  # Just date part
-                discovery_dates.add(date)
-        
-        last_discovery = max((opp.discovered_at for opp in opportunities if opp.discovered_at), default=None)
-        last_session_results = len([opp for opp in opportunities 
-                                   if opp.discovered_at and opp.discovered_at.startswith(last_discovery[:10])]) if last_discovery else 0
-        
+        # Discovery statistics (the latest discovery date holds the latest discovery)
+        recent_dates = aggregates.get('recent_discovery_dates', [])
         discovery_stats = {
-            'total_sessions': len(discovery_dates),
-            'last_discovery': last_discovery,
-            'last_session_results': last_session_results,
-            'avg_results_per_session': len(opportunities) / max(len(discovery_dates), 1)
+            'total_sessions': aggregates.get('discovery_sessions', 0),
+            'last_discovery': aggregates.get('last_discovery'),
+            'last_session_results': recent_dates[0][1] if recent_dates else 0,
+            'avg_results_per_session': opportunity_count / max(aggregates.get('discovery_sessions', 0), 1)
         }
         
         # Promotion statistics
-        total_promotions = sum(len(opp.promotion_history) for opp in opportunities)
-        auto_promotions = sum(1 for opp in opportunities for promo in opp.promotion_history 
-                             if promo.decision_type == 'auto_promote')
+        total_promotions = int(aggregates.get('promotions', 0))
+        auto_promotions = int(aggregates.get('auto_promotions', 0))
         
         promotion_stats = {
             'total_promotions': total_promotions,
             'auto_promotions': auto_promotions,
             'manual_promotions': total_promotions - auto_promotions,
-            'promotion_rate': round(total_promotions / len(opportunities), 2) if opportunities else 0.0
+            'promotion_rate': round(total_promotions / opportunity_count, 2)
         }
         
         return ProfileAnalytics(
-            opportunity_count=len(opportunities),
-            stages_distribution=stages_dist,
+            opportunity_count=opportunity_count,
+            stages_distribution=aggregates.get('stages', {}),
             scoring_stats=scoring_stats,
             discovery_stats=discovery_stats,
             promotion_stats=promotion_stats
         )
     
-    def _generate_recent_activity(self, opportunities: List[UnifiedOpportunity]) -> List[RecentActivity]:
-        """Generate recent activity from opportunities"""
+    def _generate_recent_activity(self, aggregates: Dict[str, Any]) -> List[RecentActivity]:
+        """Generate recent activity from opportunity aggregates"""
         
         activities = []
         
-        # Add discovery sessions
-        discovery_by_date = {}
-        for opp in opportunities:
-            if opp.discovered_at:
-                date = opp.discovered_at[:10]
-                if date not in discovery_by_date:
-                    discovery_by_date[date] = 0
-                discovery_by_date[date] += 1
-        
         # Recent discovery sessions
-        for date, count in sorted(discovery_by_date.items(), reverse=True)[:3]:
+        for date, count in aggregates.get('recent_discovery_dates', []):
             activities.append(RecentActivity(
                 type='discovery_session',
                 date=f"{date}T12:00:00",
@@ -992,22 +989,14 @@ class UnifiedProfileService:
                 source='Multiple Sources'
             ))
         
-        # Recent promotions
-        recent_promotions = []
-        for opp in opportunities:
-            for promo in opp.promotion_history[-2:]:  # Last 2 promotions per opportunity
-                recent_promotions.append((promo, opp.organization_name))
-        
-        # Sort by date and take most recent
-        recent_promotions.sort(key=lambda x: x[0].promoted_at or '', reverse=True)
-        
-        for promo, org_name in recent_promotions[:3]:
+        # Recent promotions (last 2 per opportunity, most recent first)
+        for promo in aggregates.get('recent_promotions', []):
             activities.append(RecentActivity(
-                type='auto_promotion' if promo.decision_type == 'auto_promote' else 'manual_promotion',
-                date=promo.promoted_at,
-                opportunity=org_name,
-                from_stage=promo.from_stage,
-                to_stage=promo.to_stage
+                type='auto_promotion' if promo['decision_type'] == 'auto_promote' else 'manual_promotion',
+                date=promo['promoted_at'],
+                opportunity=promo['organization_name'],
+                from_stage=promo['from_stage'],
+                to_stage=promo['to_stage']
             ))
         
         # Sort all activities by date
@@ -33,7 +33,9 @@ class ProfileWorkflowIntegrator:
         profile_id: str, 
         funding_types: Optional[List[FundingType]] = None,
         max_results_per_type: int = 100,
-        progress_callback: Optional[Any] = None
+        progress_callback: Optional[Any] = None,
+        progress_service: Optional[Any] = None,
+        progress_workflow_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Discover opportunities for a specific profile using the new multi-track discovery engine
@@ -43,6 +45,8 @@ class ProfileWorkflowIntegrator:
             funding_types: Types of funding to search for
             max_results_per_type: Maximum results per funding type
             progress_callback: Optional callback for progress updates
+            progress_service: Optional websocket ProgressService for live updates
+            progress_workflow_id: Workflow id the live updates are broadcast under
             
         Returns:
             Dictionary with discovery results and metadata
@@ -57,11 +61,14 @@ class ProfileWorkflowIntegrator:
             profile=profile,
             funding_types=funding_types,
             max_results_per_type=max_results_per_type,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            progress_service=progress_service,
+            progress_workflow_id=progress_workflow_id
         )
         
-        # Get session results
-        session_results = discovery_engine.get_session_results(discovery_session.session_id)
+        # Results are streamed from the session store; counts and averages
+        # come from its running totals
+        result_store = discovery_engine.get_session_store(discovery_session.session_id)
         session_summary = discovery_engine.get_session_summary(discovery_session.session_id)
         
         # Convert discovery results to the expected format for backward compatibility
@@ -69,7 +76,7 @@ class ProfileWorkflowIntegrator:
         
         # Group results by funding type
         for funding_type in discovery_session.funding_types:
-            type_results = [r for r in session_results if r.source_type == funding_type]
+            type_results = result_store.iter_results(funding_type=funding_type) if result_store else []
             
             if discovery_session.errors_by_type.get(funding_type):
                 discovery_results[funding_type.value] = {
@@ -103,6 +110,8 @@ class ProfileWorkflowIntegrator:
                         "schedule_i_match_data": result.schedule_i_match_data
                     }
                     opportunities.append(opportunity)
+                # Best first, ties in discovery order
+                opportunities.sort(key=lambda opp: -(opp["compatibility_score"] or 0.0))
                 
                 discovery_results[funding_type.value] = {
                     "status": "completed",
@@ -111,16 +120,16 @@ class ProfileWorkflowIntegrator:
                     "opportunities": opportunities,
                     "metadata": {
                         "discoverer_used": f"Multi-Track Discovery Engine",
-                        "avg_compatibility_score": sum(r.compatibility_score for r in type_results) / len(type_results) if type_results else 0,
-                        "top_matches": len([r for r in type_results if r.compatibility_score > 0.7]),
+                        "avg_compatibility_score": result_store.average_score(funding_type) if result_store else 0,
+                        "top_matches": result_store.top_matches_by_type.get(funding_type, 0) if result_store else 0,
                     }
                 }
         
         # Enhanced: Save raw results to unified service
         unified_integration_results = None
         try:
-            # Get raw discovery results for unified service integration
-            raw_session_results = discovery_engine.get_session_results(discovery_session.session_id)
+            # Stream raw discovery results into the unified service in one pass
+            raw_session_results = result_store.iter_results() if result_store else []
             
             # Save to unified service using adapter
             unified_integration_results = await self.discovery_adapter.save_discovery_results(
@@ -566,7 +575,9 @@ class ProfileWorkflowIntegrator:
         profile_id: str,
         funding_types: Optional[List[FundingType]] = None,
         priority: ProcessingPriority = ProcessingPriority.STANDARD,
-        progress_callback: Optional[Any] = None
+        progress_callback: Optional[Any] = None,
+        progress_service: Optional[Any] = None,
+        progress_workflow_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Execute complete 4-stage pipeline: Discovery → Pre-scoring → Deep Analysis → Recommendations
@@ -599,7 +610,9 @@ class ProfileWorkflowIntegrator:
         pipeline_results = await pipeline_engine.execute_pipeline(
             profile=profile,
             config=pipeline_config,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            progress_service=progress_service,
+            progress_workflow_id=progress_workflow_id
         )
         
         # Store final recommendations as opportunity leads
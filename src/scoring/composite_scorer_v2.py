@@ -38,10 +38,12 @@ Phase 3, Week 6 Implementation
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from ..profiles.models import OrganizationProfile, ScheduleIGrantee
-from .ntee_scorer import NTEEScorer, NTEEDataSource
+from .ntee_scorer import NTEEScorer, NTEEDataSource, NTEECode
 from .schedule_i_voting import ScheduleIVotingSystem
 from .grant_size_scoring import GrantSizeScorer
 from .time_decay_utils import TimeDecayCalculator, DecayType
@@ -51,6 +53,8 @@ from .scoring_config import (
     THRESHOLD_ABSTAIN_LOWER,
     THRESHOLD_ABSTAIN_UPPER,
     NTEE_MAX_CONTRIBUTION,
+    NTEE_MAJOR_WEIGHT,
+    NTEE_LEAF_WEIGHT,
 )
 
 
@@ -253,6 +257,313 @@ class CompositeScoreV2:
             abstain_reason=abstain_reason,
         )
 
+    def score_many(self,
+                   profile: OrganizationProfile,
+                   foundations: Sequence[FoundationOpportunityData],
+                   top_k: Optional[int] = None) -> List[Tuple[FoundationOpportunityData, CompositeScoreResult]]:
+        """
+        Score one profile against many foundations (e.g. 5-10k BMF private foundations)
+
+        The profile side (NTEE parsing, state, revenue) is prepared once, per-foundation
+        inputs are gathered into columns, and the eight components, weighting,
+        recommendation and confidence are evaluated over NumPy arrays. Lookups that only
+        depend on a foundation value (NTEE code, filing year, grant amount) are memoized.
+        Every result is identical to score_foundation_match(profile, foundation).
+
+        Args:
+            profile: Applicant organization profile
+            foundations: Foundations to screen
+            top_k: Only build results for the k best scores (None = all)
+
+        Returns:
+            (foundation, result) pairs sorted by final_score descending, ties in input order
+        """
+        n = len(foundations)
+        if n == 0 or (top_k is not None and top_k <= 0):
+            return []
+
+        now = datetime.now()
+        w = COMPOSITE_WEIGHTS_V2
+
+        # Component 1: NTEE Alignment (row-wise best pair, columnar finish)
+        ntee_raw, ntee_conf, ntee_decay, ntee_explanations = self._ntee_columns(profile, foundations, now)
+        ntee = np.minimum(ntee_raw * ntee_conf * ntee_decay * 100.0, NTEE_MAX_CONTRIBUTION * 100.0)
+
+        # Gather remaining per-foundation inputs into columns
+        has_ntee = np.zeros(n, dtype=bool)
+        has_states = np.zeros(n, dtype=bool)
+        state_match = np.zeros(n, dtype=bool)
+        assets = np.full(n, np.nan)
+        accepts = np.full(n, -1, dtype=np.int8)
+        filing_year = np.zeros(n, dtype=np.int64)
+        coherence = np.full(n, 50.0)
+        boost = np.zeros(n)
+        many_recipients = np.zeros(n, dtype=bool)
+        grant_size = np.full(n, 50.0)
+        schedule_i_analyses: List[Optional[Dict]] = [None] * n
+        grant_size_analyses: List[Optional[Dict]] = [None] * n
+
+        profile_state = profile.state
+        profile_revenue = profile.revenue
+        grant_fit_memo: Dict[float, Tuple[float, Optional[Dict]]] = {}
+
+        for i, foundation in enumerate(foundations):
+            has_ntee[i] = bool(foundation.ntee_codes)
+            if foundation.geographic_focus_states:
+                has_states[i] = True
+                state_match[i] = bool(profile_state) and profile_state in foundation.geographic_focus_states
+            if foundation.total_assets:
+                assets[i] = foundation.total_assets
+            if foundation.accepts_applications is not None:
+                accepts[i] = 1 if foundation.accepts_applications else 0
+            if foundation.most_recent_filing_year:
+                filing_year[i] = foundation.most_recent_filing_year
+            if foundation.schedule_i_grantees:
+                coherence[i], boost[i], analysis = self._score_recipient_coherence(foundation)
+                schedule_i_analyses[i] = analysis
+                many_recipients[i] = analysis.get('total_recipients', 0) >= 10
+            if foundation.typical_grant_amount and profile_revenue:
+                amount = foundation.typical_grant_amount
+                if amount not in grant_fit_memo:
+                    grant_fit_memo[amount] = self._score_grant_size_fit(profile, foundation)
+                grant_size[i], grant_size_analyses[i] = grant_fit_memo[amount]
+
+        # Component 2: Geographic Match
+        geo = np.where(~has_states, 50.0, np.where(state_match, 100.0, 25.0 if not profile_state else 0.0))
+
+        # Component 4: Financial Capacity
+        missing_assets = np.isnan(assets)
+        financial = np.select(
+            [missing_assets, assets > 50_000_000, assets > 10_000_000, assets > 1_000_000, assets > 100_000],
+            [50.0, 100.0, 85.0, 70.0, 50.0],
+            default=25.0,
+        )
+
+        # Component 6: Application Policy
+        application = np.select([accepts == 1, accepts == 0], [100.0, 20.0], default=60.0)
+
+        # Component 7: Filing Recency (one decay evaluation per distinct year)
+        has_year = filing_year != 0
+        years, inverse = np.unique(filing_year, return_inverse=True)
+        year_decay = np.array([
+            self.time_decay.calculate_decay(max(0.0, (now.year - int(year)) * 12)) if year else 0.9
+            for year in years
+        ])
+        filing_decay = year_decay[inverse]
+        filing = np.where(has_year, filing_decay * 100.0, 50.0)
+
+        # Component 8: Foundation Type
+        foundation_type = np.full(n, 75.0)
+
+        # Weighted final score, same operation order as the scalar path
+        final = (
+            ntee * w['ntee_alignment'] +
+            geo * w['geographic_match'] +
+            coherence * w['recipient_coherence'] +
+            financial * w['financial_capacity'] +
+            grant_size * w['grant_size_fit'] +
+            application * w['application_policy'] +
+            filing * w['filing_recency'] +
+            foundation_type * w['foundation_type']
+        )
+        final = final + boost * 100.0
+        final = final * filing_decay
+        final = np.minimum(100.0, final)
+
+        # Recommendation codes: 0 borderline, 1 no NTEE, 2 low NTEE, 3 geo mismatch, 4 PASS, 5 FAIL
+        decision = np.select(
+            [
+                (THRESHOLD_ABSTAIN_LOWER <= final) & (final <= THRESHOLD_ABSTAIN_UPPER),
+                ~has_ntee,
+                ntee < 20.0,
+                (geo == 0.0) & has_states,
+                final >= THRESHOLD_DEFAULT,
+            ],
+            [0, 1, 2, 3, 4],
+            default=5,
+        )
+
+        # Confidence
+        years_old = now.year - filing_year
+        confidence = 0.5 + np.where(has_year & (years_old <= 2), 0.2,
+                                    np.where(has_year & (years_old <= 4), 0.1, 0.0))
+        confidence = confidence + np.where(many_recipients, 0.15, 0.0)
+        confidence = confidence + np.where(ntee >= 70.0, 0.15, np.where(ntee >= 50.0, 0.05, 0.0))
+        confidence = np.minimum(1.0, confidence)
+
+        # Top-k selection: descending score, ties broken by input position
+        if top_k is not None and top_k < n:
+            kth = np.partition(final, n - top_k)[n - top_k]
+            candidates = np.flatnonzero(final >= kth)
+        else:
+            candidates = np.arange(n)
+        order = candidates[np.lexsort((candidates, -final[candidates]))]
+        if top_k is not None:
+            order = order[:top_k]
+
+        results = []
+        for i in order:
+            score = float(final[i])
+            recommendation, should_abstain, abstain_reason = self._decision_from_code(
+                int(decision[i]), score, float(ntee[i])
+            )
+            grant_analysis = grant_size_analyses[i]
+            results.append((foundations[i], CompositeScoreResult(
+                final_score=score,
+                recommendation=recommendation,
+                ntee_alignment_score=float(ntee[i]),
+                geographic_match_score=float(geo[i]),
+                recipient_coherence_score=float(coherence[i]),
+                financial_capacity_score=float(financial[i]),
+                grant_size_fit_score=float(grant_size[i]),
+                application_policy_score=float(application[i]),
+                filing_recency_score=float(filing[i]),
+                foundation_type_score=float(foundation_type[i]),
+                coherence_boost=float(boost[i]),
+                time_decay_penalty=float(filing_decay[i]),
+                ntee_explanation=ntee_explanations[i],
+                schedule_i_analysis=schedule_i_analyses[i],
+                grant_size_analysis=dict(grant_analysis) if grant_analysis else None,
+                confidence=float(confidence[i]),
+                should_abstain=should_abstain,
+                abstain_reason=abstain_reason,
+            )))
+        return results
+
+    def _ntee_columns(self,
+                      profile: OrganizationProfile,
+                      foundations: Sequence[FoundationOpportunityData],
+                      now: datetime) -> tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """
+        Batch form of _score_ntee_alignment
+
+        Returns per-foundation columns (raw two-part score, confidence, time-decay
+        factor) plus explanations; score = min(raw * confidence * decay * 100, cap).
+        The best pair is chosen exactly as NTEEScorer.score_alignment does: the
+        first pair in (profile code, foundation code) order with the highest total.
+        """
+        n = len(foundations)
+        raw = np.zeros(n)
+        conf = np.zeros(n)
+        decay = np.ones(n)
+        explanations = ["No NTEE codes available for comparison"] * n
+
+        if not profile.ntee_codes:
+            return raw, conf, decay, explanations
+
+        scorer = self.ntee_scorer
+        parsed_profile = scorer._parse_codes(
+            profile.ntee_codes, {code: NTEEDataSource.BMF for code in profile.ntee_codes}, {}
+        )
+        if parsed_profile:
+            profile_conf = sum(c.confidence for c in parsed_profile) / len(parsed_profile)
+            profile_decay = [
+                scorer.time_decay.calculate_decay((now - c.source_date).days / 30.44) if c.source_date else 1.0
+                for c in parsed_profile
+            ]
+
+        parse_memo: Dict[str, Optional[NTEECode]] = {}
+        totals_memo: Dict[Tuple[str, Optional[str]], List[Tuple[float, float, float]]] = {}
+        # BMF populations repeat the same code lists heavily; memoize whole outcomes
+        match_memo: Dict[Tuple[str, ...], Tuple[float, float, str]] = {}
+        decay_memo: Dict[Tuple, float] = {}
+        date_decay_memo: Dict[datetime, float] = {}
+
+        for i, foundation in enumerate(foundations):
+            if not foundation.ntee_codes:
+                continue
+
+            codes_key = tuple(foundation.ntee_codes)
+            parsed_foundation = []
+            for code_str in codes_key:
+                if code_str not in parse_memo:
+                    parse_memo[code_str] = NTEECode.parse(code_str)
+                if parse_memo[code_str] is not None:
+                    parsed_foundation.append((code_str, parse_memo[code_str]))
+
+            if not parsed_profile or not parsed_foundation:
+                explanations[i] = scorer._create_empty_result(
+                    parsed_profile, [code for _, code in parsed_foundation]
+                ).explanation
+                continue
+
+            if codes_key not in match_memo:
+                match_memo[codes_key] = self._ntee_best_match(
+                    parsed_profile, parsed_foundation, profile_conf, totals_memo
+                )
+            raw[i], conf[i], explanations[i] = match_memo[codes_key]
+
+            if scorer.enable_time_decay:
+                dates = foundation.ntee_code_dates or {}
+                decay_key = (codes_key, tuple(dates.get(code_str) for code_str, _ in parsed_foundation))
+                if decay_key not in decay_memo:
+                    factors = list(profile_decay)
+                    for date in decay_key[1]:
+                        if date:
+                            if date not in date_decay_memo:
+                                date_decay_memo[date] = scorer.time_decay.calculate_decay(
+                                    (now - date).days / 30.44
+                                )
+                            factors.append(date_decay_memo[date])
+                        else:
+                            factors.append(1.0)
+                    decay_memo[decay_key] = sum(factors) / len(factors)
+                decay[i] = decay_memo[decay_key]
+
+        return raw, conf, decay, explanations
+
+    def _ntee_best_match(self,
+                         parsed_profile: List[NTEECode],
+                         parsed_foundation: List[Tuple[str, NTEECode]],
+                         profile_conf: float,
+                         totals_memo: Dict) -> Tuple[float, float, str]:
+        """(raw two-part score, confidence, explanation) for one foundation's code list"""
+        scorer = self.ntee_scorer
+
+        # Per foundation code: (total, major, leaf) against each profile code
+        rows = []
+        for _, f_code in parsed_foundation:
+            key = (f_code.major, f_code.leaf)
+            if key not in totals_memo:
+                pairs = []
+                for p_code in parsed_profile:
+                    major_score, leaf_score, _, _ = scorer._compare_codes(p_code, f_code)
+                    pairs.append((major_score * NTEE_MAJOR_WEIGHT + leaf_score * NTEE_LEAF_WEIGHT,
+                                  major_score, leaf_score))
+                totals_memo[key] = pairs
+            rows.append(totals_memo[key])
+
+        raw = 0.0
+        explanation = "No NTEE code alignment found"
+        best_total = max(pair[0] for row in rows for pair in row)
+        if best_total > 0.0:
+            p_best = min(
+                next(p for p, pair in enumerate(row) if pair[0] == best_total)
+                for row in rows if any(pair[0] == best_total for pair in row)
+            )
+            f_best = next(j for j, row in enumerate(rows) if row[p_best][0] == best_total)
+            _, major_score, leaf_score = rows[f_best][p_best]
+            raw = major_score * NTEE_MAJOR_WEIGHT + leaf_score * NTEE_LEAF_WEIGHT
+            explanation = scorer._compare_codes(parsed_profile[p_best], parsed_foundation[f_best][1])[3]
+
+        foundation_conf = sum(code.confidence for _, code in parsed_foundation) / len(parsed_foundation)
+        return raw, (profile_conf + foundation_conf) / 2.0, explanation
+
+    @staticmethod
+    def _decision_from_code(code: int, final_score: float, ntee_score: float) -> tuple[str, bool, Optional[str]]:
+        """Expand a score_many decision code into _determine_recommendation's tuple"""
+        if code == 0:
+            return "ABSTAIN", True, f"Borderline score ({final_score:.1f}) - manual review recommended"
+        if code == 1:
+            return "ABSTAIN", True, "Missing NTEE codes - cannot assess mission alignment"
+        if code == 2:
+            return "ABSTAIN", True, f"Very low NTEE alignment ({ntee_score:.1f}) - mission mismatch possible"
+        if code == 3:
+            return "ABSTAIN", True, "Geographic mismatch - foundation focuses on other states"
+        if code == 4:
+            return "PASS", False, None
+        return "FAIL", False, None
+
     def _score_ntee_alignment(self,
                              profile: OrganizationProfile,
                              foundation: FoundationOpportunityData) -> tuple[float, str]:
@@ -194,15 +194,18 @@ class ScheduleIVotingSystem:
         """
         votes = []
 
-        for grantee in grantees:
-            # Resolve recipient EIN
-            ein_result = self.ein_resolver.resolve_ein(
-                ein=grantee.recipient_ein,
-                name=grantee.recipient_name,
-                state=None,  # Would need to extract from grantee address if available
-                zip_code=None
-            )
-
+        # Resolve all recipient EINs in one set-based batch
+        ein_results = self.ein_resolver.batch_resolve_eins([
+            {
+                "ein": grantee.recipient_ein,
+                "name": grantee.recipient_name,
+                "state": None,  # Would need to extract from grantee address if available
+                "zip_code": None,
+            }
+            for grantee in grantees
+        ])
+
+        for grantee, ein_result in zip(grantees, ein_results):
             if not ein_result or ein_result.confidence == EINConfidence.LOW:
                 # Skip low-confidence matches (garbage-in-garbage-out prevention)
                 self.logger.debug(
@@ -4,18 +4,29 @@ Prevents garbage-in-garbage-out by ensuring high-confidence EIN matches for reci
 
 Purpose: Critical prerequisite for Schedule I recipient voting system
 Method: Fuzzy name matching + state/ZIP3 geographic verification + confidence scoring
-Performance: <50ms per lookup with caching
+Performance: <50ms per lookup with caching; batches resolve exact EINs with
+chunked IN (...) lookups and fuzzy-match only the leftovers, in parallel
+Caching: resolutions persist in ein_resolution_cache.db until the BMF is reloaded
 
 Created: Phase 1, Week 2 (BLOCKS Phase 2 recipient voting)
 """
 
+import os
 import re
+import json
 import logging
-from typing import Optional, Dict, Tuple, List
-from dataclasses import dataclass
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Dict, Tuple, List, Iterable
+from dataclasses import dataclass, asdict
 from enum import Enum
 from difflib import SequenceMatcher
-from functools import lru_cache
+
+from ..config.database_config import get_nonprofit_intelligence_db
+from ..database.bmf_name_index import BMFNameIndex
 
 
 class EINConfidence(str, Enum):
@@ -50,6 +61,120 @@ class EINResolutionResult:
     query_name: Optional[str] = None
 
 
+# EINs per IN (...) lookup (stays under SQLite's bound-variable limit)
+EIN_LOOKUP_CHUNK = 500
+
+# Cached resolutions expire when the BMF is reloaded, and after this long regardless
+RESOLUTION_CACHE_TTL = timedelta(days=90)
+
+
+class EINResolutionCacheStore:
+    """
+    SQLite-backed persistent cache of EIN resolutions.
+
+    One row per normalized (ein, name, state, ZIP3) query, misses included
+    (stored with a NULL result). Each row records the BMF load it was
+    resolved against; rows from another load, or older than the TTL, are
+    purged when the store is opened or the load changes.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS ein_resolution_cache (
+            cache_key    TEXT PRIMARY KEY,
+            result       TEXT,
+            bmf_loaded   TEXT NOT NULL,
+            resolved_at  TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: Path, bmf_loaded: str, ttl: timedelta = RESOLUTION_CACHE_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.bmf_loaded = bmf_loaded
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self.purge()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def set_bmf_loaded(self, bmf_loaded: str) -> bool:
+        """Switch to a new BMF load; returns True if it changed"""
+        if bmf_loaded == self.bmf_loaded:
+            return False
+        self.bmf_loaded = bmf_loaded
+        self.purge()
+        return True
+
+    def purge(self) -> int:
+        """Delete rows from other BMF loads or past the TTL"""
+        cutoff = (datetime.now() - self.ttl).isoformat()
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM ein_resolution_cache WHERE bmf_loaded != ? OR resolved_at < ?",
+                (self.bmf_loaded, cutoff),
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ein_resolution_cache")
+            self._conn.commit()
+
+    def get_many(self, cache_keys: List[str]) -> Dict[str, Optional[EINResolutionResult]]:
+        """Cached results by key; a key mapped to None is a cached miss"""
+        cutoff = (datetime.now() - self.ttl).isoformat()
+        found: Dict[str, Optional[EINResolutionResult]] = {}
+        with self._lock:
+            for start in range(0, len(cache_keys), EIN_LOOKUP_CHUNK):
+                chunk = cache_keys[start:start + EIN_LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT cache_key, result FROM ein_resolution_cache "
+                    f"WHERE cache_key IN ({','.join('?' * len(chunk))}) "
+                    f"AND bmf_loaded = ? AND resolved_at >= ?",
+                    (*chunk, self.bmf_loaded, cutoff),
+                )
+                for cache_key, payload in rows:
+                    found[cache_key] = self._from_json(payload)
+        return found
+
+    def put_many(self, results: Dict[str, Optional[EINResolutionResult]]) -> None:
+        if not results:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ein_resolution_cache (cache_key, result, bmf_loaded, resolved_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, self._to_json(result), self.bmf_loaded, now) for key, result in results.items()],
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ein_resolution_cache").fetchone()[0]
+
+    @staticmethod
+    def _to_json(result: Optional[EINResolutionResult]) -> Optional[str]:
+        if result is None:
+            return None
+        data = asdict(result)
+        data["confidence"] = result.confidence.value
+        return json.dumps(data)
+
+    @staticmethod
+    def _from_json(payload: Optional[str]) -> Optional[EINResolutionResult]:
+        if payload is None:
+            return None
+        data = json.loads(payload)
+        data["confidence"] = EINConfidence(data["confidence"])
+        return EINResolutionResult(**data)
+
+
 class EINResolver:
     """
     EIN resolution with fuzzy matching and geographic verification.
@@ -60,36 +185,54 @@ class EINResolver:
     - LOW (0.0): Name-only match OR mismatched geo (excluded from voting)
 
     Performance:
-    - 90-day LRU cache for resolved EINs
+    - Persistent 90-day cache of resolutions, invalidated by a BMF reload
     - <50ms per lookup with cache hits
-    - Batch resolution support for Schedule I analysis
+    - Set-based batch resolution for Schedule I analysis
     """
 
     def __init__(
         self,
         bmf_database_path: Optional[str] = None,
-        enable_cache: bool = True
+        enable_cache: bool = True,
+        cache_db_path: Optional[str] = None,
+        max_workers: Optional[int] = None
     ):
         """
         Initialize EIN resolver.
 
         Args:
-            bmf_database_path: Path to BMF SQLite database (optional)
-            enable_cache: Enable LRU caching for performance
+            bmf_database_path: Path to BMF SQLite database (defaults to
+                the nonprofit intelligence database)
+            enable_cache: Enable in-memory and persistent result caching
+            cache_db_path: Path to the persistent resolution cache (defaults
+                to ein_resolution_cache.db next to the BMF database)
+            max_workers: Threads used for fuzzy name matching in batches
+                (defaults to the CPU count, at most 4)
         """
         self.logger = logging.getLogger(__name__)
         self.enable_cache = enable_cache
+        self.max_workers = max(1, max_workers or min(4, os.cpu_count() or 1))
 
         # Fuzzy matching threshold (Levenshtein similarity)
         self.FUZZY_NAME_THRESHOLD = 0.80  # 80% similarity
         self.EXACT_NAME_THRESHOLD = 0.90  # 90% for high confidence
 
-        # BMF database connection (lazy loaded)
-        self.bmf_db_path = bmf_database_path
-        self._bmf_conn = None
+        # Candidates pulled from the name index for fuzzy scoring
+        self.NAME_CANDIDATE_LIMIT = 10
+
+        # BMF database connections (lazy loaded, one per thread)
+        self.bmf_db_path = bmf_database_path or get_nonprofit_intelligence_db()
+        self._local = threading.local()
+        self._doc_freqs: Dict[Tuple[str, str], int] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._name_index_built: Optional[bool] = None
+        self._bmf_loaded: Optional[str] = None
 
-        # In-memory cache for resolved EINs (faster than DB for common lookups)
-        self._resolution_cache: Dict[str, EINResolutionResult] = {}
+        # Persistent cache (opened with the BMF) backed by an in-memory layer
+        self.cache_db_path = Path(cache_db_path) if cache_db_path else \
+            Path(self.bmf_db_path).with_name("ein_resolution_cache.db")
+        self._cache_store: Optional[EINResolutionCacheStore] = None
+        self._resolution_cache: Dict[str, Optional[EINResolutionResult]] = {}
 
     # =========================================================================
     # PRIMARY API: RESOLVE EIN
@@ -124,49 +267,39 @@ class EINResolver:
             >>> print(result.confidence)  # EINConfidence.HIGH
             >>> print(result.confidence_weight)  # 1.0
         """
+        self._check_bmf_load()
+
         # Input validation
         if not ein and not name:
             self.logger.warning("Must provide at least EIN or name for resolution")
             return None
 
-        # Normalize inputs
-        ein_normalized = self._normalize_ein(ein) if ein else None
-        name_normalized = self._normalize_name(name) if name else None
-        state_normalized = state.upper() if state else None
+        query = self._normalize_query(ein, name, state, zip_code)
+        cache_key = self._cache_key(*query)
 
         # Check cache
-        cache_key = f"{ein_normalized}:{name_normalized}:{state_normalized}"
-        if self.enable_cache and cache_key in self._resolution_cache:
-            return self._resolution_cache[cache_key]
+        cached = self._get_cached([cache_key])
+        if cache_key in cached:
+            return cached[cache_key]
+
+        ein_normalized, name_normalized, state_normalized, zip_code = query
 
         # Strategy 1: Exact EIN lookup (highest confidence if name matches)
+        result = None
         if ein_normalized:
             result = self._resolve_by_exact_ein(
                 ein_normalized, name_normalized, state_normalized, zip_code
             )
-            if result:
-                self._cache_result(cache_key, result)
-                return result
 
-        # Strategy 2: Fuzzy name + geographic verification (medium confidence)
-        if name_normalized and (state_normalized or zip_code):
-            result = self._resolve_by_fuzzy_name_geo(
-                name_normalized, state_normalized, zip_code
-            )
-            if result:
-                self._cache_result(cache_key, result)
-                return result
+        # Strategies 2-3: fuzzy name (+ geography)
+        if result is None and name_normalized:
+            result = self._resolve_by_name(name_normalized, state_normalized, zip_code)
 
-        # Strategy 3: Name-only match (low confidence - excluded from voting)
-        if name_normalized:
-            result = self._resolve_by_name_only(name_normalized)
-            if result:
-                self._cache_result(cache_key, result)
-                return result
+        if result is None:
+            self.logger.debug(f"No match found for EIN={ein}, name={name}")
 
-        # No match found
-        self.logger.debug(f"No match found for EIN={ein}, name={name}")
-        return None
+        self._cache_results({cache_key: result})
+        return result
 
     def batch_resolve_eins(
         self,
@@ -175,11 +308,16 @@ class EINResolver:
         """
         Resolve multiple EINs in batch for performance.
 
+        Inputs are normalized and deduplicated, answered from the cache where
+        possible, then resolved set-wise: exact EINs with chunked IN (...)
+        lookups, and only the remaining names through fuzzy matching, spread
+        over max_workers threads. Results are the same as resolve_ein's.
+
         Args:
             ein_list: List of dicts with keys: ein, name, state, zip_code
 
         Returns:
-            List of EINResolutionResults (None for no matches)
+            List of EINResolutionResults (None for no matches), in input order
 
         Example:
             >>> resolver = EINResolver()
@@ -188,17 +326,49 @@ class EINResolver:
             ...     {"ein": "541026365", "name": "Community Foundation", "state": "VA"}
             ... ])
         """
-        results = []
+        self._check_bmf_load()
+
+        keys: List[Optional[str]] = []
+        queries: Dict[str, Tuple] = {}
         for item in ein_list:
-            result = self.resolve_ein(
-                ein=item.get("ein"),
-                name=item.get("name"),
-                state=item.get("state"),
-                zip_code=item.get("zip_code")
+            if not item.get("ein") and not item.get("name"):
+                keys.append(None)
+                continue
+            query = self._normalize_query(
+                item.get("ein"), item.get("name"), item.get("state"), item.get("zip_code")
             )
-            results.append(result)
-
-        return results
+            cache_key = self._cache_key(*query)
+            keys.append(cache_key)
+            queries.setdefault(cache_key, query)
+
+        resolved = self._get_cached(list(queries))
+        pending = {key: query for key, query in queries.items() if key not in resolved}
+
+        # Strategy 1 for every EIN at once
+        records = self._lookup_bmf_by_eins({query[0] for query in pending.values() if query[0]})
+
+        computed: Dict[str, Optional[EINResolutionResult]] = {}
+        name_queries: Dict[Tuple, List[str]] = {}
+        for cache_key, (ein, name, state, zip_code) in pending.items():
+            if ein and ein in records:
+                computed[cache_key] = self._score_exact_ein_match(
+                    ein, name, state, zip_code, records[ein]
+                )
+            elif name:
+                # Leftovers with the same name and geography share one search
+                name_queries.setdefault((name, state, zip_code), []).append(cache_key)
+            else:
+                computed[cache_key] = None
+
+        # Strategies 2-3 for the leftovers
+        for (name, state, zip_code), result in self._resolve_names(list(name_queries)).items():
+            for cache_key in name_queries[(name, state, zip_code)]:
+                computed[cache_key] = result
+
+        self._cache_results(computed)
+        resolved.update(computed)
+
+        return [resolved[key] if key else None for key in keys]
 
     # =========================================================================
     # RESOLUTION STRATEGIES
@@ -225,6 +395,17 @@ class EINResolver:
         if not bmf_record:
             return None
 
+        return self._score_exact_ein_match(ein, name, state, zip_code, bmf_record)
+
+    def _score_exact_ein_match(
+        self,
+        ein: str,
+        name: Optional[str],
+        state: Optional[str],
+        zip_code: Optional[str],
+        bmf_record: Dict
+    ) -> EINResolutionResult:
+        """Confidence-score a BMF record found by exact EIN"""
         # Calculate name similarity if provided
         name_similarity = 0.0
         if name and bmf_record.get("name"):
@@ -272,6 +453,38 @@ class EINResolver:
             query_name=name,
         )
 
+    def _resolve_by_name(
+        self,
+        name: str,
+        state: Optional[str],
+        zip_code: Optional[str]
+    ) -> Optional[EINResolutionResult]:
+        """Strategies 2 and 3, for queries without an EIN hit"""
+        # Strategy 2: Fuzzy name + geographic verification (medium confidence)
+        if state or zip_code:
+            result = self._resolve_by_fuzzy_name_geo(name, state, zip_code)
+            if result:
+                return result
+
+        # Strategy 3: Name-only match (low confidence - excluded from voting)
+        return self._resolve_by_name_only(name)
+
+    def _resolve_names(
+        self,
+        queries: List[Tuple[str, Optional[str], Optional[str]]]
+    ) -> Dict[Tuple, Optional[EINResolutionResult]]:
+        """Run _resolve_by_name over (name, state, zip_code) queries on a thread pool"""
+        if len(queries) < 2 or self.max_workers == 1:
+            return {query: self._resolve_by_name(*query) for query in queries}
+
+        # Worker threads persist with the resolver, each on its own read-only BMF connection
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="ein-resolver"
+            )
+        results = self._executor.map(lambda query: self._resolve_by_name(*query), queries)
+        return dict(zip(queries, results))
+
     def _resolve_by_fuzzy_name_geo(
         self,
         name: str,
@@ -372,26 +585,77 @@ class EINResolver:
         )
 
     # =========================================================================
-    # BMF DATABASE LOOKUPS (Placeholder - will integrate with actual DB)
+    # BMF DATABASE LOOKUPS
     # =========================================================================
 
+    def _get_bmf_conn(self) -> Optional[sqlite3.Connection]:
+        """Open the BMF database read-only for this thread on first use (None if it or its table is missing)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not Path(self.bmf_db_path).exists():
+                self.logger.debug(f"BMF database not found at {self.bmf_db_path}")
+                return None
+            conn = sqlite3.connect(
+                f"file:{Path(self.bmf_db_path).as_posix()}?mode=ro", uri=True, check_same_thread=False
+            )
+            try:
+                has_table = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bmf_organizations'"
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.logger.warning(f"BMF database at {self.bmf_db_path} is unreadable: {e}")
+                has_table = None
+            if not has_table:
+                conn.close()
+                self.logger.debug(f"BMF database at {self.bmf_db_path} has no bmf_organizations table")
+                return None
+            self._local.conn = conn
+            self._local.name_index = BMFNameIndex(conn, doc_freq_cache=self._doc_freqs)
+            if self._name_index_built is None:
+                self._name_index_built = self._local.name_index.is_built()
+                if not self._name_index_built:
+                    self.logger.warning(
+                        "BMF name index not built; name searches fall back to a table scan "
+                        "(run BMFNameIndex.rebuild())"
+                    )
+        return conn
+
     def _lookup_bmf_by_ein(self, ein: str) -> Optional[Dict]:
         """
         Lookup organization in BMF database by exact EIN.
 
-        NOTE: Placeholder implementation. In production, this queries:
-        - BMF SQLite database (data/nonprofit_intelligence.db)
-        - Table: bmf_organizations
-        - Indexed by: ein
+        Uses the bmf_organizations primary key on ein.
         """
-        # TODO: Replace with actual BMF database query
-        # from src.database.bmf_soi_intelligence import BMFSOIIntelligenceService
-        # bmf_service = BMFSOIIntelligenceService()
-        # return bmf_service.get_organization_by_ein(ein)
-
-        # Mock implementation for testing
-        self.logger.debug(f"BMF lookup by EIN: {ein} (placeholder)")
-        return None  # Will be replaced with real DB query
+        return self._lookup_bmf_by_eins([ein]).get(ein)
+
+    def _lookup_bmf_by_eins(self, eins: Iterable[str]) -> Dict[str, Dict]:
+        """Lookup many EINs with chunked IN (...) queries; returns records by EIN"""
+        eins = list(eins)
+        conn = self._get_bmf_conn() if eins else None
+        if conn is None:
+            return {}
+
+        records = {}
+        try:
+            for start in range(0, len(eins), EIN_LOOKUP_CHUNK):
+                chunk = eins[start:start + EIN_LOOKUP_CHUNK]
+                rows = conn.execute(
+                    f"SELECT ein, name, state, zip, ntee_code FROM bmf_organizations "
+                    f"WHERE ein IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                for row in rows:
+                    records[row[0]] = {
+                        "ein": row[0],
+                        "name": row[1],
+                        "state": row[2],
+                        "zip_code": row[3],
+                        "ntee_code": row[4],
+                    }
+        except sqlite3.Error as e:
+            self.logger.warning(f"BMF EIN lookup failed: {e}")
+            return {}
+        return records
 
     def _search_bmf_by_name_geo(
         self,
@@ -402,24 +666,65 @@ class EINResolver:
         """
         Search BMF by name with geographic constraints.
 
-        NOTE: Placeholder. In production, uses:
-        - Full-text search on name
-        - Filter by state and/or ZIP3
-        - Return top 10 candidates for fuzzy matching
+        Ranked top-N candidates from the BMF name index, filtered by state
+        and/or ZIP3, for fuzzy matching.
         """
-        # TODO: Replace with actual BMF database query
-        self.logger.debug(f"BMF search: name={name}, state={state} (placeholder)")
-        return []  # Will be replaced with real DB query
+        return self._search_bmf_candidates(name, state, zip_code)
 
     def _search_bmf_by_name(self, name: str) -> List[Dict]:
         """
         Search BMF by name only (no geographic filter).
 
-        NOTE: Placeholder. Returns top 10 candidates.
+        Returns top-N candidates from the BMF name index.
         """
-        # TODO: Replace with actual BMF database query
-        self.logger.debug(f"BMF name search: {name} (placeholder)")
-        return []  # Will be replaced with real DB query
+        return self._search_bmf_candidates(name, None, None)
+
+    def _search_bmf_candidates(
+        self,
+        name: str,
+        state: Optional[str],
+        zip_code: Optional[str]
+    ) -> List[Dict]:
+        """Name index search, or a LIKE scan when the index has not been built"""
+        conn = self._get_bmf_conn()
+        if conn is None or not name:
+            return []
+
+        try:
+            if self._name_index_built:
+                return self._local.name_index.search(
+                    name, state=state, zip_code=zip_code, limit=self.NAME_CANDIDATE_LIMIT
+                )
+            return self._scan_bmf_candidates(conn, name, state, zip_code)
+        except sqlite3.Error as e:
+            self.logger.warning(f"BMF name search failed: {e}")
+            return []
+
+    def _scan_bmf_candidates(
+        self,
+        conn: sqlite3.Connection,
+        name: str,
+        state: Optional[str],
+        zip_code: Optional[str]
+    ) -> List[Dict]:
+        """LIKE scan on the longest word of the name, for when the index has not been built"""
+        words = name.split()
+        longest = max(words, key=len) if words else name
+        sql = "SELECT ein, name, state, zip, ntee_code FROM bmf_organizations WHERE name LIKE ?"
+        params: list = [f"%{longest}%"]
+        if state:
+            sql += " AND state = ?"
+            params.append(state)
+        if zip_code:
+            sql += " AND SUBSTR(zip, 1, 3) = ?"
+            params.append(str(zip_code)[:3])
+        sql += " LIMIT ?"
+        params.append(self.NAME_CANDIDATE_LIMIT * 5)
+
+        return [
+            {"ein": r[0], "name": r[1], "state": r[2], "zip_code": r[3], "ntee_code": r[4]}
+            for r in conn.execute(sql, params)
+        ]
 
     # =========================================================================
     # SIMILARITY & MATCHING UTILITIES
@@ -520,21 +825,115 @@ class EINResolver:
     # CACHING
     # =========================================================================
 
-    def _cache_result(self, cache_key: str, result: EINResolutionResult):
-        """Cache resolution result for performance"""
-        if self.enable_cache:
-            self._resolution_cache[cache_key] = result
+    def _normalize_query(
+        self,
+        ein: Optional[str],
+        name: Optional[str],
+        state: Optional[str],
+        zip_code: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+        """Normalized (ein, name, state, zip3); only ZIP3 affects resolution"""
+        return (
+            self._normalize_ein(ein) if ein else None,
+            self._normalize_name(name) if name else None,
+            state.upper() if state else None,
+            str(zip_code)[:3] if zip_code else None,
+        )
+
+    @staticmethod
+    def _cache_key(ein: Optional[str], name: Optional[str],
+                   state: Optional[str], zip3: Optional[str]) -> str:
+        return f"{ein or ''}:{name or ''}:{state or ''}:{zip3 or ''}"
+
+    def _bmf_load_marker(self) -> Optional[str]:
+        """Identifies the current BMF load: name index load time, else file mtime"""
+        conn = self._get_bmf_conn()
+        if conn is None:
+            return None
+        loaded_at = self._local.name_index.loaded_at()
+        if loaded_at:
+            return loaded_at
+        return f"mtime:{Path(self.bmf_db_path).stat().st_mtime_ns}"
+
+    def _get_cache_store(self) -> Optional[EINResolutionCacheStore]:
+        """Open the persistent cache on first use (None if caching or the BMF is unavailable)"""
+        if self._cache_store is None and self.enable_cache:
+            marker = self._bmf_load_marker()
+            if marker is None:
+                return None
+            try:
+                self.cache_db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._cache_store = EINResolutionCacheStore(self.cache_db_path, marker)
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning(f"Persistent EIN cache unavailable at {self.cache_db_path}: {e}")
+                self.enable_cache = False
+        return self._cache_store
+
+    def _check_bmf_load(self):
+        """Drop state derived from an earlier BMF load if it has been reloaded since"""
+        marker = self._bmf_load_marker()
+        if marker is None or marker == self._bmf_loaded:
+            return
+        reloaded = self._bmf_loaded is not None
+        self._bmf_loaded = marker
+        if reloaded:
+            self._doc_freqs.clear()
+            self._name_index_built = self._local.name_index.is_built()
+            self._resolution_cache.clear()
+            self.logger.info("BMF reloaded; cleared EIN resolution cache")
+        store = self._get_cache_store()
+        if store is not None:
+            store.set_bmf_loaded(marker)
+
+    def _get_cached(self, cache_keys: List[str]) -> Dict[str, Optional[EINResolutionResult]]:
+        """Cached results (None = cached miss) from memory, then the persistent store"""
+        if not self.enable_cache:
+            return {}
+        found = {key: self._resolution_cache[key] for key in cache_keys if key in self._resolution_cache}
+        missing = [key for key in cache_keys if key not in found]
+        store = self._get_cache_store() if missing else None
+        if store is not None:
+            stored = store.get_many(missing)
+            self._resolution_cache.update(stored)
+            found.update(stored)
+        return found
+
+    def _cache_results(self, results: Dict[str, Optional[EINResolutionResult]]):
+        """Cache resolution results (misses included) for performance"""
+        if not self.enable_cache or not results:
+            return
+        store = self._get_cache_store()
+        if store is None:
+            # No BMF to resolve against; nothing worth remembering
+            return
+        self._resolution_cache.update(results)
+        store.put_many(results)
 
     def clear_cache(self):
-        """Clear resolution cache (useful for testing)"""
+        """Clear resolution cache, in memory and on disk (useful for testing)"""
         self._resolution_cache.clear()
+        store = self._get_cache_store()
+        if store is not None:
+            store.clear()
         self.logger.info("Cleared EIN resolution cache")
 
+    def close(self):
+        """Stop batch worker threads and close the persistent cache"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._cache_store is not None:
+            self._cache_store.close()
+            self._cache_store = None
+
     def get_cache_stats(self) -> Dict:
         """Get cache performance statistics"""
+        store = self._cache_store
         return {
             "cache_size": len(self._resolution_cache),
             "cache_enabled": self.enable_cache,
+            "persistent_cache_size": store.count() if store is not None else 0,
+            "persistent_cache_path": str(self.cache_db_path),
         }
 
 
@@ -1,19 +1,117 @@
 """
 Grantee Matcher - Match discovered organizations against Schedule I grantees
+
+Grantees are prepared once per profile into a GranteeIndex (EIN map, exact
+normalized-name map, length-blocked character-count matrix for fuzzy
+candidates) and reused across discovery sessions while the profile's
+Schedule I data is unchanged. Matching results are identical to scanning
+every grantee.
 """
 import re
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Tuple
 from difflib import SequenceMatcher
 import logging
 
+import numpy as np
+
 from src.profiles.models import ScheduleIGrantee, OrganizationProfile
 from src.discovery.base_discoverer import DiscoveryResult, FunnelStage
 
 logger = logging.getLogger(__name__)
 
+# Common words ignored by the fuzzy word-overlap check
+COMMON_WORDS = frozenset({'the', 'of', 'for', 'and', 'in', 'to', 'a', 'an', 'at', 'by', 'on'})
+
+
+class GranteeIndex:
+    """
+    A profile's Schedule I grantees prepared for repeated matching.
+
+    Scores are those of the grantee scan: 1.0 for an EIN match or identical
+    normalized names, otherwise SequenceMatcher similarity. The best score
+    wins and ties go to the earliest grantee. Exact hits come from hash maps
+    holding the first grantee per key. Fuzzy candidates are grantees whose
+    upper bound on SequenceMatcher.ratio() (twice the shared characters
+    over the total length) reaches the threshold. Lengths are sorted, so
+    only the length band that can reach the threshold is scanned.
+    """
+
+    def __init__(self, grantees: List[ScheduleIGrantee], matcher: 'GranteeMatcher'):
+        self.grantees = list(grantees)
+        self.fingerprint = self.grantee_fingerprint(self.grantees)
+
+        self.names: List[str] = []
+        self.words: List[set] = []
+        self.ein_map: Dict[str, int] = {}
+        self.name_map: Dict[str, int] = {}
+        for i, grantee in enumerate(self.grantees):
+            normalized = matcher._normalize_organization_name(grantee.recipient_name)
+            self.names.append(normalized)
+            self.words.append(set(normalized.split()) - COMMON_WORDS)
+            if grantee.recipient_ein:
+                self.ein_map.setdefault(matcher._normalize_ein(grantee.recipient_ein), i)
+            if grantee.recipient_name:
+                self.name_map.setdefault(normalized, i)
+
+        # Character counts of the named grantees, rows sorted by name length
+        named = [i for i, g in enumerate(self.grantees) if g.recipient_name and self.names[i]]
+        named.sort(key=lambda i: len(self.names[i]))
+        self.alphabet = {c: k for k, c in enumerate(sorted({c for i in named for c in self.names[i]}))}
+        self.row_grantee = np.array(named, dtype=np.int64)
+        self.row_length = np.array([len(self.names[i]) for i in named], dtype=np.int64)
+        self.char_counts = np.zeros((len(named), max(len(self.alphabet), 1)), dtype=np.int32)
+        for row, i in enumerate(named):
+            for c in self.names[i]:
+                self.char_counts[row, self.alphabet[c]] += 1
+
+    @staticmethod
+    def grantee_fingerprint(grantees: List[ScheduleIGrantee]) -> int:
+        return hash(tuple(
+            (g.recipient_name, g.recipient_ein, g.grant_amount, g.grant_year, g.grant_purpose)
+            for g in grantees
+        ))
+
+    def exact_match(self, normalized_ein: Optional[str], normalized_name: Optional[str]) -> Optional[int]:
+        """Earliest grantee scoring 1.0 (EIN match or identical normalized name)"""
+        hits = []
+        if normalized_ein is not None and normalized_ein in self.ein_map:
+            hits.append(self.ein_map[normalized_ein])
+        if normalized_name is not None and normalized_name in self.name_map:
+            hits.append(self.name_map[normalized_name])
+        return min(hits) if hits else None
+
+    def fuzzy_candidates(self, normalized_name: str, threshold: float) -> List[Tuple[float, int]]:
+        """(upper bound, grantee) pairs that could reach threshold, best bound first"""
+        length = len(normalized_name)
+        if not length or not len(self.row_grantee) or threshold <= 0:
+            return []
+
+        # 2 * min(la, lb) / (la + lb) >= threshold bounds the other length
+        # (with slack for rounding; the character bound below is exact)
+        low = np.searchsorted(self.row_length, length * threshold / (2 - threshold) - 1e-9, side='left')
+        high = np.searchsorted(self.row_length, length * (2 - threshold) / threshold + 1e-9, side='right')
+        if low >= high:
+            return []
+
+        query = np.zeros(self.char_counts.shape[1], dtype=np.int32)
+        for c in normalized_name:
+            k = self.alphabet.get(c)
+            if k is not None:
+                query[k] += 1
+        shared = np.minimum(self.char_counts[low:high], query).sum(axis=1)
+        bound = 2.0 * shared / (self.row_length[low:high] + length)
+
+        keep = np.nonzero(bound >= threshold)[0]
+        order = keep[np.argsort(-bound[keep], kind='stable')]
+        return [(float(bound[k]), int(self.row_grantee[low + k])) for k in order]
+
 
 class GranteeMatcher:
     """Match discovered organizations against Schedule I grantees for fast-tracking"""
+
+    # Prepared grantee indexes kept per profile
+    MAX_PREPARED_PROFILES = 32
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -22,6 +120,30 @@ class GranteeMatcher:
         self.name_similarity_threshold = 0.85  # Name similarity threshold for matches
         self.ein_match_threshold = 1.0         # EIN matches must be exact
         self.fuzzy_match_threshold = 0.75      # Fuzzy matching threshold
+
+        # profile_id -> GranteeIndex, least recently used first
+        self._prepared: 'OrderedDict[str, GranteeIndex]' = OrderedDict()
+
+    def prepare(self, grantees: List[ScheduleIGrantee], profile_id: Optional[str] = None) -> GranteeIndex:
+        """
+        Index grantees for matching. With a profile_id the index is kept and
+        reused until the profile's grantees change.
+        """
+        if profile_id is None:
+            return GranteeIndex(grantees, self)
+
+        index = self._prepared.get(profile_id)
+        if index is not None and index.fingerprint == GranteeIndex.grantee_fingerprint(grantees):
+            self._prepared.move_to_end(profile_id)
+            return index
+
+        index = GranteeIndex(grantees, self)
+        self._prepared[profile_id] = index
+        self._prepared.move_to_end(profile_id)
+        while len(self._prepared) > self.MAX_PREPARED_PROFILES:
+            self._prepared.popitem(last=False)
+        self.logger.debug(f"Prepared grantee index for profile {profile_id}: {len(index.grantees)} grantees")
+        return index
         
     def match_discovery_results_against_grantees(
         self,
@@ -48,37 +170,47 @@ class GranteeMatcher:
         matched_count = 0
         fast_tracked_count = 0
         
+        index = self.prepare(profile.schedule_i_grantees, profile.profile_id)
+        
         for result in discovery_results:
-            grantee_match = self._find_grantee_match(result, profile.schedule_i_grantees)
-            
-            if grantee_match:
-                # Mark as Schedule I grantee match
-                result.is_schedule_i_grantee = True
-                result.schedule_i_match_data = grantee_match
-                
-                # Fast-track to CANDIDATES stage
-                result.funnel_stage = FunnelStage.CANDIDATES
-                result.stage_notes = f"Auto-promoted to CANDIDATES: Schedule I grantee match with {grantee_match['grantee_name']} (${grantee_match['grant_amount']:,.0f} in {grantee_match['grant_year']})"
-                
-                # Boost compatibility score to ensure continued progression
-                original_score = result.compatibility_score
-                result.compatibility_score = max(0.85, original_score)  # Minimum 85% score
-                
-                # Add to match factors
-                result.match_factors['schedule_i_grantee'] = True
-                result.match_factors['historical_grant_amount'] = grantee_match['grant_amount']
-                result.match_factors['historical_grant_year'] = grantee_match['grant_year']
-                
+            if self.fast_track_result(result, index):
                 matched_count += 1
                 if result.funnel_stage == FunnelStage.CANDIDATES:
                     fast_tracked_count += 1
-                
-                self.logger.info(f"Matched '{result.organization_name}' to Schedule I grantee '{grantee_match['grantee_name']}' (${grantee_match['grant_amount']:,.0f}, {grantee_match['grant_year']})")
         
         self.logger.info(f"Schedule I matching complete: {matched_count} matches found, {fast_tracked_count} fast-tracked to CANDIDATES")
         
         return discovery_results
     
+    def fast_track_result(self, result: DiscoveryResult, index: GranteeIndex) -> bool:
+        """
+        Match one discovery result against a prepared index and, on a match,
+        fast-track it to CANDIDATES. Returns whether it matched.
+        """
+        grantee_match = self._match_in_index(result, index)
+        if not grantee_match:
+            return False
+
+        # Mark as Schedule I grantee match
+        result.is_schedule_i_grantee = True
+        result.schedule_i_match_data = grantee_match
+
+        # Fast-track to CANDIDATES stage
+        result.funnel_stage = FunnelStage.CANDIDATES
+        result.stage_notes = f"Auto-promoted to CANDIDATES: Schedule I grantee match with {grantee_match['grantee_name']} (${grantee_match['grant_amount']:,.0f} in {grantee_match['grant_year']})"
+
+        # Boost compatibility score to ensure continued progression
+        original_score = result.compatibility_score
+        result.compatibility_score = max(0.85, original_score)  # Minimum 85% score
+
+        # Add to match factors
+        result.match_factors['schedule_i_grantee'] = True
+        result.match_factors['historical_grant_amount'] = grantee_match['grant_amount']
+        result.match_factors['historical_grant_year'] = grantee_match['grant_year']
+
+        self.logger.info(f"Matched '{result.organization_name}' to Schedule I grantee '{grantee_match['grantee_name']}' (${grantee_match['grant_amount']:,.0f}, {grantee_match['grant_year']})")
+        return True
+    
     def _find_grantee_match(
         self,
         discovery_result: DiscoveryResult,
@@ -94,54 +226,79 @@ class GranteeMatcher:
         Returns:
             Match data if found, None otherwise
         """
-        best_match = None
-        best_score = 0.0
-        
+        return self._match_in_index(discovery_result, self.prepare(grantees))
+
+    def _match_in_index(
+        self,
+        discovery_result: DiscoveryResult,
+        index: GranteeIndex
+    ) -> Optional[Dict[str, Any]]:
+        """Best grantee match from a prepared index (same result as scanning every grantee)"""
         discovery_name = discovery_result.organization_name.strip()
         discovery_ein = self._extract_ein_from_external_data(discovery_result)
-        
-        for grantee in grantees:
-            match_score = 0.0
-            match_method = ""
-            
-            # Try EIN match first (highest priority)
-            if discovery_ein and grantee.recipient_ein:
-                if self._normalize_ein(discovery_ein) == self._normalize_ein(grantee.recipient_ein):
-                    match_score = 1.0
-                    match_method = "ein_exact"
-            
-            # If no EIN match, try name matching
-            if match_score < self.ein_match_threshold:
-                name_similarity = self._calculate_name_similarity(discovery_name, grantee.recipient_name)
-                if name_similarity >= self.name_similarity_threshold:
-                    match_score = name_similarity
-                    match_method = "name_similarity"
-                elif name_similarity >= self.fuzzy_match_threshold:
-                    # Additional checks for fuzzy matches
-                    if self._additional_fuzzy_checks(discovery_result, grantee):
-                        match_score = name_similarity
-                        match_method = "name_fuzzy"
-            
-            # Update best match if this is better
-            if match_score > best_score:
-                best_score = match_score
-                best_match = {
-                    "grantee_name": grantee.recipient_name,
-                    "grantee_ein": grantee.recipient_ein,
-                    "grant_amount": grantee.grant_amount,
-                    "grant_year": grantee.grant_year,
-                    "grant_purpose": grantee.grant_purpose,
-                    "match_score": match_score,
-                    "match_method": match_method,
-                    "discovery_name": discovery_name,
-                    "discovery_ein": discovery_ein
-                }
-        
-        # Return match if score meets threshold
-        if best_match and best_score >= self.fuzzy_match_threshold:
-            return best_match
-        
-        return None
+
+        normalized_ein = self._normalize_ein(discovery_ein) if discovery_ein else None
+        normalized_name = self._normalize_organization_name(discovery_name) if discovery_name else None
+
+        # EIN or identical-name matches score 1.0, which nothing can beat
+        best_index = index.exact_match(normalized_ein, normalized_name)
+        if best_index is not None:
+            match_method = "ein_exact" if (
+                normalized_ein is not None and index.ein_map.get(normalized_ein) == best_index
+            ) else "name_similarity"
+            return self._build_match(index.grantees[best_index], 1.0, match_method, discovery_name, discovery_ein)
+
+        if not normalized_name:
+            return None
+
+        best_score = 0.0
+        best_method = ""
+        discovery_words = None
+        for bound, i in index.fuzzy_candidates(normalized_name, self.fuzzy_match_threshold):
+            if bound < best_score:
+                break
+            # Ties keep the earliest grantee, as in a front-to-back scan
+            if best_index is not None and bound == best_score and i > best_index:
+                continue
+
+            similarity = SequenceMatcher(None, normalized_name, index.names[i]).ratio()
+            if similarity >= self.name_similarity_threshold:
+                method = "name_similarity"
+            elif similarity >= self.fuzzy_match_threshold:
+                if discovery_words is None:
+                    discovery_words = set(normalized_name.split()) - COMMON_WORDS
+                if not self._words_overlap(discovery_words, index.words[i]):
+                    continue
+                method = "name_fuzzy"
+            else:
+                continue
+
+            if similarity > best_score or (similarity == best_score and i < best_index):
+                best_score, best_index, best_method = similarity, i, method
+
+        if best_index is None or best_score < self.fuzzy_match_threshold:
+            return None
+        return self._build_match(index.grantees[best_index], best_score, best_method, discovery_name, discovery_ein)
+
+    @staticmethod
+    def _build_match(
+        grantee: ScheduleIGrantee,
+        match_score: float,
+        match_method: str,
+        discovery_name: str,
+        discovery_ein: Optional[str]
+    ) -> Dict[str, Any]:
+        return {
+            "grantee_name": grantee.recipient_name,
+            "grantee_ein": grantee.recipient_ein,
+            "grant_amount": grantee.grant_amount,
+            "grant_year": grantee.grant_year,
+            "grant_purpose": grantee.grant_purpose,
+            "match_score": match_score,
+            "match_method": match_method,
+            "discovery_name": discovery_name,
+            "discovery_ein": discovery_ein
+        }
     
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity between two organization names"""
@@ -222,15 +379,13 @@ class GranteeMatcher:
     def _additional_fuzzy_checks(self, discovery_result: DiscoveryResult, grantee: ScheduleIGrantee) -> bool:
         """Additional checks for fuzzy matches to reduce false positives"""
         
-        # Check if both names contain similar key words
+        # Check if both names contain similar key words, ignoring common words
         discovery_words = set(self._normalize_organization_name(discovery_result.organization_name).split())
         grantee_words = set(self._normalize_organization_name(grantee.recipient_name).split())
-        
-        # Remove common words
-        common_words = {'the', 'of', 'for', 'and', 'in', 'to', 'a', 'an', 'at', 'by', 'on'}
-        discovery_words -= common_words
-        grantee_words -= common_words
-        
+        return self._words_overlap(discovery_words - COMMON_WORDS, grantee_words - COMMON_WORDS)
+
+    @staticmethod
+    def _words_overlap(discovery_words: set, grantee_words: set) -> bool:
         # Check if there's significant word overlap
         if discovery_words and grantee_words:
             overlap = len(discovery_words & grantee_words)
@@ -243,6 +398,15 @@ class GranteeMatcher:
         return False
 
 
+# Shared so prepared grantee indexes carry over between discovery sessions
+_default_matcher = GranteeMatcher()
+
+
+def get_grantee_matcher() -> GranteeMatcher:
+    """The shared matcher (and its prepared grantee indexes)"""
+    return _default_matcher
+
+
 def apply_schedule_i_fast_tracking(
     discovery_results: List[DiscoveryResult],
     profile: OrganizationProfile
@@ -257,5 +421,4 @@ def apply_schedule_i_fast_tracking(
     Returns:
         Updated discovery results with grantee matches identified and fast-tracked
     """
-    matcher = GranteeMatcher()
-    return matcher.match_discovery_results_against_grantees(discovery_results, profile)
\ No newline at end of file
+    return _default_matcher.match_discovery_results_against_grantees(discovery_results, profile)
\ No newline at end of file
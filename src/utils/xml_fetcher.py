@@ -9,12 +9,17 @@ from datetime import timedelta
 import logging
 
 from src.core.cache_manager import get_cache_manager, CacheType
+from src.core.request_scheduler import get_request_scheduler
 
 logger = logging.getLogger(__name__)
 
 XML_CACHE_TTL = timedelta(days=180)  # 990 XML filings are immutable once filed; IRS bulk releases ~2x/year
 _XML_NOT_FOUND_SENTINEL = "__NOT_FOUND__"
 
+# ProPublica website pages (organization pages, XML downloads): shared pace for all callers
+PROPUBLICA_WEB_RATE_KEY = "propublica_web"
+PROPUBLICA_WEB_MIN_INTERVAL = 0.3  # seconds between requests
+
 
 class XMLFetcher:
     """Utility class to fetch XML data from ProPublica"""
@@ -23,6 +28,12 @@ class XMLFetcher:
         self.propublica_base = "https://projects.propublica.org/nonprofits"
         self.timeout = 30
         self.context = context  # "profile" or "opportunity"
+
+        self.scheduler = get_request_scheduler()
+        if not self.scheduler.is_configured(PROPUBLICA_WEB_RATE_KEY):
+            self.scheduler.configure(
+                PROPUBLICA_WEB_RATE_KEY, calls=1, window_seconds=PROPUBLICA_WEB_MIN_INTERVAL, burst=1
+            )
     
     async def fetch_xml_by_ein(self, ein: str) -> Optional[bytes]:
         """
@@ -83,6 +94,7 @@ class XMLFetcher:
         headers = {"User-Agent": "Grant Research Automation Tool"}
         
         try:
+            await self.scheduler.acquire(PROPUBLICA_WEB_RATE_KEY)
             async with session.get(url, headers=headers, timeout=15) as response:
                 if response.status != 200:
                     logger.warning(f"Failed to access ProPublica page for EIN {ein}: status {response.status}")
@@ -133,6 +145,7 @@ class XMLFetcher:
         params = {"object_id": object_id}
 
         try:
+            await self.scheduler.acquire(PROPUBLICA_WEB_RATE_KEY)
             async with session.get(download_url, headers=headers, params=params, allow_redirects=True) as response:
                 if response.status == 200:
                     content_type = response.headers.get("Content-Type", "").lower()
@@ -185,6 +198,7 @@ class XMLFetcher:
             async with aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=self.timeout)
             ) as session:
+                await self.scheduler.acquire(PROPUBLICA_WEB_RATE_KEY)
                 async with session.get(url, headers=headers) as response:
                     if response.status != 200:
                         logger.warning(f"ProPublica page returned {response.status} for EIN {ein}")
@@ -12,6 +12,7 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import sys
 import os
@@ -65,6 +66,24 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Interval between checks of the incrementally maintained profile analytics
+ANALYTICS_RECONCILE_INTERVAL_SECONDS = 6 * 60 * 60
+
+
+async def reconcile_profile_analytics_periodically(interval_seconds: float = ANALYTICS_RECONCILE_INTERVAL_SECONDS):
+    """Verify opportunity aggregates against the full data on an interval, repairing drift."""
+    from src.profiles.unified_service import get_unified_profile_service
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            repaired = await asyncio.to_thread(get_unified_profile_service().reconcile_profile_analytics)
+            if repaired:
+                logger.warning(f"Profile analytics reconciliation repaired: {repaired}")
+        except Exception as e:
+            logger.warning(f"Profile analytics reconciliation failed: {e}")
+
+
 # Lifespan event handler (replaces deprecated on_event)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -80,9 +99,12 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to initialize tool registry: {e}")
 
+    reconcile_task = asyncio.create_task(reconcile_profile_analytics_periodically())
+
     logger.info("Catalynx API ready!")
     yield
     logger.info("Shutting down Catalynx Web Interface...")
+    reconcile_task.cancel()
 
 
 # Create FastAPI application
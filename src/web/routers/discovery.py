@@ -175,22 +175,28 @@ async def discover_opportunities(profile_id: str, discovery_params: Dict[str, An
 
         max_results = discovery_params.get("max_results", 100)
 
+        # Live results stream to clients on /api/live/progress/{progress_workflow_id}
+        from src.web.routers.websocket import progress_service
+        progress_workflow_id = discovery_params.get("workflow_id") or f"discovery_{profile_id}"
+
         discovery_results = await profile_integrator.discover_opportunities_for_profile(
             profile_id=profile_id,
             funding_types=funding_types,
-            max_results_per_type=max_results
+            max_results_per_type=max_results,
+            progress_service=progress_service,
+            progress_workflow_id=progress_workflow_id
         )
 
         from src.discovery.discovery_engine import discovery_engine
-        raw_session_results = []
-        session_id = discovery_results.get("discovery_timestamp", "")
+        session_id = discovery_results.get("session_id", "")
 
         try:
-            raw_session_results = discovery_engine.get_session_results(session_id)
-            logger.info(f"Retrieved {len(raw_session_results)} raw discovery results for unified integration")
+            # Stream results from the session store rather than loading them all
+            result_store = discovery_engine.get_session_store(session_id)
+            logger.info(f"Streaming {len(result_store) if result_store else 0} raw discovery results for unified integration")
 
             unified_save_results = await unified_discovery_adapter_inst.save_discovery_results(
-                discovery_results=raw_session_results,
+                discovery_results=result_store.iter_results() if result_store else [],
                 profile_id=profile_id,
                 session_id=session_id
             )
@@ -252,6 +258,7 @@ async def discover_opportunities(profile_id: str, discovery_params: Dict[str, An
         return {
             "message": f"Discovery completed for profile {profile_id}",
             "discovery_id": discovery_results.get("discovery_timestamp", ""),
+            "progress_workflow_id": progress_workflow_id,
             "status": "completed",
             "summary": discovery_results.get("summary", {}),
             "total_opportunities_found": len(opportunities),
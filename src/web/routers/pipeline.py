@@ -47,17 +47,23 @@ async def execute_full_pipeline(profile_id: str, pipeline_params: Dict[str, Any]
         except ValueError:
             priority = ProcessingPriority.STANDARD
 
+        # Discovery results stream to clients on /api/live/progress/{progress_workflow_id}
+        from src.web.routers.websocket import progress_service
+        progress_workflow_id = pipeline_params.get("workflow_id") or f"pipeline_{profile_id}"
+
         # Execute full pipeline
         pipeline_results = await profile_integrator.execute_full_pipeline(
             profile_id=profile_id,
             funding_types=funding_types,
             priority=priority,
-            # WebSocket progress integration available through workflow state
-            progress_callback=None  # WebSocket updates handled by workflow state
+            progress_callback=None,
+            progress_service=progress_service,
+            progress_workflow_id=progress_workflow_id
         )
 
         return {
             "message": f"Pipeline execution completed for profile {profile_id}",
+            "progress_workflow_id": progress_workflow_id,
             "pipeline_results": pipeline_results
         }
 
@@ -48,7 +48,8 @@ async def search_opportunities(
             sort_by=search_request.get('sort_by'),
             sort_direction=SortDirection(search_request.get('sort_direction', 'desc')),
             limit=search_request.get('limit'),
-            offset=search_request.get('offset', 0)
+            offset=search_request.get('offset', 0),
+            cursor=search_request.get('cursor')
         )
 
         # Perform search
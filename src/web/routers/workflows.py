@@ -67,6 +67,8 @@ class WorkflowResultResponse(BaseModel):
     started_at: datetime
     completed_at: Optional[datetime]
     error: Optional[str]
+    critical_path: List[str] = []
+    critical_path_ms: float = 0.0
 
 
 class ScreeningBatchRequest(BaseModel):
@@ -308,7 +310,11 @@ async def get_workflow_results(execution_id: str):
             "status": r.status.value,
             "output": r.output,
             "error": r.error,
-            "execution_time_ms": r.execution_time_ms
+            "execution_time_ms": r.execution_time_ms,
+            "queue_time_ms": r.queue_time_ms,
+            "attempts": r.attempts,
+            "started_at_ms": r.started_at_ms,
+            "finished_at_ms": r.finished_at_ms
         }
         for name, r in result.step_results.items()
     }
@@ -321,7 +327,9 @@ async def get_workflow_results(execution_id: str):
         total_execution_time_ms=result.total_execution_time_ms,
         started_at=result.start_time,
         completed_at=result.end_time,
-        error=result.error
+        error=result.error,
+        critical_path=result.critical_path,
+        critical_path_ms=result.critical_path_ms
     )
 
 
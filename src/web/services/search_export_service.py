@@ -65,6 +65,7 @@ class SearchCriteria:
     sort_direction: SortDirection = SortDirection.DESC
     limit: Optional[int] = None
     offset: int = 0
+    cursor: Optional[str] = None  # Keyset cursor from a previous page's page_info["next_cursor"]
 
 
 @dataclass
@@ -100,37 +101,71 @@ class AdvancedSearchService:
             SearchResults with matched opportunities and metadata
         """
         try:
-            # Get opportunities to search
-            if profile_id:
-                opportunities = self.unified_service.get_profile_opportunities(profile_id)
-                total_count = len(opportunities)
-            else:
-                # Search across all profiles
-                opportunities = []
-                all_profile_ids = self.unified_service.list_profiles()  # Returns list of profile_id strings
-                for profile_id in all_profile_ids:
-                    profile_opportunities = self.unified_service.get_profile_opportunities(profile_id)
-                    opportunities.extend(profile_opportunities)
-                total_count = len(opportunities)
+            store = self.unified_service.opportunity_store
+            self.unified_service.ensure_opportunities_migrated(profile_id)
             
-            # Apply filters
-            filtered_opportunities = self._apply_filters(opportunities, criteria.filters)
-            filtered_count = len(filtered_opportunities)
+            # Filters the indexed store can evaluate run in SQL; the rest in Python
+            pushed_filters, residual_filters = [], []
+            for filter_item in criteria.filters:
+                operator = filter_item.operator.value
+                if store.supports_filter(filter_item.field, operator, filter_item.value, filter_item.value2):
+                    pushed_filters.append((filter_item.field, operator, filter_item.value, filter_item.value2))
+                else:
+                    residual_filters.append(filter_item)
             
-            # Apply sorting
-            if criteria.sort_by:
-                filtered_opportunities = self._apply_sorting(
-                    filtered_opportunities, 
-                    criteria.sort_by, 
-                    criteria.sort_direction
-                )
+            total_count = store.count(profile_id)
             
-            # Apply pagination
-            paginated_opportunities, page_info = self._apply_pagination(
-                filtered_opportunities,
-                criteria.limit,
-                criteria.offset
-            )
+            if not residual_filters and (not criteria.sort_by or store.supports_sort(criteria.sort_by)):
+                # Filter, sort and paginate entirely in the store
+                filtered_count = store.count(profile_id, pushed_filters)
+                payloads, next_cursor = store.query(
+                    profile_id,
+                    pushed_filters,
+                    sort_by=criteria.sort_by,
+                    descending=criteria.sort_direction == SortDirection.DESC,
+                    limit=criteria.limit or None,
+                    offset=criteria.offset,
+                    after=criteria.cursor
+                )
+                paginated_opportunities = [UnifiedOpportunity(**data) for data in payloads]
+                if criteria.cursor:
+                    page_info = {
+                        "total_items": filtered_count,
+                        "items_on_page": len(paginated_opportunities),
+                        "offset": None,
+                        "limit": criteria.limit,
+                        "has_next": next_cursor is not None,
+                        "has_previous": True,
+                        "next_offset": None,
+                        "previous_offset": None
+                    }
+                else:
+                    page_info = self._page_info(
+                        filtered_count, len(paginated_opportunities), criteria.limit, criteria.offset
+                    )
+                page_info["next_cursor"] = next_cursor
+            else:
+                # Narrow in SQL, then apply remaining filters and sorting in Python
+                payloads, _ = store.query(profile_id, pushed_filters)
+                opportunities = [UnifiedOpportunity(**data) for data in payloads]
+                
+                filtered_opportunities = self._apply_filters(opportunities, residual_filters)
+                filtered_count = len(filtered_opportunities)
+                
+                # Apply sorting
+                if criteria.sort_by:
+                    filtered_opportunities = self._apply_sorting(
+                        filtered_opportunities, 
+                        criteria.sort_by, 
+                        criteria.sort_direction
+                    )
+                
+                # Apply pagination
+                paginated_opportunities, page_info = self._apply_pagination(
+                    filtered_opportunities,
+                    criteria.limit,
+                    criteria.offset
+                )
             
             # Create search metadata
             search_metadata = {
@@ -262,11 +297,11 @@ class AdvancedSearchService:
                 value = self._get_field_value(opp, sort_by)
                 # Handle None values by putting them at the end
                 if value is None:
-                    return float('inf') if not reverse else float('-inf')
+                    return (not reverse,)
                 # Convert to string for consistent comparison if not numeric
                 if not isinstance(value, (int, float)):
-                    return str(value).lower()
-                return value
+                    return (reverse, str(value).lower())
+                return (reverse, value)
             
             return sorted(opportunities, key=sort_key, reverse=reverse)
             
@@ -289,16 +324,27 @@ class AdvancedSearchService:
         
         # Apply limit
         if limit:
-            end_index = start_index + limit
-            paginated = opportunities[start_index:end_index]
+            paginated = opportunities[start_index:start_index + limit]
         else:
             paginated = opportunities[start_index:]
-            end_index = len(opportunities)
         
-        # Calculate page info
-        page_info = {
+        return paginated, self._page_info(total_items, len(paginated), limit, offset)
+    
+    def _page_info(
+        self,
+        total_items: int,
+        items_on_page: int,
+        limit: Optional[int],
+        offset: int
+    ) -> Dict[str, Any]:
+        """Page metadata for an offset/limit page"""
+        
+        start_index = max(0, offset)
+        end_index = start_index + limit if limit else total_items
+        
+        return {
             "total_items": total_items,
-            "items_on_page": len(paginated),
+            "items_on_page": items_on_page,
             "offset": offset,
             "limit": limit,
             "has_next": end_index < total_items,
@@ -306,8 +352,6 @@ class AdvancedSearchService:
             "next_offset": end_index if end_index < total_items else None,
             "previous_offset": max(0, start_index - (limit or 20)) if start_index > 0 else None
         }
-        
-        return paginated, page_info
     
     def export_opportunities(
         self,
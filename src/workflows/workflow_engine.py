@@ -1,14 +1,20 @@
 """
 Workflow Engine
 Executes multi-tool workflows with dependency management and error handling.
+
+Steps run as a dataflow DAG: each step starts as soon as its own dependencies
+have finished (not when a whole "wave" has), subject to a global concurrency
+bound, with the retry_count and timeout_seconds declared in the workflow YAML.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from collections import defaultdict
 import asyncio
 import logging
+import time
 
 from .workflow_parser import WorkflowDefinition, WorkflowStep
 from .tool_loader import get_tool_loader
@@ -35,6 +41,13 @@ class StepResult:
     execution_time_ms: float = 0.0
     timestamp: datetime = field(default_factory=datetime.now)
 
+    # Scheduling (offsets in ms from workflow start)
+    attempts: int = 1
+    queue_time_ms: float = 0.0      # Ready but waiting for a concurrency slot
+    ready_at_ms: float = 0.0        # All dependencies finished
+    started_at_ms: float = 0.0      # First attempt started
+    finished_at_ms: float = 0.0
+
 
 @dataclass
 class WorkflowResult:
@@ -47,23 +60,36 @@ class WorkflowResult:
     end_time: Optional[datetime] = None
     error: Optional[str] = None
 
+    # Chain of steps that determined the workflow's end time
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_ms: float = 0.0
+
 
 class WorkflowEngine:
     """
     Executes workflows with dependency management.
 
     Features:
-    - Parallel execution of independent steps
-    - Dependency resolution
-    - Error handling and retry logic
+    - Dataflow scheduling: a step starts when its own dependencies finish
+    - Bounded global concurrency
+    - Per-step timeouts and retries (timeout_seconds, retry_count)
+    - Queue/run timings and the critical path in WorkflowResult
     - Context variable substitution
     """
 
-    def __init__(self):
-        """Initialize workflow engine."""
+    def __init__(self, max_concurrency: int = 8, retry_backoff_seconds: float = 1.0):
+        """
+        Initialize workflow engine.
+
+        Args:
+            max_concurrency: Maximum steps executing at once
+            retry_backoff_seconds: Delay before the first retry (doubles per retry)
+        """
         self.logger = logging.getLogger(__name__)
         self.tool_registry = get_registry()
         self.tool_loader = get_tool_loader()
+        self.max_concurrency = max(1, max_concurrency)
+        self.retry_backoff_seconds = retry_backoff_seconds
 
     async def execute_workflow(
         self,
@@ -93,6 +119,9 @@ class WorkflowEngine:
             # Execute workflow steps
             step_results = await self._execute_steps(workflow.steps, context)
             result.step_results = step_results
+            result.critical_path, result.critical_path_ms = self._critical_path(
+                workflow.steps, step_results
+            )
 
             # Determine overall status
             if all(r.status == WorkflowStatus.COMPLETED for r in step_results.values()):
@@ -130,6 +159,10 @@ class WorkflowEngine:
         """
         Execute workflow steps with dependency resolution.
 
+        Each step is launched the moment its last dependency finishes
+        (successfully or not, as before), and at most max_concurrency steps
+        execute at once.
+
         Args:
             steps: List of steps to execute
             context: Execution context
@@ -137,46 +170,155 @@ class WorkflowEngine:
         Returns:
             Dictionary of step results (step_name -> StepResult)
         """
+        self._check_dependencies(steps)
+
         results: Dict[str, StepResult] = {}
-        pending_steps = list(steps)
-        completed_steps = set()
-
-        while pending_steps:
-            # Find steps ready to execute (dependencies satisfied)
-            ready_steps = [
-                step for step in pending_steps
-                if all(dep in completed_steps for dep in step.depends_on)
-            ]
-
-            if not ready_steps:
-                # Circular dependency or missing dependency
-                raise ValueError("Circular dependency detected or missing dependencies")
-
-            # Execute ready steps in parallel
-            tasks = [
-                self._execute_step(step, context, results)
-                for step in ready_steps
-            ]
-
-            step_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Process results
-            for step, step_result in zip(ready_steps, step_results):
-                if isinstance(step_result, Exception):
-                    # Handle exception
-                    results[step.name] = StepResult(
-                        step_name=step.name,
-                        status=WorkflowStatus.FAILED,
-                        error=str(step_result)
-                    )
-                else:
-                    results[step.name] = step_result
+        waiting_on = {step.name: len(set(step.depends_on)) for step in steps}
+        dependents: Dict[str, List[WorkflowStep]] = defaultdict(list)
+        for step in steps:
+            for dep in set(step.depends_on):
+                dependents[dep].append(step)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        workflow_start = time.perf_counter()
+        running: Dict[asyncio.Task, WorkflowStep] = {}
+
+        def launch(step: WorkflowStep):
+            task = asyncio.create_task(
+                self._run_step(step, context, results, semaphore, workflow_start)
+            )
+            running[task] = step
+
+        for step in steps:
+            if waiting_on[step.name] == 0:
+                launch(step)
 
-                completed_steps.add(step.name)
-                pending_steps.remove(step)
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    try:
+                        results[step.name] = task.result()
+                    except Exception as e:
+                        finished_ms = (time.perf_counter() - workflow_start) * 1000
+                        results[step.name] = StepResult(
+                            step_name=step.name,
+                            status=WorkflowStatus.FAILED,
+                            error=str(e),
+                            finished_at_ms=finished_ms
+                        )
+
+                    for dependent in dependents[step.name]:
+                        waiting_on[dependent.name] -= 1
+                        if waiting_on[dependent.name] == 0:
+                            launch(dependent)
+        finally:
+            for task in running:
+                task.cancel()
 
         return results
 
+    def _check_dependencies(self, steps: List[WorkflowStep]):
+        """Raise ValueError unless the steps form a DAG over existing step names"""
+        names = {step.name for step in steps}
+        waiting_on = {step.name: len(set(step.depends_on)) for step in steps}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for step in steps:
+            for dep in set(step.depends_on):
+                if dep not in names:
+                    raise ValueError(
+                        f"Circular dependency detected or missing dependencies "
+                        f"(step '{step.name}' depends on unknown step '{dep}')"
+                    )
+                dependents[dep].append(step.name)
+
+        ready = [name for name, count in waiting_on.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for dependent in dependents[name]:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    ready.append(dependent)
+
+        if visited < len(waiting_on):
+            cycle = sorted(name for name, count in waiting_on.items() if count > 0)
+            raise ValueError(f"Circular dependency detected or missing dependencies (steps {cycle})")
+
+    async def _run_step(
+        self,
+        step: WorkflowStep,
+        context: Dict[str, Any],
+        previous_results: Dict[str, StepResult],
+        semaphore: asyncio.Semaphore,
+        workflow_start: float
+    ) -> StepResult:
+        """
+        Run a ready step under the concurrency bound, retrying failed attempts
+        up to step.retry_count times with exponential backoff.
+        """
+        def offset_ms() -> float:
+            return (time.perf_counter() - workflow_start) * 1000
+
+        ready_at_ms = offset_ms()
+        started_at_ms = None
+        queue_time_ms = 0.0
+        run_time_ms = 0.0
+        attempts = 0
+
+        while True:
+            attempts += 1
+            queued_at_ms = offset_ms()
+            async with semaphore:
+                attempt_start_ms = offset_ms()
+                queue_time_ms += attempt_start_ms - queued_at_ms
+                if started_at_ms is None:
+                    started_at_ms = attempt_start_ms
+                result = await self._execute_step(step, context, previous_results)
+                run_time_ms += result.execution_time_ms
+
+            if result.status == WorkflowStatus.COMPLETED or attempts > step.retry_count:
+                break
+
+            delay = self.retry_backoff_seconds * (2 ** (attempts - 1))
+            self.logger.warning(
+                f"Step {step.name} failed (attempt {attempts}/{step.retry_count + 1}): "
+                f"{result.error}; retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+        result.attempts = attempts
+        result.execution_time_ms = run_time_ms
+        result.queue_time_ms = queue_time_ms
+        result.ready_at_ms = ready_at_ms
+        result.started_at_ms = started_at_ms
+        result.finished_at_ms = offset_ms()
+        return result
+
+    @staticmethod
+    def _critical_path(
+        steps: List[WorkflowStep],
+        results: Dict[str, StepResult]
+    ) -> Tuple[List[str], float]:
+        """
+        The dependency chain ending at the last step to finish, following at
+        each step the dependency that finished last (the one it waited for).
+        """
+        finished = {name: r.finished_at_ms for name, r in results.items()}
+        if not finished:
+            return [], 0.0
+
+        depends_on = {step.name: [d for d in set(step.depends_on) if d in finished] for step in steps}
+        last = max(finished, key=finished.get)
+        path = [last]
+        while depends_on.get(path[-1]):
+            path.append(max(depends_on[path[-1]], key=finished.get))
+        path.reverse()
+
+        return path, finished[last]
+
     async def _execute_step(
         self,
         step: WorkflowStep,
@@ -217,10 +359,13 @@ class WorkflowEngine:
 
             # Execute tool using tool loader
             self.logger.info(f"Executing tool {step.tool} for step {step.name}")
-            tool_result = await self.tool_loader.execute_tool(
-                tool_name=step.tool,
-                inputs=inputs,
-                context=execution_context
+            tool_result = await asyncio.wait_for(
+                self.tool_loader.execute_tool(
+                    tool_name=step.tool,
+                    inputs=inputs,
+                    context=execution_context
+                ),
+                timeout=step.timeout_seconds
             )
 
             # Extract output from ToolResult
@@ -243,6 +388,18 @@ class WorkflowEngine:
                 execution_time_ms=execution_time_ms
             )
 
+        except asyncio.TimeoutError:
+            self.logger.error(f"Step timed out: {step.name} after {step.timeout_seconds}s")
+
+            execution_time_ms = (datetime.now() - start_time).total_seconds() * 1000
+
+            return StepResult(
+                step_name=step.name,
+                status=WorkflowStatus.FAILED,
+                error=f"Step timed out after {step.timeout_seconds}s",
+                execution_time_ms=execution_time_ms
+            )
+
         except Exception as e:
             self.logger.error(f"Step execution failed: {step.name} - {e}", exc_info=True)
 
@@ -369,3 +369,103 @@ class TestRateLimitConcurrency:
         call_kwargs = service_with_key.client.messages.create.call_args.kwargs
         assert isinstance(call_kwargs["system"], list)
         assert call_kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+
+# ---------------------------------------------------------------------------
+# Completion cache tests
+# ---------------------------------------------------------------------------
+
+class StubMessages:
+    """Local stand-in for client.messages: echoes the prompt, counts calls."""
+
+    def __init__(self, text=None):
+        self.text = text
+        self.calls = 0
+
+    async def create(self, **params):
+        self.calls += 1
+        text = self.text or json.dumps({"echo": params["messages"][-1]["content"]})
+        return _make_mock_response(text, 1000, 200)
+
+
+@pytest.fixture
+def cached_service(tmp_path):
+    from types import SimpleNamespace
+    from src.core.completion_cache import CompletionCache
+
+    with patch.dict("os.environ", {}, clear=True):
+        svc = AnthropicService(
+            api_key=None, completion_cache=CompletionCache(tmp_path / "completions.db")
+        )
+    svc.client = SimpleNamespace(messages=StubMessages())
+    yield svc
+    svc.completion_cache.close()
+
+
+class TestCompletionCache:
+
+    @pytest.mark.asyncio
+    async def test_deterministic_rerun_is_free(self, cached_service):
+        messages = [{"role": "user", "content": "Score opportunity 1"}]
+        first = await cached_service.create_completion(
+            messages, stage=PipelineStage.FAST_SCREENING, system="Screen", temperature=0.0
+        )
+        second = await cached_service.create_completion(
+            messages, stage=PipelineStage.FAST_SCREENING, system="Screen", temperature=0.0
+        )
+
+        assert cached_service.client.messages.calls == 1
+        assert not first.cached and second.cached
+        assert second.content == first.content and second.usage == first.usage
+        assert second.cost_estimate == 0.0
+
+        summary = cached_service.get_cost_summary()
+        assert summary["total_requests"] == 1
+        cache = summary["completion_cache"]
+        assert (cache["hits"], cache["misses"]) == (1, 1)
+        assert cache["dollars_saved"] == round(first.cost_estimate, 6)
+
+    @pytest.mark.asyncio
+    async def test_key_covers_request_fields_and_opt_out(self, cached_service):
+        messages = [{"role": "user", "content": "Score"}]
+        base = dict(model=ClaudeModel.HAIKU.value, system="A", max_tokens=512, temperature=0.0)
+        await cached_service.create_completion(messages, **base)
+
+        for change in ({"system": "B"}, {"max_tokens": 256}, {"model": ClaudeModel.SONNET.value},
+                       {"stop_sequences": ["END"]}, {"json_mode": True}):
+            response = await cached_service.create_completion(messages, **{**base, **change})
+            assert not response.cached
+
+        assert not (await cached_service.create_completion(messages, **base, use_cache=False)).cached
+        assert not (await cached_service.create_completion(messages, model=ClaudeModel.HAIKU.value,
+                                                           system="A", max_tokens=512)).cached
+        assert (await cached_service.create_completion(messages, **base)).cached
+        assert cached_service.client.messages.calls == 8
+
+    @pytest.mark.asyncio
+    async def test_unparseable_json_is_not_served_again(self, cached_service):
+        cached_service.client.messages.text = "not json"
+        messages = [{"role": "user", "content": "Score"}]
+        for _ in range(2):
+            with pytest.raises(json.JSONDecodeError):
+                await cached_service.create_json_completion(messages)
+        assert cached_service.client.messages.calls == 2
+
+    def test_age_and_size_eviction(self, tmp_path):
+        from src.core.completion_cache import CompletionCache
+
+        cache = CompletionCache(tmp_path / "completions.db", max_bytes=10_000, max_age_seconds=60)
+        usage = {"input_tokens": 10, "output_tokens": 10}
+        for i in range(20):
+            cache.put(f"key{i}", "model", "x" * 1000, usage, "end_turn", 0.01)
+            cache.get("key0")  # Keep the first entry recently used
+
+        stats = cache.get_stats()
+        assert stats["size_bytes"] <= 10_000 and stats["evictions"] > 0
+        assert cache.get("key0") is not None and cache.get("key1") is None
+
+        cache._connection().execute("UPDATE completions SET created_at = created_at - 120")
+        assert cache.get("key19") is None
+        assert cache.evict() == stats["entries"] - 1
+        assert cache.get_stats()["entries"] == 0
+        cache.close()
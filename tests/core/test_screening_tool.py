@@ -337,3 +337,95 @@ class TestCostEstimation:
     def test_cost_estimate_convenience(self, tool_with_ai):
         estimate = tool_with_ai.get_cost_estimate(100, mode="fast")
         assert estimate == pytest.approx(0.10)
+
+
+# ---------------------------------------------------------------------------
+# Sliding-window and packed screening tests
+# ---------------------------------------------------------------------------
+
+def _make_opps(n):
+    return [
+        Opportunity(
+            opportunity_id=f"opp_{i:03d}", title=f"Grant {i}", funder=f"Funder {i}",
+            funder_type="foundation", description="Youth mentorship funding",
+        )
+        for i in range(n)
+    ]
+
+
+def _score_for(opportunity_id):
+    return {"opportunity_id": opportunity_id, "overall_score": 0.5 + int(opportunity_id[-3:]) / 100}
+
+
+class TestWindowedAndPackedScreening:
+
+    def test_thorough_prompt_includes_opportunity_for_detailed_org(self, sample_org, sample_opps):
+        _, user = _build_thorough_screening_prompt(sample_opps[0], sample_org)
+        assert "Annual Revenue: $2,500,000" in user
+        assert "Years Established: 12" in user
+        assert "Youth STEM Education Grant" in user
+
+    @pytest.mark.asyncio
+    async def test_sliding_window_bounds_concurrency_and_keeps_order(self, tool_with_ai, sample_org):
+        import asyncio
+
+        state = {"active": 0, "peak": 0}
+
+        async def complete(messages, **kwargs):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            opportunity_id = messages[0]["content"].split("Title: Grant ")[1].split("\n")[0]
+            await asyncio.sleep(0.05 if opportunity_id == "0" else 0.001)
+            state["active"] -= 1
+            assert kwargs["cache_system_prompt"] is True
+            return {"overall_score": int(opportunity_id) / 100}
+
+        tool_with_ai._anthropic.create_json_completion.side_effect = complete
+        tool_with_ai.fast_concurrency = 4
+
+        scores = await tool_with_ai._screen_fast_batch(_make_opps(30), sample_org)
+
+        assert [s.opportunity_id for s in scores] == [f"opp_{i:03d}" for i in range(30)]
+        assert state["peak"] == 4
+        # The slow first call did not hold back the other 29
+        assert tool_with_ai._anthropic.create_json_completion.call_count == 30
+
+    @pytest.mark.asyncio
+    async def test_packed_mode_scores_several_per_call(self, tool_with_ai, sample_org):
+        async def complete(messages, system, **kwargs):
+            assert '"results"' in system
+            ids = [line.split("opportunity_id: ")[1].rstrip("):")
+                   for line in messages[0]["content"].splitlines() if "opportunity_id: " in line]
+            return {"results": [_score_for(i) for i in ids]}
+
+        tool_with_ai._anthropic.create_json_completion.side_effect = complete
+        tool_with_ai.pack_size = 4
+
+        scores = await tool_with_ai._screen_fast_batch(_make_opps(10), sample_org)
+
+        assert [s.opportunity_id for s in scores] == [f"opp_{i:03d}" for i in range(10)]
+        assert scores[7].overall_score == pytest.approx(0.57)
+        assert tool_with_ai._anthropic.create_json_completion.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_packed_failures_fall_back_to_single_mode(self, tool_with_ai, sample_org):
+        async def complete(messages, system, **kwargs):
+            if "opportunity_id: opp_000" in messages[0]["content"]:
+                # Partial response: opp_001 missing
+                return {"results": [_score_for("opp_000"), "garbage"]}
+            if '"results"' in system:
+                raise json.JSONDecodeError("bad", "", 0)
+            opportunity_id = "opp_" + messages[0]["content"].split("Title: Grant ")[1].split("\n")[0].zfill(3)
+            return {"overall_score": 0.9 if opportunity_id == "opp_001" else 0.1}
+
+        tool_with_ai._anthropic.create_json_completion.side_effect = complete
+        tool_with_ai.pack_size = 2
+
+        with patch("tools.opportunity_screening_tool.app.screening_tool.enrich_opportunities_batch",
+                   return_value={}):
+            scores = await tool_with_ai._screen_thorough_batch(_make_opps(4), sample_org)
+
+        assert [s.overall_score for s in scores] == [pytest.approx(0.5), 0.9, 0.1, 0.1]
+        assert all(s.analysis_depth == "thorough" for s in scores)
+        # 2 packed calls + 1 retry for opp_001 + 2 retries for the unparseable pack
+        assert tool_with_ai._anthropic.create_json_completion.call_count == 5
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CompositeScoreV2.score_many vs per-pair score_foundation_match
+
+Screens one profile against a synthetic BMF-like population of private
+foundations (mixed NTEE codes, states, asset sizes, filing years, a share
+with Schedule I grantees) and reports foundations/s for both paths at each
+size, checking that the batch results are identical to the scalar ones.
+
+Measured speedup of the batch path is about 1.3-1.4x (1k-10k foundations,
+~7k/s batch vs ~5k/s scalar). Roughly 80% of batch time is the per-foundation
+Schedule I analysis (EIN resolution), which is not vectorized.
+
+Run from project root:
+
+    python tests/performance/bench_composite_scorer_batch.py
+    python tests/performance/bench_composite_scorer_batch.py --sizes 1000 10000 --top-k 100
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.scoring.composite_scorer_v2 import CompositeScoreV2, FoundationOpportunityData
+from src.profiles.models import OrganizationProfile, OrganizationType, ScheduleIGrantee
+from src.scoring.ntee_scorer import NTEEDataSource
+
+NTEE_POOL = ["W30", "W90", "P85", "P20", "B25", "B", "E20", "K30", "A20", "Q33", "S20", "T22", "X20"]
+STATES = ["VA", "NC", "MD", "CA", "TX", "NY", "FL"]
+
+
+def synthetic_foundations(n: int, seed: int = 42) -> list:
+    rnd = random.Random(seed)
+    foundations = []
+    for i in range(n):
+        codes = rnd.sample(NTEE_POOL, rnd.randint(1, 3))
+        grantees = None
+        if rnd.random() < 0.05:
+            grantees = [
+                ScheduleIGrantee(recipient_name=f"Grantee {k}", recipient_ein=f"5400000{k:02d}",
+                                 grant_amount=25000.0, grant_year=2023)
+                for k in range(rnd.randint(1, 15))
+            ]
+        foundations.append(FoundationOpportunityData(
+            foundation_ein=f"{100000000 + i}",
+            foundation_name=f"Foundation {i}",
+            ntee_codes=codes,
+            ntee_code_sources={c: NTEEDataSource.BMF for c in codes},
+            ntee_code_dates={c: datetime(rnd.randint(2016, 2024), 1, 1) for c in codes} if rnd.random() < 0.5 else None,
+            schedule_i_grantees=grantees,
+            typical_grant_amount=rnd.choice([None, 5000.0, 10000.0, 25000.0, 50000.0, 100000.0]),
+            geographic_focus_states=rnd.choice([None, [rnd.choice(STATES)], rnd.sample(STATES, 3)]),
+            total_assets=rnd.choice([None, 80_000.0, 600_000.0, 4_000_000.0, 20_000_000.0, 75_000_000.0]),
+            accepts_applications=rnd.choice([None, True, False]),
+            most_recent_filing_year=rnd.choice([None, 2019, 2021, 2022, 2023, 2024]),
+        ))
+    return foundations
+
+
+def sample_profile() -> OrganizationProfile:
+    return OrganizationProfile(
+        profile_id="bench_profile",
+        name="Heroes Bridge",
+        organization_type=OrganizationType.NONPROFIT,
+        ein="54-1026365",
+        location="Raleigh, VA 27601",
+        focus_areas=["Veteran Services"],
+        ntee_codes=["W30", "P85"],
+        annual_revenue=1500000,
+    )
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    p.add_argument("--top-k", type=int, default=None, help="Only materialize the k best results")
+    p.add_argument("--scalar-limit", type=int, default=10000,
+                   help="Skip the per-pair path above this size (default: 10000)")
+    args = p.parse_args()
+
+    logging.disable(logging.WARNING)
+    scorer = CompositeScoreV2()
+    profile = sample_profile()
+
+    print(f"{'foundations':>12} {'scalar/s':>12} {'batch/s':>12} {'speedup':>8} {'identical':>10}")
+    for n in args.sizes:
+        foundations = synthetic_foundations(n)
+
+        start = time.perf_counter()
+        batch = scorer.score_many(profile, foundations, top_k=args.top_k)
+        batch_rate = n / (time.perf_counter() - start)
+
+        if n <= args.scalar_limit:
+            start = time.perf_counter()
+            scalar = [(f, scorer.score_foundation_match(profile, f)) for f in foundations]
+            scalar_rate = n / (time.perf_counter() - start)
+            by_ein = {f.foundation_ein: r for f, r in scalar}
+            identical = all(by_ein[f.foundation_ein] == r for f, r in batch)
+            print(f"{n:>12,} {scalar_rate:>12,.0f} {batch_rate:>12,.0f} "
+                  f"{batch_rate / scalar_rate:>7.1f}x {str(identical):>10}")
+        else:
+            print(f"{n:>12,} {'-':>12} {batch_rate:>12,.0f} {'-':>8} {'-':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Tests for BMFNameIndex — FTS5 trigram / token name index over bmf_organizations —
+and the EINResolver name searches, batch resolution and persistent cache built on it.
+
+Uses temporary SQLite files via pytest's tmp_path fixture.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.database.bmf_name_index import BMFNameIndex, TRIGRAM_TABLE, normalize_org_name
+from src.utils import ein_resolution
+from src.utils.ein_resolution import EINConfidence, EINResolver
+
+ORGS = [
+    ("300219424", "Heroes Bridge Inc", "VA", "22030", "W30"),
+    ("541026365", "Community Foundation of Greater Richmond", "VA", "23219", "T31"),
+    ("111111111", "Richmond Community Church", "VA", "23220", "X21"),
+    ("222222222", "Heroes Bridge", "TX", "75001", "W30"),
+    ("333333333", "Children's Museum of Richmond", "VA", "23220", "A52"),
+]
+
+
+@pytest.fixture()
+def db_path(tmp_path):
+    path = str(tmp_path / "bmf.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE bmf_organizations ("
+        "ein TEXT PRIMARY KEY, name TEXT NOT NULL, state TEXT, zip TEXT, ntee_code TEXT)"
+    )
+    conn.executemany("INSERT INTO bmf_organizations VALUES (?, ?, ?, ?, ?)", ORGS)
+    conn.commit()
+    BMFNameIndex(conn).rebuild()
+    conn.close()
+    return path
+
+
+@pytest.fixture()
+def index(db_path):
+    conn = sqlite3.connect(db_path)
+    yield BMFNameIndex(conn)
+    conn.close()
+
+
+class TestBMFNameIndex:
+    def test_normalize_org_name(self):
+        assert normalize_org_name("Heroes Bridge, Inc.") == "heroes bridge"
+        assert normalize_org_name("Children's Museum") == "childrens museum"
+        assert normalize_org_name(None) == ""
+
+    def test_exact_search_respects_state(self, index):
+        results = index.search("HEROES BRIDGE INC", state="VA")
+        assert [r["ein"] for r in results] == ["300219424"]
+        assert results[0]["zip_code"] == "22030"
+
+        both = {r["ein"] for r in index.search("Heroes Bridge")}
+        assert both == {"300219424", "222222222"}
+
+    def test_typo_falls_back_to_trigrams(self, index):
+        results = index.search("Heros Brdge", state="VA", zip_code="22031")
+        assert results and results[0]["ein"] == "300219424"
+
+    def test_word_search_ranks_all_words_first(self, index):
+        results = index.search("Richmond Community", state="VA")
+        assert results[0]["ein"] in {"541026365", "111111111"}
+        assert {r["ein"] for r in results[:2]} == {"541026365", "111111111"}
+
+    def test_substring_match(self, index):
+        match = BMFNameIndex.substring_match("museum of")
+        rows = index.conn.execute(
+            f"SELECT rowid FROM {TRIGRAM_TABLE} WHERE {TRIGRAM_TABLE} MATCH ?", (match,)
+        ).fetchall()
+        assert len(rows) == 1
+        assert BMFNameIndex.substring_match("of") is None
+
+    def test_sync_indexes_appended_rows(self, index):
+        index.conn.execute(
+            "INSERT INTO bmf_organizations VALUES ('444444444', 'Late Hope Society', 'MD', '21201', 'P20')"
+        )
+        index.conn.commit()
+        assert "444444444" not in {r["ein"] for r in index.search("Late Hope Society")}
+
+        assert index.sync() == 1
+        assert [r["ein"] for r in index.search("Late Hope Society")] == ["444444444"]
+        assert index.sync() == 0
+
+
+class TestEINResolverNameSearch:
+    def test_exact_ein_lookup(self, db_path):
+        resolver = EINResolver(bmf_database_path=db_path)
+        result = resolver.resolve_ein(ein="30-0219424", name="Heroes Bridge", state="VA")
+        assert result.confidence == EINConfidence.HIGH
+        assert result.matched_by == "exact_ein_high_confidence"
+
+    def test_fuzzy_name_geo_resolution(self, db_path):
+        resolver = EINResolver(bmf_database_path=db_path)
+        result = resolver.resolve_ein(name="Heros Bridge", state="TX")
+        assert result.ein == "222222222"
+        assert result.matched_by == "fuzzy_name_geo"
+        assert result.confidence == EINConfidence.MEDIUM
+
+    def test_missing_database_returns_none(self, tmp_path):
+        resolver = EINResolver(bmf_database_path=str(tmp_path / "missing.db"))
+        assert resolver.resolve_ein(name="Heroes Bridge", state="VA") is None
+
+    def test_database_without_bmf_table_returns_none(self, tmp_path):
+        empty = tmp_path / "empty.db"
+        empty.touch()
+        resolver = EINResolver(bmf_database_path=str(empty), cache_db_path=str(tmp_path / "cache.db"))
+        assert resolver.resolve_ein(ein="300219424", name="Heroes Bridge", state="VA") is None
+        assert resolver.batch_resolve_eins(BATCH) == [None] * len(BATCH)
+
+    def test_unqueryable_bmf_table_returns_none(self, tmp_path):
+        path = tmp_path / "partial.db"
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE bmf_organizations (ein TEXT PRIMARY KEY)")
+        conn.commit()
+        conn.close()
+        resolver = EINResolver(bmf_database_path=str(path), cache_db_path=str(tmp_path / "cache.db"))
+        assert resolver.resolve_ein(ein="300219424", name="Heroes Bridge", state="VA") is None
+        assert resolver.resolve_ein(name="Heroes Bridge", state="VA") is None
+
+
+BATCH = [
+    {"ein": "30-0219424", "name": "Heroes Bridge", "state": "VA"},
+    {"ein": "541026365", "name": "Community Fdn of Greater Richmond", "zip_code": "23230"},
+    {"name": "Heros Bridge", "state": "TX"},
+    {"ein": "999999999", "name": "Childrens Museum of Richmond"},
+    {"ein": "300219424", "name": "HEROES BRIDGE, INC.", "state": "va"},
+    {"name": "Nothing Like It Anywhere"},
+    {},
+]
+
+
+class TestEINResolverBatch:
+    def test_batch_matches_single_resolution(self, db_path, tmp_path, monkeypatch):
+        monkeypatch.setattr(ein_resolution, "EIN_LOOKUP_CHUNK", 1)
+        single = EINResolver(bmf_database_path=db_path, cache_db_path=str(tmp_path / "single.db"))
+        batch = EINResolver(bmf_database_path=db_path, cache_db_path=str(tmp_path / "batch.db"))
+
+        expected = [single.resolve_ein(**item) if item else None for item in BATCH]
+        results = batch.batch_resolve_eins(BATCH)
+
+        assert results == expected
+        assert [r.ein if r else None for r in results] == [
+            "300219424", "541026365", "222222222", "333333333", "300219424", None, None]
+        # Duplicate queries normalize to one cache entry
+        assert batch.get_cache_stats()["persistent_cache_size"] == 5
+
+    def test_persistent_cache_survives_restart(self, db_path):
+        EINResolver(bmf_database_path=db_path).batch_resolve_eins(BATCH)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE bmf_organizations SET name = 'Renamed Org' WHERE ein = '300219424'")
+        conn.commit()
+        conn.close()
+
+        # Answered from the cache: the in-place update was not a BMF load
+        result = EINResolver(bmf_database_path=db_path).resolve_ein(ein="300219424", name="Heroes Bridge", state="VA")
+        assert result.organization_name == "Heroes Bridge Inc"
+
+    def test_bmf_load_invalidates_cache(self, db_path, index):
+        resolver = EINResolver(bmf_database_path=db_path)
+        assert resolver.batch_resolve_eins([{"name": "Late Hope Society", "state": "MD"}]) == [None]
+
+        index.conn.execute(
+            "INSERT INTO bmf_organizations VALUES ('444444444', 'Late Hope Society', 'MD', '21201', 'P20')"
+        )
+        index.conn.commit()
+        index.sync()
+
+        results = resolver.batch_resolve_eins([{"name": "Late Hope Society", "state": "MD"}])
+        assert results[0].ein == "444444444"
+        assert EINResolver(bmf_database_path=db_path).resolve_ein(
+            name="Late Hope Society", state="MD").ein == "444444444"
+
+    def test_bmf_load_invalidates_single_resolution_cache(self, db_path, index):
+        resolver = EINResolver(bmf_database_path=db_path)
+        assert resolver.resolve_ein(name="Late Hope Society", state="MD") is None
+
+        index.conn.execute(
+            "INSERT INTO bmf_organizations VALUES ('444444444', 'Late Hope Society', 'MD', '21201', 'P20')"
+        )
+        index.conn.commit()
+        index.sync()
+
+        assert resolver.resolve_ein(name="Late Hope Society", state="MD").ein == "444444444"
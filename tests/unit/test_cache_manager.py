@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Cache Manager
+Tests the SQLite metadata store, JSON migration, dedup aliases and LRU eviction.
+"""
+
+import pytest
+import json
+import tempfile
+from datetime import datetime, timedelta
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.core.cache_manager import CacheManager, CacheType, CacheEntry
+
+
+class TestCacheManager:
+    """Test suite for CacheManager functionality"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.cache_manager = CacheManager(self.cache_dir)
+
+    def teardown_method(self):
+        self.cache_manager.close()
+
+    @pytest.mark.asyncio
+    async def test_set_and_get_roundtrip(self):
+        """Test that cached content is returned from the SQLite-backed index"""
+        await self.cache_manager.set("https://api/x", CacheType.API_RESPONSE, {"a": 1})
+
+        assert await self.cache_manager.get("https://api/x", CacheType.API_RESPONSE) == {"a": 1}
+        assert await self.cache_manager.get("https://api/y", CacheType.API_RESPONSE) is None
+        assert (self.cache_dir / "cache_metadata.db").exists()
+        assert not (self.cache_dir / "cache_metadata.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_access_stats_are_batched(self):
+        """Test that hits are buffered and written on flush"""
+        key = await self.cache_manager.set("u", CacheType.XML_DOWNLOAD, "<x/>")
+        for _ in range(3):
+            await self.cache_manager.get("u", CacheType.XML_DOWNLOAD)
+
+        assert self.cache_manager.store.get(key).access_count == 1
+        self.cache_manager.flush_access_stats()
+        assert self.cache_manager.store.get(key).access_count == 4
+
+    @pytest.mark.asyncio
+    async def test_dedup_alias_survives_original_removal(self):
+        """Test that a shared file is kept while another key still references it"""
+        first = await self.cache_manager.set("a", CacheType.API_RESPONSE, {"same": True})
+        await self.cache_manager.set("b", CacheType.API_RESPONSE, {"same": True})
+
+        await self.cache_manager._remove_cache_entry(first)
+
+        assert await self.cache_manager.get("b", CacheType.API_RESPONSE) == {"same": True}
+        stats = await self.cache_manager.get_cache_stats()
+        assert stats["total_entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_enforces_max_cache_size(self):
+        """Test that set() evicts least-recently-used entries past max_cache_size"""
+        self.cache_manager.max_cache_size = 2000
+        for i in range(20):
+            await self.cache_manager.set(f"doc-{i}", CacheType.XML_DOWNLOAD, "x" * 200 + str(i))
+
+        stats = await self.cache_manager.get_cache_stats()
+        on_disk = sum(p.stat().st_size for p in self.cache_dir.rglob("*.cache"))
+        assert stats["total_size_bytes"] <= 2000
+        assert stats["total_size_bytes"] == on_disk
+        assert await self.cache_manager.get("doc-19", CacheType.XML_DOWNLOAD) is not None
+        assert await self.cache_manager.get("doc-0", CacheType.XML_DOWNLOAD) is None
+
+    @pytest.mark.asyncio
+    async def test_cleanup_expired(self):
+        """Test that expired entries and their files are removed"""
+        await self.cache_manager.set("old", CacheType.API_RESPONSE, {"v": 1}, ttl=timedelta(seconds=-1))
+        await self.cache_manager.set("new", CacheType.API_RESPONSE, {"v": 2})
+
+        assert await self.cache_manager.cleanup_expired() == 1
+        assert len(list(self.cache_dir.rglob("*.cache"))) == 1
+
+    def test_legacy_json_metadata_is_migrated(self):
+        """Test one-time import of cache_metadata.json"""
+        legacy_dir = Path(tempfile.mkdtemp())
+        (legacy_dir / "xml_download").mkdir()
+        cached = legacy_dir / "xml_download" / "k1.cache"
+        cached.write_text("<x/>")
+        now = datetime.now()
+        entry = CacheEntry("k1", CacheType.XML_DOWNLOAD, "h", now, now, now + timedelta(days=1), cached, {})
+        legacy = entry.to_dict()
+        legacy.pop("size_bytes")
+        (legacy_dir / "cache_metadata.json").write_text(json.dumps({"k1": legacy, "k2": legacy}))
+
+        manager = CacheManager(legacy_dir)
+        try:
+            assert manager.store.count() == 2
+            assert manager.store.get("k2").file_path == cached
+            assert manager._total_size == 4
+            assert (legacy_dir / "cache_metadata.json.migrated").exists()
+        finally:
+            manager.close()
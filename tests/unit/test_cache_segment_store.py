@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Segment Store disk layer
+Tests packed segment records, compression, tombstones, compaction and crash recovery.
+"""
+
+import tempfile
+import time
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.core.cache_segment_store import SegmentStore, SegmentStoreLocked, CODEC_RAW
+
+
+class TestSegmentStore:
+    """Test suite for SegmentStore functionality"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.root = Path(tempfile.mkdtemp())
+        self.store = SegmentStore(self.root, segment_max_bytes=20000)
+
+    def teardown_method(self):
+        self.store.close()
+
+    def test_put_get_roundtrip_and_compression(self):
+        """Test that compressible payloads are stored smaller and read back intact"""
+        payload = {"revenue": [{"year": y, "amount": y * 1000} for y in range(200)]}
+        self.store.put("fin:1", payload, time.time() + 60, compress=True)
+        self.store.put("geo:1", payload, time.time() + 60, compress=False)
+
+        assert self.store.get("fin:1") == payload
+        assert self.store.index["fin:1"].length < self.store.index["geo:1"].length
+        assert self.store.index["geo:1"].codec == CODEC_RAW
+
+    def test_expired_entries_are_not_returned(self):
+        """Test that expiry is enforced from the in-memory index"""
+        self.store.put("old", {"v": 1}, time.time() - 1, compress=False)
+
+        assert self.store.get("old") is None
+        assert "old" not in self.store.index
+
+    def test_index_rebuilt_from_segments_with_tombstones(self):
+        """Test that a reopened store sees the latest record per key and honors deletes"""
+        for round_no in range(3):
+            for i in range(20):
+                self.store.put(f"k{i}", {"round": round_no}, time.time() + 60, compress=False)
+        self.store.delete("k3")
+        self.store.close()
+
+        self.store = SegmentStore(self.root, segment_max_bytes=20000)
+        assert "k3" not in self.store.index
+        assert len(self.store.index) == 19
+        assert self.store.get("k5") == {"round": 2}
+
+    def test_compaction_reclaims_dead_segments(self):
+        """Test that overwritten records in sealed segments are compacted away"""
+        for round_no in range(6):
+            for i in range(40):
+                self.store.put(f"k{i}", {"round": round_no, "pad": "x" * 200}, time.time() + 60, compress=False)
+
+        assert len(self.store._segment_ids()) <= 3
+        assert self.store.live_bytes() <= self.store.disk_bytes()
+        assert all(self.store.get(f"k{i}")["round"] == 5 for i in range(40))
+
+    def test_torn_tail_is_truncated_on_load(self):
+        """Test recovery from a partially written final record"""
+        self.store.put("a", {"v": 1}, time.time() + 60, compress=False)
+        self.store.close()
+        segment = self.store._segment_path(self.store._segment_ids()[-1])
+        with open(segment, "ab") as f:
+            f.write(b"ECS1partial")
+
+        self.store = SegmentStore(self.root, segment_max_bytes=20000)
+        assert self.store.get("a") == {"v": 1}
+        self.store.put("b", {"v": 2}, time.time() + 60, compress=False)
+        assert self.store.get("b") == {"v": 2}
+
+    def test_directory_has_a_single_owner(self):
+        """Test that a second store on an open directory is refused until the first closes"""
+        self.store.put("a", {"v": 1}, time.time() + 60, compress=False)
+        with pytest.raises(SegmentStoreLocked):
+            SegmentStore(self.root, segment_max_bytes=20000)
+
+        self.store.close()
+        self.store = SegmentStore(self.root, segment_max_bytes=20000)
+        assert self.store.get("a") == {"v": 1}
@@ -698,9 +698,48 @@ class TestStructureAndTypes:
         assert 0.0 <= result.foundation_type_score <= 100.0
 
 
+# ============================================================================
+# Test Class 7: Batch Scoring
+# ============================================================================
+
+class TestBatchScoring:
+    """Test score_many() against the per-pair scalar path."""
+
+    def test_score_many_matches_scalar_path(self, sample_profile, high_match_foundation,
+                                            low_match_foundation, missing_data_foundation):
+        """Test batch results are identical to score_foundation_match."""
+        scorer = CompositeScoreV2()
+        foundations = [high_match_foundation, low_match_foundation, missing_data_foundation]
+
+        batch = scorer.score_many(sample_profile, foundations)
+
+        assert len(batch) == 3
+        for foundation, result in batch:
+            assert result == scorer.score_foundation_match(sample_profile, foundation)
+
+    def test_score_many_sorted_with_top_k(self, sample_profile, high_match_foundation,
+                                          low_match_foundation, missing_data_foundation):
+        """Test results are sorted by final score and truncated to top_k."""
+        scorer = CompositeScoreV2()
+        foundations = [low_match_foundation, missing_data_foundation, high_match_foundation]
+
+        ranked = scorer.score_many(sample_profile, foundations)
+        top = scorer.score_many(sample_profile, foundations, top_k=1)
+
+        scores = [result.final_score for _, result in ranked]
+        assert scores == sorted(scores, reverse=True)
+        assert len(top) == 1
+        assert top[0][0] is ranked[0][0]
+
+    def test_score_many_empty(self, sample_profile):
+        """Test empty input returns no results."""
+        assert CompositeScoreV2().score_many(sample_profile, []) == []
+
+
 # ============================================================================
 # Run Tests
 # ============================================================================
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
+
@@ -0,0 +1,150 @@
+"""
+Tests for CostLedger — the append-only, buffered cost ledger behind
+CostTracker — and the tracker paths that read from it.
+
+Rolled-up totals and billing exports are checked against a recomputation
+from the recorded CostRecords. Uses temporary directories via pytest's
+tmp_path fixture.
+"""
+
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.analytics.cost_ledger import CostLedger
+from src.analytics.cost_tracker import AIService, CostBudget, CostCategory, CostRecord, CostTracker
+
+SERVICES = [AIService.ANTHROPIC_CLAUDE_3_HAIKU, AIService.ANTHROPIC_CLAUDE_3_SONNET, AIService.OPENAI_GPT4O_MINI]
+CATEGORIES = [CostCategory.AI_SCORING, CostCategory.AI_ANALYSIS]
+
+
+def make_record(i, rnd, start=datetime(2025, 1, 25)):
+    return CostRecord(
+        record_id=f"rec_{i}",
+        profile_id="profile_a",
+        opportunity_id=f"opp_{i}",
+        service=rnd.choice(SERVICES),
+        operation_type=rnd.choice(CATEGORIES),
+        processing_step=None,
+        input_tokens=rnd.randint(100, 2000),
+        output_tokens=rnd.randint(10, 500),
+        processing_time_seconds=0.5,
+        actual_cost_usd=Decimal(rnd.randint(1, 500)) / Decimal(10000),
+        estimated_cost_usd=None,
+        cost_variance=None,
+        timestamp=start + timedelta(hours=rnd.randint(0, 24 * 20), microseconds=rnd.randint(0, 999999)),
+        success=rnd.random() < 0.9,
+        metadata={"batch_id": rnd.choice(["b1", "b2"])},
+    )
+
+
+@pytest.fixture()
+def records():
+    rnd = random.Random(3)
+    return [make_record(i, rnd) for i in range(300)]
+
+
+class TestCostLedger:
+    def test_rollups_match_records_and_survive_reopen(self, tmp_path, records):
+        ledger = CostLedger(tmp_path / "ledger.db", max_buffer=64)
+        for record in records:
+            ledger.append(record.to_dict())
+
+        day = records[0].timestamp.date().isoformat()
+        month = records[0].timestamp.strftime("%Y-%m")
+        expected = {
+            ("total", ""): [r for r in records],
+            ("day", day): [r for r in records if r.timestamp.date().isoformat() == day],
+            ("month", month): [r for r in records if r.timestamp.strftime("%Y-%m") == month],
+            ("service", SERVICES[1].value): [r for r in records if r.service == SERVICES[1]],
+        }
+        ledger.close()
+
+        reopened = CostLedger(tmp_path / "ledger.db")
+        for (dimension, bucket), matching in expected.items():
+            rollup = reopened.rollup(dimension, bucket)
+            assert rollup.count == len(matching)
+            assert rollup.cost == sum(r.actual_cost_usd for r in matching)
+            assert rollup.successes == sum(1 for r in matching if r.success)
+        assert sum(r.count for r in reopened.rollups_for("month").values()) == len(records)
+        reopened.close()
+
+    def test_range_query_streams_in_timestamp_order(self, tmp_path, records):
+        ledger = CostLedger(tmp_path / "ledger.db")
+        for record in records:
+            ledger.append(record.to_dict())
+
+        start, end = datetime(2025, 2, 1), datetime(2025, 2, 5, 12)
+        streamed = [r["record_id"] for r in ledger.iter_records(start, end, chunk_size=7)]
+        in_range = sorted((r for r in records if start <= r.timestamp <= end), key=lambda r: r.timestamp)
+        assert streamed == [r.record_id for r in in_range]
+        assert len(list(ledger.iter_records(chunk_size=10))) == len(records)
+        ledger.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_buffered_until_the_flush_interval(self, tmp_path, records):
+        ledger = CostLedger(tmp_path / "ledger.db", flush_interval=0.05)
+        for record in records[:10]:
+            ledger.append(record.to_dict())
+
+        def stored():
+            return ledger._conn.execute("SELECT COUNT(*) FROM cost_records").fetchone()[0]
+
+        assert stored() == 0
+        await asyncio.sleep(0.1)
+        assert stored() == 10
+        ledger.close()
+
+
+class TestCostTrackerLedger:
+    @pytest.mark.asyncio
+    async def test_record_budget_analytics_and_export(self, tmp_path, records):
+        tracker = CostTracker(cost_dir=tmp_path)
+        budget = await tracker.create_budget("monthly", "Monthly", Decimal("5.00"))
+
+        for record in records[:50]:
+            await tracker.record_ai_operation(
+                profile_id=record.profile_id, opportunity_id=record.opportunity_id,
+                service=record.service, operation_type=record.operation_type, processing_step=None,
+                input_tokens=record.input_tokens, output_tokens=record.output_tokens,
+                processing_time_seconds=0.5, actual_cost_usd=record.actual_cost_usd,
+                success=record.success, metadata=record.metadata,
+            )
+        spent = sum(r.actual_cost_usd for r in records[:50])
+
+        assert budget.spent_usd == spent
+        assert budget.can_spend(Decimal("5.00") - spent)
+        assert not budget.can_spend(Decimal("5.00") - spent + Decimal("0.0001"))
+        assert tracker.get_spend("day") == spent
+        assert tracker.get_service_spend(SERVICES[0]) == sum(
+            r.actual_cost_usd for r in records[:50] if r.service == SERVICES[0])
+
+        analytics = await tracker.get_cost_analytics()
+        assert analytics["total_records"] == 50
+        assert Decimal(analytics["total_cost"]) == spent
+
+        export = tracker.get_billing_export_data(format_type="detailed")
+        assert export["summary"]["total_operations"] == 50
+        assert Decimal(export["summary"]["total_cost"]) == spent
+        assert sum(b["count"] for b in export["breakdowns"]["by_batch_id"].values()) == 50
+        assert len(export["detailed_records"]) == 50
+
+        tracker.ledger.close()
+        reopened = CostTracker(cost_dir=tmp_path)
+        assert reopened.budgets["monthly"].spent_usd == spent
+        reopened.ledger.close()
+
+    def test_legacy_json_files_are_imported_once(self, tmp_path, records):
+        (tmp_path / "cost_records.json").write_text(json.dumps([r.to_dict() for r in records[:20]]))
+        budget = CostBudget(budget_id="b", name="B", total_budget_usd=Decimal("1.00"), spent_usd=Decimal("0.25"))
+        (tmp_path / "budgets.json").write_text(json.dumps({"b": budget.to_dict()}))
+
+        for _ in range(2):
+            tracker = CostTracker(cost_dir=tmp_path)
+            assert tracker.ledger.rollup("total").count == 20
+            assert tracker.budgets["b"].spent_usd == Decimal("0.25")
+            tracker.ledger.close()
@@ -0,0 +1,208 @@
+"""
+Tests for the streaming discovery result pipeline — SessionResultStore
+(dedupe, running totals, top-N, spill to disk) and the per-result
+processing in MultiTrackDiscoveryEngine.
+
+Store reads are checked against a sort of every added result. The engine
+runs against an in-memory discoverer that yields results with a delay.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.discovery import discovery_engine as engine_module
+from src.discovery.base_discoverer import DiscoveryResult, DiscoverySession, DiscoveryStatus, FunnelStage
+from src.discovery.discovery_engine import MultiTrackDiscoveryEngine
+from src.discovery.session_result_store import SessionResultStore
+from src.profiles.models import FundingType, OrganizationProfile, OrganizationType, ScheduleIGrantee
+
+TYPES = [FundingType.GRANTS, FundingType.GOVERNMENT, FundingType.COMMERCIAL]
+
+
+def make_result(i, score, funding_type=FundingType.GRANTS, ein=None, name=None):
+    return DiscoveryResult(
+        organization_name=name or f"Organization {i}",
+        source_type=funding_type,
+        discovery_source="test",
+        opportunity_id=f"opp_{i}",
+        compatibility_score=score,
+        external_data={"ein": ein} if ein else None,
+    )
+
+
+def ranked(results):
+    """Reference order: score descending, ties in arrival order"""
+    return sorted(results, key=lambda r: -r.compatibility_score)
+
+
+class TestSessionResultStore:
+    def test_reads_match_reference_across_memory_and_spill(self, tmp_path):
+        rnd = random.Random(5)
+        store = SessionResultStore("s1", max_in_memory=15, top_n=5, spill_dir=tmp_path, spill_batch=4)
+        added = []
+        for i in range(80):
+            result = make_result(i, round(rnd.random(), 2), rnd.choice(TYPES))
+            assert store.add(result)
+            added.append(result)
+
+        assert len(store) == 80 and store.spilled == 65
+        assert [r.opportunity_id for r in store.results()] == [r.opportunity_id for r in ranked(added)]
+        grants = [r for r in added if r.source_type == FundingType.GRANTS and r.compatibility_score >= 0.5]
+        assert [r.opportunity_id for r in store.results(FundingType.GRANTS, 0.5, limit=7)] == \
+            [r.opportunity_id for r in ranked(grants)][:7]
+        assert [r.opportunity_id for r in store.iter_results()] == [r.opportunity_id for r in added]
+        assert [r.opportunity_id for r in store.top()] == [r.opportunity_id for r in ranked(added)[:5]]
+        for funding_type in TYPES:
+            scores = [r.compatibility_score for r in added if r.source_type == funding_type]
+            assert store.count_by_type[funding_type] == len(scores)
+            assert store.average_score(funding_type) == pytest.approx(sum(scores) / len(scores))
+            assert store.top_matches_by_type[funding_type] == len([s for s in scores if s > 0.7])
+
+        assert list(tmp_path.iterdir())
+        store.close()
+        assert not list(tmp_path.iterdir())
+
+    def test_spilled_pages_keep_order_across_tied_scores(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SessionResultStore, "SPILL_PAGE_SIZE", 3)
+        rnd = random.Random(9)
+        store = SessionResultStore("s3", max_in_memory=2, spill_dir=tmp_path, spill_batch=5)
+        added = [make_result(i, rnd.choice([0.2, 0.5, 0.8]), rnd.choice(TYPES)) for i in range(40)]
+        for result in added:
+            store.add(result)
+
+        assert [r.opportunity_id for r in store.results()] == [r.opportunity_id for r in ranked(added)]
+        assert [r.opportunity_id for r in store.iter_results()] == [r.opportunity_id for r in added]
+        grants = [r for r in added if r.source_type == FundingType.GRANTS and r.compatibility_score >= 0.5]
+        assert [r.opportunity_id for r in store.results(FundingType.GRANTS, 0.5)] == \
+            [r.opportunity_id for r in ranked(grants)]
+        store.close()
+
+    def test_duplicates_by_ein_or_opportunity_id_are_skipped(self):
+        store = SessionResultStore("s2")
+        assert store.add(make_result(1, 0.5, ein="54-1234567"))
+        assert not store.add(make_result(2, 0.9, ein="541234567"))
+        assert not store.add(make_result(1, 0.7))
+        assert store.add(make_result(3, 0.6, ein="12345"))
+
+        assert len(store) == 2 and store.duplicates == 2
+        assert [r.opportunity_id for r in store.results()] == ["opp_3", "opp_1"]
+
+
+class FakeDiscoverer:
+    name = "fake_discoverer"
+    funding_type = FundingType.GRANTS
+
+    def __init__(self, results, delay=0.01):
+        self.results, self.delay = results, delay
+        self.finished = False
+
+    async def validate_search_params(self, params):
+        return True
+
+    async def pre_discovery_setup(self, profile):
+        return True
+
+    async def discover_opportunities(self, profile, params, max_results):
+        for result in self.results[:max_results]:
+            await asyncio.sleep(self.delay)
+            yield result
+        self.finished = True
+
+    async def post_discovery_cleanup(self, session):
+        pass
+
+
+class TestStreamingDiscovery:
+    @pytest.mark.asyncio
+    async def test_results_are_deduped_fast_tracked_and_published_while_running(self, tmp_path):
+        engine = MultiTrackDiscoveryEngine()
+        engine.spill_dir = tmp_path
+        engine.max_results_in_memory = 5
+        engine.results_update_interval = 0.0
+
+        profile = OrganizationProfile(
+            profile_id="profile_stream",
+            name="Test Foundation",
+            organization_type=OrganizationType.NONPROFIT,
+            focus_areas=["Veterans"],
+            schedule_i_grantees=[ScheduleIGrantee(recipient_name="Heroes Bridge", recipient_ein="54-1111111",
+                                                  grant_amount=5000.0, grant_year=2023)],
+        )
+        results = [make_result(i, 0.1 + i / 100, ein=f"54-20000{i:02d}") for i in range(30)]
+        results.insert(10, make_result(99, 0.2, ein="541111111", name="Heroes Bridge Inc"))
+        results.insert(20, make_result(100, 0.95, ein="54-2000003"))
+        discoverer = FakeDiscoverer(results)
+
+        session = DiscoverySession(
+            session_id="session_stream", profile_id=profile.profile_id, profile_name=profile.name,
+            funding_types=[FundingType.GRANTS], search_params={},
+        )
+        store = engine._create_result_store(session.session_id)
+        from src.utils.grantee_matcher import get_grantee_matcher
+        index = get_grantee_matcher().prepare(profile.schedule_i_grantees, profile.profile_id)
+
+        updates = []
+
+        def progress(session_id, data):
+            if data["status"] == "results":
+                updates.append((discoverer.finished, data))
+
+        await engine._execute_single_discoverer(
+            session, discoverer, profile, SimpleNamespace(max_results_per_type=100), progress, index
+        )
+
+        assert len(store) == 31 and store.duplicates == 1
+        assert session.results_by_type[FundingType.GRANTS] == 31
+        top = engine.get_session_results(session.session_id, max_results=1)[0]
+        assert top.organization_name == "Heroes Bridge Inc"
+        assert top.is_schedule_i_grantee and top.funnel_stage == FunnelStage.CANDIDATES
+        assert store.schedule_i_matches == 1 and store.fast_tracked == 1
+
+        first_finished, first = updates[0]
+        assert not first_finished and first["total_results"] == 1
+        assert updates[-1][1]["top_opportunities"][0]["organization_name"] == "Heroes Bridge Inc"
+        assert len(engine.get_session_results(session.session_id)) == 31
+
+        engine.active_sessions[session.session_id] = session
+        summary = engine.get_session_summary(session.session_id)
+        assert summary["total_results"] == 31 and summary["duplicates_skipped"] == 1
+        assert summary["results_by_funding_type"] == {"grants": 31}
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_progress_service_receives_top_results_while_running(self, tmp_path, monkeypatch):
+        engine = MultiTrackDiscoveryEngine()
+        engine.spill_dir = tmp_path
+        engine.results_update_interval = 0.0
+        discoverer = FakeDiscoverer([make_result(i, i / 20) for i in range(12)])
+        monkeypatch.setattr(engine.search_engine, "generate_search_params",
+                            lambda profile, types, limit: {FundingType.GRANTS: SimpleNamespace(max_results_per_type=limit)})
+        monkeypatch.setattr(engine_module.discoverer_registry, "get_discoverers_for_type", lambda ft: [discoverer])
+
+        class RecordingProgressService:
+            def __init__(self):
+                self.broadcasts = []
+
+            async def broadcast_progress(self, workflow_id, progress_data):
+                self.broadcasts.append((workflow_id, discoverer.finished, progress_data))
+
+        service = RecordingProgressService()
+        profile = OrganizationProfile(profile_id="profile_ws", name="Test Foundation",
+                                      organization_type=OrganizationType.NONPROFIT, focus_areas=["Arts"])
+
+        session = await engine.discover_opportunities(
+            profile, funding_types=[FundingType.GRANTS], progress_service=service,
+            progress_workflow_id="discovery_profile_ws"
+        )
+
+        assert session.status == DiscoveryStatus.COMPLETED
+        assert {workflow_id for workflow_id, _, _ in service.broadcasts} == {"discovery_profile_ws"}
+        running = [data for _, finished, data in service.broadcasts if data["status"] == "results" and not finished]
+        assert running and running[0]["top_opportunities"][0]["opportunity_id"] == "opp_0"
+        assert running[-1]["top_opportunities"][0]["opportunity_id"] == "opp_11"
+        assert all(data["session_id"] == session.session_id for _, _, data in service.broadcasts)
+        assert service.broadcasts[-1][2]["status"] == "completed"
+        engine.session_results[session.session_id].close()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Enhanced Cache System predictive warming
+Tests bounded access histograms, loader-driven refresh and hit-rate gain metrics.
+"""
+
+import pytest
+import tempfile
+import time
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.core.enhanced_cache_system import EnhancedCacheSystem, DataType, AccessHistogram
+
+
+class TestPredictiveWarming:
+    """Test suite for EnhancedCacheSystem predictive warming"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.cache = EnhancedCacheSystem(Path(tempfile.mkdtemp()))
+
+    def teardown_method(self):
+        self.cache.disk_store.close()
+
+    def _seed_pattern(self, data_type: DataType, entity_id: str, interval: float = 60.0):
+        cache_key = self.cache.generate_cache_key(data_type, entity_id)
+        stats = AccessHistogram(data_type, entity_id, None)
+        now = time.time()
+        for i in range(5):
+            stats.record(now - interval * (5 - i))
+        self.cache.access_patterns[cache_key] = stats
+        return cache_key
+
+    def test_access_patterns_are_bounded(self):
+        """Test that per-key tracking is capped and evicts least recently seen keys"""
+        self.cache.max_tracked_keys = 50
+        for i in range(500):
+            self.cache._record_access_pattern(f"k{i}", DataType.FINANCIAL_ANALYTICS, str(i), None)
+
+        assert len(self.cache.access_patterns) == 50
+        assert "k499" in self.cache.access_patterns
+        assert "k0" not in self.cache.access_patterns
+
+    def test_second_cache_on_same_directory_uses_its_own_segments(self):
+        """Test that a second cache on a shared directory takes the next segment slot"""
+        other = EnhancedCacheSystem(self.cache.cache_dir)
+        try:
+            assert self.cache.disk_store.root.name == "segments"
+            assert other.disk_store.root.name == "segments-1"
+        finally:
+            other.disk_store.close()
+
+    @pytest.mark.asyncio
+    async def test_warming_refreshes_only_predicted_uncached_keys(self):
+        """Test that hot keys without a long-lived cache entry are reloaded"""
+        loaded = []
+
+        async def loader(entity_id, context):
+            loaded.append(entity_id)
+            return {"entity": entity_id}
+
+        self.cache.warming_loaders[DataType.FINANCIAL_ANALYTICS] = loader
+        self._seed_pattern(DataType.FINANCIAL_ANALYTICS, "hot")
+        self._seed_pattern(DataType.FINANCIAL_ANALYTICS, "cached")
+        self._seed_pattern(DataType.FINANCIAL_ANALYTICS, "cold", interval=86400)
+        await self.cache.put(DataType.FINANCIAL_ANALYTICS, "cached", {"entity": "cached"})
+
+        assert await self.cache.warm_predicted_keys() == 1
+        assert loaded == ["hot"]
+        assert await self.cache.get(DataType.FINANCIAL_ANALYTICS, "hot") == {"entity": "hot"}
+
+    @pytest.mark.asyncio
+    async def test_metrics_report_warming_hit_rate_gain(self):
+        """Test that hits served by warmed entries are reported separately"""
+        self.cache.warming_loaders[DataType.NETWORK_ANALYTICS] = lambda entity_id, context: {"n": entity_id}
+        self._seed_pattern(DataType.NETWORK_ANALYTICS, "board-1")
+
+        await self.cache.warm_predicted_keys()
+        await self.cache.get(DataType.NETWORK_ANALYTICS, "board-1")
+        await self.cache.get(DataType.NETWORK_ANALYTICS, "board-2")
+
+        metrics = self.cache.get_metrics()
+        assert metrics.warming_successes == 1
+        assert metrics.warmed_hits == 1
+        assert metrics.hit_rate == pytest.approx(0.5)
+        assert metrics.baseline_hit_rate == pytest.approx(0.0)
+        assert metrics.warming_hit_rate_gain == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_hits_before_replaced_entry_expires_are_not_warmed_hits(self):
+        """Test that a refresh only earns a warmed hit once the old entry would have expired"""
+        self.cache.warming_loaders[DataType.NETWORK_ANALYTICS] = lambda entity_id, context: {"n": entity_id}
+        cache_key = self._seed_pattern(DataType.NETWORK_ANALYTICS, "board-1")
+        await self.cache.put(DataType.NETWORK_ANALYTICS, "board-1", {"n": "old"})
+        # Old entry expires inside the look-ahead window, so it is refreshed early
+        expires = datetime.now() + timedelta(seconds=60)
+        value, _ = self.cache.memory_cache[cache_key]
+        self.cache.memory_cache[cache_key] = (value, expires)
+        self.cache.disk_cache_index[cache_key].expires_at = expires.timestamp()
+
+        assert await self.cache.warm_predicted_keys() == 1
+        await self.cache.get(DataType.NETWORK_ANALYTICS, "board-1")
+        assert self.cache.get_metrics().warmed_hits == 0
+
+        self.cache._warmed_keys[cache_key] = time.time() - 1  # Old entry has now expired
+        await self.cache.get(DataType.NETWORK_ANALYTICS, "board-1")
+        await self.cache.get(DataType.NETWORK_ANALYTICS, "board-1")
+        assert self.cache.get_metrics().warmed_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_success_scorer_registers_loader_that_rescores(self, monkeypatch):
+        """Test that a cached success score can be rebuilt by the registered warming loader"""
+        from src.core import enhanced_cache_system as cache_module
+        from src.analytics.success_scorer import SuccessScorer
+        from src.core.unified_scorer_interface import ScoringContext, WorkflowStage
+
+        monkeypatch.setattr(cache_module, "enhanced_cache_system", self.cache)
+        scorer = SuccessScorer()
+        calls = []
+        original = scorer.calculate_success_score
+
+        async def counting(organization_data):
+            calls.append(organization_data["profile_id"])
+            return await original(organization_data)
+
+        monkeypatch.setattr(scorer, "calculate_success_score", counting)
+        context = ScoringContext(profile_id="p1", opportunity_id="o1", entity_type="nonprofit",
+                                 workflow_stage=WorkflowStage.ANALYZE)
+        profile = {"profile_id": "p1", "organization_name": "Test Foundation", "revenue": 500000}
+        scored = await scorer.score({"organization_name": "Funder"}, profile, context)
+
+        loader = self.cache.warming_loaders[DataType.FINANCIAL_ANALYTICS]
+        pattern = next(iter(self.cache.access_patterns.values()))
+        rebuilt = await loader(pattern.entity_id, pattern.context)
+
+        assert calls == ["p1", "p1"]
+        assert rebuilt["overall_score"] == pytest.approx(scored.overall_score)
+        assert await loader("p1:unknown", pattern.context) is None
+        assert DataType.AI_LITE_RESULTS not in self.cache.warming_loaders
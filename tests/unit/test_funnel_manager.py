@@ -0,0 +1,129 @@
+"""
+Tests for FunnelManager — indexed stage lookups, incrementally maintained
+funnel metrics and the persisted stage transition log.
+
+Indexed answers are checked against a scan of every opportunity. Uses
+temporary directories via pytest's tmp_path fixture.
+"""
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.discovery.base_discoverer import DiscoveryResult, FunnelStage
+from src.discovery.funnel_manager import FunnelManager
+from src.profiles.models import FundingType
+
+STAGES = list(FunnelStage)
+
+
+def make_opportunities(count, rnd):
+    now = datetime.now()
+    opportunities = []
+    for i in range(count):
+        opp = DiscoveryResult(
+            organization_name=f"Organization {i}",
+            source_type=FundingType.GRANTS,
+            discovery_source="test",
+            opportunity_id=f"opp_{i}",
+            compatibility_score=rnd.random(),
+            funnel_stage=rnd.choice(STAGES),
+            discovered_at=now - timedelta(days=rnd.randint(0, 60)),
+        )
+        opp.stage_updated_at = now - timedelta(days=rnd.randint(0, 30), minutes=i)
+        opportunities.append(opp)
+    return opportunities
+
+
+class TestFunnelManager:
+    def test_indexed_queries_match_scan_after_transitions(self, tmp_path):
+        rnd = random.Random(11)
+        manager = FunnelManager(log_path=tmp_path / "funnel.db")
+        opportunities = make_opportunities(300, rnd)
+        manager.add_opportunities("p1", opportunities)
+
+        for _ in range(200):
+            opp_id = f"opp_{rnd.randrange(300)}"
+            action = rnd.choice(["promote", "demote", "set"])
+            if action == "promote":
+                manager.promote_opportunity("p1", opp_id)
+            elif action == "demote":
+                manager.demote_opportunity("p1", opp_id)
+            else:
+                manager.set_opportunity_stage("p1", opp_id, rnd.choice(STAGES))
+        moved = manager.bulk_stage_transition("p1", [f"opp_{i}" for i in range(0, 300, 7)] + ["missing"],
+                                              FunnelStage.TARGETS)
+        assert moved["missing"] is False and moved["opp_7"] is True
+
+        for stage in STAGES:
+            assert manager.get_opportunities_by_stage("p1", stage) == \
+                [opp for opp in opportunities if opp.funnel_stage == stage]
+        assert manager.get_all_opportunities("p1") == opportunities
+
+        metrics = manager.get_funnel_metrics("p1")
+        assert metrics["stage_distribution"] == dict(Counter(opp.funnel_stage for opp in opportunities))
+        cutoff = datetime.now() - timedelta(days=14)
+        assert sorted(s["opportunity_id"] for s in metrics["at_risk_opportunities"]) == \
+            sorted(opp.opportunity_id for opp in opportunities if opp.stage_updated_at < cutoff)
+        now = datetime.now()
+        for stage in STAGES:
+            in_stage = [opp for opp in opportunities if opp.funnel_stage == stage]
+            if in_stage:
+                expected = sum((now - opp.discovered_at).total_seconds() for opp in in_stage) / len(in_stage) / 86400
+                assert metrics["funnel_velocity"][stage.value] == pytest.approx(expected, abs=1e-3)
+        assert len(metrics["recent_transitions"]) == len(manager.stage_history["p1"])
+
+    def test_transition_log_survives_restart(self, tmp_path):
+        rnd = random.Random(2)
+        opportunities = make_opportunities(40, rnd)
+        for opp in opportunities:
+            opp.funnel_stage = FunnelStage.PROSPECTS
+
+        manager = FunnelManager(log_path=tmp_path / "funnel.db")
+        manager.add_opportunities("p1", opportunities)
+        manager.bulk_stage_transition("p1", [opp.opportunity_id for opp in opportunities[:10]],
+                                      FunnelStage.CANDIDATES, notes="bulk")
+        history = manager.stage_history["p1"]
+        durations = manager.get_funnel_metrics("p1")["average_stage_duration_hours"]
+        assert len(history) == 50 and set(durations) == {"prospects"}
+        manager.transition_log.close()
+
+        reopened = FunnelManager(log_path=tmp_path / "funnel.db")
+        reopened.add_opportunities("p1", opportunities)
+        assert reopened.stage_history["p1"] == history
+        assert reopened.get_funnel_metrics("p1")["average_stage_duration_hours"] == durations
+        assert len(reopened.get_opportunities_by_stage("p1", FunnelStage.CANDIDATES)) == 10
+        reopened.transition_log.close()
+
+    def test_in_memory_manager_writes_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        manager = FunnelManager(log_path=None)
+        manager.add_opportunities("p1", make_opportunities(5, random.Random(1)))
+        assert manager.promote_opportunity("p1", "opp_0") or manager.demote_opportunity("p1", "opp_0")
+        assert not manager.promote_opportunity("p1", "missing")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_stage_changed_outside_manager_is_reindexed_on_re_add(self):
+        manager = FunnelManager(log_path=None)
+        opportunities = make_opportunities(3, random.Random(4))
+        for opp in opportunities:
+            opp.funnel_stage = FunnelStage.PROSPECTS
+        manager.add_opportunities("p", opportunities)
+
+        changed = opportunities[1]
+        changed.promote_to_next_stage()
+        changed.discovered_at -= timedelta(days=10)
+        manager.add_opportunities("p", [changed])
+
+        assert manager.get_opportunities_by_stage("p", FunnelStage.PROSPECTS) == [opportunities[0], opportunities[2]]
+        assert manager.get_opportunities_by_stage("p", FunnelStage.QUALIFIED_PROSPECTS) == [changed]
+        assert manager.stage_history["p"][-1]["old_stage"] == "prospects"
+        assert manager.stage_history["p"][-1]["new_stage"] == "qualified_prospects"
+
+        velocity = manager.get_funnel_metrics("p")["funnel_velocity"]
+        expected = (datetime.now() - changed.discovered_at).total_seconds() / 86400
+        assert velocity["qualified_prospects"] == pytest.approx(expected, abs=1e-3)
+        assert manager.promote_opportunity("p", changed.opportunity_id)
+        assert manager.get_opportunities_by_stage("p", FunnelStage.CANDIDATES) == [changed]
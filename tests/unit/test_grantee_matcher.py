@@ -0,0 +1,126 @@
+"""
+Tests for GranteeMatcher — prepared Schedule I grantee index and fast-tracking.
+
+The indexed matcher is checked against a front-to-back scan of every grantee
+(the matcher's original algorithm, kept here as the reference).
+"""
+
+import random
+
+from src.discovery.base_discoverer import DiscoveryResult, FunnelStage
+from src.profiles.models import FundingType, OrganizationProfile, OrganizationType, ScheduleIGrantee
+from src.utils.grantee_matcher import GranteeMatcher, apply_schedule_i_fast_tracking
+
+WORDS = ["heroes", "bridge", "community", "church", "museum", "richmond", "veterans",
+         "youth", "arts", "health", "hope", "river", "valley", "school", "family"]
+SUFFIXES = ["", " Inc", " Foundation", " Center", " Society", ", Inc."]
+
+
+def scan_match(matcher, result, grantees):
+    """Reference: score every grantee, keep the first best"""
+    best_match, best_score = None, 0.0
+    discovery_name = result.organization_name.strip()
+    discovery_ein = matcher._extract_ein_from_external_data(result)
+    for grantee in grantees:
+        match_score, match_method = 0.0, ""
+        if discovery_ein and grantee.recipient_ein:
+            if matcher._normalize_ein(discovery_ein) == matcher._normalize_ein(grantee.recipient_ein):
+                match_score, match_method = 1.0, "ein_exact"
+        if match_score < matcher.ein_match_threshold:
+            similarity = matcher._calculate_name_similarity(discovery_name, grantee.recipient_name)
+            if similarity >= matcher.name_similarity_threshold:
+                match_score, match_method = similarity, "name_similarity"
+            elif similarity >= matcher.fuzzy_match_threshold and matcher._additional_fuzzy_checks(result, grantee):
+                match_score, match_method = similarity, "name_fuzzy"
+        if match_score > best_score:
+            best_score = match_score
+            best_match = matcher._build_match(grantee, match_score, match_method, discovery_name, discovery_ein)
+    return best_match if best_match and best_score >= matcher.fuzzy_match_threshold else None
+
+
+def make_result(name, ein=None):
+    return DiscoveryResult(
+        organization_name=name,
+        source_type=FundingType.GRANTS,
+        discovery_source="test",
+        opportunity_id=f"opp_{name}",
+        compatibility_score=0.4,
+        external_data={"ein": ein} if ein else None,
+    )
+
+
+def random_name(rnd):
+    name = " ".join(rnd.sample(WORDS, rnd.randint(1, 3))).title() + rnd.choice(SUFFIXES)
+    if rnd.random() < 0.3:
+        k = rnd.randrange(len(name))
+        name = name[:k] + name[k + 1:]
+    return name
+
+
+def make_profile(grantees):
+    return OrganizationProfile(
+        profile_id="profile_grantees",
+        name="Test Foundation",
+        organization_type=OrganizationType.NONPROFIT,
+        focus_areas=["Veterans"],
+        schedule_i_grantees=grantees,
+    )
+
+
+class TestGranteeMatcher:
+    def setup_method(self):
+        self.matcher = GranteeMatcher()
+
+    def test_indexed_matches_equal_scan(self):
+        rnd = random.Random(7)
+        grantees = [
+            ScheduleIGrantee(
+                recipient_name=random_name(rnd),
+                recipient_ein=rnd.choice([None, "", "N/A", f"54-10{rnd.randint(0, 99999):05d}"]),
+                grant_amount=float(rnd.randint(1, 50) * 1000),
+                grant_year=rnd.randint(2018, 2024),
+            )
+            for _ in range(150)
+        ]
+        results = [
+            make_result(random_name(rnd), rnd.choice([None, "12345", f"5410{rnd.randint(0, 99999):05d}"]))
+            for _ in range(150)
+        ]
+        results += [make_result(g.recipient_name.upper()) for g in grantees[:20]]
+
+        index = self.matcher.prepare(grantees)
+        for result in results:
+            assert self.matcher._match_in_index(result, index) == scan_match(self.matcher, result, grantees)
+
+    def test_ein_match_wins_and_first_grantee_breaks_ties(self):
+        grantees = [
+            ScheduleIGrantee(recipient_name="Heroes Bridge", grant_amount=1000.0, grant_year=2022),
+            ScheduleIGrantee(recipient_name="Other Org", recipient_ein="30-0219424",
+                             grant_amount=5000.0, grant_year=2023),
+            ScheduleIGrantee(recipient_name="Heroes Bridge Inc", grant_amount=9000.0, grant_year=2024),
+        ]
+        match = self.matcher._find_grantee_match(make_result("Heroes Bridge", "300219424"), grantees)
+        assert (match["grant_amount"], match["match_method"]) == (1000.0, "name_similarity")
+
+        match = self.matcher._find_grantee_match(make_result("Unrelated Name", "300219424"), grantees)
+        assert (match["grantee_name"], match["match_method"]) == ("Other Org", "ein_exact")
+
+    def test_fast_tracking_and_prepared_index_reuse(self):
+        grantees = [ScheduleIGrantee(recipient_name="Richmond Youth Society", grant_amount=25000.0, grant_year=2023)]
+        profile = make_profile(grantees)
+        results = [make_result("Richmond Youth Soc."), make_result("Valley Arts Council")]
+
+        apply_schedule_i_fast_tracking(results, profile)
+        assert results[0].is_schedule_i_grantee
+        assert results[0].funnel_stage == FunnelStage.CANDIDATES
+        assert results[0].compatibility_score == 0.85
+        assert results[0].match_factors["historical_grant_amount"] == 25000.0
+        assert not results[1].is_schedule_i_grantee
+
+        index = self.matcher.prepare(profile.schedule_i_grantees, profile.profile_id)
+        assert self.matcher.prepare(list(profile.schedule_i_grantees), profile.profile_id) is index
+
+        profile.schedule_i_grantees.append(
+            ScheduleIGrantee(recipient_name="Valley Arts Council", grant_amount=500.0, grant_year=2024)
+        )
+        assert self.matcher.prepare(profile.schedule_i_grantees, profile.profile_id) is not index
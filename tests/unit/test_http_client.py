@@ -3,10 +3,14 @@ Unit tests for HTTP client abstraction layer
 """
 import pytest
 import asyncio
+import uuid
 from unittest.mock import AsyncMock, patch, MagicMock
 from aiohttp import ClientTimeout
 
+from src.core import http_client as http_client_module
+from src.core.cache_manager import CacheManager
 from src.core.http_client import CatalynxHTTPClient, HTTPConfig, HTTPError
+from src.core.request_scheduler import get_request_scheduler
 
 
 class TestHTTPConfig:
@@ -37,7 +41,7 @@ class TestCatalynxHTTPClient:
         client = CatalynxHTTPClient()
         assert client.config.timeout == 30
         assert client.rate_limits == {}
-        assert client.call_history == {}  # Initialized as Dict in http_client.py:69
+        assert client.scheduler is get_request_scheduler()  # Rate limits are process-wide
     
     def test_custom_config_initialization(self):
         config = HTTPConfig(timeout=60, max_retries=5)
@@ -127,7 +131,7 @@ class TestCatalynxHTTPClient:
     
     @pytest.mark.asyncio
     @patch('src.core.http_client.aiohttp.ClientSession')
-    async def test_http_error_handling(self, mock_session_class):
+    async def test_http_error_handling(self, mock_session_class, tmp_path, monkeypatch):
         # Mock error response
         mock_response = AsyncMock()
         mock_response.status = 404
@@ -145,6 +149,8 @@ class TestCatalynxHTTPClient:
         mock_session.closed = False
 
         mock_session_class.return_value = mock_session
+        # A 404 is negative-cached; a shared cache would serve it to the next run
+        self._isolated_cache(monkeypatch, tmp_path)
 
         client = CatalynxHTTPClient()
 
@@ -158,6 +164,96 @@ class TestCatalynxHTTPClient:
 
         await client.close()
     
+    @staticmethod
+    def _mock_session(mock_session_class, status, payload, delay=0.0):
+        mock_response = AsyncMock()
+        mock_response.status = status
+        mock_response.json = AsyncMock(return_value=payload)
+        mock_response.content_type = "application/json"
+
+        async def enter(*args):
+            await asyncio.sleep(delay)
+            return mock_response
+
+        mock_request_ctx = AsyncMock()
+        mock_request_ctx.__aenter__ = AsyncMock(side_effect=enter)
+        mock_request_ctx.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session = AsyncMock()
+        mock_session.request = MagicMock(return_value=mock_request_ctx)
+        mock_session.closed = False
+        mock_session_class.return_value = mock_session
+        return mock_session
+
+    @staticmethod
+    def _isolated_cache(monkeypatch, tmp_path):
+        """Point new clients at a CacheManager under tmp_path instead of data/cache"""
+        cache = CacheManager(tmp_path / "cache")
+        monkeypatch.setattr(http_client_module, "get_cache_manager", lambda: cache)
+        return cache
+
+    @pytest.mark.asyncio
+    @patch('src.core.http_client.aiohttp.ClientSession')
+    async def test_concurrent_identical_gets_share_one_request(self, mock_session_class, tmp_path, monkeypatch):
+        mock_session = self._mock_session(mock_session_class, 200, {"result": "shared"}, delay=0.05)
+        url = f"https://example.com/api/{uuid.uuid4().hex}"
+        cache = self._isolated_cache(monkeypatch, tmp_path)
+        client = CatalynxHTTPClient()
+
+        results = await asyncio.gather(*[client.get(url, params={"q": "x"}) for _ in range(5)])
+
+        assert results == [{"result": "shared"}] * 5
+        assert mock_session.request.call_count == 1
+        stats = client.get_stats()
+        assert (stats['coalesced'], stats['http_calls'], stats['in_flight']) == (4, 1, 0)
+
+        await client.close()
+        cache.close()
+
+    @pytest.mark.asyncio
+    @patch('src.core.http_client.aiohttp.ClientSession')
+    async def test_coalesced_callers_get_independent_copies(self, mock_session_class, tmp_path, monkeypatch):
+        self._mock_session(mock_session_class, 200, {"items": [1, 2]}, delay=0.05)
+        url = f"https://example.com/api/{uuid.uuid4().hex}"
+        cache = self._isolated_cache(monkeypatch, tmp_path)
+        client = CatalynxHTTPClient()
+
+        async def get_and_mutate():
+            result = await client.get(url)
+            result["items"].append(3)
+            return result
+
+        leader = asyncio.create_task(get_and_mutate())
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(client.get(url))
+        # Leader resumes first and mutates its result before the follower copies
+        assert (await leader)["items"] == [1, 2, 3]
+        assert (await follower)["items"] == [1, 2]
+
+        await client.close()
+        cache.close()
+
+    @pytest.mark.asyncio
+    @patch('src.core.http_client.aiohttp.ClientSession')
+    async def test_not_found_is_negatively_cached(self, mock_session_class, tmp_path, monkeypatch):
+        mock_session = self._mock_session(mock_session_class, 404, {"error": "Not found"})
+        url = f"https://example.com/organizations/{uuid.uuid4().hex}.json"
+        cache = self._isolated_cache(monkeypatch, tmp_path)
+        client = CatalynxHTTPClient()
+
+        for _ in range(3):
+            with pytest.raises(HTTPError) as exc_info:
+                await client.get(url)
+            assert exc_info.value.status_code == 404
+        assert "negative cache" in str(exc_info.value)
+
+        # Not retried, and not re-requested while cached
+        assert mock_session.request.call_count == 1
+        assert client.get_stats()['negative_cache_hits'] == 2
+
+        await client.close()
+        cache.close()
+
     @pytest.mark.asyncio
     async def test_rate_limiting(self):
         client = CatalynxHTTPClient()
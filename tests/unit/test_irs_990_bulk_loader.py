@@ -0,0 +1,155 @@
+"""
+Tests for the IRS 990 bulk loader parse stages.
+
+Builds small 990 filings in a temporary ZIP (pytest's tmp_path fixture) and
+routes them into a recording writer instead of the databases.
+"""
+
+import asyncio
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from tools.irs_990_bulk_loader.bulk_loader import (
+    _BatchSink, _Watermark, _parse_entries_parallel, _parse_entries_serial, _resume_index
+)
+
+NS = "http://www.irs.gov/efile"
+
+
+def make_990(ein: str, officers: int, form: str = "IRS990") -> bytes:
+    people = "".join(
+        f"<Form990PartVIISectionAGrp><PersonNm>Officer {i} of {ein}</PersonNm>"
+        f"<TitleTxt>Director</TitleTxt><ReportableCompFromOrgAmt>{i * 100}</ReportableCompFromOrgAmt>"
+        f"</Form990PartVIISectionAGrp>"
+        for i in range(officers)
+    )
+    return (
+        f'<Return xmlns="{NS}"><ReturnHeader><Filer><EIN>{ein}</EIN></Filer>'
+        f"<TaxPeriodEndDt>2024-12-31</TaxPeriodEndDt></ReturnHeader>"
+        f"<ReturnData><{form}><CYTotalRevenueAmt>{int(ein) % 1000 * 1000}</CYTotalRevenueAmt>"
+        f"<WebsiteAddressTxt>www.org{ein}.org</WebsiteAddressTxt>{people}</{form}></ReturnData></Return>"
+    ).encode()
+
+
+class RecordingWriter:
+    """Stands in for BulkLoaderDBWriter; keeps every flushed row"""
+
+    def __init__(self):
+        self.rows = {}
+        self.checkpoints = []
+
+    def __getattr__(self, method):
+        if not method.startswith("flush_"):
+            raise AttributeError(method)
+        return lambda batch: self.rows.setdefault(method, []).extend(batch)
+
+    def save_checkpoint(self, **checkpoint):
+        self.checkpoints.append(checkpoint)
+
+    def get_checkpoint(self, zip_filename):
+        saved = [cp for cp in self.checkpoints if cp["zip_filename"] == zip_filename]
+        return dict(saved[-1], updated_at="earlier run") if saved else None
+
+
+def make_args(**overrides):
+    args = dict(forms="all", ein=None, dry_run=False, resume=True, batch_size=4,
+                log_interval=10 ** 9, checkpoint_every=0, workers=1)
+    args.update(overrides)
+    return SimpleNamespace(**args)
+
+
+def make_stats():
+    keys = ("processed", "success", "errors", "skipped_form", "officers", "grants",
+            "fi_rows", "websites", "financials")
+    return {key: 0 for key in keys}
+
+
+@pytest.fixture()
+def zip_path(tmp_path):
+    path = tmp_path / "2024_TEOS_XML_01A.zip"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(23):
+            zf.writestr(f"{i:04d}_public.xml", make_990(f"54{i:07d}", officers=i % 4))
+        zf.writestr("0099_public.xml", b"<Return><not closed>")
+    return path
+
+
+def _rows_by_table(writer):
+    """Flushed rows per table, independent of the order chunks completed in"""
+    return {method: sorted(rows, key=repr) for method, rows in writer.rows.items()}
+
+
+class TestParsePool:
+    def test_worker_output_matches_serial(self, zip_path):
+        serial_writer, parallel_writer = RecordingWriter(), RecordingWriter()
+        serial = _BatchSink(serial_writer, make_args(), zip_path.name, make_stats())
+        parallel = _BatchSink(parallel_writer, make_args(workers=2), zip_path.name, make_stats())
+
+        with zipfile.ZipFile(zip_path) as zf:
+            entries = zf.infolist()
+            _parse_entries_serial(zf, entries, serial)
+        asyncio.run(_parse_entries_parallel(zip_path, entries, parallel, workers=2, chunk_size=5))
+        serial.flush(force=True)
+        parallel.flush(force=True)
+
+        assert parallel.stats == serial.stats
+        assert serial.stats["processed"] == 24 and serial.stats["errors"] == 1
+        assert serial.stats["officers"] == sum(i % 4 for i in range(23))
+        assert _rows_by_table(parallel_writer) == _rows_by_table(serial_writer)
+        assert parallel.watermark.last == serial.watermark.last == 23
+
+
+class TestCheckpointResume:
+    def test_watermark_waits_for_gap_below_completed_ranges(self):
+        mark = _Watermark()
+        mark.complete(5, 9)
+        mark.complete(2, 4)
+        assert mark.last == -1
+        mark.complete(0, 1)
+        assert mark.last == 9
+        mark.complete(11, 11)
+        assert mark.last == 9
+
+        resumed = _Watermark(start=10)
+        assert resumed.last == 9
+        resumed.complete(10, 12)
+        assert resumed.last == 12
+
+    def test_resume_after_partial_run_covers_every_entry(self, zip_path):
+        full_writer, writer = RecordingWriter(), RecordingWriter()
+        full = _BatchSink(full_writer, make_args(), zip_path.name, make_stats())
+
+        with zipfile.ZipFile(zip_path) as zf:
+            entries = zf.infolist()
+            _parse_entries_serial(zf, entries, full)
+            full.flush(force=True)
+
+            # First run dies after entry 9; the last checkpoint taken is entry 7
+            first = _BatchSink(writer, make_args(checkpoint_every=4), zip_path.name, make_stats())
+            assert _resume_index(writer, first.args, first, zip_path.name, len(entries), "cd") == 0
+            _parse_entries_serial(zf, entries[:10], first)
+            assert [cp["last_entry_index"] for cp in writer.checkpoints] == [3, 7]
+
+            second = _BatchSink(writer, make_args(checkpoint_every=4), zip_path.name, make_stats())
+            start = _resume_index(writer, second.args, second, zip_path.name, len(entries), "cd")
+            assert start == 8
+            _parse_entries_serial(zf, entries[start:], second, first_index=start)
+            second.checkpoint(complete=True)
+
+        assert second.stats["processed"] == len(entries) - 8
+        assert writer.checkpoints[-1]["last_entry_index"] == len(entries) - 1
+        assert writer.checkpoints[-1]["complete"] is True
+        # Entries 8-9 are parsed twice; the writer's idempotent inserts make that harmless
+        for method, rows in _rows_by_table(full_writer).items():
+            assert {repr(row) for row in writer.rows[method]} == {repr(row) for row in rows}
+
+    def test_checkpoint_from_another_zip_layout_is_ignored(self, zip_path):
+        writer = RecordingWriter()
+        writer.save_checkpoint(zip_filename=zip_path.name, cd_digest="old", file_type="all",
+                               total_entries=24, last_entry_index=11, complete=False)
+        sink = _BatchSink(writer, make_args(), zip_path.name, make_stats())
+
+        assert _resume_index(writer, sink.args, sink, zip_path.name, 24, "new") == 0
+        assert sink.watermark.last == -1
@@ -0,0 +1,238 @@
+"""
+Tests for OpportunityStore — indexed SQLite opportunity storage with
+incrementally maintained aggregates — and the UnifiedProfileService /
+AdvancedSearchService paths that read from it.
+
+Search results served from SQL are checked against the in-Python filter, sort
+and pagination path; aggregates against a full recomputation. Uses temporary
+directories via pytest's tmp_path fixture.
+"""
+
+import json
+import random
+import threading
+import time
+
+import pytest
+
+from src.profiles import opportunity_store
+from src.profiles.models import PromotionEvent, ScoringResult, UnifiedOpportunity
+from src.profiles.opportunity_store import OpportunityStore
+from src.profiles.unified_service import UnifiedProfileService
+from src.web.services import search_export_service
+from src.web.services.search_export_service import (
+    AdvancedSearchService, SearchCriteria, SearchFilter, SearchOperator, SortDirection
+)
+
+STAGES = ["prospects", "qualified_prospects", "candidates", "targets"]
+NAMES = ["Heroes Bridge", "Richmond Youth Society", "valley arts council", "Hope Center", "River Trust"]
+
+
+def make_opportunity(i, rnd, profile_id="profile_a"):
+    return {
+        "opportunity_id": f"opp_{i:04d}",
+        "profile_id": profile_id,
+        "organization_name": f"{rnd.choice(NAMES)} {i}",
+        "ein": rnd.choice([None, f"54{i:07d}"]),
+        "current_stage": rnd.choice(STAGES),
+        "scoring": rnd.choice([None, {"overall_score": round(rnd.random(), 2)}]),
+        "discovered_at": rnd.choice([None, f"2024-0{rnd.randint(1, 9)}-1{rnd.randint(0, 9)}T00:00:00"]),
+        "funding_amount": rnd.choice([None, rnd.randint(1, 20) * 5000]),
+    }
+
+
+@pytest.fixture()
+def service(tmp_path):
+    rnd = random.Random(11)
+    for profile_id in ("profile_a", "profile_b"):
+        opp_dir = tmp_path / profile_id / "opportunities"
+        opp_dir.mkdir(parents=True)
+        for i in range(60):
+            opp = make_opportunity(i, rnd, profile_id)
+            (opp_dir / f"opportunity_{i:04d}.json").write_text(json.dumps(opp))
+        (opp_dir / "opportunity_broken.json").write_text("{not json")
+    service = UnifiedProfileService(data_dir=str(tmp_path))
+    yield service
+    service.opportunity_store.close()
+
+
+@pytest.fixture()
+def search(service, monkeypatch):
+    monkeypatch.setattr(search_export_service, "get_unified_profile_service", lambda: service)
+    return AdvancedSearchService()
+
+
+def python_search(search, opportunities, criteria):
+    """Reference: the in-memory filter / sort / paginate path"""
+    matched = search._apply_filters(opportunities, criteria.filters)
+    if criteria.sort_by:
+        matched = search._apply_sorting(matched, criteria.sort_by, criteria.sort_direction)
+    return search._apply_pagination(matched, criteria.limit, criteria.offset)
+
+
+def ids(opportunities):
+    return [opp.opportunity_id for opp in opportunities]
+
+
+class TestOpportunityStore:
+    def test_migration_and_reads(self, service, tmp_path):
+        opportunities = service.get_profile_opportunities("profile_a")
+        assert len(opportunities) == 60
+        assert service.opportunity_store.is_migrated("profile_a")
+        assert not service.opportunity_store.is_migrated("profile_b")
+
+        dates = [opp.discovered_at or "1900-01-01" for opp in opportunities]
+        assert dates == sorted(dates, reverse=True)
+
+        candidates = service.get_profile_opportunities("profile_a", stage_filter="candidates")
+        assert candidates and {opp.current_stage for opp in candidates} == {"candidates"}
+
+        assert service.get_opportunity("profile_a", "opp_0007").opportunity_id == "opp_0007"
+        assert service.get_opportunity("profile_a", "0007").opportunity_id == "opp_0007"
+        assert service.get_opportunity("profile_a", "opp_9999") is None
+
+    def test_save_updates_store_and_json_mirror(self, service, tmp_path):
+        opportunity = service.get_opportunity("profile_a", "opp_0003")
+        opportunity.current_stage = "approach"
+        assert service.save_opportunity("profile_a", opportunity)
+
+        assert service.get_opportunity("profile_a", "opp_0003").current_stage == "approach"
+        mirror = json.loads((tmp_path / "profile_a" / "opportunities" / "opportunity_0003.json").read_text())
+        assert mirror["current_stage"] == "approach"
+
+        new = UnifiedOpportunity(opportunity_id="opp_new", profile_id="profile_c", organization_name="New Org")
+        assert service.save_opportunity("profile_c", new)
+        assert ids(service.get_profile_opportunities("profile_c")) == ["opp_new"]
+
+    @pytest.mark.parametrize("criteria", [
+        SearchCriteria(filters=[], limit=10, offset=5),
+        SearchCriteria(filters=[], sort_by="discovered_at", sort_direction=SortDirection.ASC, limit=50),
+        SearchCriteria(filters=[SearchFilter("current_stage", SearchOperator.IN_LIST, ["candidates", "targets"])],
+                       sort_by="scoring.overall_score", sort_direction=SortDirection.DESC, limit=7, offset=3),
+        SearchCriteria(filters=[SearchFilter("organization_name", SearchOperator.CONTAINS, "VALLEY"),
+                                SearchFilter("funding_amount", SearchOperator.BETWEEN, 10000, 60000)],
+                       sort_by="funding_amount", sort_direction=SortDirection.ASC),
+        SearchCriteria(filters=[SearchFilter("scoring.overall_score", SearchOperator.GREATER_THAN, "0.5"),
+                                SearchFilter("ein", SearchOperator.NOT_IN_LIST, ["540000001"])],
+                       sort_by="discovered_at", sort_direction=SortDirection.ASC, limit=4),
+        SearchCriteria(filters=[SearchFilter("organization_name", SearchOperator.ENDS_WITH, "1"),
+                                SearchFilter("profile_id", SearchOperator.EQUALS, "profile_a")],
+                       sort_by="scoring.overall_score", limit=5),
+    ])
+    def test_search_matches_python_path(self, service, search, criteria):
+        opportunities = service.get_profile_opportunities("profile_a")
+        expected, expected_page = python_search(search, opportunities, criteria)
+
+        results = search.search_opportunities(criteria, "profile_a")
+        assert ids(results.opportunities) == ids(expected)
+        assert results.total_count == 60
+        assert results.filtered_count == expected_page["total_items"]
+        for key, value in expected_page.items():
+            assert results.page_info[key] == value
+
+    def test_keyset_pagination_walks_all_profiles(self, service, search):
+        filters = [SearchFilter("current_stage", SearchOperator.EQUALS, "prospects")]
+        everything = search.search_opportunities(
+            SearchCriteria(filters=filters, sort_by="organization_name", sort_direction=SortDirection.ASC)
+        )
+        assert {opp.profile_id for opp in everything.opportunities} == {"profile_a", "profile_b"}
+
+        walked, cursor = [], None
+        while True:
+            page = search.search_opportunities(SearchCriteria(
+                filters=filters, sort_by="organization_name", sort_direction=SortDirection.ASC,
+                limit=6, cursor=cursor
+            ))
+            walked.extend((opp.profile_id, opp.opportunity_id) for opp in page.opportunities)
+            cursor = page.page_info["next_cursor"]
+            if cursor is None:
+                break
+        assert walked == [(opp.profile_id, opp.opportunity_id) for opp in everything.opportunities]
+
+
+class TestProfileAnalytics:
+    def mutate(self, service, rnd):
+        for opportunity in rnd.sample(service.get_profile_opportunities("profile_a"), 25):
+            old_stage = opportunity.current_stage
+            opportunity.current_stage = rnd.choice(STAGES)
+            opportunity.promotion_history.append(PromotionEvent(
+                from_stage=old_stage, to_stage=opportunity.current_stage,
+                decision_type=rnd.choice(["auto_promote", "manual"]),
+                promoted_at=f"2024-10-{rnd.randint(10, 28)}T00:00:00",
+            ))
+            opportunity.scoring = rnd.choice([None, ScoringResult(
+                overall_score=round(rnd.random(), 2), auto_promotion_eligible=rnd.random() < 0.3,
+                scored_at=f"2024-11-{rnd.randint(10, 28)}T00:00:00",
+            )])
+            service.save_opportunity("profile_a", opportunity)
+
+    def test_incremental_aggregates_match_full_data(self, service):
+        self.mutate(service, random.Random(5))
+        opportunities = service.get_profile_opportunities("profile_a")
+        analytics = service._compute_analytics(service.opportunity_store.analytics("profile_a"))
+
+        stages = {}
+        for opp in opportunities:
+            stages[opp.current_stage] = stages.get(opp.current_stage, 0) + 1
+        scores = [opp.scoring.overall_score for opp in opportunities if opp.scoring]
+        dates = {opp.discovered_at[:10] for opp in opportunities if opp.discovered_at}
+        promotions = [p for opp in opportunities for p in opp.promotion_history]
+
+        assert analytics.opportunity_count == 60
+        assert analytics.stages_distribution == stages
+        assert analytics.scoring_stats["avg_score"] == round(sum(scores) / len(scores), 3)
+        assert analytics.scoring_stats["high_potential_count"] == len([s for s in scores if s >= 0.80])
+        assert sum(analytics.scoring_stats["score_histogram"].values()) == len(scores)
+        assert analytics.scoring_stats["last_scored"] == max(
+            opp.scoring.scored_at for opp in opportunities if opp.scoring and opp.scoring.scored_at)
+        assert analytics.discovery_stats["total_sessions"] == len(dates)
+        assert analytics.promotion_stats["total_promotions"] == len(promotions) == 25
+        assert analytics.promotion_stats["auto_promotions"] == len(
+            [p for p in promotions if p.decision_type == "auto_promote"])
+
+        activity = service._generate_recent_activity(service.opportunity_store.analytics("profile_a"))
+        latest = max(p.promoted_at for p in promotions)
+        assert activity[0].date == latest and activity[0].type.endswith("promotion")
+
+        assert service.reconcile_profile_analytics() == []
+
+    def test_reconcile_repairs_drift(self, service):
+        service.ensure_opportunities_migrated("profile_a")
+        store = service.opportunity_store
+        expected = store.analytics("profile_a")
+
+        store._conn.execute(
+            "UPDATE opportunity_aggregates SET value = value + 3 WHERE profile_id = 'profile_a' AND metric = 'stage'"
+        )
+        store._conn.commit()
+        assert store.analytics("profile_a") != expected
+
+        assert store.reconcile("profile_a") == ["profile_a"]
+        assert store.analytics("profile_a") == expected
+
+    def test_two_stores_on_one_database_do_not_drift(self, tmp_path, monkeypatch):
+        first = OpportunityStore(tmp_path / "opportunities.db")
+        second = OpportunityStore(tmp_path / "opportunities.db")
+        opportunity = make_opportunity(1, random.Random(3))
+        real_contributions = opportunity_store.aggregate_contributions
+        first_read = threading.Event()
+
+        def slow_contributions(data):
+            # The first store pauses between reading replaced rows and writing
+            if threading.current_thread().name == "first" and not first_read.is_set():
+                first_read.set()
+                time.sleep(0.2)
+            return real_contributions(data)
+
+        monkeypatch.setattr(opportunity_store, "aggregate_contributions", slow_contributions)
+        writer = threading.Thread(
+            target=first.upsert, args=("profile_a", {**opportunity, "current_stage": "targets"}), name="first"
+        )
+        writer.start()
+        first_read.wait()
+        second.upsert("profile_a", {**opportunity, "current_stage": "candidates"})
+        writer.join()
+
+        assert first.reconcile("profile_a") == []
+        first.close()
+        second.close()
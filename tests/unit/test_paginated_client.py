@@ -0,0 +1,114 @@
+"""
+Tests for PaginatedAPIClient — concurrent page prefetch when the first
+response reports the page count, sequential paging when it does not.
+
+Uses an in-memory paginated API with per-page latency in place of HTTP.
+"""
+
+import asyncio
+
+import pytest
+
+from src.clients.base_client import PaginatedAPIClient
+
+
+class FakePagedClient(PaginatedAPIClient):
+    """Serves `total` items in pages of `rows`; reports totals only when `known_total`"""
+
+    def __init__(self, total=95, rows=10, known_total=True, latency=0.02, empty_from=None):
+        self.total, self.rows, self.known_total = total, rows, known_total
+        self.latency, self.empty_from = latency, empty_from
+        self.requested = []
+        self.active = 0
+        self.peak = 0
+        super().__init__("fake_paged", "https://example.test", requires_api_key=False)
+
+    def _configure_rate_limits(self):
+        pass
+
+    async def test_connection(self):
+        return {"status": "ok"}
+
+    def _format_auth_headers(self, api_key):
+        return {}
+
+    async def _get(self, endpoint, params=None, headers=None, cache_ttl=None):
+        start = params.get("start", 0)
+        self.requested.append(start)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency * (1 + (start // self.rows) % 3))
+        finally:
+            self.active -= 1
+        if self.empty_from is not None and start >= self.empty_from:
+            items = []
+        else:
+            items = [{"n": n} for n in range(start, min(start + self.rows, self.total))]
+        response = {"start": start, "items": items}
+        if self.known_total:
+            response["total"] = self.total
+        return response
+
+    def _extract_pagination_info(self, response):
+        return {"start": response["start"], "total": response.get("total")}
+
+    def _build_next_page_params(self, current_params, pagination_info):
+        return {**current_params, "start": pagination_info["start"] + self.rows}
+
+    def _plan_pages(self, first_params, pagination_info, max_pages):
+        if pagination_info["total"] is None:
+            return None
+        starts = range(pagination_info["start"] + self.rows, pagination_info["total"], self.rows)
+        return [{**first_params, "start": start} for start in starts][:max_pages - 1]
+
+    def _extract_page_data(self, response):
+        return response["items"]
+
+
+def numbers(items):
+    return [item["n"] for item in items]
+
+
+class TestPaginatedAPIClient:
+    @pytest.mark.asyncio
+    async def test_prefetch_is_bounded_and_results_keep_page_order(self):
+        client = FakePagedClient()
+        client.prefetch_pages = 3
+        messages = []
+
+        results = await client.get_all_pages("items", {"start": 0}, max_pages=20, progress_callback=messages.append)
+
+        assert numbers(results) == list(range(95))
+        assert client.peak == 3
+        assert sorted(client.requested) == list(range(0, 95, 10))
+        assert len(messages) == 10
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_streams_as_pages_arrive(self):
+        client = FakePagedClient(total=60)
+        arrived = [index async for index, _ in client.iter_pages("items", {"start": 0}, prefetch=5)]
+
+        assert sorted(arrived) == list(range(6))
+        assert arrived != sorted(arrived)
+
+    @pytest.mark.asyncio
+    async def test_max_pages_and_empty_page_end_the_listing(self):
+        client = FakePagedClient()
+        assert numbers(await client.get_all_pages("items", {"start": 0}, max_pages=4)) == list(range(40))
+        assert len(client.requested) == 4
+
+        client = FakePagedClient(empty_from=30, latency=0.001)
+        client.prefetch_pages = 1
+        assert numbers(await client.get_all_pages("items", {"start": 0}, max_pages=20)) == list(range(30))
+        assert client.requested == [0, 10, 20, 30]
+
+    @pytest.mark.asyncio
+    async def test_unknown_total_pages_sequentially(self):
+        client = FakePagedClient(total=35, known_total=False)
+
+        results = await client.get_all_pages("items", {"start": 0}, max_pages=10)
+
+        assert numbers(results) == list(range(35))
+        assert client.peak == 1
+        assert client.requested == [0, 10, 20, 30, 40]
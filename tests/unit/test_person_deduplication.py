@@ -11,7 +11,11 @@ from datetime import datetime, timezone
 import pytest
 
 from src.network.name_normalizer import NameNormalizer
-from src.network.person_deduplication import PersonDeduplicationService
+from src.network.person_deduplication import (
+    PersonDeduplicationService,
+    _lcs_length,
+    _similarity,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -182,6 +186,66 @@ class TestFindSimilarNames:
         assert pair["confidence"] < 0.95  # not exact
 
 
+class TestFuzzyMatching:
+    @staticmethod
+    def _brute_force(names):
+        """Reference: every pair in a last-name block, scored with a DP LCS."""
+        def dp_lcs(a, b):
+            prev = [0] * (len(b) + 1)
+            for ca in a:
+                cur = [0]
+                for j, cb in enumerate(b):
+                    cur.append(prev[j] + 1 if ca == cb else max(prev[j + 1], cur[j]))
+                prev = cur
+            return prev[-1]
+
+        found = set()
+        for i, (norm_a, last_a) in enumerate(names):
+            for j in range(i + 1, len(names)):
+                norm_b, last_b = names[j]
+                if last_a[:2] != last_b[:2]:
+                    continue
+                sim = 1.0 if norm_a == norm_b else 2.0 * dp_lcs(norm_a, norm_b) / (len(norm_a) + len(norm_b))
+                if sim > 0.85:
+                    found.add((i + 1, j + 1, f"fuzzy_similarity({sim:.2f})"))
+        return found
+
+    def test_bit_parallel_lcs_matches_dp(self):
+        assert _lcs_length("john smith", "jon smyth") == 8
+        assert _lcs_length("", "abc") == 0
+        assert _lcs_length("abcbdab", "bdcaba") == 4
+        assert _similarity("john smith", "john smith") == 1.0
+
+    def test_blocked_candidates_match_all_pairs(self, db_path, svc):
+        """Candidate pruning must not lose any pair above the threshold."""
+        names = [
+            ("john smith", "smith"), ("jon smith", "smith"), ("john smyth", "smyth"),
+            ("john a smith", "smith"), ("jonathan smith", "smith"), ("j smith", "smith"),
+            ("mary smith", "smith"), ("maria smith", "smith"), ("john smith", "smith"),
+            ("robert jones", "jones"), ("bob jones", "jones"), ("robert jonas", "jonas"),
+            ("al s", "s"), ("al sm", "sm"), ("a sm", "sm"),
+        ]
+        conn = sqlite3.connect(db_path)
+        for i, (norm, last) in enumerate(names):
+            _insert_person(
+                conn, original_name=norm.title(), name_hash=f"fz{i}",
+                first_name=norm.split()[0], last_name=last, normalized_name=norm,
+            )
+        conn.commit()
+        conn.row_factory = sqlite3.Row
+        candidates = {}
+        svc._find_fuzzy_similar(conn, candidates)
+        conn.close()
+
+        found = {
+            (a, b, reason)
+            for (a, b), entry in candidates.items()
+            for reason in entry["match_reasons"]
+        }
+        assert found == self._brute_force(names)
+        assert all(entry["confidence"] == 0.65 for entry in candidates.values())
+
+
 class TestSharedOrgBoost:
     def test_shared_org_increases_confidence(self, db_path, svc):
         """Two similar names sharing an organisation should receive a +0.15
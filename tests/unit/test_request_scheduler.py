@@ -0,0 +1,94 @@
+"""
+Tests for RequestScheduler — process-wide token buckets with priority dispatch.
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.core.http_client import CatalynxHTTPClient
+from src.core.request_scheduler import (
+    API_RATE_LIMITS, DEFAULT_BURST, RequestPriority, RequestScheduler, request_priority
+)
+
+
+class TestRequestScheduler:
+    """Test token-bucket limits, priority ordering and metrics"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_refill_rate(self):
+        scheduler = RequestScheduler()
+        scheduler.configure("api", calls=20, window_seconds=1, burst=2)
+
+        start = time.monotonic()
+        await asyncio.gather(*[scheduler.acquire("api") for _ in range(6)])
+        elapsed = time.monotonic() - start
+
+        # 2 from the burst, 4 more at 20/s
+        assert 0.18 <= elapsed < 0.5
+        stats = scheduler.get_stats("api")
+        assert stats["dispatched"] == 6
+        assert stats["queued"] == 4
+        assert stats["peak_queue_depth"] == 4
+        assert stats["queue_depth"] == 0
+        assert stats["max_wait_ms"] >= 150
+
+    @pytest.mark.asyncio
+    async def test_interactive_dispatched_before_batch(self):
+        scheduler = RequestScheduler()
+        scheduler.configure("api", calls=50, window_seconds=1, burst=1)
+        order = []
+
+        async def call(name):
+            await scheduler.acquire("api")
+            order.append(name)
+
+        await scheduler.acquire("api")  # Drain the burst so everything below queues
+        with request_priority(RequestPriority.BATCH):
+            batch = [asyncio.create_task(call(f"batch{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        interactive = [asyncio.create_task(call(f"ui{i}")) for i in range(2)]
+        await asyncio.gather(*batch, *interactive)
+
+        assert order == ["ui0", "ui1", "batch0", "batch1", "batch2"]
+        by_priority = scheduler.get_stats("api")["avg_wait_ms_by_priority"]
+        assert by_priority["interactive"] < by_priority["batch"]
+
+    @pytest.mark.asyncio
+    async def test_min_interval_and_cancelled_waiters(self):
+        scheduler = RequestScheduler()
+        scheduler.configure("api", calls=1000, window_seconds=1, min_interval=0.05)
+
+        await scheduler.acquire("api")
+        cancelled = asyncio.create_task(scheduler.acquire("api"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        start = time.monotonic()
+        await scheduler.acquire("api")
+        assert time.monotonic() - start >= 0.04
+        assert scheduler.get_stats("api")["dispatched"] == 2
+
+    @pytest.mark.asyncio
+    async def test_default_burst_is_small(self):
+        scheduler = RequestScheduler()
+        scheduler.configure("api", calls=1000, window_seconds=3600)
+
+        for _ in range(DEFAULT_BURST):
+            assert await scheduler.acquire("api") == 0.0
+        waiter = asyncio.create_task(scheduler.acquire("api"))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        waiter.cancel()
+
+    def test_clients_and_processors_share_one_limit(self):
+        client = CatalynxHTTPClient()
+        client.scheduler = RequestScheduler()
+
+        client.set_api_rate_limit("propublica")
+        calls, delay = API_RATE_LIMITS["propublica"]
+        queue = client.scheduler._queues["propublica"]
+        assert queue.rate == pytest.approx(calls / 3600)
+        assert queue.min_interval == delay
+        with pytest.raises(ValueError):
+            client.set_api_rate_limit("unknown_api")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Workflow Engine
+Tests dataflow scheduling, the concurrency bound, per-step timeouts and
+retries, and the timings / critical path recorded in WorkflowResult.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.workflows.workflow_engine import WorkflowEngine, WorkflowStatus
+from src.workflows.workflow_parser import WorkflowParser
+
+
+class FakeToolLoader:
+    """Runs 'tools' named sleep:<seconds>, flaky:<failures>, fail or ok; records start order"""
+
+    def __init__(self):
+        self.started = []
+        self.calls = {}
+        self.active = 0
+        self.peak = 0
+
+    async def execute_tool(self, tool_name, inputs, context):
+        step = context.metadata["workflow_step"]
+        self.started.append(step)
+        self.calls[step] = self.calls.get(step, 0) + 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            kind, _, arg = tool_name.partition(":")
+            if kind == "sleep":
+                await asyncio.sleep(float(arg))
+            elif kind == "flaky" and self.calls[step] <= int(arg):
+                return SimpleNamespace(is_success=False, data=None, error="transient")
+            elif kind == "fail":
+                return SimpleNamespace(is_success=False, data=None, error="boom")
+            return SimpleNamespace(is_success=True, data={"step": step, **inputs}, error=None)
+        finally:
+            self.active -= 1
+
+
+def make_engine(**kwargs):
+    engine = WorkflowEngine(retry_backoff_seconds=0, **kwargs)
+    engine.tool_registry = SimpleNamespace(get_tool=lambda name: SimpleNamespace(version="1.0.0"))
+    engine.tool_loader = FakeToolLoader()
+    return engine
+
+
+def workflow(*steps):
+    return WorkflowParser.parse_dict({
+        "name": "test", "description": "test", "version": "1.0.0", "steps": list(steps)
+    })
+
+
+class TestWorkflowEngine:
+    """Test suite for the dataflow WorkflowEngine"""
+
+    @pytest.mark.asyncio
+    async def test_step_starts_when_its_own_dependencies_finish(self):
+        """A fast branch is not held back by an unrelated slow step"""
+        engine = make_engine()
+        result = await engine.execute_workflow(workflow(
+            {"name": "slow", "tool": "sleep:0.3"},
+            {"name": "fast", "tool": "sleep:0.01"},
+            {"name": "after_fast", "tool": "sleep:0.01", "depends_on": ["fast"]},
+            {"name": "join", "tool": "ok", "depends_on": ["slow", "after_fast"]},
+        ))
+
+        assert result.status == WorkflowStatus.COMPLETED
+        steps = result.step_results
+        assert steps["after_fast"].started_at_ms < steps["slow"].finished_at_ms
+        assert engine.tool_loader.started[-1] == "join"
+        assert result.critical_path == ["slow", "join"]
+        assert result.critical_path_ms == steps["join"].finished_at_ms
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        engine = make_engine(max_concurrency=2)
+        result = await engine.execute_workflow(workflow(
+            *[{"name": f"s{i}", "tool": "sleep:0.05"} for i in range(5)]
+        ))
+
+        assert result.status == WorkflowStatus.COMPLETED
+        assert engine.tool_loader.peak == 2
+        assert max(r.queue_time_ms for r in result.step_results.values()) >= 40
+
+    @pytest.mark.asyncio
+    async def test_retries_and_timeouts(self):
+        engine = make_engine()
+        result = await engine.execute_workflow(workflow(
+            {"name": "flaky", "tool": "flaky:2", "retry_count": 2},
+            {"name": "hangs", "tool": "sleep:5", "timeout_seconds": 0.05, "retry_count": 1,
+             "optional": True},
+        ))
+
+        flaky, hangs = result.step_results["flaky"], result.step_results["hangs"]
+        assert (flaky.status, flaky.attempts) == (WorkflowStatus.COMPLETED, 3)
+        assert (hangs.status, hangs.attempts) == (WorkflowStatus.FAILED, 2)
+        assert "timed out" in hangs.error
+        assert result.status == WorkflowStatus.PARTIAL
+
+    @pytest.mark.asyncio
+    async def test_cycle_fails_workflow(self):
+        engine = make_engine()
+        result = await engine.execute_workflow(workflow(
+            {"name": "a", "tool": "ok", "depends_on": ["b"]},
+            {"name": "b", "tool": "ok", "depends_on": ["a"]},
+            {"name": "c", "tool": "ok"},
+        ))
+
+        assert result.status == WorkflowStatus.FAILED
+        assert "Circular dependency" in result.error
+        assert engine.tool_loader.started == []
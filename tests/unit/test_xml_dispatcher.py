@@ -0,0 +1,99 @@
+"""
+Tests for the IRS 990 XML dispatcher's single-pass tag index and the form
+extractors built on it, over small namespaced sample filings.
+"""
+
+import xml.etree.ElementTree as ET
+
+from tools.irs_990_bulk_loader.xml_dispatcher import _TagIndex, _iter, _txt, parse_xml_bytes
+
+NS = "http://www.irs.gov/efile"
+
+SAMPLE_990PF = f"""<Return xmlns="{NS}">
+  <ReturnHeader>
+    <TaxPeriodEndDt>2023-12-31</TaxPeriodEndDt>
+    <Filer><EIN>54-1026365</EIN></Filer>
+  </ReturnHeader>
+  <ReturnData>
+    <IRS990PF>
+      <FMVAssetsEndOfYearAmt>2500000</FMVAssetsEndOfYearAmt>
+      <TotalRevenueAmt>180000</TotalRevenueAmt>
+      <QualifyingDistributionsAmt>125000</QualifyingDistributionsAmt>
+      <OperatingFoundationInd>X</OperatingFoundationInd>
+      <GrantMakingProceduresTxt>Contributions by invitation only</GrantMakingProceduresTxt>
+      <OfficerDirTrstKeyEmplGrp>
+        <PersonNm>Jane Q. Public</PersonNm><TitleTxt>President</TitleTxt><CompensationAmt>0</CompensationAmt>
+      </OfficerDirTrstKeyEmplGrp>
+      <OfficerDirTrstKeyEmplGrp>
+        <PersonNm>John Doe</PersonNm><TitleTxt>Treasurer</TitleTxt>
+      </OfficerDirTrstKeyEmplGrp>
+      <GrantOrContributionPdDurYrGrp>
+        <RecipientBusinessName><BusinessNameLine1Txt>Heroes Bridge</BusinessNameLine1Txt></RecipientBusinessName>
+        <Amt>5000</Amt><GrantOrContributionPurposeTxt>Veteran services</GrantOrContributionPurposeTxt>
+      </GrantOrContributionPdDurYrGrp>
+      <GrantOrContributionPdDurYrGrp>
+        <RecipientPersonNm>Sam Smith</RecipientPersonNm><Amt>750</Amt>
+      </GrantOrContributionPdDurYrGrp>
+    </IRS990PF>
+  </ReturnData>
+</Return>""".encode()
+
+SAMPLE_990EZ = f"""<Return xmlns="{NS}">
+  <ReturnHeader><TaxYr>2022</TaxYr><TaxPeriodBeginDt>2022-07-01</TaxPeriodBeginDt>
+    <Filer><EIN>300219424</EIN></Filer></ReturnHeader>
+  <ReturnData>
+    <IRS990EZ>
+      <WebsiteAddressTxt>WWW.HEROESBRIDGE.ORG/</WebsiteAddressTxt>
+      <TotalRevenueAmt>91000</TotalRevenueAmt>
+      <Form990EZPartVOfcrDirTrstKeyEmplGrp><PersonNm>Ann Lee</PersonNm><TitleTxt>Chair</TitleTxt></Form990EZPartVOfcrDirTrstKeyEmplGrp>
+    </IRS990EZ>
+  </ReturnData>
+</Return>""".encode()
+
+
+class TestTagIndex:
+    def test_lookups_match_elementtree_subtree_scans(self):
+        root = ET.fromstring(SAMPLE_990PF)
+        idx = _TagIndex(root)
+        q = lambda tag: f".//{{{NS}}}{tag}"
+
+        groups = root.findall(q("OfficerDirTrstKeyEmplGrp"))
+        assert idx.findall(root, "OfficerDirTrstKeyEmplGrp") == groups
+        for grp in groups:
+            assert idx.find(grp, "TitleTxt") is grp.find(q("TitleTxt"))
+            assert idx.find(grp, "CompensationAmt") is grp.find(q("CompensationAmt"))
+        # Lookups are scoped to the parent's subtree
+        assert idx.find(groups[1], "PersonNm").text == "John Doe"
+        assert idx.findall(groups[0], "BusinessNameLine1Txt") == []
+        assert idx.find(root, "NoSuchTag") is None
+
+    def test_include_self_matches_element_iter(self):
+        root = ET.fromstring(SAMPLE_990PF)
+        idx = _TagIndex(root)
+        irs990pf = idx.find(root, "IRS990PF")
+
+        assert _iter(irs990pf, idx, "IRS990PF") == [irs990pf]
+        assert idx.find(irs990pf, "IRS990PF") is None
+        assert _txt(root, idx, "Missing", "EIN") == "54-1026365"
+
+    def test_990pf_extractors(self):
+        parsed = parse_xml_bytes(SAMPLE_990PF)
+
+        assert (parsed["form_type"], parsed["ein"], parsed["tax_year"]) == ("990-PF", "541026365", 2023)
+        assert [o["raw_name"] for o in parsed["officers"]] == ["Jane Q. Public", "John Doe"]
+        assert parsed["officers"][0]["normalized_name"] == "jane q public"
+        assert parsed["officers"][1]["compensation"] is None
+        assert [(g["recipient_name"], g["grant_amount"]) for g in parsed["grants"]] == \
+            [("Heroes Bridge", 5000.0), ("Sam Smith", 750.0)]
+        assert parsed["financials"]["assets_fmv"] == 2500000.0
+        assert parsed["financials"]["qualifying_distributions"] == 125000.0
+        assert parsed["is_operating_foundation"] is True
+        assert parsed["narrative"]["accepts_applications"] == "invitation_only"
+
+    def test_990ez_extractors(self):
+        parsed = parse_xml_bytes(SAMPLE_990EZ)
+
+        assert (parsed["form_type"], parsed["ein"], parsed["tax_year"]) == ("990-EZ", "300219424", 2022)
+        assert [o["title"] for o in parsed["officers"]] == ["Chair"]
+        assert parsed["financials"]["total_revenue"] == 91000.0
+        assert parsed["website_url"] == "https://www.heroesbridge.org"
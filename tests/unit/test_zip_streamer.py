@@ -0,0 +1,107 @@
+"""
+Tests for the --stream ZIP reader: range-request block planning and the
+central directory digest used to validate resume checkpoints.
+
+The remote ZIP is an in-memory archive; HTTP size and range requests are
+answered from its bytes.
+"""
+
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+from tools.irs_990_bulk_loader.zip_streamer import ZipStreamer, central_directory_digest
+
+
+def entry(index, offset, size):
+    return {"index": index, "name": f"{index:04d}_public.xml",
+            "local_hdr_offset": offset, "next_offset": offset + size}
+
+
+def build_zip(count=12, method=zipfile.ZIP_DEFLATED):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", method) as zf:
+        for i in range(count):
+            zf.writestr(f"{i:04d}_public.xml", f"<Return><EIN>{i:09d}</EIN></Return>".encode() * (i + 1))
+            if i == 5:
+                zf.writestr("README.txt", b"not an XML filing" * 50)
+    return buf.getvalue()
+
+
+def in_memory_streamer(data: bytes) -> ZipStreamer:
+    streamer = ZipStreamer("https://example.test/2024_TEOS_XML_01A.zip", session=None)
+    streamer.requests = []
+
+    async def file_size():
+        return len(data)
+
+    async def range_fetch(start, end):
+        streamer.requests.append((start, end))
+        return data[start:end + 1]
+
+    streamer._get_file_size = file_size
+    streamer._range_fetch = range_fetch
+    return streamer
+
+
+class TestPlanBlocks:
+    def test_adjacent_entries_share_a_block(self):
+        entries = [entry(0, 0, 100), entry(1, 100, 100), entry(2, 200, 100)]
+        assert ZipStreamer._plan_blocks(entries, block_bytes=1000, max_gap=0) == [entries]
+
+    def test_gap_larger_than_max_gap_starts_a_new_block(self):
+        entries = [entry(0, 0, 100), entry(1, 150, 100), entry(2, 400, 100)]
+        blocks = ZipStreamer._plan_blocks(entries, block_bytes=1000, max_gap=50)
+        assert [[e["index"] for e in block] for block in blocks] == [[0, 1], [2]]
+
+    def test_block_stays_within_block_bytes(self):
+        entries = [entry(i, i * 100, 100) for i in range(5)] + [entry(5, 500, 1000)]
+        blocks = ZipStreamer._plan_blocks(entries, block_bytes=250, max_gap=0)
+        assert [[e["index"] for e in block] for block in blocks] == [[0, 1], [2, 3], [4], [5]]
+
+    def test_entries_out_of_file_order_are_not_coalesced(self):
+        entries = [entry(1, 100, 100), entry(0, 0, 100)]
+        assert len(ZipStreamer._plan_blocks(entries, block_bytes=1000, max_gap=1000)) == 2
+
+    def test_no_entries(self):
+        assert ZipStreamer._plan_blocks([], block_bytes=1000, max_gap=0) == []
+
+
+class TestCentralDirectoryDigest:
+    def test_streamed_digest_matches_local_zipfile(self):
+        data = build_zip()
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            local = central_directory_digest(
+                (i.filename, i.compress_size, i.file_size)
+                for i in zf.infolist() if i.filename.lower().endswith(".xml")
+            )
+        assert asyncio.run(in_memory_streamer(data).central_directory_digest()) == local
+
+    def test_digest_changes_with_entry_list(self):
+        base = [("0000_public.xml", 10, 20), ("0001_public.xml", 11, 21)]
+        assert central_directory_digest(base) == central_directory_digest(list(base))
+        assert central_directory_digest(base) != central_directory_digest(base[::-1])
+        assert central_directory_digest(base) != central_directory_digest(base[:1])
+        assert central_directory_digest(base) != central_directory_digest(
+            [base[0], ("0001_public.xml", 12, 21)])
+
+
+class TestStreamEntryBlocks:
+    @pytest.mark.parametrize("method", [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED])
+    def test_blocks_decode_to_zip_contents(self, method):
+        data = build_zip(method=method)
+        streamer = in_memory_streamer(data)
+
+        async def collect():
+            return [item async for block in streamer.stream_entry_blocks(
+                [0, 3, 4, 5, 6, 11], max_gap=0) for item in block]
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            names = [n for n in zf.namelist() if n.endswith(".xml")]
+            expected = [(i, names[i], zf.read(names[i])) for i in (0, 3, 4, 5, 6, 11)]
+
+        assert asyncio.run(collect()) == expected
+        # Tail + central directory, then [0], [3..5], [6] (README.txt sits between 5 and 6), [11]
+        assert len(streamer.requests) == 2 + 4
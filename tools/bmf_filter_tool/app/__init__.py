@@ -15,6 +15,7 @@ clean 12-factor principles:
 
 Key Components:
 - BMFFilterTool: Core filtering logic
+- BMFColumnStore: Optional resident columnar query engine
 - BMFFilterAgent: LLM integration
 - Server: HTTP API service
 - Main: CLI interface and examples
@@ -25,5 +26,6 @@ __author__ = "Catalynx Development"
 
 # Import main components for easy access
 from .bmf_filter import BMFFilterTool
+from .bmf_column_store import BMFColumnStore
 
-__all__ = ["BMFFilterTool"]
\ No newline at end of file
+__all__ = ["BMFFilterTool", "BMFColumnStore"]
\ No newline at end of file
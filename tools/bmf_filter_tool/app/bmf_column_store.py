@@ -0,0 +1,344 @@
+"""
+BMF Column Store - Resident Query Engine
+========================================
+
+Optional in-memory engine behind BMFFilterTool (enabled with
+BMF_RESIDENT_ENGINE=true).
+
+The bmf_organizations table is loaded once into typed columnar arrays:
+- Code columns (state, NTEE, subsection, status, ...) are dictionary-encoded
+  into int32 arrays; an IN filter is a lookup-table gather
+- Financials are int64 arrays with SQLite's CAST(... AS INTEGER) semantics
+  and a separate NULL mask
+- Name and ruling-date sort ranks are precomputed
+
+A query narrows a row-position array filter by filter, sorts only the
+survivors (top-k partition when a limit is set) and reads the full rows for
+the returned page only, by rowid, over a connection held for the life of the
+store. refresh() reloads the arrays after the BMF ETL rewrites the table;
+the tool calls it before each query, and it is a no-op unless SQLite's
+data_version shows another connection has committed since the load.
+"""
+
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.bmf_name_index import BMFNameIndex, TRIGRAM_TABLE
+
+logger = logging.getLogger(__name__)
+
+# Columns returned for each organization (same as the SQL query path)
+ORG_COLUMNS = (
+    "ein", "name", "ico", "street", "city", "state", "zip",
+    "ntee_code", "foundation_code", "organization_code", "subsection", "classification",
+    "status", "filing_req_cd", "pf_filing_req_cd", "deductibility", "activity",
+    "group_code", "ruling_date", "affiliation", "acct_pd",
+    "asset_amt", "income_amt", "revenue_amt",
+)
+
+# Dictionary-encoded filter columns
+CODE_COLUMNS = (
+    "state", "ntee_code", "subsection", "status", "filing_req_cd",
+    "deductibility", "activity", "group_code", "foundation_code", "city_upper",
+)
+
+PRIVATE_FOUNDATION_CODES = ("10", "11", "12", "13", "15", "16", "17")
+
+_LOAD_QUERY = """
+    SELECT
+        rowid AS row_id,
+        state, ntee_code, subsection, status, filing_req_cd,
+        deductibility, activity, group_code, foundation_code,
+        UPPER(city) AS city_upper,
+        UPPER(name) AS name_upper,
+        name, ruling_date,
+        CAST(income_amt AS INTEGER) AS income_int,
+        CAST(revenue_amt AS INTEGER) AS revenue_int,
+        CAST(asset_amt AS INTEGER) AS asset_int,
+        CAST(COALESCE(income_amt, revenue_amt, '0') AS INTEGER) AS revenue_sort,
+        CAST(COALESCE(asset_amt, '0') AS INTEGER) AS asset_sort
+    FROM bmf_organizations
+    ORDER BY rowid
+"""
+
+# Rows per IN (...) when materializing a page
+_FETCH_BATCH = 500
+
+# Above this many surviving rows, name filters go through the trigram index
+_NAME_INDEX_MIN_ROWS = 50000
+
+
+class BMFColumnStore:
+    """Columnar, read-only snapshot of bmf_organizations"""
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self.row_count = 0
+        self.load_time_ms = 0.0
+        self._cols: Dict[str, Any] = {}
+        self._vocab: Dict[str, Dict[Any, int]] = {}
+        self._ruling_values: List[str] = []
+        self._data_version: Optional[int] = None
+        self._name_index_available = False
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+        self.load()
+
+    # ── Loading / refresh ────────────────────────────────────────────────────
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection held for the store's lifetime (caller holds _conn_lock)"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.database_path, check_same_thread=False)
+        return self._conn
+
+    def is_stale(self) -> bool:
+        """True once another connection (e.g. the BMF ETL) has committed a change"""
+        with self._conn_lock:
+            version = self._connection().execute("PRAGMA data_version").fetchone()[0]
+        return version != self._data_version
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the arrays if the database changed (or always, with force)"""
+        if not force and not self.is_stale():
+            return False
+        self.load()
+        return True
+
+    def load(self) -> None:
+        """Read bmf_organizations into columnar arrays and swap them in"""
+        start = time.time()
+        with self._conn_lock:
+            conn = self._connection()
+            # Read before the load, so a write during it leaves the snapshot stale
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            df = pd.read_sql_query(_LOAD_QUERY, conn)
+            name_index_available = BMFNameIndex(conn).is_built()
+
+        cols: Dict[str, Any] = {"row_id": df["row_id"].to_numpy(dtype=np.int64)}
+        vocab: Dict[str, Dict[Any, int]] = {}
+        for column in CODE_COLUMNS:
+            codes, uniques = pd.factorize(df[column])
+            cols[column] = codes.astype(np.int32)          # NULL -> -1
+            vocab[column] = {value: i for i, value in enumerate(uniques)}
+
+        for column in ("income_int", "revenue_int", "asset_int", "revenue_sort", "asset_sort"):
+            series = df[column]
+            cols[column + "_valid"] = series.notna().to_numpy()
+            cols[column] = series.fillna(0).to_numpy(dtype=np.int64)
+
+        # Ruling dates encoded in sorted order, so range filters and sorting
+        # compare codes; NULL (-1) sorts first, like SQLite
+        ruling = df["ruling_date"].map(lambda v: None if v is None or pd.isna(v) else str(v))
+        ruling_values = sorted(ruling.dropna().unique())
+        ruling_codes = pd.Categorical(ruling, categories=ruling_values, ordered=True).codes
+        cols["ruling_code"] = ruling_codes.astype(np.int32)
+
+        # Rank of each row under ORDER BY name (NULL first, binary collation)
+        order = df["name"].sort_values(na_position="first", kind="mergesort").index.to_numpy()
+        name_rank = np.empty(len(df), dtype=np.int32)
+        name_rank[order] = np.arange(len(df), dtype=np.int32)
+        cols["name_rank"] = name_rank
+        cols["name_upper"] = df["name_upper"].to_numpy(dtype=object)
+
+        self._cols = cols
+        self._vocab = vocab
+        self._ruling_values = ruling_values
+        self._data_version = data_version
+        self._name_index_available = name_index_available
+        self.row_count = len(df)
+        self.load_time_ms = (time.time() - start) * 1000
+        logger.info(
+            f"BMF column store loaded {self.row_count:,} organizations in {self.load_time_ms:.0f}ms"
+        )
+
+    def close(self) -> None:
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ── Query ────────────────────────────────────────────────────────────────
+
+    def _code_lookup(self, column: str, values: Sequence[Any]) -> np.ndarray:
+        """Boolean table indexed by code (+1 slot for NULL = -1) for an IN filter"""
+        vocab = self._vocab[column]
+        lut = np.zeros(len(vocab) + 1, dtype=bool)
+        for value in values:
+            code = vocab.get(value)
+            if code is not None:
+                lut[code] = True
+        return lut
+
+    def query(self, criteria, ntee_codes: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, int]:
+        """
+        Evaluate BMFFilterCriteria against the arrays.
+
+        Mirrors BMFFilterTool._process_database_query: active 501(c)(3)s by
+        default, SQL NULL semantics for every comparison, same ORDER BY.
+
+        Returns:
+            Tuple of (rowids of the returned page in order, total rows matched)
+        """
+        cols = self._cols
+        idx: Optional[np.ndarray] = None
+
+        def narrow(test) -> None:
+            nonlocal idx
+            if idx is None:
+                idx = np.flatnonzero(test(slice(None)))
+            elif len(idx):
+                idx = idx[test(idx)]
+
+        def code_in(column: str, values: Sequence[Any]) -> None:
+            lut = self._code_lookup(column, values)
+            narrow(lambda rows: lut[cols[column][rows]])
+
+        # Most selective filters first; the result does not depend on order
+        if criteria.states:
+            code_in("state", criteria.states)
+        if ntee_codes:
+            code_in("ntee_code", ntee_codes)
+        if criteria.cities:
+            code_in("city_upper", [city.upper() for city in criteria.cities])
+        for attr, column in (("filing_req_codes", "filing_req_cd"),
+                             ("deductibility_codes", "deductibility"),
+                             ("activity_codes", "activity"),
+                             ("group_codes", "group_code")):
+            values = getattr(criteria, attr, None)
+            if values:
+                code_in(column, values)
+
+        status_codes = getattr(criteria, "status_codes", None)
+        code_in("status", status_codes if status_codes else ["01"])
+        code_in("subsection", ["03"])
+
+        ruling_after = getattr(criteria, "ruling_date_after", None)
+        if ruling_after:
+            low = bisect_left(self._ruling_values, ruling_after)
+            narrow(lambda rows: cols["ruling_code"][rows] >= low)
+        ruling_before = getattr(criteria, "ruling_date_before", None)
+        if ruling_before:
+            high = bisect_right(self._ruling_values, ruling_before)
+            narrow(lambda rows: (cols["ruling_code"][rows] >= 0) & (cols["ruling_code"][rows] < high))
+
+        if criteria.revenue_min is not None:
+            bound = criteria.revenue_min
+            narrow(lambda rows: (cols["income_int_valid"][rows] & (cols["income_int"][rows] >= bound))
+                   | (cols["revenue_int_valid"][rows] & (cols["revenue_int"][rows] >= bound)))
+        if criteria.revenue_max is not None:
+            bound = criteria.revenue_max
+            narrow(lambda rows: (cols["income_int_valid"][rows] & (cols["income_int"][rows] <= bound))
+                   | (cols["revenue_int_valid"][rows] & (cols["revenue_int"][rows] <= bound)))
+        if criteria.asset_min is not None:
+            bound = criteria.asset_min
+            narrow(lambda rows: cols["asset_int_valid"][rows] & (cols["asset_int"][rows] >= bound))
+        if criteria.asset_max is not None:
+            bound = criteria.asset_max
+            narrow(lambda rows: cols["asset_int_valid"][rows] & (cols["asset_int"][rows] <= bound))
+
+        if criteria.foundation_type and criteria.foundation_type != "any":
+            private = self._code_lookup("foundation_code", PRIVATE_FOUNDATION_CODES)
+            if criteria.foundation_type == "private_foundation":
+                narrow(lambda rows: private[cols["foundation_code"][rows]])
+            elif criteria.foundation_type == "public_charity":
+                narrow(lambda rows: ~private[cols["foundation_code"][rows]])
+
+        if idx is None:
+            idx = np.arange(self.row_count)
+
+        # Substring match last, on the survivors only (or via the trigram
+        # index when few other filters narrowed the rows)
+        if criteria.organization_name and len(idx):
+            name_match = BMFNameIndex.substring_match(criteria.organization_name)
+            if self._name_index_available and name_match and len(idx) > _NAME_INDEX_MIN_ROWS:
+                idx = np.intersect1d(idx, self._name_positions(name_match), assume_unique=True)
+            else:
+                needle = criteria.organization_name.upper()
+                names = pd.Series(cols["name_upper"][idx])
+                idx = idx[names.str.contains(needle, regex=False, na=False).to_numpy()]
+
+        total = len(idx)
+        keys = self._sort_keys(criteria.sort_by, idx)
+        if keys is not None:
+            idx = idx[self._top_k(keys, criteria.limit)]
+        elif criteria.limit:
+            idx = idx[:criteria.limit]
+        return cols["row_id"][idx], total
+
+    def _name_positions(self, name_match: str) -> np.ndarray:
+        """Row positions whose name matches a trigram MATCH expression"""
+        with self._conn_lock:
+            rowids = np.fromiter(
+                (r[0] for r in self._connection().execute(
+                    f"SELECT rowid FROM {TRIGRAM_TABLE} WHERE {TRIGRAM_TABLE} MATCH ?", (name_match,))),
+                dtype=np.int64,
+            )
+        row_id = self._cols["row_id"]
+        positions = np.searchsorted(row_id, rowids)
+        valid = positions < len(row_id)
+        positions, rowids = positions[valid], rowids[valid]
+        return np.sort(positions[row_id[positions] == rowids])
+
+    def _sort_keys(self, sort_by, idx: np.ndarray) -> Optional[np.ndarray]:
+        """Ascending sort key matching BMFFilterTool._get_sql_sort_clause"""
+        if not sort_by:
+            return None
+        cols = self._cols
+        if sort_by == "revenue_desc":
+            return -cols["revenue_sort"][idx]
+        if sort_by == "revenue_asc":
+            return cols["revenue_sort"][idx]
+        if sort_by == "assets_desc":
+            return -cols["asset_sort"][idx]
+        if sort_by == "assets_asc":
+            return cols["asset_sort"][idx]
+        if sort_by == "recent_filing":
+            return -cols["ruling_code"][idx]
+        return cols["name_rank"][idx]
+
+    @staticmethod
+    def _top_k(keys: np.ndarray, limit: Optional[int]) -> np.ndarray:
+        """Positions of the `limit` smallest keys in stable order (ties keep row order)"""
+        if not limit or limit >= len(keys):
+            return np.argsort(keys, kind="stable")
+        kth = np.partition(keys, limit - 1)[limit - 1]
+        below = np.flatnonzero(keys < kth)
+        ties = np.flatnonzero(keys == kth)[:limit - len(below)]
+        chosen = np.concatenate([below, ties])
+        return chosen[np.argsort(keys[chosen], kind="stable")]
+
+    # ── Page materialization ─────────────────────────────────────────────────
+
+    def fetch_rows(self, rowids: Sequence[int]) -> List[sqlite3.Row]:
+        """Full rows for the given rowids, in the given order"""
+        rowids = [int(r) for r in rowids]
+        if not rowids:
+            return []
+        by_id: Dict[int, sqlite3.Row] = {}
+        with self._conn_lock:
+            cursor = self._connection().cursor()
+            cursor.row_factory = sqlite3.Row
+            for i in range(0, len(rowids), _FETCH_BATCH):
+                batch = rowids[i:i + _FETCH_BATCH]
+                placeholders = ",".join("?" for _ in batch)
+                cursor.execute(
+                    f"SELECT rowid AS row_id, {', '.join(ORG_COLUMNS)} "
+                    f"FROM bmf_organizations WHERE rowid IN ({placeholders})",
+                    batch,
+                )
+                for row in cursor:
+                    by_id[row["row_id"]] = row
+        return [by_id[r] for r in rowids if r in by_id]
@@ -17,6 +17,7 @@ Key 12-Factor Principles:
 """
 
 import os
+import sys
 import time
 import json
 import logging
@@ -35,6 +36,13 @@ from .generated import (
     BMFDataQuality, BMFSearchPriority
 )
 
+from .bmf_column_store import BMFColumnStore
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.bmf_name_index import BMFNameIndex, TRIGRAM_TABLE
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -61,6 +69,7 @@ class BMFFilterTool:
         self.max_results = int(os.getenv("BMF_MAX_RESULTS", "1000"))
         self.timeout_seconds = int(os.getenv("BMF_TIMEOUT_SECONDS", "30"))
         self.memory_limit_mb = int(os.getenv("BMF_MEMORY_LIMIT_MB", "512"))
+        self.resident_engine_enabled = os.getenv("BMF_RESIDENT_ENGINE", "false").lower() == "true"
 
         # Performance monitoring
         self.log_performance = os.getenv("BMF_LOG_PERFORMANCE", "true").lower() == "true"
@@ -76,6 +85,11 @@ class BMFFilterTool:
         # Test database connection
         self._test_database_connection()
 
+        # Optional resident columnar engine (loads the BMF once)
+        self.column_store: Optional[BMFColumnStore] = None
+        if self.resident_engine_enabled:
+            self.column_store = BMFColumnStore(self.database_path)
+
         logger.info(f"BMF Filter Tool initialized - Database: {self.database_path}")
 
     def _test_database_connection(self) -> None:
@@ -104,12 +118,31 @@ class BMFFilterTool:
             count = cursor.fetchone()[0]
             logger.info(f"Database connection verified: {count:,} organizations available")
 
+            # FTS5 name index (replaces UPPER(name) LIKE scans when present)
+            self.name_index_available = BMFNameIndex(conn).is_built()
+            if not self.name_index_available:
+                logger.warning("BMF name index not built - name filters will scan the table")
+
             conn.close()
 
         except Exception as e:
             logger.error(f"Database connection test failed: {e}")
             raise
 
+    def refresh_resident_engine(self, force: bool = True) -> bool:
+        """
+        Reload the resident engine after the BMF ETL rewrites bmf_organizations.
+
+        Queries also reload automatically when the database file changes;
+        call this to pick up a reload immediately. Clears the result cache.
+        """
+        if not self.column_store:
+            return False
+        reloaded = self.column_store.refresh(force=force)
+        if reloaded:
+            self._cache.clear()
+        return reloaded
+
     def _load_filter_config(self) -> List[str]:
         """Load NTEE filter configuration (similar to existing script)"""
         default_ntee = ['E31', 'P81', 'W70']  # Fallback values
@@ -290,6 +323,9 @@ class BMFFilterTool:
         Returns:
             Tuple of (results, processing_statistics)
         """
+        if self.column_store:
+            return self._process_resident_query(criteria)
+
         import sqlite3
 
         try:
@@ -385,10 +421,15 @@ class BMFFilterTool:
                 query_parts.append("AND ruling_date <= ?")
                 params.append(criteria.ruling_date_before)
 
-            # Organization name filter
+            # Organization name filter (trigram index when available)
             if criteria.organization_name:
-                query_parts.append("AND UPPER(name) LIKE ?")
-                params.append(f"%{criteria.organization_name.upper()}%")
+                name_match = BMFNameIndex.substring_match(criteria.organization_name) if self.name_index_available else None
+                if name_match:
+                    query_parts.append(f"AND rowid IN (SELECT rowid FROM {TRIGRAM_TABLE} WHERE {TRIGRAM_TABLE} MATCH ?)")
+                    params.append(name_match)
+                else:
+                    query_parts.append("AND UPPER(name) LIKE ?")
+                    params.append(f"%{criteria.organization_name.upper()}%")
 
             # Financial filters
             if criteria.revenue_min is not None:
@@ -435,39 +476,7 @@ class BMFFilterTool:
             rows = cursor.fetchall()
 
             # Convert to list of dictionaries with enhanced data
-            organizations = []
-            for row in rows:
-                org_data = {
-                    'ein': row['ein'] or '',
-                    'name': row['name'] or '',
-                    'ico': row['ico'] or '',
-                    'street': row['street'] or '',
-                    'city': row['city'] or '',
-                    'state': row['state'] or '',
-                    'zip_code': row['zip'] or '',
-                    'ntee_code': row['ntee_code'] or '',
-                    'foundation_code': row['foundation_code'] or '',
-                    'organization_code': row['organization_code'] or '',
-                    'subsection': row['subsection'] or '',
-                    'classification': row['classification'] or '',
-                    'status': row['status'] or '',
-                    'filing_req_cd': row['filing_req_cd'] or '',
-                    'pf_filing_req_cd': row['pf_filing_req_cd'] or '',
-                    'deductibility': row['deductibility'] or '',
-                    'activity': row['activity'] or '',
-                    'group_code': row['group_code'] or '',
-                    'ruling_date': row['ruling_date'] or '',
-                    'affiliation': row['affiliation'] or '',
-                    'acct_pd': row['acct_pd'] or '',
-                    'bmf_revenue': self._safe_int_convert(row['income_amt']) or self._safe_int_convert(row['revenue_amt']),
-                    'bmf_assets': self._safe_int_convert(row['asset_amt']),
-                    'f990_revenue': None,  # Would come from form_990 table join
-                    'f990_assets': None,   # Would come from form_990 table join
-                    'f990_expenses': None,
-                    'grants_paid': None,
-                    'latest_year': None
-                }
-                organizations.append(org_data)
+            organizations = [self._row_to_org_data(row) for row in rows]
 
             conn.close()
 
@@ -485,6 +494,63 @@ class BMFFilterTool:
             logger.error(f"Database query failed: {str(e)}")
             raise
 
+    def _process_resident_query(self, criteria: BMFFilterCriteria) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Answer the query from the resident column store.
+
+        Same filters, ordering and row dicts as the SQL path; only the
+        returned page is read from SQLite.
+        """
+        if self.refresh_resident_engine(force=False):
+            logger.info("BMF database changed - resident engine reloaded")
+
+        ntee_codes_to_use = criteria.ntee_codes or self.default_ntee_codes
+        rowids, matched = self.column_store.query(criteria, ntee_codes_to_use)
+        organizations = [self._row_to_org_data(row) for row in self.column_store.fetch_rows(rowids)]
+
+        total_count = self.column_store.row_count
+        processing_stats = {
+            'rows_processed': total_count,
+            'rows_after_filters': matched,
+            'final_results': len(organizations),
+            'filter_efficiency': matched / total_count if total_count > 0 else 0
+        }
+        logger.info(f"Resident query complete: {len(organizations)} results ({matched} matched) from {total_count} total records")
+        return organizations, processing_stats
+
+    def _row_to_org_data(self, row) -> Dict[str, Any]:
+        """Convert a bmf_organizations row into the organization dict used downstream"""
+        return {
+            'ein': row['ein'] or '',
+            'name': row['name'] or '',
+            'ico': row['ico'] or '',
+            'street': row['street'] or '',
+            'city': row['city'] or '',
+            'state': row['state'] or '',
+            'zip_code': row['zip'] or '',
+            'ntee_code': row['ntee_code'] or '',
+            'foundation_code': row['foundation_code'] or '',
+            'organization_code': row['organization_code'] or '',
+            'subsection': row['subsection'] or '',
+            'classification': row['classification'] or '',
+            'status': row['status'] or '',
+            'filing_req_cd': row['filing_req_cd'] or '',
+            'pf_filing_req_cd': row['pf_filing_req_cd'] or '',
+            'deductibility': row['deductibility'] or '',
+            'activity': row['activity'] or '',
+            'group_code': row['group_code'] or '',
+            'ruling_date': row['ruling_date'] or '',
+            'affiliation': row['affiliation'] or '',
+            'acct_pd': row['acct_pd'] or '',
+            'bmf_revenue': self._safe_int_convert(row['income_amt']) or self._safe_int_convert(row['revenue_amt']),
+            'bmf_assets': self._safe_int_convert(row['asset_amt']),
+            'f990_revenue': None,  # Would come from form_990 table join
+            'f990_assets': None,   # Would come from form_990 table join
+            'f990_expenses': None,
+            'grants_paid': None,
+            'latest_year': None
+        }
+
     def _safe_int_convert(self, value) -> Optional[int]:
         """Safely convert string to int, return None if conversion fails"""
         if pd.isna(value) or value == '':
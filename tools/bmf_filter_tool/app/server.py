@@ -126,6 +126,25 @@ async def filter_bmf_data(intent: BMFFilterIntent):
         logger.error(f"BMF filter execution error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Execution failed: {str(e)}")
 
+@app.post("/refresh")
+async def refresh_resident_engine():
+    """
+    Reload the resident BMF engine after the BMF ETL rewrites the table
+
+    Returns:
+        Whether a resident engine was reloaded and its row count
+    """
+    if not bmf_tool:
+        raise HTTPException(status_code=503, detail="Tool not available")
+
+    reloaded = bmf_tool.refresh_resident_engine()
+    return {
+        "resident_engine": bmf_tool.column_store is not None,
+        "reloaded": reloaded,
+        "organizations": bmf_tool.column_store.row_count if bmf_tool.column_store else None,
+        "timestamp": time.time()
+    }
+
 @app.get("/health")
 async def health_check():
     """
@@ -245,6 +264,7 @@ async def get_metrics():
             "tool_status": "running",
             "cache_enabled": bmf_tool.cache_enabled,
             "cache_size": len(bmf_tool._cache),
+            "resident_engine": bmf_tool.column_store is not None,
             "input_file_exists": os.path.exists(bmf_tool.input_path),
             "input_file_path": bmf_tool.input_path,
             "max_results_limit": bmf_tool.max_results,
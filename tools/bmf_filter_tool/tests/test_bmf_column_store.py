@@ -0,0 +1,111 @@
+"""
+BMF Column Store - Tests
+========================
+
+Tests for the resident columnar engine: filters, ordering, page
+materialization and refresh after the table changes.
+"""
+
+import sqlite3
+import pytest
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.bmf_column_store import BMFColumnStore
+from app.generated import BMFFilterCriteria, BMFSortOption
+
+ROWS = [
+    # ein, name, city, state, ntee, subsection, foundation, status, income, revenue, assets, ruling
+    ("100000001", "Test Education Org", "Richmond", "VA", "P20", "03", "", "01", 500000, None, 1000000, "199001"),
+    ("100000002", "Sample Health Center", "Norfolk", "VA", "B25", "03", "15", "01", 1200000, None, 5000000, "200512"),
+    ("100000003", "Virginia Arts Council", "richmond", "VA", "A20", "03", None, "01", None, 75000, 200000, None),
+    ("100000004", "Child Development Center", "Alexandria", "VA", "P20", "03", "", "01", 800000, None, None, "201006"),
+    ("100000005", "Tech Training Institute", "Austin", "TX", "P20", "03", "", "01", 300000, None, 600000, "201801"),
+    ("100000006", "Inactive Education Org", "Richmond", "VA", "P20", "03", "", "02", 900000, None, 100, "201801"),
+    ("100000007", "Social Club", "Richmond", "VA", "P20", "07", "", "01", 950000, None, 100, "201801"),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "bmf.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE bmf_organizations (
+            ein TEXT PRIMARY KEY, name TEXT, ico TEXT, street TEXT, city TEXT, state TEXT, zip TEXT,
+            ntee_code TEXT, foundation_code TEXT, organization_code TEXT, subsection TEXT,
+            classification TEXT, status TEXT, filing_req_cd TEXT, pf_filing_req_cd TEXT,
+            deductibility TEXT, activity TEXT, group_code TEXT, ruling_date TEXT,
+            affiliation TEXT, acct_pd TEXT, asset_amt INTEGER, income_amt INTEGER, revenue_amt INTEGER
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO bmf_organizations (ein, name, city, state, ntee_code, subsection, foundation_code, "
+        "status, income_amt, revenue_amt, asset_amt, ruling_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ROWS,
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def store(db_path):
+    store = BMFColumnStore(db_path)
+    yield store
+    store.close()
+
+
+def _eins(store, criteria, ntee_codes=None):
+    rowids, _ = store.query(criteria, ntee_codes or criteria.ntee_codes)
+    return [row["ein"] for row in store.fetch_rows(rowids)]
+
+
+class TestBMFColumnStore:
+    """Test cases for the resident BMF engine"""
+
+    def test_default_filters_active_501c3(self, store):
+        """Inactive and non-03 organizations are excluded, as in the SQL path"""
+        eins = _eins(store, BMFFilterCriteria(states=["VA"], sort_by=None, limit=None))
+        assert eins == ["100000001", "100000002", "100000003", "100000004"]
+
+    def test_code_city_and_name_filters(self, store):
+        """IN filters on encoded columns, case-insensitive city and name matching"""
+        assert _eins(store, BMFFilterCriteria(ntee_codes=["P20"], states=["VA"], sort_by=None)) == [
+            "100000001", "100000004"]
+        assert _eins(store, BMFFilterCriteria(cities=["RICHMOND"], sort_by=None)) == ["100000001", "100000003"]
+        assert _eins(store, BMFFilterCriteria(organization_name="child")) == ["100000004"]
+
+    def test_financial_and_foundation_filters(self, store):
+        """NULL amounts never satisfy a range, matching SQL comparison semantics"""
+        assert _eins(store, BMFFilterCriteria(revenue_min=600000, sort_by=None)) == ["100000002", "100000004"]
+        assert _eins(store, BMFFilterCriteria(asset_max=700000, sort_by=None)) == ["100000003", "100000005"]
+        assert _eins(store, BMFFilterCriteria(foundation_type="private_foundation")) == ["100000002"]
+        assert "100000002" not in _eins(store, BMFFilterCriteria(foundation_type="public_charity"))
+
+    def test_sorting_and_top_k(self, store):
+        """Sort keys follow the SQL ORDER BY clauses; limit keeps the top rows"""
+        rowids, matched = store.query(BMFFilterCriteria(sort_by=BMFSortOption.revenue_desc, limit=2))
+        assert matched == 5
+        assert [row["ein"] for row in store.fetch_rows(rowids)] == ["100000002", "100000004"]
+        assert _eins(store, BMFFilterCriteria(sort_by=BMFSortOption.name_asc, limit=2)) == [
+            "100000004", "100000002"]
+        assert _eins(store, BMFFilterCriteria(sort_by=BMFSortOption.recent_filing))[-1] == "100000003"
+
+    def test_refresh_after_external_write(self, store, db_path):
+        """A commit from another connection marks the snapshot stale"""
+        assert not store.is_stale()
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE bmf_organizations SET name = 'Renamed Arts Council' WHERE ein = '100000003'")
+        conn.commit()
+        conn.close()
+
+        assert store.is_stale()
+        assert store.refresh()
+        assert not store.refresh()
+        assert _eins(store, BMFFilterCriteria(organization_name="renamed")) == ["100000003"]
@@ -0,0 +1,175 @@
+"""
+Benchmark: xml_dispatcher.parse_xml_bytes throughput (files/s)
+
+Measures parse throughput over a corpus of 990 / 990-PF / 990-EZ XML files
+and, optionally, compares it against another copy of the dispatcher (e.g.
+the version before a change) on the same corpus, checking that both return
+identical dicts.
+
+Corpus sources (first match wins):
+  --zip PATH    an IRS TEOS monthly ZIP (or any ZIP of .xml files)
+  --dir PATH    a directory of .xml files
+  (neither)     a built-in synthetic corpus of all three form types,
+                990-PF filings carrying a realistic Part XV grant list
+
+Run from project root:
+
+    # Current dispatcher on the synthetic corpus
+    python tools/irs_990_bulk_loader/bench_xml_dispatcher.py
+
+    # Before/after on a real monthly ZIP
+    git show HEAD~1:tools/irs_990_bulk_loader/xml_dispatcher.py > /tmp/xml_dispatcher_before.py
+    python tools/irs_990_bulk_loader/bench_xml_dispatcher.py \\
+        --zip D:/tmp/2024_TEOS_XML_01A.zip --limit 5000 \\
+        --compare /tmp/xml_dispatcher_before.py
+"""
+
+import argparse
+import importlib.util
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
+from tools.irs_990_bulk_loader import xml_dispatcher
+
+_NS = "http://www.irs.gov/efile"
+
+
+# ── Corpus ────────────────────────────────────────────────────────────────────
+
+def _synthetic_990(i: int) -> bytes:
+    officers = "".join(
+        f"<Form990PartVIISectionAGrp><PersonNm>Officer {i}-{k}</PersonNm>"
+        f"<TitleTxt>Director</TitleTxt><ReportableCompFromOrgAmt>{k * 1000}</ReportableCompFromOrgAmt>"
+        f"</Form990PartVIISectionAGrp>"
+        for k in range(12)
+    )
+    grants = "".join(
+        f"<RecipientTable><RecipientBusinessName><BusinessNameLine1Txt>Grantee {k}</BusinessNameLine1Txt>"
+        f"</RecipientBusinessName><RecipientEIN>{540000000 + k}</RecipientEIN>"
+        f"<RecipientUSAddress><CityNm>Richmond</CityNm><StateAbbreviationCd>VA</StateAbbreviationCd>"
+        f"</RecipientUSAddress><CashGrantAmt>{k * 250}</CashGrantAmt>"
+        f"<PurposeOfGrantTxt>General support</PurposeOfGrantTxt></RecipientTable>"
+        for k in range(25)
+    )
+    return (
+        f'<?xml version="1.0"?><Return xmlns="{_NS}"><ReturnHeader>'
+        f"<TaxPeriodEndDt>2023-12-31</TaxPeriodEndDt><ReturnTypeCd>990</ReturnTypeCd>"
+        f"<Filer><EIN>{100000000 + i}</EIN></Filer></ReturnHeader><ReturnData><IRS990>"
+        f"<WebsiteAddressTxt>www.example{i}.org</WebsiteAddressTxt>"
+        f"<ActivityOrMissionDesc>Community services</ActivityOrMissionDesc>"
+        f"<CYTotalRevenueAmt>{i * 1000}</CYTotalRevenueAmt><TotalAssetsEOYAmt>50000</TotalAssetsEOYAmt>"
+        f"<CYTotalFunctionalExpensesAmt>9000</CYTotalFunctionalExpensesAmt>"
+        f"<TotalEmployeeCnt>14</TotalEmployeeCnt>{officers}</IRS990>"
+        f"<IRS990ScheduleI>{grants}</IRS990ScheduleI></ReturnData></Return>"
+    ).encode()
+
+
+def _synthetic_990pf(i: int) -> bytes:
+    officers = "".join(
+        f"<OfficerDirTrstKeyEmplGrp><PersonNm>Trustee {i}-{k}</PersonNm><TitleTxt>Trustee</TitleTxt>"
+        f"<CompensationAmt>0</CompensationAmt></OfficerDirTrstKeyEmplGrp>"
+        for k in range(6)
+    )
+    grants = "".join(
+        f"<GrantOrContributionPdDurYrGrp><RecipientBusinessName><BusinessNameLine1Txt>School {k}"
+        f"</BusinessNameLine1Txt></RecipientBusinessName><Amt>{k * 500 + 100}</Amt>"
+        f"<GrantOrContributionPurposeTxt>Scholarships</GrantOrContributionPurposeTxt>"
+        f"</GrantOrContributionPdDurYrGrp>"
+        for k in range(120)
+    )
+    return (
+        f'<?xml version="1.0"?><Return xmlns="{_NS}"><ReturnHeader>'
+        f"<TaxPeriodEndDt>2022-12-31</TaxPeriodEndDt><ReturnTypeCd>990PF</ReturnTypeCd>"
+        f"<Filer><EIN>{200000000 + i}</EIN></Filer></ReturnHeader><ReturnData><IRS990PF>"
+        f"<FMVAssetsEndOfYearAmt>25000000</FMVAssetsEndOfYearAmt><TotalRevenueAmt>1200000</TotalRevenueAmt>"
+        f"<TotalAssetsAmt>24000000</TotalAssetsAmt><QualifyingDistributionsAmt>1300000</QualifyingDistributionsAmt>"
+        f"<DistributableAmountAmt>1200000</DistributableAmountAmt>"
+        f"<GrantMakingProceduresTxt>Grants by invitation only</GrantMakingProceduresTxt>"
+        f"{officers}<SupplementaryInformationGrp>{grants}</SupplementaryInformationGrp>"
+        f"</IRS990PF></ReturnData></Return>"
+    ).encode()
+
+
+def _synthetic_990ez(i: int) -> bytes:
+    return (
+        f'<?xml version="1.0"?><Return xmlns="{_NS}"><ReturnHeader>'
+        f"<TaxPeriodEndDt>2023-06-30</TaxPeriodEndDt><ReturnTypeCd>990EZ</ReturnTypeCd>"
+        f"<Filer><EIN>{300000000 + i}</EIN></Filer></ReturnHeader><ReturnData><IRS990EZ>"
+        f"<TotalRevenueAmt>85000</TotalRevenueAmt><TotalExpensesAmt>80000</TotalExpensesAmt>"
+        f"<TotalAssetsEOYAmt>30000</TotalAssetsEOYAmt>"
+        f"<OfficerDirectorTrusteeGrp><PersonNm>President {i}</PersonNm><TitleTxt>President</TitleTxt>"
+        f"</OfficerDirectorTrusteeGrp></IRS990EZ></ReturnData></Return>"
+    ).encode()
+
+
+def synthetic_corpus(n: int) -> list:
+    makers = (_synthetic_990, _synthetic_990pf, _synthetic_990ez)
+    return [makers[i % 3](i) for i in range(n)]
+
+
+def load_corpus(args) -> list:
+    if args.zip:
+        with zipfile.ZipFile(args.zip) as zf:
+            names = [n for n in zf.namelist() if n.lower().endswith(".xml")][: args.limit]
+            return [zf.read(n) for n in names]
+    if args.dir:
+        paths = sorted(Path(args.dir).glob("*.xml"))[: args.limit]
+        return [p.read_bytes() for p in paths]
+    return synthetic_corpus(args.limit)
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def _load_module(path: str):
+    spec = importlib.util.spec_from_file_location("xml_dispatcher_compare", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench(parse, corpus: list, repeat: int) -> tuple[float, list]:
+    """Return (best files/s over `repeat` runs, results of the last run)."""
+    best = 0.0
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [parse(blob) for blob in corpus]
+        elapsed = time.perf_counter() - start
+        best = max(best, len(corpus) / elapsed if elapsed > 0 else 0.0)
+    return best, results
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--zip", help="ZIP of XML filings")
+    p.add_argument("--dir", help="Directory of XML filings")
+    p.add_argument("--limit", type=int, default=3000, help="Max files in the corpus (default: 3000)")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per implementation; best is reported")
+    p.add_argument("--compare", metavar="PY_FILE", help="Another xml_dispatcher.py to benchmark against")
+    args = p.parse_args()
+
+    corpus = load_corpus(args)
+    size_mb = sum(len(b) for b in corpus) / 1e6
+    print(f"Corpus: {len(corpus):,} files, {size_mb:.1f} MB")
+
+    current_rate, current = bench(xml_dispatcher.parse_xml_bytes, corpus, args.repeat)
+
+    if args.compare:
+        other = _load_module(args.compare)
+        other_rate, before = bench(other.parse_xml_bytes, corpus, args.repeat)
+        mismatches = sum(1 for a, b in zip(before, current) if a != b)
+        print(f"  {args.compare}: {other_rate:,.0f} files/s")
+        print(f"  current:  {current_rate:,.0f} files/s  ({current_rate / other_rate:.2f}x)")
+        print(f"  differing results: {mismatches:,} / {len(corpus):,}")
+    else:
+        print(f"  current:  {current_rate:,.0f} files/s")
+
+
+if __name__ == "__main__":
+    main()
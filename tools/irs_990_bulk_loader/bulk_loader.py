@@ -25,17 +25,30 @@ Run from project root:
     # Custom temp directory for downloaded ZIPs
     python tools/irs_990_bulk_loader/bulk_loader.py --temp-dir D:/tmp
 
-Resume is on by default — interrupted runs can be restarted safely.
+    # Parse in 12 worker processes (DB writes stay on one writer)
+    python tools/irs_990_bulk_loader/bulk_loader.py --years 2025 --workers 12
+
+    # Stream entries with range requests — no temp ZIP on disk; with --forms/--ein
+    # non-matching filings are skipped via the IRS index before download
+    python tools/irs_990_bulk_loader/bulk_loader.py --years 2025 --stream --workers 8 --forms 990-PF
+
+Resume is on by default — interrupted runs can be restarted safely. Progress
+is checkpointed every --checkpoint-every entries, so a crash or --max-time
+cutoff part-way through a ZIP restarts at the first unprocessed entry (with
+--stream, the already-handled part of the ZIP is not downloaded again).
 """
 
 import argparse
 import asyncio
+import csv
 import logging
 import sys
 import tempfile
 import time
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 import aiohttp
 
@@ -48,12 +61,15 @@ if str(_PROJECT_ROOT) not in sys.path:
 
 from tools.irs_990_bulk_loader.xml_dispatcher import parse_xml_bytes
 from tools.irs_990_bulk_loader.db_writer import BulkLoaderDBWriter
+from tools.irs_990_bulk_loader.parse_pool import init_parse_worker, parse_xml_chunk, parse_zip_chunk
+from tools.irs_990_bulk_loader.zip_streamer import ZipStreamer, central_directory_digest
 
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
 
-IRS_ZIP_URL = "https://apps.irs.gov/pub/epostcard/990/xml/{year}/{year}_TEOS_XML_{month:02d}A.zip"
+IRS_ZIP_URL   = "https://apps.irs.gov/pub/epostcard/990/xml/{year}/{year}_TEOS_XML_{month:02d}A.zip"
+IRS_INDEX_URL = "https://apps.irs.gov/pub/epostcard/990/xml/{year}/index_{year}.csv"
 
 DEFAULT_INTEL_DB    = str(_PROJECT_ROOT / "data" / "nonprofit_intelligence.db")
 DEFAULT_CATALYNX_DB = str(_PROJECT_ROOT / "data" / "catalynx.db")
@@ -65,6 +81,9 @@ FORM_FILTER_MAP = {
     "all":    {"990", "990-PF", "990-EZ"},
 }
 
+# index_{year}.csv RETURN_TYPE → form type used by FORM_FILTER_MAP
+INDEX_RETURN_TYPES = {"990": "990", "990PF": "990-PF", "990EZ": "990-EZ"}
+
 DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024   # 4 MB chunks
 LOG_DOWNLOAD_EVERY  = 10                 # log download progress every N %
 
@@ -137,6 +156,638 @@ async def _download_zip(
     return zip_path
 
 
+# ---------------------------------------------------------------------------
+# Batch accumulation (single writer)
+# ---------------------------------------------------------------------------
+
+# (batch key, BulkLoaderDBWriter method) — flush order matches the original loader
+_BATCH_FLUSHERS = (
+    ("board",   "flush_board_network"),
+    ("grant",   "flush_grants"),
+    ("fi",      "flush_foundation_intelligence"),
+    ("fn",      "flush_foundation_narratives"),
+    ("ei",      "flush_ein_intelligence"),
+    ("website", "flush_organization_websites"),
+    ("fin",     "flush_financials"),
+)
+
+
+class _Watermark:
+    """
+    Highest entry index such that every entry up to it is done.
+
+    Entries may complete out of order (--workers); completed ranges wait
+    here until the gap below them closes.
+    """
+
+    def __init__(self, start: int = 0):
+        self.next = start          # lowest index not yet done
+        self._ranges: dict = {}    # lo -> hi (inclusive) of completed ranges above the gap
+
+    def complete(self, lo: int, hi: int) -> None:
+        self._ranges[lo] = hi
+        while self.next in self._ranges:
+            self.next = self._ranges.pop(self.next) + 1
+
+    @property
+    def last(self) -> int:
+        return self.next - 1
+
+
+class _BatchSink:
+    """
+    Per-table batch accumulators for one ZIP, flushed through a single
+    BulkLoaderDBWriter.
+
+    Both the serial and the --workers parse paths hand parsed dicts to
+    route(). All DB writes happen here on the event loop thread, so SQLite
+    only ever sees one writer regardless of how many parse processes run.
+    Also tracks busy seconds per stage (read, parse, write) for the
+    progress log.
+
+    Entry checkpoints: callers report finished entry indexes via
+    complete(); every args.checkpoint_every entries the sink flushes all
+    batches and records the contiguous high-water index in
+    irs_990_import_log (see enable_checkpoints()).
+    """
+
+    def __init__(self, writer: BulkLoaderDBWriter, args, zip_filename: str, stats: dict):
+        self.writer       = writer
+        self.args         = args
+        self.zip_filename = zip_filename
+        self.stats        = stats
+        self.form_filter  = FORM_FILTER_MAP[args.forms]
+        self.ein_filter   = set(args.ein) if args.ein else None
+        self.batches      = {key: [] for key, _ in _BATCH_FLUSHERS}
+        self.stage_s      = {"read": 0.0, "parse": 0.0, "write": 0.0}
+        self.start        = time.time()
+        self._next_log    = args.log_interval
+        self.watermark    = _Watermark()
+        self._checkpoint: Optional[dict] = None
+        self._checkpointed = -1
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def enable_checkpoints(self, cd_digest: str, total_entries: int, start_index: int) -> None:
+        """Turn on entry checkpoints; entries below start_index are already committed."""
+        self.watermark = _Watermark(start_index)
+        self._checkpointed = start_index - 1
+        self._checkpoint = {
+            "zip_filename":  self.zip_filename,
+            "cd_digest":     cd_digest,
+            "file_type":     self.args.forms,
+            "total_entries": total_entries,
+        }
+
+    def complete(self, lo: int, hi: int) -> None:
+        """Mark entries lo..hi (inclusive) as routed; checkpoint when due."""
+        self.watermark.complete(lo, hi)
+        every = getattr(self.args, "checkpoint_every", 0)
+        if self._checkpoint and every and self.watermark.last - self._checkpointed >= every:
+            self.checkpoint()
+
+    def checkpoint(self, complete: bool = False) -> None:
+        """Flush every batch, then record the watermark — in that order."""
+        if not self._checkpoint:
+            return
+        self.flush(force=True)
+        last = self.watermark.last
+        self.writer.save_checkpoint(last_entry_index=last, complete=complete, **self._checkpoint)
+        self._checkpointed = last
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def route(self, parsed: Optional[dict]) -> None:
+        """Apply form/EIN filters and append one parsed filing to the batches."""
+        stats = self.stats
+        if parsed is None:
+            stats["errors"] += 1
+            return
+
+        # Form type filter
+        if parsed["form_type"] not in self.form_filter:
+            stats["skipped_form"] += 1
+            return
+
+        # EIN filter
+        if self.ein_filter and parsed.get("ein") not in self.ein_filter:
+            return
+
+        ein       = parsed["ein"] or ""
+        tax_year  = parsed["tax_year"]
+        form_type = parsed["form_type"]
+
+        if not ein:
+            stats["errors"] += 1
+            return
+
+        stats["success"] += 1
+
+        if self.args.dry_run:
+            return
+
+        b = self.batches
+
+        # Board network (all form types)
+        for o in parsed["officers"]:
+            b["board"].append({
+                **o,
+                "ein":             ein,
+                "source_tax_year": tax_year,
+            })
+            stats["officers"] += 1
+
+        # Grants (990 and 990-PF)
+        if form_type in ("990", "990-PF"):
+            for g in parsed["grants"]:
+                b["grant"].append({
+                    **g,
+                    "grantor_ein":     ein,
+                    "tax_year":        tax_year,
+                    "form_type":       form_type,
+                    "source_zip_file": self.zip_filename,
+                })
+            stats["grants"] += len(parsed["grants"])
+
+        # Foundation intelligence + narratives (990-PF only)
+        if form_type == "990-PF":
+            parsed["grant_count"] = len(parsed["grants"])
+            b["fi"].append(parsed)
+            b["fn"].append(parsed)
+            stats["fi_rows"] += 1
+
+        # Mission statement for 990/990-EZ filers (INSERT OR IGNORE)
+        if form_type in ("990", "990-EZ") and parsed["narrative"].get("mission_statement"):
+            b["fn"].append(parsed)
+
+        # ein_intelligence officer merge (all types)
+        if parsed["officers"]:
+            b["ei"].append(parsed)
+
+        # Website URL (all form types)
+        if parsed.get("website_url"):
+            b["website"].append({
+                "ein":         ein,
+                "website_url": parsed["website_url"],
+                "tax_year":    tax_year,
+            })
+            stats["websites"] += 1
+
+        # Financials (all form types with any financial data)
+        if parsed.get("financials", {}).get("total_revenue") is not None:
+            parsed["source_zip_file"] = self.zip_filename
+            b["fin"].append(parsed)
+            stats["financials"] += 1
+
+        # Flush at batch-size threshold
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self, force: bool = False) -> None:
+        """Flush every batch at the batch-size threshold (or all non-empty if force)."""
+        for key, method in _BATCH_FLUSHERS:
+            batch = self.batches[key]
+            if batch and (force or len(batch) >= self.args.batch_size):
+                t0 = time.perf_counter()
+                getattr(self.writer, method)(batch)
+                self.stage_s["write"] += time.perf_counter() - t0
+                self.batches[key] = []
+
+    # ------------------------------------------------------------------
+    # Progress
+    # ------------------------------------------------------------------
+
+    def stage_rates(self) -> str:
+        """
+        Files per busy-second for each stage. With --workers the read and
+        parse seconds are summed across processes, so those rates are scaled
+        by the worker count to show aggregate stage capacity.
+        """
+        n = self.stats["processed"]
+        workers = max(1, getattr(self.args, "workers", 1) or 1)
+        parts = []
+        for stage in ("read", "parse", "write"):
+            busy = self.stage_s[stage]
+            if stage != "write":
+                busy /= workers
+            parts.append(f"{stage} {n / busy:,.0f}/s" if busy > 0 else f"{stage} —")
+        return "  ".join(parts)
+
+    def maybe_log_progress(self, cap: int) -> None:
+        stats = self.stats
+        if stats["processed"] < self._next_log:
+            return
+        while self._next_log <= stats["processed"]:
+            self._next_log += self.args.log_interval
+        elapsed = time.time() - self.start
+        rate = stats["processed"] / elapsed if elapsed > 0 else 0
+        pct = (stats["processed"] / cap * 100) if cap else 0
+        eta_s = ((cap - stats["processed"]) / rate) if rate > 0 and cap > stats["processed"] else 0
+        eta_str = f"{eta_s/60:.0f}m" if eta_s > 0 else "—"
+        logger.info(
+            f"[{self.zip_filename}] {stats['processed']:,}/{cap:,} ({pct:.1f}%) | "
+            f"ok={stats['success']:,} err={stats['errors']} | "
+            f"officers={stats['officers']:,} grants={stats['grants']:,} | "
+            f"{rate:.0f} files/s  ETA {eta_str} | {self.stage_rates()}"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Parse stages
+# ---------------------------------------------------------------------------
+
+def _parse_entries_serial(
+    zf: zipfile.ZipFile,
+    entries: list,
+    sink: _BatchSink,
+    deadline: float = None,
+    first_index: int = 0,
+) -> None:
+    """
+    Read and parse entries one at a time on the calling thread.
+    first_index is the position of entries[0] in the ZIP's XML entry list.
+    """
+    stats = sink.stats
+    cap = len(entries)
+    for i, entry in enumerate(entries, start=first_index):
+        # Time limit
+        if deadline and time.time() >= deadline:
+            stats["stopped_early"] = True
+            break
+
+        stats["processed"] += 1
+        try:
+            t0 = time.perf_counter()
+            xml_bytes = zf.read(entry)
+            t1 = time.perf_counter()
+            parsed = parse_xml_bytes(xml_bytes)
+            t2 = time.perf_counter()
+            sink.stage_s["read"]  += t1 - t0
+            sink.stage_s["parse"] += t2 - t1
+            sink.route(parsed)
+        except Exception as e:
+            stats["errors"] += 1
+            logger.debug(f"Error processing {entry.filename}: {e}")
+
+        sink.complete(i, i)
+        sink.maybe_log_progress(cap)
+
+
+async def _parse_entries_parallel(
+    zip_path: Path,
+    entries: list,
+    sink: _BatchSink,
+    workers: int,
+    chunk_size: int,
+    deadline: float = None,
+    first_index: int = 0,
+) -> None:
+    """
+    Fan entries out to a process pool in chunks and route results as each
+    chunk completes (completion order, not ZIP order). At most 2 chunks per
+    worker are in flight, which bounds memory while keeping every worker busy
+    during DB flushes on the event loop thread. Checkpoints only advance over
+    contiguous completed chunks (see _Watermark).
+    """
+    stats = sink.stats
+    cap = len(entries)
+    names = [e.filename for e in entries]
+    chunks = [
+        (first_index + i, names[i:i + chunk_size])
+        for i in range(0, len(names), chunk_size)
+    ]
+    max_in_flight = workers * 2
+
+    loop = asyncio.get_running_loop()
+    pending: dict = {}
+    next_chunk = 0
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_parse_worker,
+        initargs=(str(zip_path),),
+    ) as pool:
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < max_in_flight:
+                # Time limit — stop submitting, drain what is in flight
+                if deadline and time.time() >= deadline:
+                    stats["stopped_early"] = True
+                    next_chunk = len(chunks)
+                    break
+                lo, chunk = chunks[next_chunk]
+                pending[loop.run_in_executor(pool, parse_zip_chunk, chunk)] = (lo, chunk)
+                next_chunk += 1
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                lo, chunk = pending.pop(fut)
+                try:
+                    out = fut.result()
+                except Exception as e:
+                    stats["processed"] += len(chunk)
+                    stats["errors"]    += len(chunk)
+                    logger.warning(f"Parse worker failed on {len(chunk)} entries: {e}")
+                    sink.complete(lo, lo + len(chunk) - 1)
+                    continue
+
+                sink.stage_s["read"]  += out["read_s"]
+                sink.stage_s["parse"] += out["parse_s"]
+                for filename, parsed in out["results"]:
+                    stats["processed"] += 1
+                    try:
+                        sink.route(parsed)
+                    except Exception as e:
+                        stats["errors"] += 1
+                        logger.debug(f"Error processing {filename}: {e}")
+                sink.complete(lo, lo + len(chunk) - 1)
+                sink.maybe_log_progress(cap)
+
+
+async def _parse_stream(
+    streamer: ZipStreamer,
+    indices: list,
+    sink: _BatchSink,
+    args,
+    deadline: float = None,
+    first_index: int = 0,
+    end_index: int = None,
+) -> None:
+    """
+    --stream parse stage: pull coalesced blocks of entries from the
+    streamer (which keeps args.stream_concurrency range requests in flight)
+    and parse them as they arrive — inline, or in a process pool with
+    --workers. Entries between the wanted indices were filtered out before
+    download and count as done for checkpoints: the watermark runs from
+    first_index and, on a clean finish, advances through end_index.
+    """
+    stats = sink.stats
+    cap = len(indices)
+    workers = getattr(args, "workers", 1) or 1
+    block_bytes = args.stream_block_mb * 1024 * 1024
+    prev = first_index - 1
+
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    pending: dict = {}
+
+    def route_results(results: list) -> None:
+        for filename, parsed in results:
+            stats["processed"] += 1
+            try:
+                sink.route(parsed)
+            except Exception as e:
+                stats["errors"] += 1
+                logger.debug(f"Error processing {filename}: {e}")
+
+    async def drain(limit: int) -> None:
+        while len(pending) > limit:
+            done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                lo, hi, n = pending.pop(fut)
+                try:
+                    out = fut.result()
+                except Exception as e:
+                    stats["processed"] += n
+                    stats["errors"]    += n
+                    logger.warning(f"Parse worker failed on {n} entries: {e}")
+                else:
+                    sink.stage_s["parse"] += out["parse_s"]
+                    route_results(out["results"])
+                sink.complete(lo, hi)
+                sink.maybe_log_progress(cap)
+
+    # max_gap=0: an entry filtered out before download is never fetched as
+    # filler between two wanted neighbours
+    blocks = streamer.stream_entry_blocks(indices, block_bytes=block_bytes, max_gap=0)
+    try:
+        while True:
+            t0 = time.perf_counter()
+            block = await anext(blocks, None)
+            sink.stage_s["read"] += time.perf_counter() - t0
+            if block is None:
+                break
+
+            # Entries whose range request failed after retries
+            items = []
+            for index, name, xml_bytes in block:
+                if xml_bytes is None:
+                    stats["processed"] += 1
+                    stats["errors"]    += 1
+                else:
+                    items.append((index, name, xml_bytes))
+
+            lo, hi = prev + 1, block[-1][0]
+            prev = hi
+
+            if pool is None:
+                out = parse_xml_chunk([(name, xml_bytes) for _, name, xml_bytes in items])
+                sink.stage_s["parse"] += out["parse_s"]
+                route_results(out["results"])
+                sink.complete(lo, hi)
+                sink.maybe_log_progress(cap)
+            elif not items:
+                sink.complete(lo, hi)
+            else:
+                # Each chunk owns the index range up to its last entry (the
+                # last chunk up to hi), so the watermark stays exact when
+                # chunks finish out of order
+                chunk_lo = lo
+                for i in range(0, len(items), args.chunk_size):
+                    chunk = items[i:i + args.chunk_size]
+                    chunk_hi = hi if i + args.chunk_size >= len(items) else chunk[-1][0]
+                    payload = [(name, xml_bytes) for _, name, xml_bytes in chunk]
+                    fut = loop.run_in_executor(pool, parse_xml_chunk, payload)
+                    pending[fut] = (chunk_lo, chunk_hi, len(chunk))
+                    chunk_lo = chunk_hi + 1
+                await drain(workers * 2)
+
+            # Time limit — stop fetching, finish what is in flight
+            if deadline and time.time() >= deadline:
+                stats["stopped_early"] = True
+                break
+
+        await drain(0)
+        if not stats["stopped_early"] and end_index is not None and end_index > prev:
+            sink.complete(prev + 1, end_index)
+    finally:
+        await blocks.aclose()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# Entry-level resume
+# ---------------------------------------------------------------------------
+
+def _resume_index(
+    writer: BulkLoaderDBWriter,
+    args,
+    sink: _BatchSink,
+    zip_filename: str,
+    total_entries: int,
+    cd_digest: str,
+) -> int:
+    """
+    Return the first XML entry index to process and enable checkpoints.
+
+    A stored checkpoint is honored only when --resume is on and the ZIP's
+    central directory digest and --forms value still match. Checkpoints are
+    not taken for --dry-run or --ein runs, whose output is not a complete
+    load of the entries they pass over.
+    """
+    if args.dry_run or args.ein:
+        return 0
+
+    start_index = 0
+    if args.resume:
+        cp = writer.get_checkpoint(zip_filename)
+        if cp and cp["cd_digest"] == cd_digest and cp["file_type"] == args.forms:
+            start_index = min(cp["last_entry_index"] + 1, total_entries)
+            if start_index:
+                logger.info(
+                    f"Resuming {zip_filename} at entry {start_index:,}/{total_entries:,} "
+                    f"(checkpoint {cp['updated_at']})"
+                )
+        elif cp:
+            logger.info(f"Checkpoint for {zip_filename} does not match this ZIP/--forms — starting over")
+
+    sink.enable_checkpoints(cd_digest, total_entries, start_index)
+    return start_index
+
+
+# ---------------------------------------------------------------------------
+# IRS index prefilter (--stream)
+# ---------------------------------------------------------------------------
+
+# (year, forms, eins) -> (known object IDs, wanted object IDs) or None
+_index_filter_cache: dict = {}
+
+
+def _object_id(filename: str) -> Optional[int]:
+    """TEOS entry '202401349349300430_public.xml' → 202401349349300430."""
+    stem = filename.rsplit("/", 1)[-1].split("_", 1)[0]
+    return int(stem) if stem.isdigit() else None
+
+
+async def _load_index_filter(session: aiohttp.ClientSession, year: int, args) -> Optional[tuple]:
+    """
+    Resolve --forms/--ein to TEOS object IDs via the IRS index_{year}.csv,
+    so --stream can skip non-matching entries before downloading them.
+
+    Returns (known_ids, wanted_ids), or None when no filter is active or the
+    index is unavailable — every entry is then downloaded and filtered after
+    parsing, as in disk mode. Object IDs missing from the index are always
+    downloaded. Cached per (year, filter) for the run.
+    """
+    if args.forms == "all" and not args.ein:
+        return None
+    key = (year, args.forms, tuple(sorted(args.ein or ())))
+    if key in _index_filter_cache:
+        return _index_filter_cache[key]
+
+    form_filter = FORM_FILTER_MAP[args.forms]
+    ein_filter  = set(args.ein) if args.ein else None
+    url = IRS_INDEX_URL.format(year=year)
+    known: set = set()
+    wanted: set = set()
+    result = None
+    try:
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            header = None
+            async for raw in resp.content:
+                row = next(csv.reader([raw.decode("utf-8", errors="replace")]), None)
+                if not row:
+                    continue
+                if header is None:
+                    header = {name.strip().upper(): i for i, name in enumerate(row)}
+                    i_ein, i_type, i_oid = header["EIN"], header["RETURN_TYPE"], header["OBJECT_ID"]
+                    continue
+                try:
+                    oid = int(row[i_oid])
+                except (IndexError, ValueError):
+                    continue
+                known.add(oid)
+                form_type = INDEX_RETURN_TYPES.get(row[i_type].strip().upper())
+                ein = row[i_ein].strip().zfill(9)
+                if form_type in form_filter and (ein_filter is None or ein in ein_filter):
+                    wanted.add(oid)
+        result = (known, wanted)
+        logger.info(f"IRS index {year}: {len(wanted):,} of {len(known):,} filings match --forms/--ein")
+    except Exception as e:
+        logger.warning(f"IRS index {year} unavailable ({e}) — filtering after download instead")
+
+    _index_filter_cache[key] = result
+    return result
+
+
+async def _process_stream(
+    session: aiohttp.ClientSession,
+    url: str,
+    zip_filename: str,
+    year: int,
+    args,
+    sink: _BatchSink,
+    deadline: float = None,
+    global_remaining: int = None,
+) -> None:
+    """
+    --stream: read the central directory with range requests, drop entries
+    that are already checkpointed or excluded by the IRS index, then stream
+    and parse the rest. Nothing is written to temp disk.
+    """
+    stats = sink.stats
+    streamer = ZipStreamer(url, session, concurrency=args.stream_concurrency)
+    entries = await streamer.get_entries()
+    total_in_zip = len(entries)
+
+    start_index = _resume_index(
+        sink.writer, args, sink, zip_filename, total_in_zip,
+        await streamer.central_directory_digest(),
+    )
+
+    index_filter = await _load_index_filter(session, year, args)
+    indices = []
+    for entry in entries[start_index:]:
+        if index_filter is not None:
+            known, wanted = index_filter
+            oid = _object_id(entry["name"])
+            if oid in known and oid not in wanted:
+                continue
+        indices.append(entry["index"])
+    skipped = total_in_zip - start_index - len(indices)
+    logger.info(
+        f"Streaming {len(indices):,} of {total_in_zip:,} XML entries from {zip_filename}"
+        + (f" ({skipped:,} excluded by IRS index)" if skipped else "")
+    )
+
+    # Per-ZIP and global (across ZIPs) file caps
+    limit = len(indices)
+    if args.max_files:
+        limit = min(limit, args.max_files)
+    if global_remaining is not None:
+        limit = min(limit, max(global_remaining, 0))
+    end_index = total_in_zip - 1
+    if limit < len(indices):
+        stats["stopped_early"] = True
+        indices = indices[:limit]
+
+    await _parse_stream(
+        streamer, indices, sink, args, deadline,
+        first_index=start_index, end_index=end_index,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Core processing
 # ---------------------------------------------------------------------------
@@ -153,25 +804,20 @@ async def process_zip(
     """
     Download, extract, and process one monthly ZIP. Returns stats dict.
     The ZIP file is deleted from disk after processing.
+
+    With args.workers > 1 the read+parse stage runs in a process pool;
+    batching and DB writes stay on this thread (see _BatchSink). With
+    args.stream the ZIP is never written to disk: entries are range-fetched
+    and parsed as they arrive (see _process_stream).
     """
     logger.info(f"Starting {zip_filename}")
     start = time.time()
 
-    form_filter = FORM_FILTER_MAP[args.forms]
-    ein_filter  = set(args.ein) if args.ein else None
-
-    # Per-batch accumulators
-    board_batch   = []
-    grant_batch   = []
-    fi_batch      = []
-    fn_batch      = []
-    ei_batch      = []
-    website_batch = []
-    fin_batch     = []
-
     stats = {"processed": 0, "success": 0, "errors": 0, "skipped_form": 0,
              "officers": 0, "grants": 0, "fi_rows": 0, "websites": 0,
              "financials": 0, "stopped_early": False}
+    sink = _BatchSink(writer, args, zip_filename, stats)
+    workers = getattr(args, "workers", 1) or 1
 
     temp_dir = Path(args.temp_dir) if args.temp_dir else Path(tempfile.gettempdir()) / "irs_bulk_loader"
     temp_dir.mkdir(parents=True, exist_ok=True)
@@ -199,147 +845,51 @@ async def process_zip(
                 logger.warning(f"ZIP HEAD failed {zip_filename}: {e} — skipping")
                 return stats
 
-            zip_path = await _download_zip(url, zip_filename, session, temp_dir)
+            if args.stream:
+                await _process_stream(
+                    session, url, zip_filename, year, args, sink,
+                    deadline=deadline, global_remaining=global_remaining,
+                )
+            else:
+                zip_path = await _download_zip(url, zip_filename, session, temp_dir)
 
         # ------------------------------------------------------------------
-        # 2. Process extracted XML entries (synchronous, local I/O)
+        # 2. Process extracted XML entries
         # ------------------------------------------------------------------
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            xml_entries = [e for e in zf.infolist() if e.filename.lower().endswith(".xml")]
-            total_in_zip = len(xml_entries)
-            logger.info(f"Extracted {total_in_zip:,} XML entries from {zip_filename}")
-
-            for entry in xml_entries:
-                filename = entry.filename
-                stats["processed"] += 1
-
-                # Per-ZIP file cap
-                if args.max_files and stats["processed"] > args.max_files:
-                    stats["stopped_early"] = True
-                    break
-
-                # Global file cap (across ZIPs)
-                if global_remaining is not None and stats["processed"] > global_remaining:
+        if zip_path is not None:
+            with zipfile.ZipFile(zip_path, "r") as zf:
+                xml_entries = [e for e in zf.infolist() if e.filename.lower().endswith(".xml")]
+                total_in_zip = len(xml_entries)
+                logger.info(f"Extracted {total_in_zip:,} XML entries from {zip_filename}")
+
+                # Entry-level resume
+                start_index = _resume_index(
+                    writer, args, sink, zip_filename, total_in_zip,
+                    central_directory_digest(
+                        (e.filename, e.compress_size, e.file_size) for e in xml_entries
+                    ),
+                )
+                xml_entries = xml_entries[start_index:]
+
+                # Per-ZIP and global (across ZIPs) file caps
+                remaining = len(xml_entries)
+                limit = remaining
+                if args.max_files:
+                    limit = min(limit, args.max_files)
+                if global_remaining is not None:
+                    limit = min(limit, max(global_remaining, 0))
+                if limit < remaining:
                     stats["stopped_early"] = True
-                    break
-
-                # Time limit
-                if deadline and time.time() >= deadline:
-                    stats["stopped_early"] = True
-                    break
-
-                try:
-                    xml_bytes = zf.read(entry)
-                    parsed = parse_xml_bytes(xml_bytes)
-                    if parsed is None:
-                        stats["errors"] += 1
-                        continue
-
-                    # Form type filter
-                    if parsed["form_type"] not in form_filter:
-                        stats["skipped_form"] += 1
-                        continue
+                xml_entries = xml_entries[:limit]
 
-                    # EIN filter
-                    if ein_filter and parsed.get("ein") not in ein_filter:
-                        continue
-
-                    ein       = parsed["ein"] or ""
-                    tax_year  = parsed["tax_year"]
-                    form_type = parsed["form_type"]
-
-                    if not ein:
-                        stats["errors"] += 1
-                        continue
-
-                    stats["success"] += 1
-
-                    if not args.dry_run:
-                        # Board network (all form types)
-                        for o in parsed["officers"]:
-                            board_batch.append({
-                                **o,
-                                "ein":             ein,
-                                "source_tax_year": tax_year,
-                            })
-                            stats["officers"] += 1
-
-                        # Grants (990 and 990-PF)
-                        if form_type in ("990", "990-PF"):
-                            for g in parsed["grants"]:
-                                grant_batch.append({
-                                    **g,
-                                    "grantor_ein":     ein,
-                                    "tax_year":        tax_year,
-                                    "form_type":       form_type,
-                                    "source_zip_file": zip_filename,
-                                })
-                            stats["grants"] += len(parsed["grants"])
-
-                        # Foundation intelligence + narratives (990-PF only)
-                        if form_type == "990-PF":
-                            parsed["grant_count"] = len(parsed["grants"])
-                            fi_batch.append(parsed)
-                            fn_batch.append(parsed)
-                            stats["fi_rows"] += 1
-
-                        # Mission statement for 990/990-EZ filers (INSERT OR IGNORE)
-                        if form_type in ("990", "990-EZ") and parsed["narrative"].get("mission_statement"):
-                            fn_batch.append(parsed)
-
-                        # ein_intelligence officer merge (all types)
-                        if parsed["officers"]:
-                            ei_batch.append(parsed)
-
-                        # Website URL (all form types)
-                        if parsed.get("website_url"):
-                            website_batch.append({
-                                "ein":         ein,
-                                "website_url": parsed["website_url"],
-                                "tax_year":    tax_year,
-                            })
-                            stats["websites"] += 1
-
-                        # Financials (all form types with any financial data)
-                        if parsed.get("financials", {}).get("total_revenue") is not None:
-                            parsed["source_zip_file"] = zip_filename
-                            fin_batch.append(parsed)
-                            stats["financials"] += 1
-
-                        # Flush at batch-size threshold
-                        if len(board_batch) >= args.batch_size:
-                            writer.flush_board_network(board_batch);   board_batch = []
-                        if len(grant_batch) >= args.batch_size:
-                            writer.flush_grants(grant_batch);           grant_batch = []
-                        if len(fi_batch) >= args.batch_size:
-                            writer.flush_foundation_intelligence(fi_batch); fi_batch = []
-                        if len(fn_batch) >= args.batch_size:
-                            writer.flush_foundation_narratives(fn_batch);   fn_batch = []
-                        if len(ei_batch) >= args.batch_size:
-                            writer.flush_ein_intelligence(ei_batch);    ei_batch = []
-                        if len(website_batch) >= args.batch_size:
-                            writer.flush_organization_websites(website_batch); website_batch = []
-                        if len(fin_batch) >= args.batch_size:
-                            writer.flush_financials(fin_batch);         fin_batch = []
-
-                except Exception as e:
-                    stats["errors"] += 1
-                    logger.debug(f"Error processing {filename}: {e}")
-
-                # Progress logging
-                if stats["processed"] % args.log_interval == 0:
-                    elapsed = time.time() - start
-                    rate = stats["processed"] / elapsed if elapsed > 0 else 0
-                    cap = min(args.max_files, total_in_zip) if args.max_files else total_in_zip
-                    pct = (stats["processed"] / cap * 100) if cap else 0
-                    eta_s = ((cap - stats["processed"]) / rate) if rate > 0 and cap > stats["processed"] else 0
-                    eta_str = f"{eta_s/60:.0f}m" if eta_s > 0 else "—"
-                    logger.info(
-                        f"[{zip_filename}] {stats['processed']:,}/{cap:,} ({pct:.1f}%) | "
-                        f"ok={stats['success']:,} err={stats['errors']} | "
-                        f"officers={stats['officers']:,} grants={stats['grants']:,} | "
-                        f"{rate:.0f} files/s  ETA {eta_str}"
+                if workers > 1:
+                    logger.info(f"Parsing with {workers} worker processes (chunk size {args.chunk_size})")
+                    await _parse_entries_parallel(
+                        zip_path, xml_entries, sink, workers, args.chunk_size, deadline,
+                        first_index=start_index,
                     )
+                else:
+                    _parse_entries_serial(zf, xml_entries, sink, deadline, first_index=start_index)
 
     finally:
         # ------------------------------------------------------------------
@@ -352,15 +902,10 @@ async def process_zip(
             except Exception as e:
                 logger.warning(f"Could not delete {zip_path}: {e}")
 
-    # Flush remaining batches
+    # Flush remaining batches (and checkpoint where this run stopped)
     if not args.dry_run:
-        if board_batch:   writer.flush_board_network(board_batch)
-        if grant_batch:   writer.flush_grants(grant_batch)
-        if fi_batch:      writer.flush_foundation_intelligence(fi_batch)
-        if fn_batch:      writer.flush_foundation_narratives(fn_batch)
-        if ei_batch:      writer.flush_ein_intelligence(ei_batch)
-        if website_batch: writer.flush_organization_websites(website_batch)
-        if fin_batch:     writer.flush_financials(fin_batch)
+        sink.flush(force=True)
+        sink.checkpoint(complete=not stats["stopped_early"])
 
     elapsed = time.time() - start
     logger.info(
@@ -369,10 +914,12 @@ async def process_zip(
         f"errors={stats['errors']} | "
         f"officers={stats['officers']:,} grants={stats['grants']:,} "
         f"websites={stats['websites']:,} financials={stats['financials']:,} fi={stats['fi_rows']:,} | "
-        f"{elapsed/60:.1f} min"
+        f"{elapsed/60:.1f} min | {sink.stage_rates()}"
     )
 
-    if not args.dry_run:
+    # A ZIP stopped early is not complete — its checkpoint carries the
+    # progress and the next --resume run picks up from there
+    if not args.dry_run and not stats["stopped_early"]:
         writer.log_import(
             zip_filename=zip_filename,
             file_type=args.forms,
@@ -436,7 +983,8 @@ def parse_args():
     )
     p.add_argument(
         "--resume", action="store_true", default=True,
-        help="Skip ZIPs already recorded in data_import_log (default: on)",
+        help="Skip ZIPs already recorded in data_import_log and restart partial ZIPs "
+             "at their irs_990_import_log checkpoint (default: on)",
     )
     p.add_argument(
         "--no-resume", action="store_false", dest="resume",
@@ -472,6 +1020,38 @@ def parse_args():
         metavar="MINUTES",
         help="Stop gracefully after N minutes (completes current ZIP before exiting)",
     )
+    p.add_argument(
+        "--stream", action="store_true",
+        help="Range-fetch entries from the IRS server instead of downloading the whole ZIP to temp disk",
+    )
+    p.add_argument(
+        "--stream-concurrency", type=int, default=4,
+        dest="stream_concurrency",
+        metavar="N",
+        help="Range requests in flight with --stream (default: 4)",
+    )
+    p.add_argument(
+        "--stream-block-mb", type=int, default=8,
+        dest="stream_block_mb",
+        metavar="MB",
+        help="Max size of one coalesced range request with --stream (default: 8)",
+    )
+    p.add_argument(
+        "--checkpoint-every", type=int, default=5000,
+        dest="checkpoint_every",
+        metavar="N",
+        help="Flush all batches and checkpoint progress every N XML entries (default: 5000, 0 = only at end)",
+    )
+    p.add_argument(
+        "--workers", type=int, default=1,
+        metavar="N",
+        help="Parse XML in N worker processes; DB writes stay single-threaded (default: 1 = serial)",
+    )
+    p.add_argument(
+        "--chunk-size", type=int, default=64,
+        dest="chunk_size",
+        help="XML entries per worker task when --workers > 1 (default: 64)",
+    )
     return p.parse_args()
 
 
@@ -485,6 +1065,8 @@ async def main():
     logger.info(f"Months:      {args.months}")
     logger.info(f"Forms:       {args.forms}")
     logger.info(f"Batch size:  {args.batch_size}")
+    logger.info(f"Workers:     {args.workers}")
+    logger.info(f"Mode:        {'stream (range requests)' if args.stream else 'download ZIP'}")
     logger.info(f"Dry run:     {args.dry_run}")
     logger.info(f"Resume:      {args.resume}")
     temp_display = args.temp_dir or f"{tempfile.gettempdir()}/irs_bulk_loader"
@@ -4,7 +4,7 @@ BulkLoaderDBWriter — all database writes for the IRS 990 offline bulk loader.
 Writes to two databases:
   - nonprofit_intelligence.db: board_network_index, foundation_grants,
                                foundation_intelligence_index, foundation_narratives,
-                               data_import_log
+                               data_import_log, irs_990_import_log (entry checkpoints)
   - catalynx.db:               ein_intelligence.pdf_analyses (officer data for Stage 3 ETL)
 
 All flushes use executemany() with a single transaction per batch.
@@ -169,6 +169,68 @@ class BulkLoaderDBWriter:
         except Exception:
             return False
 
+    def get_checkpoint(self, zip_filename: str) -> Optional[dict]:
+        """Return the irs_990_import_log row for this ZIP, or None."""
+        try:
+            row = self._intel().execute(
+                """
+                SELECT zip_filename, cd_digest, file_type, total_entries,
+                       last_entry_index, status, loader_version, updated_at
+                FROM irs_990_import_log
+                WHERE zip_filename = ?
+                """,
+                (zip_filename,),
+            ).fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error:
+            return None
+
+    def save_checkpoint(
+        self,
+        zip_filename: str,
+        cd_digest: str,
+        file_type: str,
+        total_entries: int,
+        last_entry_index: int,
+        complete: bool = False,
+    ) -> None:
+        """
+        Record that entries 0..last_entry_index of this ZIP are committed.
+        Call only right after every pending batch has been flushed.
+        """
+        try:
+            conn = self._intel()
+            conn.execute(
+                """
+                INSERT INTO irs_990_import_log
+                    (zip_filename, cd_digest, file_type, total_entries,
+                     last_entry_index, status, loader_version, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(zip_filename) DO UPDATE SET
+                    cd_digest        = excluded.cd_digest,
+                    file_type        = excluded.file_type,
+                    total_entries    = excluded.total_entries,
+                    last_entry_index = excluded.last_entry_index,
+                    status           = excluded.status,
+                    loader_version   = excluded.loader_version,
+                    updated_at       = excluded.updated_at
+                """,
+                (
+                    zip_filename,
+                    cd_digest,
+                    file_type,
+                    total_entries,
+                    last_entry_index,
+                    "complete" if complete else "in_progress",
+                    _LOADER_VERSION,
+                    _now(),
+                ),
+            )
+            conn.commit()
+            logger.debug(f"irs_990_import_log: {zip_filename} committed through entry {last_entry_index}")
+        except sqlite3.Error as e:
+            logger.warning(f"irs_990_import_log write failed: {e}")
+
     # ------------------------------------------------------------------
     # board_network_index
     # ------------------------------------------------------------------
@@ -495,12 +557,18 @@ class BulkLoaderDBWriter:
             ]
           }
         }
+
+        Set-based: the batch is reduced to one entry per (ein, year) in
+        memory (last filing wins), then written with a single executemany
+        UPSERT in one transaction. Existing rows are merged in place by
+        SQLite's json_set(), so stored pdf_analyses blobs never round-trip
+        through Python and other years / other EINs' data are untouched.
+        A missing or malformed pdf_analyses value is treated as {}.
         """
         if not batch:
             return 0
 
-        conn = self._cat()
-        updated = 0
+        merged: dict = {}
         for r in batch:
             ein = r.get("ein")
             if not ein or not r.get("officers"):
@@ -508,8 +576,7 @@ class BulkLoaderDBWriter:
             year = str(r.get("tax_year", ""))
             if not year:
                 continue
-
-            officers_list = [
+            merged[(ein, year)] = [
                 {
                     "name":        o["raw_name"],
                     "title":       o.get("title") or "",
@@ -519,45 +586,47 @@ class BulkLoaderDBWriter:
                 }
                 for o in r["officers"]
             ]
+        if not merged:
+            return 0
 
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    row = conn.execute(
-                        "SELECT pdf_analyses FROM ein_intelligence WHERE ein = ?", (ein,)
-                    ).fetchone()
-
-                    if row:
-                        existing = {}
-                        try:
-                            existing = json.loads(row["pdf_analyses"] or "{}")
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                        existing[year] = {"officers_and_directors": officers_list}
-                        conn.execute(
-                            "UPDATE ein_intelligence SET pdf_analyses = ?, updated_at = ? WHERE ein = ?",
-                            (json.dumps(existing), _now(), ein),
-                        )
-                    else:
-                        pdf_analyses = json.dumps({year: {"officers_and_directors": officers_list}})
-                        conn.execute(
-                            """
-                            INSERT OR IGNORE INTO ein_intelligence
-                                (ein, pdf_analyses, created_at, updated_at)
-                            VALUES (?, ?, ?, ?)
-                            """,
-                            (ein, pdf_analyses, _now(), _now()),
-                        )
-                    conn.commit()
-                    updated += 1
-                    break
-                except sqlite3.OperationalError as e:
-                    if "locked" in str(e).lower() and attempt < max_retries - 1:
-                        time.sleep(2 ** attempt)
-                    else:
-                        logger.debug(f"ein_intelligence write failed EIN {ein}: {e}")
-                        break
+        now = _now()
+        rows = []
+        for (ein, year), officers_list in merged.items():
+            year_json = json.dumps({"officers_and_directors": officers_list})
+            rows.append((ein, year, year_json, now, now, f'$."{year}"', year_json, now))
 
+        conn = self._cat()
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                with conn:
+                    conn.executemany(
+                        """
+                        INSERT INTO ein_intelligence (ein, pdf_analyses, created_at, updated_at)
+                        VALUES (?, json_object(?, json(?)), ?, ?)
+                        ON CONFLICT(ein) DO UPDATE SET
+                            pdf_analyses = json_set(
+                                CASE WHEN json_valid(pdf_analyses)
+                                     THEN CASE WHEN json_type(pdf_analyses) = 'object'
+                                               THEN pdf_analyses ELSE '{}' END
+                                     ELSE '{}' END,
+                                ?, json(?)
+                            ),
+                            updated_at = ?
+                        """,
+                        rows,
+                    )
+                break
+            except sqlite3.OperationalError as e:
+                # connect(timeout=30) already waits out short locks; retry the
+                # whole batch a couple of times before giving up on it
+                if "locked" in str(e).lower() and attempt < max_retries - 1:
+                    time.sleep(2 ** attempt)
+                else:
+                    logger.warning(f"ein_intelligence batch write failed ({len(rows)} rows): {e}")
+                    return 0
+
+        updated = len({ein for ein, _ in merged})
         logger.debug(f"ein_intelligence: {updated} EINs updated in catalynx.db")
         return updated
 
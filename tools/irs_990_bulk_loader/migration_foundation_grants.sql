@@ -110,3 +110,23 @@ CREATE TABLE IF NOT EXISTS form990_financials (
 
 CREATE INDEX IF NOT EXISTS idx_f990fin_ein  ON form990_financials(ein, tax_year DESC);
 CREATE INDEX IF NOT EXISTS idx_f990fin_year ON form990_financials(tax_year DESC);
+
+-- =====================================================================================
+-- IRS 990 IMPORT LOG (entry-level checkpoints)
+-- One row per monthly ZIP. Written by the bulk loader right after a full batch flush,
+-- so every entry up to last_entry_index is committed in both databases.
+-- --resume restarts at last_entry_index + 1 when cd_digest (hash of the ZIP central
+-- directory) and file_type still match; a republished ZIP starts over from entry 0.
+-- Whole-ZIP completion is still recorded in data_import_log.
+-- =====================================================================================
+
+CREATE TABLE IF NOT EXISTS irs_990_import_log (
+    zip_filename      TEXT PRIMARY KEY,     -- e.g. '2025_TEOS_XML_01A.zip'
+    cd_digest         TEXT NOT NULL,        -- sha256 of XML entry names + sizes, CD order
+    file_type         TEXT NOT NULL,        -- --forms value the checkpoint was taken under
+    total_entries     INTEGER NOT NULL,
+    last_entry_index  INTEGER NOT NULL DEFAULT -1,   -- 0-based, -1 = nothing committed
+    status            TEXT NOT NULL DEFAULT 'in_progress',   -- 'in_progress' | 'complete'
+    loader_version    TEXT,
+    updated_at        TEXT DEFAULT (datetime('now'))
+);
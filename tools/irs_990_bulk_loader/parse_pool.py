@@ -0,0 +1,85 @@
+"""
+Process-pool parse stage for the IRS 990 bulk loader.
+
+Worker functions live in their own lightweight module (no aiohttp, no DB
+imports) so that spawn-based platforms (Windows) can re-import them cheaply
+in every child process.
+
+Disk mode: each worker opens the downloaded ZIP once in its initializer and
+then reads and parses chunks of entries by name. Only the entry names travel
+to the worker and only the parsed dicts travel back — the raw XML bytes
+never cross the process boundary.
+
+Stream mode (--stream): the bytes arrive over HTTP in the parent, so chunks
+of (filename, xml_bytes) are shipped to parse_xml_chunk() instead.
+"""
+
+import time
+import zipfile
+from typing import Optional
+
+from tools.irs_990_bulk_loader.xml_dispatcher import parse_xml_bytes
+
+# Per-process ZIP handle, opened by init_parse_worker()
+_WORKER_ZF: Optional[zipfile.ZipFile] = None
+
+
+def init_parse_worker(zip_path: str) -> None:
+    """ProcessPoolExecutor initializer — open the ZIP once per worker."""
+    global _WORKER_ZF
+    _WORKER_ZF = zipfile.ZipFile(zip_path, "r")
+
+
+def parse_zip_chunk(names: list) -> dict:
+    """
+    Read and parse a chunk of ZIP entries inside a worker process.
+
+    Returns:
+        {
+          "results":  [(filename, parsed_dict | None), ...],
+          "read_s":   float,   # seconds spent in zf.read()
+          "parse_s":  float,   # seconds spent in parse_xml_bytes()
+        }
+
+    A per-entry failure yields (filename, None) so one bad file never
+    loses the rest of the chunk.
+    """
+    results = []
+    read_s = 0.0
+    parse_s = 0.0
+    for name in names:
+        t0 = time.perf_counter()
+        try:
+            xml_bytes = _WORKER_ZF.read(name)
+        except Exception:
+            read_s += time.perf_counter() - t0
+            results.append((name, None))
+            continue
+        t1 = time.perf_counter()
+        try:
+            parsed = parse_xml_bytes(xml_bytes)
+        except Exception:
+            parsed = None
+        t2 = time.perf_counter()
+        read_s  += t1 - t0
+        parse_s += t2 - t1
+        results.append((name, parsed))
+    return {"results": results, "read_s": read_s, "parse_s": parse_s}
+
+
+def parse_xml_chunk(items: list) -> dict:
+    """
+    Parse a chunk of already-downloaded (filename, xml_bytes) pairs.
+    Same return shape as parse_zip_chunk(), with read_s always 0.
+    """
+    results = []
+    parse_s = 0.0
+    for name, xml_bytes in items:
+        t0 = time.perf_counter()
+        try:
+            parsed = parse_xml_bytes(xml_bytes)
+        except Exception:
+            parsed = None
+        parse_s += time.perf_counter() - t0
+        results.append((name, parsed))
+    return {"results": results, "read_s": 0.0, "parse_s": parse_s}
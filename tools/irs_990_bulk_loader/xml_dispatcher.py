@@ -9,6 +9,7 @@ Returns a normalized dict ready for db_writer.py.
 
 import logging
 import xml.etree.ElementTree as ET
+from bisect import bisect_left, bisect_right
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -58,16 +59,15 @@ def parse_xml_bytes(xml_bytes: bytes) -> Optional[dict]:
         logger.debug(f"XML parse error: {e}")
         return None
 
-    # Build namespace prefix used throughout this document
-    ns = root.tag.split("}")[0].lstrip("{") if "}" in root.tag else ""
-    pfx = f"{{{ns}}}" if ns else ""
+    # One walk over the tree; every extractor below is an index lookup
+    idx = _TagIndex(root)
 
-    form_type = _detect_form_type(root, pfx)
+    form_type = _detect_form_type(root, idx)
     if not form_type:
         return None
 
-    ein      = _extract_ein(root, pfx)
-    tax_year = _extract_tax_year(root, pfx)
+    ein      = _extract_ein(root, idx)
+    tax_year = _extract_tax_year(root, idx)
 
     result: dict = {
         "ein":        ein,
@@ -82,11 +82,11 @@ def parse_xml_bytes(xml_bytes: bytes) -> Optional[dict]:
     }
 
     if form_type == "990":
-        _parse_990(root, pfx, result)
+        _parse_990(root, idx, result)
     elif form_type == "990-PF":
-        _parse_990pf(root, pfx, result)
+        _parse_990pf(root, idx, result)
     elif form_type == "990-EZ":
-        _parse_990ez(root, pfx, result)
+        _parse_990ez(root, idx, result)
 
     return result
 
@@ -95,7 +95,7 @@ def parse_xml_bytes(xml_bytes: bytes) -> Optional[dict]:
 # Form type detection
 # ---------------------------------------------------------------------------
 
-def _detect_form_type(root: ET.Element, pfx: str) -> Optional[str]:
+def _detect_form_type(root: ET.Element, idx: "_TagIndex") -> Optional[str]:
     """Return '990', '990-PF', '990-EZ', or None."""
     # Check for dedicated form elements (most reliable)
     for tag, form in (
@@ -103,30 +103,17 @@ def _detect_form_type(root: ET.Element, pfx: str) -> Optional[str]:
         ("IRS990EZ", "990-EZ"),
         ("IRS990",   "990"),
     ):
-        if root.find(f".//{pfx}{tag}") is not None:
-            return form
-        if root.find(f".//{tag}") is not None:
+        if idx.find(root, tag, include_self=True) is not None:
             return form
 
     # Fallback: ReturnTypeCd in header
-    for path in (f".//{pfx}ReturnTypeCd", ".//ReturnTypeCd"):
-        val = (root.findtext(path) or "").strip().upper()
-        if val == "990PF":
-            return "990-PF"
-        if val == "990EZ":
-            return "990-EZ"
-        if val == "990":
-            return "990"
-
-    # Last resort: scan all element tags
-    for elem in root.iter():
-        tag = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-        if tag == "IRS990PF":
-            return "990-PF"
-        if tag == "IRS990EZ":
-            return "990-EZ"
-        if tag == "IRS990":
-            return "990"
+    val = _txt(root, idx, "ReturnTypeCd").upper()
+    if val == "990PF":
+        return "990-PF"
+    if val == "990EZ":
+        return "990-EZ"
+    if val == "990":
+        return "990"
 
     return None
 
@@ -135,43 +122,36 @@ def _detect_form_type(root: ET.Element, pfx: str) -> Optional[str]:
 # Shared header extraction
 # ---------------------------------------------------------------------------
 
-def _extract_ein(root: ET.Element, pfx: str) -> str:
-    for path in (f".//{pfx}EIN", ".//EIN"):
-        val = (root.findtext(path) or "").strip().replace("-", "")
-        if val:
-            return val
-    return ""
+def _extract_ein(root: ET.Element, idx: "_TagIndex") -> str:
+    return _txt(root, idx, "EIN").replace("-", "")
 
 
-def _extract_tax_year(root: ET.Element, pfx: str) -> int:
+def _extract_tax_year(root: ET.Element, idx: "_TagIndex") -> int:
     # Try TaxPeriodEndDt / TaxPeriodEndDate first (YYYY-MM-DD → take year)
     for tag in ("TaxPeriodEndDt", "TaxPeriodEndDate"):
-        for path in (f".//{pfx}{tag}", f".//{tag}"):
-            val = (root.findtext(path) or "").strip()
-            if val and len(val) >= 4:
-                try:
-                    return int(val[:4])
-                except ValueError:
-                    pass
-
-    # TaxYear element
-    for path in (f".//{pfx}TaxYear", ".//TaxYear"):
-        val = (root.findtext(path) or "").strip()
-        if val:
+        val = _txt(root, idx, tag)
+        if val and len(val) >= 4:
             try:
-                return int(val)
+                return int(val[:4])
             except ValueError:
                 pass
 
+    # TaxYear element
+    val = _txt(root, idx, "TaxYear")
+    if val:
+        try:
+            return int(val)
+        except ValueError:
+            pass
+
     # TaxPeriodBeginDate — take year (covers edge cases)
     for tag in ("TaxPeriodBeginDt", "TaxPeriodBeginDate"):
-        for path in (f".//{pfx}{tag}", f".//{tag}"):
-            val = (root.findtext(path) or "").strip()
-            if val and len(val) >= 4:
-                try:
-                    return int(val[:4])
-                except ValueError:
-                    pass
+        val = _txt(root, idx, tag)
+        if val and len(val) >= 4:
+            try:
+                return int(val[:4])
+            except ValueError:
+                pass
 
     return 0
 
@@ -180,76 +160,76 @@ def _extract_tax_year(root: ET.Element, pfx: str) -> int:
 # Form 990 (regular nonprofits)
 # ---------------------------------------------------------------------------
 
-def _parse_990(root: ET.Element, pfx: str, result: dict) -> None:
+def _parse_990(root: ET.Element, idx: "_TagIndex", result: dict) -> None:
     # Officers — Part VII Section A
-    for grp in _iter(root, pfx, "Form990PartVIISectionAGrp"):
-        name = _txt(grp, pfx, "PersonNm")
+    for grp in _iter(root, idx, "Form990PartVIISectionAGrp"):
+        name = _txt(grp, idx, "PersonNm")
         if not name:
             continue
         result["officers"].append({
             "normalized_name": _normalize(name),
             "raw_name":        name.strip(),
-            "title":           _txt(grp, pfx, "TitleTxt") or None,
-            "compensation":    _flt(grp, pfx, "ReportableCompFromOrgAmt"),
+            "title":           _txt(grp, idx, "TitleTxt") or None,
+            "compensation":    _flt(grp, idx, "ReportableCompFromOrgAmt"),
         })
 
     # Grants — Schedule I: RecipientTable rows
-    for grp in _iter(root, pfx, "RecipientTable"):
-        name = _txt(grp, pfx, "BusinessNameLine1Txt", "RecipientPersonNm")
+    for grp in _iter(root, idx, "RecipientTable"):
+        name = _txt(grp, idx, "BusinessNameLine1Txt", "RecipientPersonNm")
         if not name:
             continue
-        addr = grp.find(f".//{pfx}RecipientUSAddress") or grp.find(".//RecipientUSAddress")
+        addr = idx.find(grp, "RecipientUSAddress")
         city, state = None, None
         if addr is not None:
-            city  = _txt(addr, pfx, "CityNm")
-            state = _txt(addr, pfx, "StateAbbreviationCd")
+            city  = _txt(addr, idx, "CityNm")
+            state = _txt(addr, idx, "StateAbbreviationCd")
         result["grants"].append({
             "recipient_name":  name.strip(),
-            "recipient_ein":   _clean_ein(_txt(grp, pfx, "RecipientEIN")),
+            "recipient_ein":   _clean_ein(_txt(grp, idx, "RecipientEIN")),
             "recipient_city":  city,
             "recipient_state": state,
-            "grant_amount":    _flt(grp, pfx, "CashGrantAmt") or 0.0,
-            "grant_purpose":   _txt(grp, pfx, "PurposeOfGrantTxt") or None,
-            "assistance_type": _txt(grp, pfx, "AssistanceTypeCd") or None,
+            "grant_amount":    _flt(grp, idx, "CashGrantAmt") or 0.0,
+            "grant_purpose":   _txt(grp, idx, "PurposeOfGrantTxt") or None,
+            "assistance_type": _txt(grp, idx, "AssistanceTypeCd") or None,
         })
 
     # Also catch older GrantOrContribution format
-    for grp in _iter(root, pfx, "GrantOrContribution"):
-        name = _txt(grp, pfx, "BusinessNameLine1Txt", "RecipientPersonNm")
+    for grp in _iter(root, idx, "GrantOrContribution"):
+        name = _txt(grp, idx, "BusinessNameLine1Txt", "RecipientPersonNm")
         if not name:
             continue
         result["grants"].append({
             "recipient_name":  name.strip(),
-            "recipient_ein":   _clean_ein(_txt(grp, pfx, "RecipientEIN")),
+            "recipient_ein":   _clean_ein(_txt(grp, idx, "RecipientEIN")),
             "recipient_city":  None,
             "recipient_state": None,
-            "grant_amount":    _flt(grp, pfx, "Amount", "CashGrant") or 0.0,
-            "grant_purpose":   _txt(grp, pfx, "PurposeOfGrantTxt", "PurposeTxt") or None,
+            "grant_amount":    _flt(grp, idx, "Amount", "CashGrant") or 0.0,
+            "grant_purpose":   _txt(grp, idx, "PurposeOfGrantTxt", "PurposeTxt") or None,
             "assistance_type": None,
         })
 
     # Financials — from IRS990 element
-    irs990 = root.find(f".//{pfx}IRS990") or root.find(".//IRS990")
+    irs990 = idx.find(root, "IRS990", include_self=True)
     if irs990 is not None:
-        result["financials"]["total_revenue"]           = _flt(irs990, pfx, "CYTotalRevenueAmt")
-        result["financials"]["total_assets"]            = _flt(irs990, pfx, "TotalAssetsEOYAmt")
-        result["financials"]["total_expenses"]          = _flt(irs990, pfx, "CYTotalFunctionalExpensesAmt")
-        result["financials"]["program_expenses"]        = _flt(irs990, pfx, "CYProgramServiceExpensesAmt")
-        result["financials"]["admin_expenses"]          = _flt(irs990, pfx, "CYManagementAndGeneralExpensesAmt")
-        result["financials"]["fundraising_expenses"]    = _flt(irs990, pfx, "CYFundraisingExpensesAmt")
-        result["financials"]["total_liabilities"]       = _flt(irs990, pfx, "TotalLiabilitiesEOYAmt")
-        result["financials"]["net_assets"]              = _flt(irs990, pfx, "TotalNetAssetsOrFundBalancesEOYAmt")
-        result["financials"]["contributions_grants"]    = _flt(irs990, pfx, "CYContributionsGrantsAmt")
-        result["financials"]["program_service_revenue"] = _flt(irs990, pfx, "CYProgramServiceRevenueAmt")
-        result["financials"]["investment_income"]       = _flt(irs990, pfx, "CYInvestmentIncomeAmt")
-        result["financials"]["other_revenue"]           = _flt(irs990, pfx, "CYOtherRevenueAmt")
-        result["financials"]["employee_count"]          = _int(irs990, pfx, "TotalEmployeeCnt")
+        result["financials"]["total_revenue"]           = _flt(irs990, idx, "CYTotalRevenueAmt")
+        result["financials"]["total_assets"]            = _flt(irs990, idx, "TotalAssetsEOYAmt")
+        result["financials"]["total_expenses"]          = _flt(irs990, idx, "CYTotalFunctionalExpensesAmt")
+        result["financials"]["program_expenses"]        = _flt(irs990, idx, "CYProgramServiceExpensesAmt")
+        result["financials"]["admin_expenses"]          = _flt(irs990, idx, "CYManagementAndGeneralExpensesAmt")
+        result["financials"]["fundraising_expenses"]    = _flt(irs990, idx, "CYFundraisingExpensesAmt")
+        result["financials"]["total_liabilities"]       = _flt(irs990, idx, "TotalLiabilitiesEOYAmt")
+        result["financials"]["net_assets"]              = _flt(irs990, idx, "TotalNetAssetsOrFundBalancesEOYAmt")
+        result["financials"]["contributions_grants"]    = _flt(irs990, idx, "CYContributionsGrantsAmt")
+        result["financials"]["program_service_revenue"] = _flt(irs990, idx, "CYProgramServiceRevenueAmt")
+        result["financials"]["investment_income"]       = _flt(irs990, idx, "CYInvestmentIncomeAmt")
+        result["financials"]["other_revenue"]           = _flt(irs990, idx, "CYOtherRevenueAmt")
+        result["financials"]["employee_count"]          = _int(irs990, idx, "TotalEmployeeCnt")
 
     # Website URL and mission statement
-    result["website_url"] = _normalize_url(_txt(root, pfx, "WebsiteAddressTxt")) or None
+    result["website_url"] = _normalize_url(_txt(root, idx, "WebsiteAddressTxt")) or None
     result["narrative"]["mission_statement"] = (
-        _txt(root, pfx, "ActivityOrMissionDesc")
-        or _txt(root, pfx, "MissionDesc")
+        _txt(root, idx, "ActivityOrMissionDesc")
+        or _txt(root, idx, "MissionDesc")
         or None
     )
 
@@ -258,19 +238,19 @@ def _parse_990(root: ET.Element, pfx: str, result: dict) -> None:
 # Form 990-PF (private foundations)
 # ---------------------------------------------------------------------------
 
-def _parse_990pf(root: ET.Element, pfx: str, result: dict) -> None:
-    irs990pf = root.find(f".//{pfx}IRS990PF") or root.find(".//IRS990PF")
+def _parse_990pf(root: ET.Element, idx: "_TagIndex", result: dict) -> None:
+    irs990pf = idx.find(root, "IRS990PF", include_self=True)
 
     # Officers — Part VIII: OfficerDirTrstKeyEmplGrp
-    for grp in _iter(root, pfx, "OfficerDirTrstKeyEmplGrp"):
-        name = _txt(grp, pfx, "PersonNm")
+    for grp in _iter(root, idx, "OfficerDirTrstKeyEmplGrp"):
+        name = _txt(grp, idx, "PersonNm")
         if not name:
             continue
         result["officers"].append({
             "normalized_name": _normalize(name),
             "raw_name":        name.strip(),
-            "title":           _txt(grp, pfx, "TitleTxt") or None,
-            "compensation":    _flt(grp, pfx, "CompensationAmt"),
+            "title":           _txt(grp, idx, "TitleTxt") or None,
+            "compensation":    _flt(grp, idx, "CompensationAmt"),
         })
 
     # Grants — Part XV: multiple possible group names
@@ -280,127 +260,186 @@ def _parse_990pf(root: ET.Element, pfx: str, result: dict) -> None:
         "GrantOrContribution",
     )
     for tag in grant_group_tags:
-        for grp in _iter(root, pfx, tag):
+        for grp in _iter(root, idx, tag):
             name = (
-                _txt(grp, pfx, "RecipientBusinessName", "BusinessNameLine1Txt")
-                or _txt(grp, pfx, "RecipientPersonNm")
+                _txt(grp, idx, "RecipientBusinessName", "BusinessNameLine1Txt")
+                or _txt(grp, idx, "RecipientPersonNm")
             )
             if not name:
                 continue
             amount = (
-                _flt(grp, pfx, "Amt")
-                or _flt(grp, pfx, "Amount")
-                or _flt(grp, pfx, "GrantOrContributionAmt")
+                _flt(grp, idx, "Amt")
+                or _flt(grp, idx, "Amount")
+                or _flt(grp, idx, "GrantOrContributionAmt")
                 or 0.0
             )
             result["grants"].append({
                 "recipient_name":  name.strip(),
-                "recipient_ein":   _clean_ein(_txt(grp, pfx, "RecipientEIN")),
+                "recipient_ein":   _clean_ein(_txt(grp, idx, "RecipientEIN")),
                 "recipient_city":  None,
                 "recipient_state": None,
                 "grant_amount":    amount,
-                "grant_purpose":   _txt(grp, pfx, "GrantOrContributionPurposeTxt", "PurposeTxt") or None,
+                "grant_purpose":   _txt(grp, idx, "GrantOrContributionPurposeTxt", "PurposeTxt") or None,
                 "assistance_type": None,
             })
 
     # Financials (all from IRS990PF element)
     if irs990pf is not None:
-        result["financials"]["total_revenue"]             = _flt(irs990pf, pfx, "TotalRevenueAmt")
-        result["financials"]["total_assets"]              = _flt(irs990pf, pfx, "TotalAssetsAmt")
-        result["financials"]["grants_paid_total"]         = _flt(irs990pf, pfx, "QualifyingDistributionsAmt")
-        result["financials"]["distributable_amount"]      = _flt(irs990pf, pfx, "DistributableAmountAmt")
-        result["financials"]["qualifying_distributions"]  = _flt(irs990pf, pfx, "QualifyingDistributionsAmt")
+        result["financials"]["total_revenue"]             = _flt(irs990pf, idx, "TotalRevenueAmt")
+        result["financials"]["total_assets"]              = _flt(irs990pf, idx, "TotalAssetsAmt")
+        result["financials"]["grants_paid_total"]         = _flt(irs990pf, idx, "QualifyingDistributionsAmt")
+        result["financials"]["distributable_amount"]      = _flt(irs990pf, idx, "DistributableAmountAmt")
+        result["financials"]["qualifying_distributions"]  = _flt(irs990pf, idx, "QualifyingDistributionsAmt")
 
         # Fair market value of assets (used for capacity tier)
         result["financials"]["assets_fmv"] = (
-            _flt(irs990pf, pfx, "FMVAssetsEndOfYearAmt")
-            or _flt(irs990pf, pfx, "TotalAssetsAmt")
+            _flt(irs990pf, idx, "FMVAssetsEndOfYearAmt")
+            or _flt(irs990pf, idx, "TotalAssetsAmt")
         )
 
         # Governance / narrative
-        result["is_operating_foundation"] = _bool(irs990pf, pfx, "OperatingFoundationInd")
+        result["is_operating_foundation"] = _bool(irs990pf, idx, "OperatingFoundationInd")
 
-        accepts_flag = _txt(irs990pf, pfx, "AcceptsApplicationsInd")
-        procedures   = _txt(irs990pf, pfx, "GrantMakingProceduresTxt") or ""
+        accepts_flag = _txt(irs990pf, idx, "AcceptsApplicationsInd")
+        procedures   = _txt(irs990pf, idx, "GrantMakingProceduresTxt") or ""
         result["narrative"]["accepts_applications"] = _infer_accepts(accepts_flag, procedures)
 
         result["narrative"]["geographic_limitations"] = (
-            _txt(irs990pf, pfx, "GeographicLimitationsTxt")
-            or _txt(irs990pf, pfx, "DistributionLimitationsTxt")
+            _txt(irs990pf, idx, "GeographicLimitationsTxt")
+            or _txt(irs990pf, idx, "DistributionLimitationsTxt")
         )
 
         result["narrative"]["mission_statement"] = (
-            _txt(irs990pf, pfx, "MissionDescriptionTxt")
-            or _txt(irs990pf, pfx, "ActivityOrMissionDesc")
-            or _txt(irs990pf, pfx, "PurposeOfGrantOrContributionTxt")
+            _txt(irs990pf, idx, "MissionDescriptionTxt")
+            or _txt(irs990pf, idx, "ActivityOrMissionDesc")
+            or _txt(irs990pf, idx, "PurposeOfGrantOrContributionTxt")
         )
 
     # Website URL (searched outside irs990pf scope to catch ReturnHeader location)
-    result["website_url"] = _normalize_url(_txt(root, pfx, "WebsiteAddressTxt")) or None
+    result["website_url"] = _normalize_url(_txt(root, idx, "WebsiteAddressTxt")) or None
 
 
 # ---------------------------------------------------------------------------
 # Form 990-EZ (small nonprofits)
 # ---------------------------------------------------------------------------
 
-def _parse_990ez(root: ET.Element, pfx: str, result: dict) -> None:
+def _parse_990ez(root: ET.Element, idx: "_TagIndex", result: dict) -> None:
     # Officers — Part V: two possible group names
     officers_found = False
     for tag in ("Form990EZPartVOfcrDirTrstKeyEmplGrp", "OfficerDirectorTrusteeGrp"):
-        for grp in _iter(root, pfx, tag):
-            name = _txt(grp, pfx, "PersonNm") or _txt(grp, pfx, "PersonFullNm")
+        for grp in _iter(root, idx, tag):
+            name = _txt(grp, idx, "PersonNm") or _txt(grp, idx, "PersonFullNm")
             if not name:
                 continue
             result["officers"].append({
                 "normalized_name": _normalize(name),
                 "raw_name":        name.strip(),
-                "title":           _txt(grp, pfx, "TitleTxt") or None,
-                "compensation":    _flt(grp, pfx, "CompensationAmt"),
+                "title":           _txt(grp, idx, "TitleTxt") or None,
+                "compensation":    _flt(grp, idx, "CompensationAmt"),
             })
             officers_found = True
 
     # Financials
-    result["financials"]["total_revenue"]        = _first_flt(root, pfx, "TotalRevenueAmt")
-    result["financials"]["total_assets"]         = _first_flt(root, pfx, "TotalAssetsEOYAmt")
-    result["financials"]["total_expenses"]       = _first_flt(root, pfx, "TotalExpensesAmt")
-    result["financials"]["net_assets"]           = _first_flt(root, pfx, "NetAssetsOrFundBalancesEOYAmt")
-    result["financials"]["contributions_grants"] = _first_flt(root, pfx, "TotalContributionsAmt")
+    result["financials"]["total_revenue"]        = _first_flt(root, idx, "TotalRevenueAmt")
+    result["financials"]["total_assets"]         = _first_flt(root, idx, "TotalAssetsEOYAmt")
+    result["financials"]["total_expenses"]       = _first_flt(root, idx, "TotalExpensesAmt")
+    result["financials"]["net_assets"]           = _first_flt(root, idx, "NetAssetsOrFundBalancesEOYAmt")
+    result["financials"]["contributions_grants"] = _first_flt(root, idx, "TotalContributionsAmt")
 
     # Website URL and mission statement
-    result["website_url"] = _normalize_url(_txt(root, pfx, "WebsiteAddressTxt")) or None
-    result["narrative"]["mission_statement"] = _txt(root, pfx, "ActivityOrMissionDesc") or None
+    result["website_url"] = _normalize_url(_txt(root, idx, "WebsiteAddressTxt")) or None
+    result["narrative"]["mission_statement"] = _txt(root, idx, "ActivityOrMissionDesc") or None
 
 
 # ---------------------------------------------------------------------------
 # XML helper utilities
 # ---------------------------------------------------------------------------
 
-def _iter(parent: ET.Element, pfx: str, tag: str):
-    """Iterate elements by tag, trying namespaced then non-namespaced."""
-    found = list(parent.iter(f"{pfx}{tag}")) if pfx else []
-    if not found:
-        found = list(parent.iter(tag))
-    return found
+class _TagIndex:
+    """
+    Single-pass element index for one parsed 990 document.
+
+    One pre-order pass over root.iter() records, for every namespace-stripped
+    tag, the pre-order positions and elements carrying it. A "first/all <tag>
+    under <parent>" query is then a bisect into that tag's position list
+    within the parent's [start, end] span instead of a `.//` subtree scan, so
+    a filing costs O(document) to index and O(log n) per field — regardless
+    of how many fields a form parser asks for.
 
+    Namespace handling is done once here: '{http://www.irs.gov/efile}EIN'
+    and 'EIN' both index as 'EIN'.
+    """
 
-def _txt(parent: ET.Element, pfx: str, *tags: str) -> str:
+    __slots__ = ("_pos", "_span", "_tags")
+
+    def __init__(self, root: ET.Element):
+        pos_of: dict = {}
+        tags: dict = {}
+        for pos, elem in enumerate(root.iter()):
+            tag = elem.tag
+            if "}" in tag:
+                tag = tag.rpartition("}")[2]
+            entry = tags.get(tag)
+            if entry is None:
+                entry = tags[tag] = ([], [])
+            entry[0].append(pos)
+            entry[1].append(elem)
+            pos_of[elem] = pos
+        self._pos = pos_of
+        self._tags = tags
+        self._span: dict = {root: (0, len(pos_of) - 1)}
+
+    def _span_of(self, parent: ET.Element) -> tuple:
+        """[start, end] pre-order span of parent's subtree (computed on first use)."""
+        span = self._span.get(parent)
+        if span is None:
+            start = self._pos[parent]
+            span = self._span[parent] = (start, start + sum(1 for _ in parent.iter()) - 1)
+        return span
+
+    def _range(self, parent: ET.Element, tag: str, include_self: bool):
+        entry = self._tags.get(tag)
+        if entry is None:
+            return None, 0, 0
+        start, end = self._span_of(parent)
+        positions = entry[0]
+        lo = bisect_left(positions, start if include_self else start + 1)
+        hi = bisect_right(positions, end, lo)
+        return entry[1], lo, hi
+
+    def find(self, parent: ET.Element, tag: str, include_self: bool = False) -> Optional[ET.Element]:
+        """First element with this tag under parent (descendants, like `.//tag`)."""
+        elems, lo, hi = self._range(parent, tag, include_self)
+        return elems[lo] if lo < hi else None
+
+    def findall(self, parent: ET.Element, tag: str, include_self: bool = False) -> list:
+        """All elements with this tag under parent, in document order."""
+        elems, lo, hi = self._range(parent, tag, include_self)
+        return elems[lo:hi] if lo < hi else []
+
+
+def _iter(parent: ET.Element, idx: _TagIndex, tag: str) -> list:
+    """All elements with this tag in parent's subtree (parent included, like Element.iter)."""
+    return idx.findall(parent, tag, include_self=True)
+
+
+def _txt(parent: ET.Element, idx: _TagIndex, *tags: str) -> str:
     """
     Return text of the first matching tag (tried in order), searching anywhere
     in the subtree. Each tag is a simple element name, not a path.
     """
     for tag in tags:
-        val = parent.findtext(f".//{pfx}{tag}") or parent.findtext(f".//{tag}") or ""
-        val = val.strip()
+        elem = idx.find(parent, tag)
+        val = (elem.text or "").strip() if elem is not None else ""
         if val:
             return val
     return ""
 
 
-def _flt(parent: ET.Element, pfx: str, *tags: str) -> Optional[float]:
+def _flt(parent: ET.Element, idx: _TagIndex, *tags: str) -> Optional[float]:
     """Return float value of first matching tag."""
     for tag in tags:
-        val = parent.findtext(f".//{pfx}{tag}") or parent.findtext(f".//{tag}") or ""
-        val = val.strip()
+        val = _txt(parent, idx, tag)
         if val:
             try:
                 return float(val)
@@ -409,9 +448,9 @@ def _flt(parent: ET.Element, pfx: str, *tags: str) -> Optional[float]:
     return None
 
 
-def _first_flt(root: ET.Element, pfx: str, tag: str) -> Optional[float]:
+def _first_flt(root: ET.Element, idx: _TagIndex, tag: str) -> Optional[float]:
     """Find the first element with this tag anywhere in the document."""
-    elem = root.find(f".//{pfx}{tag}") or root.find(f".//{tag}")
+    elem = idx.find(root, tag)
     if elem is not None and elem.text:
         try:
             return float(elem.text.strip())
@@ -420,8 +459,8 @@ def _first_flt(root: ET.Element, pfx: str, tag: str) -> Optional[float]:
     return None
 
 
-def _bool(parent: ET.Element, pfx: str, tag: str) -> bool:
-    val = (parent.findtext(f".//{pfx}{tag}") or parent.findtext(f".//{tag}") or "").strip().lower()
+def _bool(parent: ET.Element, idx: _TagIndex, tag: str) -> bool:
+    val = _txt(parent, idx, tag).lower()
     return val in ("1", "true", "x", "yes")
 
 
@@ -475,11 +514,10 @@ def _normalize_url(url: str) -> Optional[str]:
     return url.rstrip("/")
 
 
-def _int(parent: ET.Element, pfx: str, *tags: str) -> Optional[int]:
+def _int(parent: ET.Element, idx: _TagIndex, *tags: str) -> Optional[int]:
     """Return int value of first matching tag."""
     for tag in tags:
-        val = parent.findtext(f".//{pfx}{tag}") or parent.findtext(f".//{tag}") or ""
-        val = val.strip()
+        val = _txt(parent, idx, tag)
         if val:
             try:
                 return int(float(val))
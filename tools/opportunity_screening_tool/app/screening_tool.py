@@ -18,7 +18,7 @@ from src.core.tool_framework.path_helper import setup_tool_paths
 # Setup paths for imports
 project_root = setup_tool_paths(__file__)
 
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 import asyncio
 import json
 import logging
@@ -50,30 +50,77 @@ from .screening_models import (
 # Prompt builders — convert BAML templates into plain-text Claude prompts
 # ---------------------------------------------------------------------------
 
-def _build_fast_screening_prompt(
-    opportunity: Opportunity,
-    organization: OrganizationProfile,
-) -> str:
-    """Build the system + user prompt for fast (haiku) screening."""
-    system = (
-        "You are an expert grant researcher analyzing opportunity fit for a nonprofit. "
-        "Return ONLY valid JSON matching the schema below — no markdown, no commentary.\n\n"
-        "JSON Schema:\n"
-        "{\n"
-        '  "strategic_fit_score": float 0.0-1.0,\n'
-        '  "eligibility_score": float 0.0-1.0,\n'
-        '  "timing_score": float 0.0-1.0,\n'
-        '  "overall_score": float 0.0-1.0,\n'
-        '  "confidence_level": "high" | "medium" | "low",\n'
-        '  "one_sentence_summary": string,\n'
-        '  "key_strengths": [string, string],\n'
-        '  "key_concerns": [string, string],\n'
-        '  "reasoning": string (1-2 sentences explaining the score)\n'
-        "}\n\n"
-        "Scoring weights: overall = strategic_fit*0.50 + eligibility*0.30 + timing*0.20\n"
-        "Be honest — a poor fit should score below 0.4. A great fit above 0.8."
+_FAST_SYSTEM_PROMPT = (
+    "You are an expert grant researcher analyzing opportunity fit for a nonprofit. "
+    "Return ONLY valid JSON matching the schema below — no markdown, no commentary.\n\n"
+    "JSON Schema:\n"
+    "{\n"
+    '  "strategic_fit_score": float 0.0-1.0,\n'
+    '  "eligibility_score": float 0.0-1.0,\n'
+    '  "timing_score": float 0.0-1.0,\n'
+    '  "overall_score": float 0.0-1.0,\n'
+    '  "confidence_level": "high" | "medium" | "low",\n'
+    '  "one_sentence_summary": string,\n'
+    '  "key_strengths": [string, string],\n'
+    '  "key_concerns": [string, string],\n'
+    '  "reasoning": string (1-2 sentences explaining the score)\n'
+    "}\n\n"
+    "Scoring weights: overall = strategic_fit*0.50 + eligibility*0.30 + timing*0.20\n"
+    "Be honest — a poor fit should score below 0.4. A great fit above 0.8."
+)
+
+_THOROUGH_SYSTEM_PROMPT = (
+    "You are an expert grant researcher performing comprehensive opportunity analysis. "
+    "Return ONLY valid JSON matching the schema below — no markdown, no commentary.\n\n"
+    "JSON Schema:\n"
+    "{\n"
+    '  "strategic_fit_score": float 0.0-1.0,\n'
+    '  "eligibility_score": float 0.0-1.0,\n'
+    '  "timing_score": float 0.0-1.0,\n'
+    '  "financial_score": float 0.0-1.0,\n'
+    '  "competition_score": float 0.0-1.0,\n'
+    '  "overall_score": float 0.0-1.0,\n'
+    '  "confidence_level": "high" | "medium" | "low",\n'
+    '  "one_sentence_summary": string,\n'
+    '  "key_strengths": [string, ...] (3-5 items),\n'
+    '  "key_concerns": [string, ...] (3-5 items),\n'
+    '  "risk_factors": [string, ...],\n'
+    '  "recommended_actions": [string, ...],\n'
+    '  "estimated_effort_hours": int,\n'
+    '  "reasoning": string (2-3 sentences)\n'
+    "}\n\n"
+    "Scoring weights: overall = strategic_fit*0.35 + eligibility*0.25 + "
+    "timing*0.15 + financial*0.15 + competition*0.10\n\n"
+    "Strategic Fit: Mission alignment, program match, geographic alignment, capacity fit.\n"
+    "Eligibility: Hard requirements, NTEE match, revenue/size, geographic eligibility.\n"
+    "Timing: Deadline feasibility, award timing, project duration.\n"
+    "Financial: Award size vs org capacity, budget fit, ROI potential.\n"
+    "Competition: Competitive positioning, past recipients, unique value proposition.\n\n"
+    "Be honest and specific. Poor fits should score below 0.4."
+)
+
+# Appended to the system prompt when several opportunities share one call
+_PACKED_INSTRUCTIONS = (
+    "\n\nYou will be given several opportunities, each labeled with an opportunity_id. "
+    "Score each one independently against the organization using the schema above. "
+    "Return ONLY a JSON object of the form "
+    '{"results": [{"opportunity_id": string, ...schema fields...}, ...]} '
+    "with exactly one entry per opportunity, in the order given."
+)
+
+
+def _fast_organization_block(organization: OrganizationProfile) -> str:
+    return (
+        f"ORGANIZATION:\n"
+        f"  Name: {organization.name}\n"
+        f"  Mission: {organization.mission}\n"
+        f"  NTEE: {', '.join(organization.ntee_codes)}\n"
+        f"  Geography: {', '.join(organization.geographic_focus)}\n"
+        f"  Programs: {', '.join(organization.program_areas)}\n\n"
     )
 
+
+def _fast_opportunity_block(opportunity: Opportunity) -> str:
     geo = ", ".join(opportunity.geographic_restrictions) if opportunity.geographic_restrictions else "None specified"
     focus = ", ".join(opportunity.focus_areas) if opportunity.focus_areas else "None specified"
     amount = ""
@@ -82,14 +129,7 @@ def _build_fast_screening_prompt(
     else:
         amount = "Not specified"
 
-    user = (
-        f"ORGANIZATION:\n"
-        f"  Name: {organization.name}\n"
-        f"  Mission: {organization.mission}\n"
-        f"  NTEE: {', '.join(organization.ntee_codes)}\n"
-        f"  Geography: {', '.join(organization.geographic_focus)}\n"
-        f"  Programs: {', '.join(organization.program_areas)}\n\n"
-        f"OPPORTUNITY:\n"
+    block = (
         f"  Title: {opportunity.title}\n"
         f"  Funder: {opportunity.funder} ({opportunity.funder_type})\n"
         f"  Description: {opportunity.description[:1500]}\n"
@@ -101,49 +141,34 @@ def _build_fast_screening_prompt(
 
     # Inject funder intelligence summary if available
     if opportunity.funder_intelligence and hasattr(opportunity.funder_intelligence, 'to_screening_context'):
-        user += f"\n{opportunity.funder_intelligence.to_screening_context(mode='fast')}\n"
-        user += "\nConsider the funder intelligence above when scoring accepts_applications and eligibility.\n"
+        block += f"\n{opportunity.funder_intelligence.to_screening_context(mode='fast')}\n"
+        block += "\nConsider the funder intelligence above when scoring accepts_applications and eligibility.\n"
 
-    user += "\nScore this opportunity for the organization above."
-    return system, user
+    return block
 
 
-def _build_thorough_screening_prompt(
+def _thorough_organization_block(organization: OrganizationProfile) -> str:
+    block = (
+        f"ORGANIZATION:\n"
+        f"  Name: {organization.name}\n"
+        f"  Mission: {organization.mission}\n"
+        f"  NTEE Codes: {', '.join(organization.ntee_codes)}\n"
+        f"  Geography: {', '.join(organization.geographic_focus)}\n"
+        f"  Programs: {', '.join(organization.program_areas)}\n"
+    )
+    if organization.annual_revenue:
+        block += f"  Annual Revenue: ${organization.annual_revenue:,.0f}\n"
+    if organization.staff_count:
+        block += f"  Staff: {organization.staff_count}\n"
+    if organization.years_established:
+        block += f"  Years Established: {organization.years_established}\n"
+    return block + "\n"
+
+
+def _thorough_opportunity_block(
     opportunity: Opportunity,
-    organization: OrganizationProfile,
     funder_intel: Optional[FunderIntelligence] = None,
 ) -> str:
-    """Build the system + user prompt for thorough (sonnet) screening."""
-    system = (
-        "You are an expert grant researcher performing comprehensive opportunity analysis. "
-        "Return ONLY valid JSON matching the schema below — no markdown, no commentary.\n\n"
-        "JSON Schema:\n"
-        "{\n"
-        '  "strategic_fit_score": float 0.0-1.0,\n'
-        '  "eligibility_score": float 0.0-1.0,\n'
-        '  "timing_score": float 0.0-1.0,\n'
-        '  "financial_score": float 0.0-1.0,\n'
-        '  "competition_score": float 0.0-1.0,\n'
-        '  "overall_score": float 0.0-1.0,\n'
-        '  "confidence_level": "high" | "medium" | "low",\n'
-        '  "one_sentence_summary": string,\n'
-        '  "key_strengths": [string, ...] (3-5 items),\n'
-        '  "key_concerns": [string, ...] (3-5 items),\n'
-        '  "risk_factors": [string, ...],\n'
-        '  "recommended_actions": [string, ...],\n'
-        '  "estimated_effort_hours": int,\n'
-        '  "reasoning": string (2-3 sentences)\n'
-        "}\n\n"
-        "Scoring weights: overall = strategic_fit*0.35 + eligibility*0.25 + "
-        "timing*0.15 + financial*0.15 + competition*0.10\n\n"
-        "Strategic Fit: Mission alignment, program match, geographic alignment, capacity fit.\n"
-        "Eligibility: Hard requirements, NTEE match, revenue/size, geographic eligibility.\n"
-        "Timing: Deadline feasibility, award timing, project duration.\n"
-        "Financial: Award size vs org capacity, budget fit, ROI potential.\n"
-        "Competition: Competitive positioning, past recipients, unique value proposition.\n\n"
-        "Be honest and specific. Poor fits should score below 0.4."
-    )
-
     geo = ", ".join(opportunity.geographic_restrictions) if opportunity.geographic_restrictions else "None specified"
     focus = ", ".join(opportunity.focus_areas) if opportunity.focus_areas else "None specified"
     past = ", ".join(opportunity.past_recipients[:5]) if opportunity.past_recipients else "Unknown"
@@ -157,17 +182,7 @@ def _build_thorough_screening_prompt(
     else:
         amount = "Not specified"
 
-    user = (
-        f"ORGANIZATION:\n"
-        f"  Name: {organization.name}\n"
-        f"  Mission: {organization.mission}\n"
-        f"  NTEE Codes: {', '.join(organization.ntee_codes)}\n"
-        f"  Geography: {', '.join(organization.geographic_focus)}\n"
-        f"  Programs: {', '.join(organization.program_areas)}\n"
-        f"  Annual Revenue: ${organization.annual_revenue:,.0f}\n" if organization.annual_revenue else ""
-        f"  Staff: {organization.staff_count}\n" if organization.staff_count else ""
-        f"  Years Established: {organization.years_established}\n\n" if organization.years_established else "\n"
-        f"OPPORTUNITY:\n"
+    block = (
         f"  Title: {opportunity.title}\n"
         f"  Funder: {opportunity.funder} ({opportunity.funder_type})\n"
         f"  Description: {opportunity.description[:3000]}\n\n"
@@ -185,23 +200,78 @@ def _build_thorough_screening_prompt(
 
     # Inject BMF funder intelligence (existing FunderIntelligence from discovery data)
     if funder_intel and (funder_intel.capacity_tier or funder_intel.total_assets):
-        user += funder_intel.to_prompt_context() + "\n\n"
-        user += (
+        block += funder_intel.to_prompt_context() + "\n\n"
+        block += (
             "Use the funder intelligence above to inform your scoring — "
             "especially competition, financial fit, and geographic alignment.\n\n"
         )
 
     # Inject W/9 funder intelligence (GrantFunderIntelligence from website/990 fetch)
     if opportunity.funder_intelligence and hasattr(opportunity.funder_intelligence, 'to_screening_context'):
-        user += opportunity.funder_intelligence.to_screening_context(mode='thorough') + "\n\n"
-        user += (
+        block += opportunity.funder_intelligence.to_screening_context(mode='thorough') + "\n\n"
+        block += (
             "Use the detailed funder intelligence above to inform all scoring dimensions — "
             "especially eligibility (accepts_applications, deadlines), strategic fit "
             "(priorities, programs), and competitive positioning.\n\n"
         )
 
-    user += "Provide comprehensive scoring for this opportunity."
+    return block
+
+
+def _build_fast_screening_prompt(
+    opportunity: Opportunity,
+    organization: OrganizationProfile,
+) -> Tuple[str, str]:
+    """Build the system + user prompt for fast (haiku) screening."""
+    user = (
+        _fast_organization_block(organization)
+        + "OPPORTUNITY:\n"
+        + _fast_opportunity_block(opportunity)
+        + "\nScore this opportunity for the organization above."
+    )
+    return _FAST_SYSTEM_PROMPT, user
+
+
+def _build_thorough_screening_prompt(
+    opportunity: Opportunity,
+    organization: OrganizationProfile,
+    funder_intel: Optional[FunderIntelligence] = None,
+) -> Tuple[str, str]:
+    """Build the system + user prompt for thorough (sonnet) screening."""
+    user = (
+        _thorough_organization_block(organization)
+        + "OPPORTUNITY:\n"
+        + _thorough_opportunity_block(opportunity, funder_intel)
+        + "Provide comprehensive scoring for this opportunity."
+    )
+    return _THOROUGH_SYSTEM_PROMPT, user
+
+
+def _build_packed_screening_prompt(
+    opportunities: List[Opportunity],
+    organization: OrganizationProfile,
+    mode: str,
+    funder_cache: Optional[Dict[str, FunderIntelligence]] = None,
+) -> Tuple[str, str]:
+    """Build one system + user prompt that scores several opportunities at once."""
+    if mode == "fast":
+        system = _FAST_SYSTEM_PROMPT + _PACKED_INSTRUCTIONS
+        user = _fast_organization_block(organization)
+    else:
+        system = _THOROUGH_SYSTEM_PROMPT + _PACKED_INSTRUCTIONS
+        user = _thorough_organization_block(organization)
+
+    for n, opportunity in enumerate(opportunities, 1):
+        user += f"OPPORTUNITY {n} (opportunity_id: {opportunity.opportunity_id}):\n"
+        if mode == "fast":
+            user += _fast_opportunity_block(opportunity) + "\n"
+        else:
+            user += _thorough_opportunity_block(opportunity, (funder_cache or {}).get(opportunity.funder))
 
+    user += (
+        f"Score each of the {len(opportunities)} opportunities above for the organization. "
+        "Return one result per opportunity_id."
+    )
     return system, user
 
 
@@ -267,6 +337,18 @@ def _parse_ai_score(
     )
 
 
+def _packed_results_by_id(raw_json: Any) -> Dict[str, dict]:
+    """Index a packed response's results by opportunity_id (malformed entries are skipped)."""
+    results = raw_json.get("results") if isinstance(raw_json, dict) else raw_json
+    if not isinstance(results, list):
+        raise ValueError("Packed screening response has no results list")
+    return {
+        str(result["opportunity_id"]): result
+        for result in results
+        if isinstance(result, dict) and result.get("opportunity_id") is not None
+    }
+
+
 # ---------------------------------------------------------------------------
 # Tool class
 # ---------------------------------------------------------------------------
@@ -280,6 +362,12 @@ class OpportunityScreeningTool(BaseTool[ScreeningOutput]):
     Factor 10: Single responsibility - opportunity screening only
 
     Uses Claude API when available, falls back to rule-based scoring otherwise.
+
+    AI calls run in a sliding window (fast_concurrency / thorough_concurrency
+    in flight, paced by AnthropicService's RPM/TPM limiter). With pack_size > 1,
+    that many opportunities share one prompt and return a multi-result JSON
+    response; opportunities missing from an unparseable or partial response
+    are re-screened one at a time.
     """
 
     def __init__(self, config: Optional[dict] = None):
@@ -288,6 +376,9 @@ class OpportunityScreeningTool(BaseTool[ScreeningOutput]):
         config = config or {}
         self.default_mode = config.get("default_mode", "fast")
         self.default_threshold = config.get("default_threshold", 0.40)
+        self.fast_concurrency = config.get("fast_concurrency", 10)
+        self.thorough_concurrency = config.get("thorough_concurrency", 5)
+        self.pack_size = config.get("pack_size", 1)  # Opportunities per prompt; 1 = one call each
 
         # Get Anthropic service (may not have an API key)
         self._anthropic: AnthropicService = get_anthropic_service()
@@ -366,23 +457,90 @@ class OpportunityScreeningTool(BaseTool[ScreeningOutput]):
     # Fast screening (haiku)
     # ------------------------------------------------------------------
 
-    async def _screen_fast_batch(
+    async def _run_windowed(
+        self,
+        items: Sequence[Any],
+        worker: Callable[[Any], Awaitable[Any]],
+        concurrency: int,
+    ) -> List[Any]:
+        """Run worker over items with at most `concurrency` in flight, results in input order.
+
+        The next item starts as soon as any call finishes, so one slow call
+        no longer holds back a whole batch.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(item):
+            async with semaphore:
+                return await worker(item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+    def _packs(self, opportunities: List[Opportunity]) -> List[List[Opportunity]]:
+        return [
+            opportunities[i:i + self.pack_size]
+            for i in range(0, len(opportunities), self.pack_size)
+        ]
+
+    async def _screen_packed_ai(
         self,
         opportunities: List[Opportunity],
         organization: OrganizationProfile,
+        mode: str,
+        funder_cache: Optional[Dict[str, FunderIntelligence]] = None,
     ) -> List[OpportunityScore]:
-        """Fast screening — parallel batches of 10."""
-        self.logger.info(f"Fast screening {len(opportunities)} opportunities")
+        """Score several opportunities in one call; re-screen singly any that are missing."""
+        system, user = _build_packed_screening_prompt(opportunities, organization, mode, funder_cache)
+        try:
+            result = await self._anthropic.create_json_completion(
+                messages=[{"role": "user", "content": user}],
+                system=system,
+                stage=PipelineStage.FAST_SCREENING if mode == "fast" else PipelineStage.THOROUGH_SCREENING,
+                max_tokens=(512 if mode == "fast" else 1024) * len(opportunities),
+                temperature=0.0,
+                cache_system_prompt=True,
+            )
+            by_id = _packed_results_by_id(result)
+        except Exception as e:
+            self.logger.warning(
+                f"Packed {mode} screening of {len(opportunities)} opportunities failed, "
+                f"screening individually: {e}"
+            )
+            by_id = {}
+
         scores = []
-        batch_size = 10
-        for i in range(0, len(opportunities), batch_size):
-            batch = opportunities[i:i + batch_size]
-            batch_scores = await asyncio.gather(*[
-                self._screen_fast_single(opp, organization) for opp in batch
-            ])
-            scores.extend(batch_scores)
+        for opportunity in opportunities:
+            raw = by_id.get(str(opportunity.opportunity_id))
+            if raw is not None:
+                scores.append(_parse_ai_score(raw, opportunity, mode=mode))
+            elif mode == "fast":
+                scores.append(await self._screen_fast_ai(opportunity, organization))
+            else:
+                funder_intel = (funder_cache or {}).get(opportunity.funder)
+                scores.append(await self._screen_thorough_ai(opportunity, organization, funder_intel))
         return scores
 
+    async def _screen_fast_batch(
+        self,
+        opportunities: List[Opportunity],
+        organization: OrganizationProfile,
+    ) -> List[OpportunityScore]:
+        """Fast screening — sliding window of fast_concurrency calls."""
+        self.logger.info(f"Fast screening {len(opportunities)} opportunities")
+        if self._ai_available and self.pack_size > 1:
+            packed = await self._run_windowed(
+                self._packs(opportunities),
+                lambda pack: self._screen_packed_ai(pack, organization, "fast"),
+                self.fast_concurrency,
+            )
+            return [score for pack_scores in packed for score in pack_scores]
+
+        return await self._run_windowed(
+            opportunities,
+            lambda opp: self._screen_fast_single(opp, organization),
+            self.fast_concurrency,
+        )
+
     async def _screen_fast_single(
         self,
         opportunity: Opportunity,
@@ -407,6 +565,7 @@ class OpportunityScreeningTool(BaseTool[ScreeningOutput]):
                 stage=PipelineStage.FAST_SCREENING,
                 max_tokens=512,
                 temperature=0.0,
+                cache_system_prompt=True,
             )
             return _parse_ai_score(result, opportunity, mode="fast")
         except Exception as e:
@@ -460,22 +619,25 @@ class OpportunityScreeningTool(BaseTool[ScreeningOutput]):
         opportunities: List[Opportunity],
         organization: OrganizationProfile,
     ) -> List[OpportunityScore]:
-        """Thorough screening — enrich funders, then parallel batches of 5."""
+        """Thorough screening — enrich funders, then a sliding window of thorough_concurrency calls."""
         self.logger.info(f"Thorough screening {len(opportunities)} opportunities")
 
         # Pre-enrich all funders in one pass (dedupes by funder name)
         funder_cache = enrich_opportunities_batch(opportunities)
 
-        scores = []
-        batch_size = 5
-        for i in range(0, len(opportunities), batch_size):
-            batch = opportunities[i:i + batch_size]
-            batch_scores = await asyncio.gather(*[
-                self._screen_thorough_single(opp, organization, funder_cache)
-                for opp in batch
-            ])
-            scores.extend(batch_scores)
-        return scores
+        if self._ai_available and self.pack_size > 1:
+            packed = await self._run_windowed(
+                self._packs(opportunities),
+                lambda pack: self._screen_packed_ai(pack, organization, "thorough", funder_cache),
+                self.thorough_concurrency,
+            )
+            return [score for pack_scores in packed for score in pack_scores]
+
+        return await self._run_windowed(
+            opportunities,
+            lambda opp: self._screen_thorough_single(opp, organization, funder_cache),
+            self.thorough_concurrency,
+        )
 
     async def _screen_thorough_single(
         self,
@@ -506,6 +668,7 @@ class OpportunityScreeningTool(BaseTool[ScreeningOutput]):
                 stage=PipelineStage.THOROUGH_SCREENING,
                 max_tokens=1024,
                 temperature=0.0,
+                cache_system_prompt=True,
             )
             return _parse_ai_score(result, opportunity, mode="thorough")
         except Exception as e: